@@ -41,6 +41,8 @@ CREATE TABLE messages (
     message_type VARCHAR(50) DEFAULT 'agent_response',
     metadata JSON,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Canonical UTC epoch microseconds for time filtering/sorting
+    ts_us BIGINT DEFAULT (CAST(UNIX_TIMESTAMP(CURRENT_TIMESTAMP(6)) * 1000000 AS SIGNED)),
     parent_message_id BIGINT,
 
     CONSTRAINT messages_session_id_not_empty CHECK (CHAR_LENGTH(TRIM(session_id)) > 0),
@@ -52,6 +54,7 @@ CREATE TABLE messages (
 
     INDEX idx_session_id (session_id),
     INDEX idx_parent_message_id (parent_message_id),
+    FULLTEXT INDEX idx_messages_fulltext (sender, content),
 
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE,
     FOREIGN KEY (parent_message_id) REFERENCES messages(id) ON DELETE SET NULL
@@ -68,6 +71,9 @@ CREATE TABLE agent_memory (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     expires_at TIMESTAMP NULL,
+    -- NULL session_ids never collide in unique keys; memory_scope maps
+    -- global entries to '' so set_memory's upsert finds them
+    memory_scope VARCHAR(255) AS (COALESCE(session_id, '')) STORED,
 
     CONSTRAINT agent_memory_agent_id_not_empty CHECK (CHAR_LENGTH(TRIM(agent_id)) > 0),
     CONSTRAINT agent_memory_key_not_empty CHECK (CHAR_LENGTH(TRIM(key_name)) > 0),
@@ -77,6 +83,7 @@ CREATE TABLE agent_memory (
     CONSTRAINT agent_memory_metadata_valid CHECK (metadata IS NULL OR JSON_VALID(metadata)),
 
     UNIQUE KEY unique_agent_session_key (agent_id, session_id, key_name),
+    UNIQUE KEY unique_agent_scope_key (agent_id, memory_scope, key_name),
     INDEX idx_session_id (session_id),
 
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
@@ -110,6 +117,8 @@ CREATE TABLE audit_log (
 
 -- Primary message access patterns
 CREATE INDEX idx_messages_session_time ON messages(session_id, timestamp);
+CREATE INDEX idx_messages_session_ts ON messages(session_id, ts_us);
+CREATE INDEX idx_messages_session_id_id ON messages(session_id, id);
 CREATE INDEX idx_messages_sender_timestamp ON messages(sender, timestamp);
 CREATE INDEX idx_messages_visibility_session ON messages(visibility, session_id);
 CREATE INDEX idx_messages_sender_type ON messages(sender_type, timestamp);
@@ -131,6 +140,119 @@ CREATE INDEX idx_sessions_created_by ON sessions(created_by);
 CREATE INDEX idx_sessions_active ON sessions(is_active);
 CREATE INDEX idx_sessions_updated_at ON sessions(updated_at);
 
+-- ============================================================================
+-- SESSION STATISTICS
+-- ============================================================================
+-- Per-session counters read by the dashboard, session view and debug prompt
+-- instead of aggregating messages and agent_memory on every page load.
+-- Maintained by triggers, so every writer keeps them current. Messages are
+-- append-only apart from deletes; memory_count counts stored session memory
+-- entries, including expired ones until the cleanup task removes them.
+
+CREATE TABLE session_stats (
+    session_id VARCHAR(255) PRIMARY KEY,
+    message_count INT NOT NULL DEFAULT 0,
+    public_count INT NOT NULL DEFAULT 0,
+    private_count INT NOT NULL DEFAULT 0,
+    agent_only_count INT NOT NULL DEFAULT 0,
+    admin_only_count INT NOT NULL DEFAULT 0,
+    participant_count INT NOT NULL DEFAULT 0,
+    memory_count INT NOT NULL DEFAULT 0,
+    last_activity TIMESTAMP NULL,  -- timestamp of the newest message (by ts_us)
+    last_activity_us BIGINT,
+
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Distinct senders per session with their message counts
+CREATE TABLE session_senders (
+    session_id VARCHAR(255) NOT NULL,
+    sender VARCHAR(255) NOT NULL,
+    message_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (session_id, sender),
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TRIGGER session_stats_session_insert_trigger
+AFTER INSERT ON sessions
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO session_stats (session_id) VALUES (NEW.id);
+END;
+
+-- SET assignments apply left to right: last_activity reads the old last_activity_us
+CREATE TRIGGER session_stats_message_insert_trigger
+AFTER INSERT ON messages
+FOR EACH ROW
+BEGIN
+    DECLARE new_sender INT DEFAULT 0;
+    INSERT IGNORE INTO session_stats (session_id) VALUES (NEW.session_id);
+    INSERT INTO session_senders (session_id, sender, message_count)
+    VALUES (NEW.session_id, NEW.sender, 1)
+    ON DUPLICATE KEY UPDATE message_count = message_count + 1;
+    SET new_sender = (ROW_COUNT() = 1);
+    UPDATE session_stats SET
+        last_activity = IF(last_activity_us > NEW.ts_us, last_activity, NEW.timestamp),
+        last_activity_us = GREATEST(COALESCE(last_activity_us, 0), NEW.ts_us),
+        message_count = message_count + 1,
+        public_count = public_count + (NEW.visibility = 'public'),
+        private_count = private_count + (NEW.visibility = 'private'),
+        agent_only_count = agent_only_count + (NEW.visibility = 'agent_only'),
+        admin_only_count = admin_only_count + (NEW.visibility = 'admin_only'),
+        participant_count = participant_count + new_sender
+    WHERE session_id = NEW.session_id;
+END;
+
+CREATE TRIGGER session_stats_message_delete_trigger
+AFTER DELETE ON messages
+FOR EACH ROW
+BEGIN
+    DECLARE remaining INT DEFAULT 0;
+    UPDATE session_senders SET message_count = message_count - 1
+    WHERE session_id = OLD.session_id AND sender = OLD.sender;
+    SELECT message_count INTO remaining FROM session_senders
+    WHERE session_id = OLD.session_id AND sender = OLD.sender;
+    IF remaining <= 0 THEN
+        DELETE FROM session_senders
+        WHERE session_id = OLD.session_id AND sender = OLD.sender;
+    END IF;
+    UPDATE session_stats SET
+        message_count = message_count - 1,
+        public_count = public_count - (OLD.visibility = 'public'),
+        private_count = private_count - (OLD.visibility = 'private'),
+        agent_only_count = agent_only_count - (OLD.visibility = 'agent_only'),
+        admin_only_count = admin_only_count - (OLD.visibility = 'admin_only'),
+        participant_count = participant_count - (remaining <= 0)
+    WHERE session_id = OLD.session_id;
+    UPDATE session_stats SET
+        last_activity = (
+            SELECT timestamp FROM messages
+            WHERE session_id = OLD.session_id
+            ORDER BY ts_us DESC LIMIT 1
+        ),
+        last_activity_us = (
+            SELECT MAX(ts_us) FROM messages WHERE session_id = OLD.session_id
+        )
+    WHERE session_id = OLD.session_id AND last_activity_us <= OLD.ts_us;
+END;
+
+CREATE TRIGGER session_stats_memory_insert_trigger
+AFTER INSERT ON agent_memory
+FOR EACH ROW
+BEGIN
+    UPDATE session_stats SET memory_count = memory_count + 1
+    WHERE session_id = NEW.session_id;
+END;
+
+CREATE TRIGGER session_stats_memory_delete_trigger
+AFTER DELETE ON agent_memory
+FOR EACH ROW
+BEGIN
+    UPDATE session_stats SET memory_count = memory_count - 1
+    WHERE session_id = OLD.session_id;
+END;
+
 -- ============================================================================
 -- CLEANUP VIEWS
 -- ============================================================================
@@ -210,3 +332,33 @@ VALUES (3, 'PRP-010: MySQL schema with JSON, AUTO_INCREMENT, and InnoDB optimiza
 ON DUPLICATE KEY UPDATE
     description = VALUES(description),
     applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (4, 'Full-text search index on messages (FULLTEXT sender, content)')
+ON DUPLICATE KEY UPDATE
+    description = VALUES(description),
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (5, 'Canonical messages.ts_us epoch microseconds indexed by session')
+ON DUPLICATE KEY UPDATE
+    description = VALUES(description),
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (6, 'Keyset pagination index on messages(session_id, id)')
+ON DUPLICATE KEY UPDATE
+    description = VALUES(description),
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (7, 'Trigger-maintained session_stats and session_senders')
+ON DUPLICATE KEY UPDATE
+    description = VALUES(description),
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (8, 'Unique global agent_memory keys for single-statement upserts')
+ON DUPLICATE KEY UPDATE
+    description = VALUES(description),
+    applied_at = CURRENT_TIMESTAMP;
@@ -37,7 +37,9 @@ CREATE TABLE messages (
     message_type VARCHAR(50) DEFAULT 'agent_response',
     metadata JSONB,
     timestamp TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    ts_us BIGINT,  -- Canonical UTC epoch microseconds for time filtering/sorting
     parent_message_id BIGINT,
+    search_vector TSVECTOR,
 
     CONSTRAINT messages_session_id_not_empty CHECK (length(trim(session_id)) > 0),
     CONSTRAINT messages_sender_not_empty CHECK (length(trim(sender)) > 0),
@@ -113,6 +115,39 @@ CREATE TRIGGER agent_memory_updated_at_trigger
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Full-text search vector maintenance for messages.search_vector
+CREATE OR REPLACE FUNCTION messages_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.content, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.sender, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.metadata::text, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER messages_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF sender, content, metadata ON messages
+    FOR EACH ROW
+    EXECUTE FUNCTION messages_search_vector_update();
+
+-- Canonical epoch microseconds for writers that don't set messages.ts_us
+CREATE OR REPLACE FUNCTION messages_ts_us_default()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.ts_us IS NULL THEN
+        NEW.ts_us := (EXTRACT(EPOCH FROM COALESCE(NEW.timestamp, CURRENT_TIMESTAMP)) * 1000000)::BIGINT;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER messages_ts_us_trigger
+    BEFORE INSERT ON messages
+    FOR EACH ROW
+    EXECUTE FUNCTION messages_ts_us_default();
+
 -- ============================================================================
 -- PERFORMANCE INDEXES
 -- ============================================================================
@@ -121,6 +156,8 @@ CREATE TRIGGER agent_memory_updated_at_trigger
 -- Primary message access patterns
 CREATE INDEX idx_messages_session_id ON messages(session_id);
 CREATE INDEX idx_messages_session_time ON messages(session_id, timestamp);
+CREATE INDEX idx_messages_session_ts ON messages(session_id, ts_us);
+CREATE INDEX idx_messages_session_id_id ON messages(session_id, id);
 CREATE INDEX idx_messages_sender_timestamp ON messages(sender, timestamp);
 CREATE INDEX idx_messages_visibility_session ON messages(visibility, session_id);
 CREATE INDEX idx_messages_parent_id ON messages(parent_message_id) WHERE parent_message_id IS NOT NULL;
@@ -131,6 +168,9 @@ CREATE INDEX idx_agent_memory_lookup ON agent_memory(agent_id, session_id, key);
 CREATE INDEX idx_agent_memory_agent_global ON agent_memory(agent_id) WHERE session_id IS NULL;
 CREATE INDEX idx_agent_memory_expiry ON agent_memory(expires_at) WHERE expires_at IS NOT NULL;
 CREATE INDEX idx_agent_memory_session ON agent_memory(session_id) WHERE session_id IS NOT NULL;
+-- UNIQUE(agent_id, session_id, key) treats NULL session_ids as distinct;
+-- global entries need their own conflict target for set_memory's upsert
+CREATE UNIQUE INDEX idx_agent_memory_unique_global ON agent_memory(agent_id, key) WHERE session_id IS NULL;
 
 -- Audit log access patterns
 CREATE INDEX idx_audit_log_timestamp ON audit_log(timestamp);
@@ -149,6 +189,145 @@ CREATE INDEX idx_sessions_metadata_gin ON sessions USING GIN (metadata);
 CREATE INDEX idx_agent_memory_metadata_gin ON agent_memory USING GIN (metadata);
 CREATE INDEX idx_audit_log_metadata_gin ON audit_log USING GIN (metadata);
 
+-- Full-text search index used by search_context candidate retrieval
+CREATE INDEX idx_messages_search_vector ON messages USING GIN (search_vector);
+
+-- ============================================================================
+-- SESSION STATISTICS
+-- ============================================================================
+-- Per-session counters read by the dashboard, session view and debug prompt
+-- instead of aggregating messages and agent_memory on every page load.
+-- Maintained by triggers, so every writer keeps them current. Messages are
+-- append-only apart from deletes; memory_count counts stored session memory
+-- entries, including expired ones until the cleanup task removes them.
+
+CREATE TABLE session_stats (
+    session_id VARCHAR(255) PRIMARY KEY,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    public_count INTEGER NOT NULL DEFAULT 0,
+    private_count INTEGER NOT NULL DEFAULT 0,
+    agent_only_count INTEGER NOT NULL DEFAULT 0,
+    admin_only_count INTEGER NOT NULL DEFAULT 0,
+    participant_count INTEGER NOT NULL DEFAULT 0,
+    memory_count INTEGER NOT NULL DEFAULT 0,
+    last_activity TIMESTAMPTZ,  -- timestamp of the newest message (by ts_us)
+    last_activity_us BIGINT,
+
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+);
+
+-- Distinct senders per session with their message counts
+CREATE TABLE session_senders (
+    session_id VARCHAR(255) NOT NULL,
+    sender VARCHAR(255) NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (session_id, sender),
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION session_stats_session_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO session_stats (session_id) VALUES (NEW.id)
+    ON CONFLICT (session_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER session_stats_session_insert_trigger
+    AFTER INSERT ON sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION session_stats_session_insert();
+
+CREATE OR REPLACE FUNCTION session_stats_message_insert()
+RETURNS TRIGGER AS $$
+DECLARE
+    new_sender BOOLEAN;
+BEGIN
+    INSERT INTO session_stats (session_id) VALUES (NEW.session_id)
+    ON CONFLICT (session_id) DO NOTHING;
+    INSERT INTO session_senders (session_id, sender, message_count)
+    VALUES (NEW.session_id, NEW.sender, 1)
+    ON CONFLICT (session_id, sender)
+    DO UPDATE SET message_count = session_senders.message_count + 1
+    RETURNING (xmax = 0) INTO new_sender;
+    UPDATE session_stats SET
+        message_count = message_count + 1,
+        public_count = public_count + (NEW.visibility = 'public')::INTEGER,
+        private_count = private_count + (NEW.visibility = 'private')::INTEGER,
+        agent_only_count = agent_only_count + (NEW.visibility = 'agent_only')::INTEGER,
+        admin_only_count = admin_only_count + (NEW.visibility = 'admin_only')::INTEGER,
+        participant_count = participant_count + new_sender::INTEGER,
+        last_activity = CASE
+            WHEN last_activity_us > NEW.ts_us THEN last_activity
+            ELSE NEW.timestamp
+        END,
+        last_activity_us = GREATEST(last_activity_us, NEW.ts_us)
+    WHERE session_id = NEW.session_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER session_stats_message_insert_trigger
+    AFTER INSERT ON messages
+    FOR EACH ROW
+    EXECUTE FUNCTION session_stats_message_insert();
+
+CREATE OR REPLACE FUNCTION session_stats_message_delete()
+RETURNS TRIGGER AS $$
+DECLARE
+    remaining INTEGER;
+BEGIN
+    UPDATE session_senders SET message_count = message_count - 1
+    WHERE session_id = OLD.session_id AND sender = OLD.sender
+    RETURNING message_count INTO remaining;
+    IF remaining <= 0 THEN
+        DELETE FROM session_senders
+        WHERE session_id = OLD.session_id AND sender = OLD.sender;
+    END IF;
+    UPDATE session_stats SET
+        message_count = message_count - 1,
+        public_count = public_count - (OLD.visibility = 'public')::INTEGER,
+        private_count = private_count - (OLD.visibility = 'private')::INTEGER,
+        agent_only_count = agent_only_count - (OLD.visibility = 'agent_only')::INTEGER,
+        admin_only_count = admin_only_count - (OLD.visibility = 'admin_only')::INTEGER,
+        participant_count = participant_count - COALESCE(remaining <= 0, FALSE)::INTEGER
+    WHERE session_id = OLD.session_id;
+    UPDATE session_stats SET (last_activity, last_activity_us) = (
+        SELECT timestamp, ts_us FROM messages
+        WHERE session_id = OLD.session_id
+        ORDER BY ts_us DESC LIMIT 1
+    )
+    WHERE session_id = OLD.session_id AND last_activity_us <= OLD.ts_us;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER session_stats_message_delete_trigger
+    AFTER DELETE ON messages
+    FOR EACH ROW
+    EXECUTE FUNCTION session_stats_message_delete();
+
+CREATE OR REPLACE FUNCTION session_stats_memory_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE session_stats SET memory_count = memory_count + 1
+        WHERE session_id = NEW.session_id;
+    ELSE
+        UPDATE session_stats SET memory_count = memory_count - 1
+        WHERE session_id = OLD.session_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER session_stats_memory_trigger
+    AFTER INSERT OR DELETE ON agent_memory
+    FOR EACH ROW
+    EXECUTE FUNCTION session_stats_memory_count();
+
 -- ============================================================================
 -- CLEANUP VIEWS
 -- ============================================================================
@@ -229,3 +408,33 @@ VALUES (3, 'PRP-010: PostgreSQL schema with JSONB, TIMESTAMPTZ, and optimized in
 ON CONFLICT (version) DO UPDATE SET
     description = EXCLUDED.description,
     applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (4, 'Full-text search vector on messages (tsvector + GIN)')
+ON CONFLICT (version) DO UPDATE SET
+    description = EXCLUDED.description,
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (5, 'Canonical messages.ts_us epoch microseconds indexed by session')
+ON CONFLICT (version) DO UPDATE SET
+    description = EXCLUDED.description,
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (6, 'Keyset pagination index on messages(session_id, id)')
+ON CONFLICT (version) DO UPDATE SET
+    description = EXCLUDED.description,
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (7, 'Trigger-maintained session_stats and session_senders')
+ON CONFLICT (version) DO UPDATE SET
+    description = EXCLUDED.description,
+    applied_at = CURRENT_TIMESTAMP;
+
+INSERT INTO schema_version (version, description)
+VALUES (8, 'Unique global agent_memory keys for single-statement upserts')
+ON CONFLICT (version) DO UPDATE SET
+    description = EXCLUDED.description,
+    applied_at = CURRENT_TIMESTAMP;
@@ -52,6 +52,7 @@ CREATE TABLE IF NOT EXISTS messages (
     message_type TEXT DEFAULT 'agent_response',
     metadata TEXT CHECK (metadata IS NULL OR json_valid(metadata)),
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ts_us INTEGER,  -- Canonical UTC epoch microseconds for time filtering/sorting
     parent_message_id INTEGER,
 
     CONSTRAINT messages_session_id_not_empty CHECK (length(trim(session_id)) > 0),
@@ -129,8 +130,11 @@ END;
 -- Optimized for multi-agent concurrent access patterns
 
 -- Primary message access patterns
+-- Also serves get_messages keyset pages: an SQLite index implicitly ends
+-- with the rowid (messages.id), so this is (session_id, id)
 CREATE INDEX IF NOT EXISTS idx_messages_session_id ON messages(session_id);
 CREATE INDEX IF NOT EXISTS idx_messages_session_time ON messages(session_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_messages_session_ts ON messages(session_id, ts_us);
 CREATE INDEX IF NOT EXISTS idx_messages_sender_timestamp ON messages(sender, timestamp);
 CREATE INDEX IF NOT EXISTS idx_messages_visibility_session ON messages(visibility, session_id);
 CREATE INDEX IF NOT EXISTS idx_messages_parent_id ON messages(parent_message_id) WHERE parent_message_id IS NOT NULL;
@@ -159,6 +163,191 @@ CREATE INDEX IF NOT EXISTS idx_sessions_created_by ON sessions(created_by);
 CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(is_active) WHERE is_active = TRUE;
 CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at);
 
+-- ============================================================================
+-- CANONICAL MESSAGE TIMESTAMPS
+-- ============================================================================
+-- messages.timestamp holds Unix floats (add_message) or ISO strings
+-- (CURRENT_TIMESTAMP defaults). Writers that don't set ts_us get it derived
+-- from timestamp so time-window queries can range scan idx_messages_session_ts.
+
+CREATE TRIGGER IF NOT EXISTS messages_ts_us_insert_trigger
+    AFTER INSERT ON messages
+    FOR EACH ROW
+    WHEN NEW.ts_us IS NULL
+BEGIN
+    UPDATE messages SET ts_us = CASE
+        WHEN typeof(NEW.timestamp) IN ('integer', 'real')
+            THEN CAST(round(NEW.timestamp * 1000000) AS INTEGER)
+        ELSE CAST(round((julianday(NEW.timestamp) - 2440587.5) * 86400000) AS INTEGER) * 1000 END
+    WHERE id = NEW.id;
+END;
+
+-- ============================================================================
+-- FULL-TEXT SEARCH INDEX
+-- ============================================================================
+-- FTS5 external-content index over messages, kept in sync by triggers.
+-- search_context pulls BM25-ranked candidates from here and only re-ranks
+-- that candidate set with RapidFuzz instead of scanning the session.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    sender,
+    content,
+    metadata,
+    content='messages',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert_trigger
+    AFTER INSERT ON messages
+    FOR EACH ROW
+BEGIN
+    INSERT INTO messages_fts (rowid, sender, content, metadata)
+    VALUES (NEW.id, NEW.sender, NEW.content, COALESCE(NEW.metadata, ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete_trigger
+    AFTER DELETE ON messages
+    FOR EACH ROW
+BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, sender, content, metadata)
+    VALUES ('delete', OLD.id, OLD.sender, OLD.content, COALESCE(OLD.metadata, ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_update_trigger
+    AFTER UPDATE OF sender, content, metadata ON messages
+    FOR EACH ROW
+BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, sender, content, metadata)
+    VALUES ('delete', OLD.id, OLD.sender, OLD.content, COALESCE(OLD.metadata, ''));
+    INSERT INTO messages_fts (rowid, sender, content, metadata)
+    VALUES (NEW.id, NEW.sender, NEW.content, COALESCE(NEW.metadata, ''));
+END;
+
+-- ============================================================================
+-- SESSION STATISTICS
+-- ============================================================================
+-- Per-session counters read by the dashboard, session view and debug prompt
+-- instead of aggregating messages and agent_memory on every page load.
+-- Maintained by triggers, so every writer keeps them current. Messages are
+-- append-only apart from deletes; memory_count counts stored session memory
+-- entries, including expired ones until the cleanup task removes them.
+
+CREATE TABLE IF NOT EXISTS session_stats (
+    session_id TEXT PRIMARY KEY,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    public_count INTEGER NOT NULL DEFAULT 0,
+    private_count INTEGER NOT NULL DEFAULT 0,
+    agent_only_count INTEGER NOT NULL DEFAULT 0,
+    admin_only_count INTEGER NOT NULL DEFAULT 0,
+    participant_count INTEGER NOT NULL DEFAULT 0,
+    memory_count INTEGER NOT NULL DEFAULT 0,
+    last_activity TIMESTAMP,  -- timestamp of the newest message (by ts_us)
+    last_activity_us INTEGER,
+
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+);
+
+-- Distinct senders per session with their message counts
+CREATE TABLE IF NOT EXISTS session_senders (
+    session_id TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (session_id, sender),
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS session_stats_session_insert_trigger
+    AFTER INSERT ON sessions
+    FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO session_stats (session_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS session_stats_message_insert_trigger
+    AFTER INSERT ON messages
+    FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO session_stats (session_id) VALUES (NEW.session_id);
+    -- ts_us may not be set yet: derive it as messages_ts_us_insert_trigger does
+    UPDATE session_stats SET
+        message_count = message_count + 1,
+        public_count = public_count + (NEW.visibility = 'public'),
+        private_count = private_count + (NEW.visibility = 'private'),
+        agent_only_count = agent_only_count + (NEW.visibility = 'agent_only'),
+        admin_only_count = admin_only_count + (NEW.visibility = 'admin_only'),
+        participant_count = participant_count + NOT EXISTS (
+            SELECT 1 FROM session_senders
+            WHERE session_id = NEW.session_id AND sender = NEW.sender
+        ),
+        last_activity = iif(
+            last_activity_us > coalesce(NEW.ts_us, CASE
+                WHEN typeof(NEW.timestamp) IN ('integer', 'real')
+                    THEN CAST(round(NEW.timestamp * 1000000) AS INTEGER)
+                ELSE CAST(round((julianday(NEW.timestamp) - 2440587.5) * 86400000) AS INTEGER) * 1000 END),
+            last_activity, NEW.timestamp
+        ),
+        last_activity_us = max(
+            coalesce(last_activity_us, 0),
+            coalesce(NEW.ts_us, CASE
+                WHEN typeof(NEW.timestamp) IN ('integer', 'real')
+                    THEN CAST(round(NEW.timestamp * 1000000) AS INTEGER)
+                ELSE CAST(round((julianday(NEW.timestamp) - 2440587.5) * 86400000) AS INTEGER) * 1000 END)
+        )
+    WHERE session_id = NEW.session_id;
+    INSERT INTO session_senders (session_id, sender, message_count)
+    VALUES (NEW.session_id, NEW.sender, 1)
+    ON CONFLICT (session_id, sender) DO UPDATE SET message_count = message_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS session_stats_message_delete_trigger
+    AFTER DELETE ON messages
+    FOR EACH ROW
+BEGIN
+    UPDATE session_stats SET
+        message_count = message_count - 1,
+        public_count = public_count - (OLD.visibility = 'public'),
+        private_count = private_count - (OLD.visibility = 'private'),
+        agent_only_count = agent_only_count - (OLD.visibility = 'agent_only'),
+        admin_only_count = admin_only_count - (OLD.visibility = 'admin_only'),
+        participant_count = participant_count - EXISTS (
+            SELECT 1 FROM session_senders
+            WHERE session_id = OLD.session_id AND sender = OLD.sender
+            AND message_count <= 1
+        )
+    WHERE session_id = OLD.session_id;
+    UPDATE session_senders SET message_count = message_count - 1
+    WHERE session_id = OLD.session_id AND sender = OLD.sender;
+    DELETE FROM session_senders
+    WHERE session_id = OLD.session_id AND sender = OLD.sender AND message_count <= 0;
+    UPDATE session_stats SET (last_activity, last_activity_us) = (
+        SELECT timestamp, ts_us FROM messages
+        WHERE session_id = OLD.session_id
+        ORDER BY ts_us DESC LIMIT 1
+    )
+    WHERE session_id = OLD.session_id
+    AND last_activity_us <= coalesce(OLD.ts_us, last_activity_us);
+END;
+
+CREATE TRIGGER IF NOT EXISTS session_stats_memory_insert_trigger
+    AFTER INSERT ON agent_memory
+    FOR EACH ROW
+    WHEN NEW.session_id IS NOT NULL
+BEGIN
+    UPDATE session_stats SET memory_count = memory_count + 1
+    WHERE session_id = NEW.session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS session_stats_memory_delete_trigger
+    AFTER DELETE ON agent_memory
+    FOR EACH ROW
+    WHEN OLD.session_id IS NOT NULL
+BEGIN
+    UPDATE session_stats SET memory_count = memory_count - 1
+    WHERE session_id = OLD.session_id;
+END;
+
 -- ============================================================================
 -- CLEANUP VIEWS
 -- ============================================================================
@@ -240,6 +429,16 @@ CREATE INDEX IF NOT EXISTS idx_expires_cleanup ON secure_tokens(expires_at);
 -- Insert current schema version
 INSERT OR REPLACE INTO schema_version (version, description)
 VALUES (3, 'PRP-006: Added secure_tokens table with Fernet encryption for JWT hiding');
+INSERT OR REPLACE INTO schema_version (version, description)
+VALUES (4, 'Full-text search index on messages (FTS5 + sync triggers)');
+INSERT OR REPLACE INTO schema_version (version, description)
+VALUES (5, 'Canonical messages.ts_us epoch microseconds indexed by session');
+INSERT OR REPLACE INTO schema_version (version, description)
+VALUES (6, 'Keyset pagination index on messages(session_id, id)');
+INSERT OR REPLACE INTO schema_version (version, description)
+VALUES (7, 'Trigger-maintained session_stats and session_senders');
+INSERT OR REPLACE INTO schema_version (version, description)
+VALUES (8, 'Unique global agent_memory keys for single-statement upserts');
 
 -- ============================================================================
 -- INITIAL DATA VALIDATION
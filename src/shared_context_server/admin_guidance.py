@@ -206,16 +206,21 @@ def _generate_operations_guidance(access_level: str) -> dict[str, Any]:
         "get_session - Retrieve session information and messages",
         "get_messages - Retrieve messages with agent-specific filtering (use offset for efficient polling)",
         "search_context - Fuzzy search messages with RapidFuzz",
+        "search_context_batch - Fuzzy search several queries in one call",
         "search_by_sender - Find messages by specific sender",
         "search_by_timerange - Search messages within time ranges",
         "get_memory - Retrieve values from agent's private memory",
         "list_memory - List agent's memory entries with filtering",
+        "get_memory_many - Retrieve several memory keys in one call",
     ]
 
     write_operations = [
         "create_session - Create new shared context sessions",
         "add_message - Add messages to sessions (respects visibility controls)",
+        "add_messages - Add several messages to a session in one call",
         "set_memory - Store values in agent's private memory",
+        "set_memory_many - Store several memory keys in one transaction",
+        "delete_memory_many - Delete several memory keys in one transaction",
     ]
 
     base_operations = read_only_operations + write_operations
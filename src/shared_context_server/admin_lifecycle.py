@@ -3,7 +3,7 @@ Administration Lifecycle Management for Shared Context MCP Server.
 
 Provides server lifecycle management and performance monitoring:
 - get_performance_metrics: Comprehensive performance data for admin users
-- Background memory cleanup tasks
+- Background memory and token expiry tasks
 - Server lifecycle management with startup/shutdown hooks
 - Database connection pool management
 
@@ -91,34 +91,35 @@ async def get_performance_metrics(
 
 
 async def _perform_memory_cleanup() -> None:
-    """Perform a single memory cleanup operation."""
+    """Delete every expired memory entry, in chunks."""
     try:
-        current_timestamp = datetime.now(timezone.utc).timestamp()
-
-        async with get_db_connection() as conn:
-            cursor = await conn.execute(
-                """
-                DELETE FROM agent_memory
-                WHERE expires_at IS NOT NULL AND expires_at < ?
-            """,
-                (current_timestamp,),
-            )
+        from .expiry_scheduler import expiry_scheduler
 
-            deleted_count = cursor.rowcount
-            await conn.commit()
+        current_timestamp = datetime.now(timezone.utc).timestamp()
+        deleted_count = await expiry_scheduler.expire_now(
+            "agent_memory", current_timestamp, get_db_connection
+        )
 
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} expired memory entries")
+        if deleted_count > 0:
+            logger.info(f"Cleaned up {deleted_count} expired memory entries")
 
     except Exception:
         logger.exception("Memory cleanup failed")
 
 
 async def cleanup_expired_memory_task() -> None:
-    """Lightweight TTL sweeper for expired memory entries."""
+    """
+    Fallback TTL sweeper, used when the expiry scheduler is disabled.
+
+    Deletes expired memory entries and secure tokens every 5 minutes.
+    """
+    from .auth_secure import get_secure_token_manager
+
     while True:
         await asyncio.sleep(300)  # Run every 5 minutes
         await _perform_memory_cleanup()
+        with suppress(Exception):
+            await get_secure_token_manager().cleanup_expired_tokens()
 
 
 # ============================================================================
@@ -164,6 +165,12 @@ async def lifespan() -> Any:
         cache_task = await start_cache_maintenance()
         cleanup_tasks.append(cache_task)
 
+        # Warm the session registry; it follows remote cache invalidations
+        from .utils.caching import cache_manager
+        from .utils.session_registry import start_session_registry
+
+        await start_session_registry(cache_manager)
+
         # Import subscription cleanup from resources module
         from .admin_resources import cleanup_subscriptions_task
 
@@ -171,9 +178,23 @@ async def lifespan() -> Any:
         cleanup_task = asyncio.create_task(cleanup_subscriptions_task())
         cleanup_tasks.append(cleanup_task)
 
-        # Start memory cleanup task
-        memory_task = asyncio.create_task(cleanup_expired_memory_task())
-        cleanup_tasks.append(memory_task)
+        # Expire memory and secure tokens near their deadlines, or fall back
+        # to the periodic sweep
+        from .expiry_scheduler import start_expiry_scheduler
+
+        if not start_expiry_scheduler():
+            memory_task = asyncio.create_task(cleanup_expired_memory_task())
+            cleanup_tasks.append(memory_task)
+
+        # Start group-commit writer (optional)
+        from .database_write_queue import start_write_queue
+
+        start_write_queue()
+
+        # Start write-behind audit log writer
+        from .audit_writer import start_audit_writer
+
+        start_audit_writer()
 
         print("Background tasks started (performance, cache, cleanup)")
     except Exception as e:
@@ -190,6 +211,19 @@ async def lifespan() -> Any:
     # SQLAlchemy handles connection cleanup automatically
     print("Database connection cleanup handled by SQLAlchemy")
 
+    # Flush buffered audit records, then writes still queued for group commit
+    from .audit_writer import audit_writer
+    from .database_write_queue import write_queue
+    from .expiry_scheduler import expiry_scheduler
+
+    await expiry_scheduler.stop()
+    await audit_writer.stop()
+    await write_queue.stop()
+
+    from .utils.session_registry import session_registry
+
+    session_registry.reset()
+
     # Cancel background tasks
     for task in cleanup_tasks:
         if not task.done():
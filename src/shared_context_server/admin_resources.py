@@ -170,28 +170,27 @@ async def get_session_resource(session_id: str, ctx: Any = None) -> Resource:
                 AND (visibility = 'public' OR
                      (visibility = 'private' AND sender = ?) OR
                      (visibility = 'agent_only' AND sender = ?))
-                ORDER BY timestamp ASC
+                ORDER BY ts_us ASC
             """,
                 (session_id, agent_id, agent_id),
             )
 
             messages = list(await cursor.fetchall())
 
-            # Get session statistics
+            # Get session statistics (maintained by triggers)
             cursor = await conn.execute(
                 """
                 SELECT
-                    COUNT(*) as total_messages,
-                    COUNT(DISTINCT sender) as unique_agents,
-                    MAX(timestamp) as last_activity
-                FROM messages
+                    message_count as total_messages,
+                    participant_count as unique_agents,
+                    last_activity
+                FROM session_stats
                 WHERE session_id = ?
             """,
                 (session_id,),
             )
 
             stats = await cursor.fetchone()
-            assert stats is not None
 
             # Format resource content
             content = {
@@ -273,16 +272,8 @@ async def get_agent_memory_resource(agent_id: str, ctx: Any = None) -> Resource:
 
         async with get_db_connection() as conn:
             conn.row_factory = CompatibleRow  # Set row factory for dict access
-            # Clean expired memory entries
-            await conn.execute(
-                """
-                DELETE FROM agent_memory
-                WHERE agent_id = ? AND expires_at IS NOT NULL AND expires_at < ?
-            """,
-                (agent_id, current_timestamp),
-            )
 
-            # Get all memory entries for the agent
+            # Get all unexpired memory entries for the agent (read-only)
             cursor = await conn.execute(
                 """
                 SELECT key, value, session_id, metadata, created_at, updated_at, expires_at
@@ -484,7 +475,7 @@ async def get_session_messages_paginated_resource(
                 """
                 SELECT * FROM messages
                 WHERE session_id = ?
-                ORDER BY timestamp DESC
+                ORDER BY ts_us DESC
                 LIMIT ?
                 """,
                 (session_id, limit_int),
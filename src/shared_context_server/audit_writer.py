@@ -0,0 +1,357 @@
+"""
+Write-behind audit log writer.
+
+Every tool call used to open a connection and commit one ``INSERT INTO
+audit_log`` before responding, roughly doubling the write load. When the
+writer is running, ``audit_log_auth_event`` only appends a record to a
+bounded in-memory queue; a background task drains it and inserts whole
+batches with one ``executemany`` and one commit.
+
+Security events (authentication and token failures, token issuance) are
+never buffered: they are written synchronously so they can't be lost in a
+crash. When the queue is full the configured overflow policy decides what
+happens, and each outcome is counted:
+
+- ``write_through``: write the record synchronously (the pre-buffer behavior)
+- ``drop_oldest``: discard the oldest buffered record to make room
+- ``drop_newest``: discard the incoming record
+
+Per-event-type policies (AuditPolicyConfig) keep high-volume read events
+from growing ``audit_log`` without bound: ``always`` logs every event,
+``sample:N`` logs one in N (tagged with ``sample_rate``), and ``aggregate``
+folds events into one row per minute per agent, session and event type,
+with the count in its metadata. Policies never apply to security events.
+
+``stop()`` flushes everything already buffered, including open aggregation
+windows; lifespan() calls it on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+from .config import parse_audit_policy
+from .database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["write_through", "drop_oldest", "drop_newest"]
+
+# Events that must reach the database before the caller continues
+SECURITY_AUDIT_EVENTS = frozenset(
+    {
+        "authentication_failed",
+        "authentication_error",
+        "jwt_token_generated",
+        "permission_denied",
+        "token_recovered",
+        "token_refreshed",
+        "token_refresh_failed",
+        "token_refresh_error",
+    }
+)
+_SECURITY_EVENT_SUFFIXES = ("_failed", "_error", "_denied")
+
+INSERT_AUDIT_RECORD = """
+    INSERT INTO audit_log
+    (event_type, agent_id, session_id, metadata, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+AuditRecord = tuple[str, str, str | None, str, str]
+
+
+def is_security_event(event_type: str) -> bool:
+    """Whether an audit event is security-critical and must be written in full."""
+    return event_type in SECURITY_AUDIT_EVENTS or event_type.endswith(
+        _SECURITY_EVENT_SUFFIXES
+    )
+
+
+class AuditLogWriter:
+    """Bounded queue of audit records drained by a background batch writer."""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        overflow_policy: OverflowPolicy = "write_through",
+        policies: dict[str, str] | None = None,
+        default_policy: str = "always",
+        aggregate_window: float = 60.0,
+    ) -> None:
+        """
+        Initialize a stopped writer.
+
+        Args:
+            max_size: Maximum buffered records before the overflow policy applies
+            batch_size: Maximum records inserted per transaction
+            flush_interval: Seconds to let records accumulate before a flush
+            overflow_policy: What to do with a record when the buffer is full
+            policies: Audit policy per event type
+            default_policy: Policy for event types without their own entry
+            aggregate_window: Seconds covered by one aggregated row
+        """
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy: OverflowPolicy = overflow_policy
+        self._queue: asyncio.Queue[AuditRecord | None] = asyncio.Queue(max_size)
+        self.policies = policies or {}
+        self.default_policy = default_policy
+        self.aggregate_window = aggregate_window
+        self._task: asyncio.Task[None] | None = None
+        self._sample_counts: dict[str, int] = {}
+        # (window start, event type, agent, session) -> events in that window
+        self._aggregates: dict[tuple[float, str, str, str | None], int] = {}
+        self.stats = {
+            "enqueued": 0,
+            "sampled_out": 0,
+            "aggregated": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "written_through": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether records are being buffered."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background writer in the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write every buffered record, then stop the background writer."""
+        if not self.running:
+            return
+        task = self._task
+        self._task = None
+        await self._queue.put(None)
+        await task  # type: ignore[misc]
+
+    def record(
+        self,
+        event_type: str,
+        agent_id: str,
+        session_id: str | None,
+        metadata: dict[str, Any] | None,
+    ) -> bool:
+        """
+        Apply the event type's audit policy and buffer what it keeps.
+
+        Returns:
+            False if the caller must write the record itself (see ``enqueue``);
+            True if it was buffered, sampled out or counted in an aggregate
+        """
+        if not self.running:
+            return False
+
+        kind, rate = parse_audit_policy(
+            "always"
+            if is_security_event(event_type)
+            else self.policies.get(event_type, self.default_policy)
+        )
+        if kind == "aggregate":
+            window = time.time() // self.aggregate_window * self.aggregate_window
+            key = (window, event_type, agent_id, session_id)
+            self._aggregates[key] = self._aggregates.get(key, 0) + 1
+            self.stats["aggregated"] += 1
+            return True
+        if kind == "sample":
+            seen = self._sample_counts.get(event_type, 0)
+            self._sample_counts[event_type] = seen + 1
+            if seen % rate:
+                self.stats["sampled_out"] += 1
+                return True
+            metadata = {**(metadata or {}), "sample_rate": rate}
+
+        return self.enqueue(
+            event_type, agent_id, session_id, json.dumps(metadata or {})
+        )
+
+    def enqueue(
+        self,
+        event_type: str,
+        agent_id: str,
+        session_id: str | None,
+        metadata_json: str,
+    ) -> bool:
+        """
+        Buffer an audit record without waiting for the database.
+
+        Returns:
+            False if the caller must write the record itself (writer stopped,
+            or buffer full under the ``write_through`` policy); True otherwise,
+            including when the overflow policy dropped a record
+        """
+        if not self.running:
+            return False
+
+        # Stamp now: the row is inserted later than the event happened
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        record = (event_type, agent_id, session_id, metadata_json, timestamp)
+
+        if self._queue.full():
+            if self.overflow_policy == "write_through":
+                self.stats["written_through"] += 1
+                return False
+            if self.overflow_policy == "drop_newest":
+                self.stats["dropped_newest"] += 1
+                return True
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.stats["dropped_oldest"] += 1
+
+        self._queue.put_nowait(record)
+        self.stats["enqueued"] += 1
+        return True
+
+    async def flush(self) -> None:
+        """Wait until every record buffered so far has been written."""
+        if self.running:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until stopped."""
+        stopping = False
+        while not stopping:
+            try:
+                # Wake up at least once per window to write closed aggregates
+                item = await asyncio.wait_for(
+                    self._queue.get(), self._seconds_to_next_window()
+                )
+            except asyncio.TimeoutError:
+                await self._flush_aggregates()
+                continue
+            if item is None:
+                self._queue.task_done()
+                break
+            if self.flush_interval > 0:
+                # Let a burst of tool calls accumulate into one insert
+                await asyncio.sleep(self.flush_interval)
+
+            batch = [item]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            await self._flush_aggregates()
+
+        await self._flush_aggregates(include_open=True)
+
+    def _seconds_to_next_window(self) -> float:
+        """Seconds until the current aggregation window closes."""
+        return self.aggregate_window - time.time() % self.aggregate_window + 0.01
+
+    async def _flush_aggregates(self, include_open: bool = False) -> None:
+        """Write one row per closed aggregation window (or every window)."""
+        current = time.time() // self.aggregate_window * self.aggregate_window
+        closed = [key for key in self._aggregates if include_open or key[0] < current]
+        if not closed:
+            return
+
+        records = []
+        for key in closed:
+            window, event_type, agent_id, session_id = key
+            count = self._aggregates.pop(key)
+            window_start = datetime.fromtimestamp(window, timezone.utc)
+            metadata = {
+                "aggregated": True,
+                "count": count,
+                "window_start": window_start.isoformat(),
+                "window_seconds": self.aggregate_window,
+            }
+            records.append(
+                (
+                    event_type,
+                    agent_id,
+                    session_id,
+                    json.dumps(metadata),
+                    window_start.strftime("%Y-%m-%d %H:%M:%S"),
+                )
+            )
+        for start in range(0, len(records), self.batch_size):
+            await self._write(records[start : start + self.batch_size])
+
+    async def _write(self, batch: list[AuditRecord]) -> None:
+        """Insert a batch in one transaction; isolate bad records on failure."""
+        try:
+            async with get_db_connection() as conn:
+                await conn.executemany(INSERT_AUDIT_RECORD, batch)
+                await conn.commit()
+        except Exception:
+            if len(batch) > 1:
+                # e.g. a record for a session deleted meanwhile; keep the rest
+                for record in batch:
+                    await self._write([record])
+                return
+            self.stats["failed"] += 1
+            logger.exception("Failed to write audit record")
+            return
+
+        self.stats["batches"] += 1
+        self.stats["written"] += len(batch)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get writer counters and buffer occupancy."""
+        return {
+            "running": self.running,
+            "pending": self._queue.qsize(),
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "overflow_policy": self.overflow_policy,
+            "open_aggregates": len(self._aggregates),
+            **self.stats,
+        }
+
+
+# Global writer (stopped unless write-behind audit logging is enabled)
+audit_writer = AuditLogWriter()
+
+
+def start_audit_writer() -> bool:
+    """Start the global audit writer if enabled in configuration."""
+    from .config import get_audit_policy_config, get_database_config
+
+    db_config = get_database_config()
+    if not db_config.audit_write_behind:
+        return False
+
+    audit_writer.max_size = db_config.audit_queue_size
+    audit_writer.batch_size = db_config.audit_batch_size
+    audit_writer.flush_interval = db_config.audit_flush_interval_ms / 1000
+    audit_writer.overflow_policy = db_config.audit_overflow_policy
+
+    policy_config = get_audit_policy_config()
+    audit_writer.policies = dict(policy_config.audit_event_policies)
+    audit_writer.default_policy = policy_config.default_audit_policy
+    audit_writer.start()
+    logger.info(
+        f"Write-behind audit log started (queue={audit_writer.max_size}, "
+        f"batch={audit_writer.batch_size}, "
+        f"overflow={audit_writer.overflow_policy})"
+    )
+    return True
@@ -28,6 +28,7 @@ else:
     Context = None
     get_http_request = None
 
+from .audit_writer import audit_writer, is_security_event
 from .database import get_db_connection
 from .models import create_error_response
 
@@ -269,9 +270,23 @@ async def audit_log_auth_event(
     agent_id: str,
     session_id: str | None = None,
     metadata: dict[str, Any] | None = None,
+    *,
+    sync: bool = False,
 ) -> None:
-    """Log authentication and authorization events for security monitoring."""
+    """
+    Log authentication and authorization events for security monitoring.
+
+    Routine events are handed to the write-behind audit writer when it is
+    running, which applies the event type's audit policy; security events,
+    and any event logged with ``sync=True``, are committed in full before
+    this returns.
+    """
     try:
+        if not (sync or is_security_event(event_type)) and audit_writer.record(
+            event_type, agent_id, session_id, metadata
+        ):
+            return
+
         async with get_db_connection() as conn:
             await conn.execute(
                 """
@@ -303,6 +303,13 @@ async def validate_agent_context_or_error(
 # ============================================================================
 
 
+def _schedule_token_expiry(expires_at: datetime) -> None:
+    """Register a new token's deadline with the expiry scheduler."""
+    from .expiry_scheduler import expiry_scheduler
+
+    expiry_scheduler.schedule("secure_tokens", expires_at.timestamp())
+
+
 class SecureTokenManager:
     """
     Secure Token Manager with Fernet encryption for JWT hiding.
@@ -361,6 +368,8 @@ class SecureTokenManager:
         # Encrypt JWT token
         encrypted_jwt = self.fernet.encrypt(jwt_token.encode())
 
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
         # Store in database with transaction safety
         async with get_db_connection() as conn:
             # Check if this is SQLAlchemy backend (which handles transactions automatically)
@@ -379,7 +388,7 @@ class SecureTokenManager:
                         token_id,
                         encrypted_jwt,
                         agent_id,
-                        datetime.now(timezone.utc) + timedelta(hours=1),
+                        expires_at,
                     ),
                 )
 
@@ -390,6 +399,8 @@ class SecureTokenManager:
                     await conn.rollback()
                 raise
 
+        _schedule_token_expiry(expires_at)
+
         # Log token creation without sensitive agent ID
         logger.info("Protected token created successfully")
         return token_id
@@ -466,6 +477,7 @@ class SecureTokenManager:
                     # Generate new token ID
                     new_token_id = f"sct_{self._uuid.uuid4()}"
                     encrypted_jwt = self.fernet.encrypt(jwt_token.encode())
+                    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
 
                     # Insert new token and delete old token atomically
                     await conn.execute(
@@ -477,7 +489,7 @@ class SecureTokenManager:
                             new_token_id,
                             encrypted_jwt,
                             agent_id,
-                            datetime.now(timezone.utc) + timedelta(hours=1),
+                            expires_at,
                         ),
                     )
 
@@ -488,6 +500,8 @@ class SecureTokenManager:
                     if not is_sqlalchemy:
                         await conn.commit()
 
+                    _schedule_token_expiry(expires_at)
+
                     # Log token refresh success without sensitive agent ID
                     logger.info("Protected token refresh completed successfully")
                     return new_token_id
@@ -625,28 +639,23 @@ class SecureTokenManager:
 
     async def cleanup_expired_tokens(self) -> int:
         """
-        Clean up expired tokens from database.
+        Clean up expired tokens from database, in chunks.
 
         Returns:
             Number of tokens cleaned up
         """
         try:
-            async with get_db_connection() as conn:
-                cursor = await conn.execute(
-                    """
-                    DELETE FROM secure_tokens
-                    WHERE expires_at <= ?
-                    """,
-                    (datetime.now(timezone.utc).isoformat(),),
-                )
-                await conn.commit()
-                count = cursor.rowcount
+            from .expiry_scheduler import expiry_scheduler
+
+            count = await expiry_scheduler.expire_now(
+                "secure_tokens", get_connection=get_db_connection
+            )
 
-                if count > 0:
-                    # CodeQL: This logging statement uses non-sensitive count data only
-                    logger.info("Cleaned up %d expired secure tokens", count)
+            if count > 0:
+                # CodeQL: This logging statement uses non-sensitive count data only
+                logger.info("Cleaned up %d expired secure tokens", count)
 
-                return int(count)
+            return count
         except Exception:
             logger.exception("Failed to cleanup expired tokens")
             return 0
@@ -107,6 +107,56 @@ class DatabaseConfig(BaseSettings):
     sqlite_pool_size: int = Field(
         default=5, json_schema_extra={"env": "SQLITE_POOL_SIZE"}
     )
+    # Read-only connections for SELECTs next to the single SQLite writer
+    # (WAL mode); 0 shares one connection for reads and writes, so every
+    # block, read-only ones included, takes the writer in turn
+    sqlite_read_pool_size: int = Field(
+        default=4, ge=0, json_schema_extra={"env": "SQLITE_READ_POOL_SIZE"}
+    )
+
+    # Group commit: batch add_message / memory writes into shared transactions
+    database_group_commit: bool = Field(
+        default=False, json_schema_extra={"env": "DATABASE_GROUP_COMMIT"}
+    )
+    database_group_commit_max_batch: int = Field(
+        default=64, ge=1, json_schema_extra={"env": "DATABASE_GROUP_COMMIT_MAX_BATCH"}
+    )
+    database_group_commit_delay_ms: float = Field(
+        default=2.0, ge=0, json_schema_extra={"env": "DATABASE_GROUP_COMMIT_DELAY_MS"}
+    )
+
+    # Write-behind audit log (security events are always written synchronously)
+    audit_write_behind: bool = Field(
+        default=True, json_schema_extra={"env": "AUDIT_WRITE_BEHIND"}
+    )
+    audit_queue_size: int = Field(
+        default=10000, ge=1, json_schema_extra={"env": "AUDIT_QUEUE_SIZE"}
+    )
+    audit_batch_size: int = Field(
+        default=500, ge=1, json_schema_extra={"env": "AUDIT_BATCH_SIZE"}
+    )
+    audit_flush_interval_ms: float = Field(
+        default=50.0, ge=0, json_schema_extra={"env": "AUDIT_FLUSH_INTERVAL_MS"}
+    )
+    audit_overflow_policy: Literal["write_through", "drop_oldest", "drop_newest"] = (
+        Field(
+            default="write_through", json_schema_extra={"env": "AUDIT_OVERFLOW_POLICY"}
+        )
+    )
+
+    # TTL expiry: delete expired memory and secure tokens near their deadlines
+    expiry_scheduler: bool = Field(
+        default=True, json_schema_extra={"env": "EXPIRY_SCHEDULER"}
+    )
+    expiry_chunk_size: int = Field(
+        default=500, ge=1, json_schema_extra={"env": "EXPIRY_CHUNK_SIZE"}
+    )
+    expiry_refill_interval: float = Field(
+        default=60.0, gt=0, json_schema_extra={"env": "EXPIRY_REFILL_INTERVAL"}
+    )
+    expiry_max_scheduled: int = Field(
+        default=10000, ge=1, json_schema_extra={"env": "EXPIRY_MAX_SCHEDULED"}
+    )
 
     # Query logging
     enable_query_logging: bool = Field(
@@ -479,6 +529,58 @@ class AgentPermissionsConfig(BaseSettings):
         return "\n".join(lines)
 
 
+def parse_audit_policy(policy: str) -> tuple[str, int]:
+    """
+    Parse an audit policy string into its kind and sample rate.
+
+    Policies are "always", "sample:N" (log one event in N) and "aggregate"
+    (per-minute counts per agent, session and event type).
+    """
+    kind, _, rate = policy.partition(":")
+    if kind in ("always", "aggregate") and not rate:
+        return kind, 1
+    if kind == "sample" and rate.isdigit() and int(rate) >= 1:
+        return kind, int(rate)
+    raise ValueError(
+        f"Invalid audit policy '{policy}'. "
+        "Use 'always', 'sample:N' (N >= 1) or 'aggregate'"
+    )
+
+
+class AuditPolicyConfig(BaseSettings):
+    """Per-event-type audit logging policies (security events are always logged)."""
+
+    default_audit_policy: str = Field(
+        default="always",
+        json_schema_extra={"env": "DEFAULT_AUDIT_POLICY"},
+        description="Policy for event types without their own entry",
+    )
+    audit_event_policies: dict[str, str] = Field(
+        default={
+            "context_searched": "aggregate",
+            "context_batch_searched": "aggregate",
+            "usage_guidance_accessed": "sample:10",
+        },
+        json_schema_extra={"env": "AUDIT_EVENT_POLICIES"},
+        description="Mapping of audit event types to 'always', 'sample:N' or 'aggregate'",
+    )
+
+    @field_validator("default_audit_policy")
+    @classmethod
+    def validate_default_audit_policy(cls, v: str) -> str:
+        """Validate the default policy string."""
+        parse_audit_policy(v)
+        return v
+
+    @field_validator("audit_event_policies")
+    @classmethod
+    def validate_audit_event_policies(cls, v: dict[str, str]) -> dict[str, str]:
+        """Validate every per-event policy string."""
+        for policy in v.values():
+            parse_audit_policy(policy)
+        return v
+
+
 class OperationalConfig(BaseSettings):
     """Operational and monitoring configuration."""
 
@@ -519,6 +621,60 @@ class OperationalConfig(BaseSettings):
         default=10, json_schema_extra={"env": "MAX_METADATA_SIZE_KB"}
     )
 
+    # Cache byte budgets
+    cache_l1_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        json_schema_extra={"env": "CACHE_L1_MAX_BYTES"},
+    )
+    cache_l2_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=1,
+        json_schema_extra={"env": "CACHE_L2_MAX_BYTES"},
+    )
+    cache_max_entry_fraction: float = Field(
+        default=0.1,
+        gt=0,
+        le=1,
+        json_schema_extra={"env": "CACHE_MAX_ENTRY_FRACTION"},
+    )
+
+    # Stale-while-revalidate windows (seconds past TTL a cached value may be
+    # served while it is refreshed in the background; 0 disables)
+    cache_stale_session_seconds: int = Field(
+        default=30, ge=0, json_schema_extra={"env": "CACHE_STALE_SESSION_SECONDS"}
+    )
+    cache_stale_search_seconds: int = Field(
+        default=60, ge=0, json_schema_extra={"env": "CACHE_STALE_SEARCH_SECONDS"}
+    )
+    cache_stale_memory_seconds: int = Field(
+        default=30, ge=0, json_schema_extra={"env": "CACHE_STALE_MEMORY_SECONDS"}
+    )
+
+    # Shared L2 cache backend for multi-process deployments
+    cache_shared_backend: Literal["none", "sqlite"] = Field(
+        default="none", json_schema_extra={"env": "CACHE_SHARED_BACKEND"}
+    )
+    cache_shared_path: str = Field(
+        default="./shared_cache.db", json_schema_extra={"env": "CACHE_SHARED_PATH"}
+    )
+    cache_invalidation_poll_interval: float = Field(
+        default=0.5,
+        gt=0,
+        json_schema_extra={"env": "CACHE_INVALIDATION_POLL_INTERVAL"},
+    )
+
+    # Session registry: answers "does this session exist?" without a query
+    session_registry_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "SESSION_REGISTRY_ENABLED"}
+    )
+    session_registry_max_entries: int = Field(
+        default=100000, ge=1, json_schema_extra={"env": "SESSION_REGISTRY_MAX_ENTRIES"}
+    )
+    session_registry_negative_ttl: float = Field(
+        default=5.0, ge=0, json_schema_extra={"env": "SESSION_REGISTRY_NEGATIVE_TTL"}
+    )
+
     # Cleanup settings
     enable_automatic_cleanup: bool = Field(
         default=True, json_schema_extra={"env": "ENABLE_AUTOMATIC_CLEANUP"}
@@ -563,6 +719,7 @@ class SharedContextServerConfig(BaseSettings):
     mcp_server: MCPServerConfig
     security: SecurityConfig
     agent_permissions: AgentPermissionsConfig
+    audit_policy: AuditPolicyConfig
     operational: OperationalConfig
     development: DevelopmentConfig
 
@@ -586,6 +743,8 @@ class SharedContextServerConfig(BaseSettings):
             )
         if "agent_permissions" not in kwargs:
             kwargs["agent_permissions"] = AgentPermissionsConfig()
+        if "audit_policy" not in kwargs:
+            kwargs["audit_policy"] = AuditPolicyConfig()
         if "operational" not in kwargs:
             kwargs["operational"] = OperationalConfig()
         if "development" not in kwargs:
@@ -794,6 +953,11 @@ def get_agent_permissions_config() -> AgentPermissionsConfig:
     return get_config().agent_permissions
 
 
+def get_audit_policy_config() -> AuditPolicyConfig:
+    """Get audit policy configuration section."""
+    return get_config().audit_policy
+
+
 def get_operational_config() -> OperationalConfig:
     """Get operational configuration section."""
     return get_config().operational
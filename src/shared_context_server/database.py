@@ -167,6 +167,25 @@ def parse_utc_timestamp(timestamp_input: str | datetime) -> datetime:
         return dt
 
 
+def to_epoch_us(timestamp_input: str | datetime | float) -> int:
+    """
+    Convert a timestamp to UTC epoch microseconds (the messages.ts_us format).
+
+    Args:
+        timestamp_input: Unix timestamp in seconds, ISO timestamp string or
+            datetime object
+
+    Returns:
+        Integer microseconds since the Unix epoch
+    """
+    if isinstance(timestamp_input, (int, float)):
+        return round(timestamp_input * 1_000_000)
+
+    dt = parse_utc_timestamp(timestamp_input)
+    delta = dt - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
 # Validation utilities
 def validate_session_id(session_id: str) -> bool:
     """
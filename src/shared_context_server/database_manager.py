@@ -38,6 +38,13 @@ from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from .database_migrations import (
+    SCHEMA_VERSION,
+    apply_pending_migrations,
+    get_applied_schema_version,
+)
+from .database_statements import StatementCache
+
 sqlite3.register_adapter(dt, lambda dt_obj: dt_obj.isoformat())
 sqlite3.register_converter("TIMESTAMP", lambda b: dt.fromisoformat(b.decode()))
 
@@ -45,9 +52,20 @@ if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
 
     from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+    from sqlalchemy.sql.elements import TextClause
 
 logger = logging.getLogger(__name__)
 
+# Managers whose writer transaction the current task (or its parent) holds
+_held_writers: ContextVar[frozenset[int]] = ContextVar(
+    "held_writers", default=frozenset()
+)
+
+
+def holds_writer() -> bool:
+    """Whether the current task holds a SQLite writer transaction."""
+    return bool(_held_writers.get())
+
 
 class DatabaseError(Exception):
     """Base exception for database operations."""
@@ -79,6 +97,19 @@ _SQLITE_PRAGMAS = [
     "PRAGMA optimize;",  # Enable query optimizer
 ]
 
+# Reader pool connections skip the database-level settings (journal mode,
+# optimize) the writer owns and refuse writes outright
+_SQLITE_READER_PRAGMAS = [
+    "PRAGMA query_only = ON;",  # Reject writes routed here by mistake
+    "PRAGMA cache_size = -8000;",  # 8MB cache per connection
+    "PRAGMA temp_store = MEMORY;",  # Use memory for temporary tables
+    "PRAGMA mmap_size = 268435456;",  # 256MB memory mapping
+    "PRAGMA busy_timeout = 5000;",  # 5 second timeout for busy database
+]
+
+# Compiled ? -> :param statements shared by all connection wrappers
+_statement_cache = StatementCache()
+
 
 def _is_testing_environment() -> bool:
     """Detect if running in testing environment with enhanced detection."""
@@ -142,18 +173,32 @@ class SQLAlchemyConnectionWrapper:
         self._connection = connection
         self.row_factory: type[CompatibleRow] | None = None
         self.autocommit = autocommit
+        # Dialect name ("sqlite", "postgresql", "mysql") for dialect-specific SQL
+        dialect = getattr(connection, "dialect", None)
+        self.db_type: str = getattr(dialect, "name", "sqlite")
 
     async def execute(
         self, query: str, parameters: tuple[Any, ...] | list[Any] = ()
     ) -> SQLAlchemyCursorWrapper:
         """Execute SQL query with parameter binding."""
         # Convert ? placeholders to SQLAlchemy :param format
-        converted_query, converted_params = self._convert_query_params(
-            query, parameters
+        statement, converted_params = self._convert_query_params(query, parameters)
+        result = await self._connection.execute(statement, converted_params)
+        return SQLAlchemyCursorWrapper(result, self.row_factory)
+
+    async def executemany(
+        self, query: str, seq_of_parameters: list[tuple[Any, ...]]
+    ) -> SQLAlchemyCursorWrapper:
+        """Execute one SQL statement for each parameter tuple (DBAPI executemany)."""
+        compiled = _statement_cache.get(self.db_type, query)
+        result = await self._connection.execute(
+            compiled.clause, [compiled.bind(params) for params in seq_of_parameters]
         )
-        result = await self._connection.execute(text(converted_query), converted_params)
         return SQLAlchemyCursorWrapper(result, self.row_factory)
 
+    async def begin_write(self) -> None:
+        """Declare that the block writes (a no-op: this connection is the writer)."""
+
     async def commit(self) -> None:
         """Commit transaction."""
         await self._connection.commit()
@@ -164,20 +209,102 @@ class SQLAlchemyConnectionWrapper:
 
     def _convert_query_params(
         self, query: str, params: tuple[Any, ...] | list[Any]
-    ) -> tuple[str, dict[str, Any]]:
+    ) -> tuple[TextClause, dict[str, Any]]:
         """Convert ? placeholders to SQLAlchemy named parameters."""
-        if not params:
-            return query, {}
+        compiled = _statement_cache.get(self.db_type, query)
+        return compiled.clause, compiled.bind(params)
+
+
+class RoutedConnectionWrapper(SQLAlchemyConnectionWrapper):
+    """
+    SQLite connection wrapper that splits reads from writes.
 
-        converted_query = query
-        converted_params = {}
+    SELECTs run on a pooled read-only connection until the first write;
+    the first write checks out the single writer connection and opens a
+    transaction, and every later statement in the block stays on it so the
+    block reads its own uncommitted writes. commit() and rollback() end that
+    transaction and release the writer, so post-commit side effects in the
+    block (audit, notifications) don't hold up other writers.
 
-        for i, param in enumerate(params):
-            param_name = f"param_{i}"
-            converted_query = converted_query.replace("?", f":{param_name}", 1)
-            converted_params[param_name] = param
+    Without a reader pool every statement runs on the writer, which is then
+    held from the block's first statement until commit or block exit.
+    """
 
-        return converted_query, converted_params
+    def __init__(
+        self,
+        manager: SimpleSQLAlchemyManager,
+        stack: contextlib.AsyncExitStack,
+    ) -> None:
+        self._manager = manager
+        self._writer_engine: AsyncEngine = manager.engine  # type: ignore[assignment]
+        self._reader_engine: AsyncEngine | None = manager.read_engine
+        self._stack = stack
+        self._write_stack: contextlib.AsyncExitStack | None = None
+        self._connection: AsyncConnection | None = None  # type: ignore[assignment]
+        self._reader: AsyncConnection | None = None
+        self.row_factory = None
+        self.autocommit = False
+        self.db_type = "sqlite"
+
+    async def _connection_for(self, read_only: bool) -> AsyncConnection:
+        """Return the connection a statement should run on."""
+        if read_only and self._connection is None and self._reader_engine is not None:
+            if self._reader is None:
+                self._reader = await self._stack.enter_async_context(
+                    self._reader_engine.connect()
+                )
+            return self._reader
+
+        if self._connection is None:
+            # Scoped to one transaction: closed by commit/rollback, or by the
+            # block's exit (committing) if neither was called
+            self._write_stack = await self._stack.enter_async_context(
+                contextlib.AsyncExitStack()
+            )
+            await self._write_stack.enter_async_context(self._manager.hold_writer())
+            self._connection = await self._write_stack.enter_async_context(
+                self._writer_engine.begin()
+            )
+        return self._connection
+
+    async def _end_write(self) -> None:
+        """Leave the writer transaction and release the writer lock."""
+        write_stack, self._write_stack = self._write_stack, None
+        self._connection = None
+        if write_stack is not None:
+            await write_stack.aclose()
+
+    async def begin_write(self) -> None:
+        """Check out the writer now so every statement in the block runs on it."""
+        await self._connection_for(read_only=False)
+
+    async def execute(
+        self, query: str, parameters: tuple[Any, ...] | list[Any] = ()
+    ) -> SQLAlchemyCursorWrapper:
+        """Execute SQL query on the reader pool or the writer."""
+        compiled = _statement_cache.get(self.db_type, query)
+        connection = await self._connection_for(compiled.read_only)
+        result = await connection.execute(compiled.clause, compiled.bind(parameters))
+        return SQLAlchemyCursorWrapper(result, self.row_factory)
+
+    async def executemany(
+        self, query: str, seq_of_parameters: list[tuple[Any, ...]]
+    ) -> SQLAlchemyCursorWrapper:
+        """Execute one SQL statement per parameter tuple on the writer."""
+        await self.begin_write()
+        return await super().executemany(query, seq_of_parameters)
+
+    async def commit(self) -> None:
+        """Commit the write transaction, if one was started, and release the writer."""
+        if self._connection is not None:
+            await self._connection.commit()
+            await self._end_write()
+
+    async def rollback(self) -> None:
+        """Rollback the write transaction, if one was started, and release the writer."""
+        if self._connection is not None:
+            await self._connection.rollback()
+            await self._end_write()
 
 
 class SQLAlchemyCursorWrapper:
@@ -210,11 +337,18 @@ class SQLAlchemyCursorWrapper:
 class SimpleSQLAlchemyManager:
     """Simplified SQLAlchemy connection manager for single-backend architecture."""
 
-    def __init__(self, database_url: str, eager_init: bool = True) -> None:
+    def __init__(
+        self, database_url: str, eager_init: bool = True, read_pool_size: int = 0
+    ) -> None:
         self.database_url = database_url
         self.engine: AsyncEngine | None = None
+        # File-backed SQLite only: pooled read-only connections for SELECTs
+        # alongside the single writer connection (0 = one shared connection)
+        self.read_pool_size = read_pool_size
+        self.read_engine: AsyncEngine | None = None
         self._initialized = False
         self._init_lock = asyncio.Lock()
+        self._write_lock: tuple[asyncio.AbstractEventLoop, asyncio.Lock] | None = None
         self._eager_init = eager_init
         self._initialization_task: asyncio.Task | None = None
 
@@ -360,6 +494,9 @@ class SimpleSQLAlchemyManager:
                         cursor.execute(pragma)
                     cursor.close()
 
+                if self.read_pool_size > 0 and ":memory:" not in self.database_url:
+                    self.read_engine = self._create_read_engine(connection_timeout)
+
             # Initialize schema
             await self._initialize_schema()
             self._initialized = True
@@ -385,22 +522,46 @@ class SimpleSQLAlchemyManager:
                     )
                     logger._engine_init_logged = True  # type: ignore
 
+    def _create_read_engine(self, connection_timeout: int) -> AsyncEngine:
+        """Create the bounded pool of read-only SQLite connections.
+
+        Under WAL, readers don't block the writer or each other, so SELECTs
+        from concurrent agents run in parallel instead of queueing behind
+        the single writer connection.
+        """
+        read_engine = create_async_engine(
+            self.database_url,
+            echo=False,
+            pool_size=self.read_pool_size,
+            max_overflow=0,
+            pool_timeout=connection_timeout,
+            pool_recycle=3600,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": connection_timeout,
+            },
+        )
+
+        @event.listens_for(read_engine.sync_engine, "connect")
+        def set_reader_pragma(dbapi_connection: Any, _connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            for pragma in _SQLITE_READER_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+        return read_engine
+
     async def _initialize_schema(self) -> None:
         """Initialize database schema if needed."""
         if not self.engine:
             raise DatabaseConnectionError("Engine not initialized")
 
-        # Load and execute schema if database doesn't exist or is empty
+        # Load and execute schema if database doesn't exist, is empty, or was
+        # created by an older release (the SQLite schema file is idempotent)
         async with self.engine.begin() as conn:
-            # Check if schema_version table exists
-            result = await conn.execute(
-                text(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='schema_version'"
-                )
-            )
+            previous_version = await get_applied_schema_version(conn)
 
-            if not result.fetchone():
-                # Schema doesn't exist, create it
+            if previous_version is None or previous_version < SCHEMA_VERSION:
                 schema_path = self._get_schema_path()
                 if schema_path.exists():
                     schema_sql = schema_path.read_text()
@@ -453,6 +614,8 @@ class SimpleSQLAlchemyManager:
 
                     logger.info("Database schema initialized from SQL file")
 
+                await apply_pending_migrations(conn, "sqlite", previous_version)
+
     def _get_schema_path(self) -> Path:
         """Get path to schema SQL file."""
         # Look for schema file relative to project root
@@ -468,6 +631,32 @@ class SimpleSQLAlchemyManager:
         # Fall back to current directory
         return current_dir / schema_file
 
+    @asynccontextmanager
+    async def hold_writer(self) -> AsyncGenerator[None, None]:
+        """
+        Hold the SQLite writer connection exclusively.
+
+        Every block shares the one StaticPool writer connection, so without
+        this, concurrent blocks interleave statements in each other's
+        transactions and one block's commit or rollback applies to the
+        others. Re-entrant within a task (and the tasks it spawns) so nested
+        get_connection() blocks keep working.
+        """
+        held = _held_writers.get()
+        if "sqlite" not in self.database_url.lower() or id(self) in held:
+            yield
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._write_lock is None or self._write_lock[0] is not loop:
+            self._write_lock = (loop, asyncio.Lock())
+        async with self._write_lock[1]:
+            token = _held_writers.set(held | {id(self)})
+            try:
+                yield
+            finally:
+                _held_writers.reset(token)
+
     @asynccontextmanager
     async def get_connection(
         self, autocommit: bool = False
@@ -504,8 +693,10 @@ class SimpleSQLAlchemyManager:
         for attempt in range(max_retries):
             try:
                 if autocommit:
-                    # Use autocommit mode for read-only operations (faster in tests)
-                    async with self.engine.connect() as conn:
+                    # Use autocommit mode for read-only operations (faster in tests);
+                    # BEGIN IMMEDIATE takes SQLite's write lock, so the block
+                    # holds the writer throughout
+                    async with self.hold_writer(), self.engine.connect() as conn:
                         await conn.execute(
                             text("BEGIN IMMEDIATE")
                         )  # Explicit transaction for SQLite compatibility
@@ -517,8 +708,14 @@ class SimpleSQLAlchemyManager:
                         except Exception:
                             await conn.execute(text("ROLLBACK"))
                             raise
+                elif "sqlite" in self.database_url.lower():
+                    # Reads go to the reader pool (if any) until the block first
+                    # writes; the writer is only held until commit
+                    async with contextlib.AsyncExitStack() as stack:
+                        yield RoutedConnectionWrapper(self, stack)
+                        return
                 else:
-                    # Standard transactional mode
+                    # Standard transactional mode (PostgreSQL/MySQL pools)
                     async with self.engine.begin() as conn:
                         wrapper = SQLAlchemyConnectionWrapper(conn, autocommit=False)
                         yield wrapper
@@ -544,6 +741,10 @@ class SimpleSQLAlchemyManager:
                 await self._initialization_task
         self._initialization_task = None
 
+        if self.read_engine:
+            await self.read_engine.dispose()
+            self.read_engine = None
+
         if self.engine:
             # Use optimized disposal timeout in testing environments
             is_testing = _is_testing_environment()
@@ -605,6 +806,15 @@ class SimpleSQLAlchemyManager:
         else:
             metrics["pool"] = {"type": "no_pool_info"}
 
+        if self.read_engine is not None:
+            read_pool = self.read_engine.pool
+            metrics["read_pool"] = {
+                "size": getattr(read_pool, "size", lambda: 0)(),
+                "checked_in": getattr(read_pool, "checkedin", lambda: 0)(),
+                "checked_out": getattr(read_pool, "checkedout", lambda: 0)(),
+            }
+
+        metrics["statement_cache"] = _statement_cache.get_stats()
         return metrics
 
 
@@ -641,7 +851,9 @@ def get_sqlalchemy_manager() -> SimpleSQLAlchemyManager:
                 # Convert database_path to SQLAlchemy URL
                 database_url = f"sqlite+aiosqlite:///{db_config.database_path}"
 
-            manager = SimpleSQLAlchemyManager(database_url)
+            manager = SimpleSQLAlchemyManager(
+                database_url, read_pool_size=db_config.sqlite_read_pool_size
+            )
 
         except Exception:
             # Fallback to environment variables
@@ -0,0 +1,233 @@
+"""
+Incremental schema migrations for Shared Context MCP Server.
+
+The schema SQL files describe the latest schema and are applied to fresh
+databases as-is. Databases created by an older release already have their
+tables, so anything the newer schema relies on that ``CREATE ... IF NOT EXISTS``
+cannot express (new columns, backfills, index rebuilds) is applied here.
+
+Both database managers call ``apply_pending_migrations`` after executing the
+schema file, passing the schema version that was recorded *before* the schema
+file ran. Fresh databases (no previous version) skip migrations entirely.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from sqlalchemy import inspect, text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# Latest schema version written by the schema SQL files
+SCHEMA_VERSION = 8
+
+# messages.timestamp holds Unix floats or ISO strings on SQLite; normalize both
+# to UTC epoch microseconds (mirrors messages_ts_us_insert_trigger)
+_SQLITE_TS_US_EXPRESSION = (
+    "CASE WHEN typeof(timestamp) IN ('integer', 'real') "
+    "THEN CAST(round(timestamp * 1000000) AS INTEGER) "
+    "ELSE CAST(round((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER) * 1000 END"
+)
+
+
+# Recount session_stats/session_senders from scratch; portable across dialects
+_SESSION_STATS_BACKFILL = [
+    "DELETE FROM session_senders",
+    "INSERT INTO session_senders (session_id, sender, message_count) "
+    "SELECT session_id, sender, COUNT(*) FROM messages GROUP BY session_id, sender",
+    "DELETE FROM session_stats",
+    "INSERT INTO session_stats (session_id, message_count, public_count, "
+    "private_count, agent_only_count, admin_only_count, participant_count, "
+    "memory_count, last_activity, last_activity_us) "
+    "SELECT s.id, COALESCE(m.message_count, 0), COALESCE(m.public_count, 0), "
+    "COALESCE(m.private_count, 0), COALESCE(m.agent_only_count, 0), "
+    "COALESCE(m.admin_only_count, 0), COALESCE(m.participant_count, 0), "
+    "COALESCE(am.memory_count, 0), "
+    "(SELECT timestamp FROM messages WHERE session_id = s.id "
+    "ORDER BY ts_us DESC LIMIT 1), m.last_activity_us "
+    "FROM sessions s "
+    "LEFT JOIN (SELECT session_id, COUNT(*) AS message_count, "
+    "SUM(CASE WHEN visibility = 'public' THEN 1 ELSE 0 END) AS public_count, "
+    "SUM(CASE WHEN visibility = 'private' THEN 1 ELSE 0 END) AS private_count, "
+    "SUM(CASE WHEN visibility = 'agent_only' THEN 1 ELSE 0 END) AS agent_only_count, "
+    "SUM(CASE WHEN visibility = 'admin_only' THEN 1 ELSE 0 END) AS admin_only_count, "
+    "COUNT(DISTINCT sender) AS participant_count, MAX(ts_us) AS last_activity_us "
+    "FROM messages GROUP BY session_id) m ON m.session_id = s.id "
+    "LEFT JOIN (SELECT session_id, COUNT(*) AS memory_count FROM agent_memory "
+    "WHERE session_id IS NOT NULL GROUP BY session_id) am ON am.session_id = s.id",
+]
+
+
+@dataclass
+class Migration:
+    """A single schema migration with per-dialect statements."""
+
+    version: int
+    description: str
+    statements: dict[str, list[str]] = field(default_factory=dict)
+
+
+_MIGRATIONS: list[Migration] = [
+    Migration(
+        version=4,
+        description="Full-text search index on messages",
+        statements={
+            # messages_fts and its triggers are created by the schema file;
+            # existing rows only need to be indexed once.
+            "sqlite": ["INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')"],
+            "postgresql": [
+                "ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+                "UPDATE messages SET search_vector = "
+                "setweight(to_tsvector('simple', coalesce(content, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(sender, '')), 'B') || "
+                "setweight(to_tsvector('simple', coalesce(CAST(metadata AS TEXT), '')), 'C')",
+                "CREATE INDEX IF NOT EXISTS idx_messages_search_vector "
+                "ON messages USING GIN (search_vector)",
+            ],
+            "mysql": [
+                "ALTER TABLE messages ADD FULLTEXT INDEX idx_messages_fulltext (sender, content)",
+            ],
+        },
+    ),
+    Migration(
+        version=5,
+        description="Canonical messages.ts_us epoch microseconds",
+        statements={
+            "sqlite": [
+                "ALTER TABLE messages ADD COLUMN ts_us INTEGER",
+                f"UPDATE messages SET ts_us = {_SQLITE_TS_US_EXPRESSION} "
+                "WHERE ts_us IS NULL",
+                "CREATE INDEX IF NOT EXISTS idx_messages_session_ts "
+                "ON messages(session_id, ts_us)",
+            ],
+            "postgresql": [
+                "ALTER TABLE messages ADD COLUMN IF NOT EXISTS ts_us BIGINT",
+                "UPDATE messages SET ts_us = "
+                "(EXTRACT(EPOCH FROM timestamp) * 1000000)::BIGINT WHERE ts_us IS NULL",
+                "CREATE INDEX IF NOT EXISTS idx_messages_session_ts "
+                "ON messages(session_id, ts_us)",
+            ],
+            "mysql": [
+                "ALTER TABLE messages ADD COLUMN ts_us BIGINT "
+                "DEFAULT (CAST(UNIX_TIMESTAMP(CURRENT_TIMESTAMP(6)) * 1000000 AS SIGNED))",
+                # The column default filled existing rows with "now"; use their timestamps
+                "UPDATE messages SET ts_us = "
+                "CAST(UNIX_TIMESTAMP(timestamp) * 1000000 AS SIGNED)",
+                "CREATE INDEX idx_messages_session_ts ON messages(session_id, ts_us)",
+            ],
+        },
+    ),
+    Migration(
+        version=6,
+        description="Keyset pagination index on messages(session_id, id)",
+        statements={
+            # idx_messages_session_id already ends with the rowid (= id)
+            "sqlite": [],
+            "postgresql": [
+                "CREATE INDEX IF NOT EXISTS idx_messages_session_id_id "
+                "ON messages(session_id, id)",
+            ],
+            "mysql": [
+                "CREATE INDEX idx_messages_session_id_id ON messages(session_id, id)",
+            ],
+        },
+    ),
+    Migration(
+        version=7,
+        description="Trigger-maintained session statistics",
+        statements={
+            # The tables and triggers come from the schema file; existing
+            # sessions only need their counters computed once.
+            "sqlite": _SESSION_STATS_BACKFILL,
+            "postgresql": _SESSION_STATS_BACKFILL,
+            "mysql": _SESSION_STATS_BACKFILL,
+        },
+    ),
+    Migration(
+        version=8,
+        description="Unique global agent_memory keys for single-statement upserts",
+        statements={
+            # idx_agent_memory_unique_global/_session are in the schema file
+            "sqlite": [],
+            # UNIQUE(agent_id, session_id, key) treats NULL session_ids as
+            # distinct; keep the newest duplicate global entry, then index
+            "postgresql": [
+                "DELETE FROM agent_memory a USING agent_memory b "
+                "WHERE a.session_id IS NULL AND b.session_id IS NULL "
+                "AND a.agent_id = b.agent_id AND a.key = b.key AND a.id < b.id",
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_agent_memory_unique_global "
+                "ON agent_memory(agent_id, key) WHERE session_id IS NULL",
+            ],
+            "mysql": [
+                "DELETE a FROM agent_memory a JOIN agent_memory b "
+                "ON a.agent_id = b.agent_id AND a.key_name = b.key_name "
+                "AND a.session_id IS NULL AND b.session_id IS NULL AND a.id < b.id",
+                "ALTER TABLE agent_memory "
+                "ADD COLUMN memory_scope VARCHAR(255) "
+                "AS (COALESCE(session_id, '')) STORED, "
+                "ADD UNIQUE KEY unique_agent_scope_key (agent_id, memory_scope, key_name)",
+            ],
+        },
+    ),
+]
+
+
+async def get_applied_schema_version(conn: AsyncConnection) -> int | None:
+    """
+    Return the highest recorded schema version, or None for a fresh database.
+
+    Args:
+        conn: SQLAlchemy async connection
+
+    Returns:
+        Highest version in schema_version, or None if the table doesn't exist
+    """
+    has_table = await conn.run_sync(
+        lambda sync_conn: inspect(sync_conn).has_table("schema_version")
+    )
+    if not has_table:
+        return None
+
+    result = await conn.execute(text("SELECT MAX(version) FROM schema_version"))
+    row = result.fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+async def apply_pending_migrations(
+    conn: AsyncConnection, db_type: str, from_version: int | None
+) -> list[int]:
+    """
+    Apply migrations newer than ``from_version`` for an existing database.
+
+    Args:
+        conn: SQLAlchemy async connection (caller owns the transaction)
+        db_type: Database dialect name ("sqlite", "postgresql", "mysql")
+        from_version: Schema version recorded before the schema file ran,
+            or None for a freshly created database
+
+    Returns:
+        List of migration versions that were applied
+    """
+    if from_version is None or from_version >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    for migration in _MIGRATIONS:
+        if migration.version <= from_version:
+            continue
+
+        for statement in migration.statements.get(db_type, []):
+            await conn.execute(text(statement))
+
+        applied.append(migration.version)
+        logger.info(
+            f"Applied schema migration {migration.version}: {migration.description}"
+        )
+
+    return applied
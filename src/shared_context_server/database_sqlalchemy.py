@@ -16,7 +16,6 @@ Key features:
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -26,11 +25,15 @@ from typing import TYPE_CHECKING, Any
 from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine
 
+from .database_migrations import apply_pending_migrations, get_applied_schema_version
+from .database_statements import StatementCache
+
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Iterator
 
     from sqlalchemy.engine import Result
     from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+    from sqlalchemy.sql.elements import TextClause
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +50,36 @@ _SQLITE_PRAGMAS = [
 ]
 
 
+def _translate_mysql_columns(db_type: str, query: str) -> str:
+    """Rename agent_memory.key to key_name (a reserved word in MySQL)."""
+    if db_type != "mysql" or "agent_memory" not in query.lower():
+        return query
+
+    # Replace references to agent_memory.key with agent_memory.key_name
+    query = query.replace("agent_memory.key", "agent_memory.key_name")
+    # Handle cases where 'key' is used in INSERT/UPDATE for agent_memory
+    if "INSERT INTO agent_memory" in query and " key," in query:
+        query = query.replace(" key,", " key_name,")
+    if "INSERT INTO agent_memory" in query and " key)" in query:
+        query = query.replace(" key)", " key_name)")
+    # Handle WHERE clauses with key column
+    if " key " in query and any(
+        clause in query.lower() for clause in ["where", "and", "or"]
+    ):
+        query = query.replace(" key ", " key_name ")
+    if " key=" in query:
+        query = query.replace(" key=", " key_name=")
+    # Handle UPDATE statements
+    if "UPDATE agent_memory" in query and " key " in query:
+        query = query.replace(" key ", " key_name ")
+    return query
+
+
+# Compiled statements shared by all connection wrappers; the MySQL column
+# translation runs once per statement instead of on every execute
+_statement_cache = StatementCache(rewrite=_translate_mysql_columns)
+
+
 def _raise_foreign_keys_error(value: int) -> None:
     """Raise a foreign keys configuration error."""
     raise RuntimeError(f"Expected foreign_keys=1, got {value}")
@@ -213,131 +246,26 @@ class SQLAlchemyConnectionWrapper:
         self.conn = conn
         self.row_factory = None  # Compatibility with aiosqlite.Row assignment
         self.db_type = db_type
-        self._pragmas_applied = False
 
     def _convert_params(
         self, query: str, params: tuple[Any, ...] = ()
-    ) -> tuple[str, dict[str, Any]]:
+    ) -> tuple[TextClause, dict[str, Any]]:
         """
         Convert aiosqlite-style ? parameters to SQLAlchemy named parameters.
         Also handles database-specific column name translations.
 
+        The translated statement is compiled once per (dialect, query) and
+        reused, so repeated queries only bind their values.
+
         Args:
             query: SQL query with ? placeholders
             params: Tuple of parameter values
 
         Returns:
-            Tuple of (converted_query, named_params_dict)
-        """
-        # Handle MySQL column name translation (key -> key_name)
-        if self.db_type == "mysql" and "agent_memory" in query.lower():
-            # Replace references to agent_memory.key with agent_memory.key_name
-            query = query.replace("agent_memory.key", "agent_memory.key_name")
-            # Handle cases where 'key' is used in INSERT/UPDATE for agent_memory
-            if "INSERT INTO agent_memory" in query and " key," in query:
-                query = query.replace(" key,", " key_name,")
-            if "INSERT INTO agent_memory" in query and " key)" in query:
-                query = query.replace(" key)", " key_name)")
-            # Handle WHERE clauses with key column
-            if " key " in query and any(
-                clause in query.lower() for clause in ["where", "and", "or"]
-            ):
-                query = query.replace(" key ", " key_name ")
-            if " key=" in query:
-                query = query.replace(" key=", " key_name=")
-            # Handle UPDATE statements
-            if "UPDATE agent_memory" in query and " key " in query:
-                query = query.replace(" key ", " key_name ")
-
-        if not params:
-            return query, {}
-
-        # Convert ? placeholders to :param1, :param2, etc.
-        converted_query = query
-        named_params = {}
-
-        param_count = 0
-        while "?" in converted_query:
-            param_count += 1
-            param_name = f"param{param_count}"
-            converted_query = converted_query.replace("?", f":{param_name}", 1)
-
-            if param_count <= len(params):
-                named_params[param_name] = params[param_count - 1]
-
-        return converted_query, named_params
-
-    async def _apply_pragmas(self) -> None:
-        """
-        Apply SQLite PRAGMA settings to ensure interface compatibility.
-
-        Only applies to SQLite connections and only once per connection.
+            Tuple of (compiled_statement, named_params_dict)
         """
-        if self.db_type != "sqlite" or self._pragmas_applied:
-            return
-
-        try:
-            # Apply all PRAGMA settings
-            for pragma in _SQLITE_PRAGMAS:
-                # Skip PRAGMAs that can't be changed in transaction context
-                if "transaction" in pragma.lower():
-                    logger.debug(f"Skipping transaction-sensitive PRAGMA: {pragma}")
-                    continue
-
-                # Add small delay before PRAGMA optimize to prevent hot reload conflicts
-                if "optimize" in pragma.lower():
-                    from .config import get_config
-
-                    config = get_config()
-                    # Only apply delay in development mode and not during testing
-                    if (
-                        config.development.environment == "development"
-                        and not _is_testing_environment()
-                    ):
-                        await asyncio.sleep(0.1)
-                        logger.debug(
-                            "Applying PRAGMA optimize with delay for hot reload compatibility (development mode)"
-                        )
-
-                await self.conn.execute(text(pragma))
-
-            # Validate critical settings
-            result = await self.conn.execute(text("PRAGMA foreign_keys;"))
-            row = result.fetchone()
-            if row and row[0] != 1:
-                _raise_foreign_keys_error(row[0])
-
-            result = await self.conn.execute(text("PRAGMA journal_mode;"))
-            row = result.fetchone()
-            if row:
-                journal_mode = row[0].lower()
-
-                if _is_testing_environment():
-                    # In testing environments, accept any journal mode (including memory databases)
-                    acceptable_modes = {
-                        "wal",
-                        "memory",
-                        "delete",
-                        "truncate",
-                        "persist",
-                    }
-                    if journal_mode not in acceptable_modes:
-                        _raise_journal_mode_error(row[0])
-                    elif journal_mode != "wal":
-                        logger.debug(
-                            f"Using journal_mode={journal_mode} instead of WAL "
-                            f"(testing environment detected)"
-                        )
-                else:
-                    # In production, require WAL mode
-                    if journal_mode != "wal":
-                        _raise_journal_mode_error(row[0])
-
-            self._pragmas_applied = True
-
-        except Exception as e:
-            logger.exception("Failed to apply SQLite PRAGMA settings")
-            raise RuntimeError(f"PRAGMA application failed: {e}") from e
+        compiled = _statement_cache.get(self.db_type, query)
+        return compiled.clause, compiled.bind(params)
 
     async def execute(
         self, query: str, params: tuple[Any, ...] = ()
@@ -353,14 +281,11 @@ class SQLAlchemyConnectionWrapper:
             SQLAlchemyCursorWrapper compatible with aiosqlite cursor
         """
         try:
-            # Apply PRAGMA settings if not already applied (SQLite only)
-            await self._apply_pragmas()
-
             # Convert parameters from aiosqlite format to SQLAlchemy format
-            converted_query, named_params = self._convert_params(query, params)
+            statement, named_params = self._convert_params(query, params)
 
-            # Execute query using SQLAlchemy text() for raw SQL
-            result = await self.conn.execute(text(converted_query), named_params)
+            # Execute the cached text() clause for raw SQL
+            result = await self.conn.execute(statement, named_params)
 
             return SQLAlchemyCursorWrapper(result)
 
@@ -459,7 +384,8 @@ class SimpleSQLAlchemyManager:
         engine_config = self._get_engine_config()
         self.engine = create_async_engine(database_url, **engine_config)
 
-        # Apply SQLite PRAGMA optimizations on each connection
+        # Apply SQLite PRAGMA optimizations once per physical (DBAPI) connection;
+        # pooled checkouts reuse them, so wrappers don't re-issue PRAGMAs
         if self.db_type == "sqlite":
             try:
                 # Only register event listeners for real engines, not mocks
@@ -568,6 +494,12 @@ class SimpleSQLAlchemyManager:
         if self.is_initialized:
             return
 
+        if self.db_type == "sqlite":
+            await self._validate_sqlite_settings()
+
+        # Record the pre-existing schema version so upgrades can be migrated
+        previous_version = await self._get_previous_schema_version()
+
         if self.db_type == "sqlite":
             # Check if this is an in-memory database which can't use file-based DatabaseManager
             if ":memory:" in self.database_url:
@@ -682,8 +614,66 @@ class SimpleSQLAlchemyManager:
                 logger.exception(f"Failed to initialize {self.db_type} database")
                 raise RuntimeError(f"Database initialization failed: {e}") from e
 
+        await self._apply_migrations(previous_version)
+
         self.is_initialized = True
 
+    async def _validate_sqlite_settings(self) -> None:
+        """
+        Check once at startup that the connect-time PRAGMAs took effect.
+
+        Foreign keys must be enabled; the journal mode must be WAL outside of
+        testing environments (where in-memory and rollback journals are fine).
+        """
+        try:
+            async with self.engine.connect() as conn:
+                result = await conn.execute(text("PRAGMA foreign_keys;"))
+                row = result.fetchone()
+                if row and row[0] != 1:
+                    _raise_foreign_keys_error(row[0])
+
+                result = await conn.execute(text("PRAGMA journal_mode;"))
+                row = result.fetchone()
+        except Exception as e:
+            logger.exception("Failed to validate SQLite PRAGMA settings")
+            raise RuntimeError(f"PRAGMA validation failed: {e}") from e
+
+        if not row:
+            return
+
+        journal_mode = row[0].lower()
+        if _is_testing_environment():
+            # In testing environments, accept any journal mode (including memory databases)
+            acceptable_modes = {"wal", "memory", "delete", "truncate", "persist"}
+            if journal_mode not in acceptable_modes:
+                _raise_journal_mode_error(row[0])
+            elif journal_mode != "wal":
+                logger.debug(
+                    f"Using journal_mode={journal_mode} instead of WAL "
+                    f"(testing environment detected)"
+                )
+        elif journal_mode != "wal":
+            # In production, require WAL mode
+            _raise_journal_mode_error(row[0])
+
+    async def _get_previous_schema_version(self) -> int | None:
+        """Return the schema version recorded before initialization, if any."""
+        try:
+            async with self.engine.connect() as conn:
+                return await get_applied_schema_version(conn)
+        except Exception as e:
+            logger.debug(f"Could not read existing schema version: {e}")
+            return None
+
+    async def _apply_migrations(self, previous_version: int | None) -> None:
+        """Apply schema migrations for databases created by older releases."""
+        try:
+            async with self.engine.connect() as conn, conn.begin():
+                await apply_pending_migrations(conn, self.db_type, previous_version)
+        except Exception as e:
+            logger.exception(f"Failed to migrate {self.db_type} database")
+            raise RuntimeError(f"Database migration failed: {e}") from e
+
     def _has_statement_terminator(self, line: str) -> bool:
         """
         Check if a line contains a statement terminator (semicolon), accounting for inline comments.
@@ -715,6 +705,9 @@ class SimpleSQLAlchemyManager:
             return "$$" not in full_statement or full_statement.count("$$") < 2
 
         if "CREATE TRIGGER" in full_statement:
+            # PostgreSQL triggers are one statement calling a function
+            if "EXECUTE FUNCTION" in full_statement:
+                return False
             return "END;" not in full_statement
 
         # MySQL procedure patterns
@@ -765,4 +758,5 @@ class SimpleSQLAlchemyManager:
                 if self.db_type == "sqlite" and self.database_path.exists()
                 else 0
             ),
+            "statement_cache": _statement_cache.get_stats(),
         }
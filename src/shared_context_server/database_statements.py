@@ -0,0 +1,133 @@
+"""
+Compiled statement cache for the SQLAlchemy connection wrappers.
+
+Tool code issues aiosqlite-style SQL with ``?`` placeholders. Translating a
+statement means rewriting the placeholders to named parameters, applying any
+dialect-specific rewrites and building a ``TextClause`` (which parses the SQL
+for bind parameters). The same few dozen statements run on every request, so
+the translated clause and its parameter names are kept in an LRU keyed by
+(dialect, raw SQL) and the hot path only binds values.
+
+Reusing the same ``TextClause`` object also lets SQLAlchemy's own compiled
+cache hit instead of re-deriving a cache key from fresh SQL text. Compiled
+statements also record whether they are plain SELECTs, which the SQLite
+reader pool uses for routing.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from sqlalchemy.sql.elements import TextClause
+
+# Leading whitespace and -- comments, then SELECT (WITH may wrap DML in SQLite)
+_READ_ONLY_STATEMENT = re.compile(r"\s*(?:--[^\n]*\n\s*)*SELECT\b", re.IGNORECASE)
+
+
+class CompiledStatement(NamedTuple):
+    """A translated statement ready for value binding."""
+
+    clause: TextClause
+    param_names: tuple[str, ...]
+    read_only: bool
+
+    def bind(self, params: Sequence[Any]) -> dict[str, Any]:
+        """Map positional values onto the statement's named parameters."""
+        return dict(zip(self.param_names, params, strict=False))
+
+
+def _convert_placeholders(query: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Replace ``?`` placeholders with ``:param_N`` in a single pass.
+
+    Question marks inside single-quoted string literals are left alone.
+    """
+    # Splitting on quotes leaves SQL outside literals at even indexes
+    # (doubled '' escapes produce empty segments and keep the parity)
+    segments = query.split("'")
+    param_names: list[str] = []
+
+    for index in range(0, len(segments), 2):
+        if "?" not in segments[index]:
+            continue
+        pieces = segments[index].split("?")
+        converted = [pieces[0]]
+        for piece in pieces[1:]:
+            name = f"param_{len(param_names)}"
+            param_names.append(name)
+            converted.append(f":{name}{piece}")
+        segments[index] = "".join(converted)
+
+    return "'".join(segments), tuple(param_names)
+
+
+class StatementCache:
+    """LRU of compiled statements keyed by (dialect, raw SQL)."""
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        rewrite: Callable[[str, str], str] | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of compiled statements kept
+            rewrite: Optional ``(dialect, query) -> query`` translation applied
+                before placeholders are converted (e.g. column renames)
+        """
+        self.max_size = max_size
+        self._rewrite = rewrite
+        self._statements: OrderedDict[tuple[str, str], CompiledStatement] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, dialect: str, query: str) -> CompiledStatement:
+        """Return the compiled form of ``query``, compiling it on a miss."""
+        key = (dialect, query)
+        compiled = self._statements.get(key)
+        if compiled is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+            return compiled
+
+        self.misses += 1
+        sql = self._rewrite(dialect, query) if self._rewrite else query
+        converted, param_names = _convert_placeholders(sql)
+        compiled = CompiledStatement(
+            text(converted),
+            param_names,
+            read_only=_READ_ONLY_STATEMENT.match(sql) is not None,
+        )
+
+        self._statements[key] = compiled
+        if len(self._statements) > self.max_size:
+            self._statements.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        """Drop all compiled statements and reset the counters."""
+        self._statements.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counts and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._statements),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
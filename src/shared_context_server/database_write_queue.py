@@ -0,0 +1,243 @@
+"""
+Group-commit write queue for high-rate writes.
+
+Under bursty load each add_message / set_memory call used to open its own
+transaction, so SQLite paid one WAL commit (and possibly a "database is
+locked" retry) per write. When enabled, a single writer task takes write
+intents from an asyncio queue, runs up to ``max_batch`` of them - or
+whatever arrives within ``max_delay`` seconds - in one transaction on the
+writer connection, and commits once.
+
+Durability is unchanged from the caller's point of view: a caller's future
+resolves only after the transaction containing its write has committed.
+If a batch fails, its intents are retried one transaction each so a bad
+write only fails its own caller.
+
+A write intent is an async callable taking the connection wrapper and
+returning the caller's result (e.g. ``lastrowid``). Intents must not commit.
+The queue is optional; ``run_write`` runs intents directly on the caller's
+connection while it is stopped, or when the caller already holds the
+writer (always the case without a SQLite read pool).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from . import database_manager
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from .database_manager import SQLAlchemyConnectionWrapper
+
+    WriteIntent = Callable[[SQLAlchemyConnectionWrapper], Awaitable[Any]]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def write_statement(query: str, params: tuple[Any, ...] = ()) -> WriteIntent:
+    """Create an intent that executes one statement and returns its lastrowid."""
+
+    async def intent(conn: SQLAlchemyConnectionWrapper) -> int | None:
+        cursor = await conn.execute(query, params)
+        return cursor.lastrowid  # type: ignore[no-any-return]
+
+    return intent
+
+
+class GroupCommitQueue:
+    """Single writer task that batches write intents into shared commits."""
+
+    def __init__(self, max_batch: int = 64, max_delay: float = 0.002) -> None:
+        """
+        Initialize a stopped queue.
+
+        Args:
+            max_batch: Maximum intents committed in one transaction
+            max_delay: Seconds to wait for more intents after the first one
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[tuple[WriteIntent, asyncio.Future[Any]] | None]
+        self._queue = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+        self.stats = {
+            "submitted": 0,
+            "committed": 0,
+            "failed": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "split_batches": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer task is accepting intents."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the writer task in the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit every intent already submitted, then stop the writer task."""
+        if not self.running:
+            return
+        task = self._task
+        self._task = None
+        await self._queue.put(None)
+        await task  # type: ignore[misc]
+
+    async def submit(self, intent: Callable[..., Awaitable[T]]) -> T:
+        """
+        Queue a write intent and wait until it has been committed.
+
+        Returns:
+            The intent's result
+
+        Raises:
+            RuntimeError: If the queue is not running
+            Exception: Whatever the intent (or its transaction) raised
+        """
+        if not self.running:
+            raise RuntimeError("Group-commit write queue is not running")
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((intent, future))
+        self.stats["submitted"] += 1
+        return await future
+
+    async def _run(self) -> None:
+        """Collect batches and commit them until stopped."""
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            stopping = await self._fill_batch(batch)
+            await self._commit(batch)
+
+    async def _fill_batch(
+        self, batch: list[tuple[WriteIntent, asyncio.Future[Any]]]
+    ) -> bool:
+        """Add queued intents to ``batch``; return True if a stop was requested."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                return True
+            batch.append(item)
+        return False
+
+    async def _execute(
+        self, batch: list[tuple[WriteIntent, asyncio.Future[Any]]]
+    ) -> list[Any]:
+        """Run a batch in one writer transaction; committed when this returns."""
+        async with database_manager.get_db_connection() as conn:
+            await conn.begin_write()
+            return [await intent(conn) for intent, _ in batch]
+
+    async def _commit(
+        self, batch: list[tuple[WriteIntent, asyncio.Future[Any]]]
+    ) -> None:
+        """Commit a batch and resolve its callers' futures."""
+        try:
+            results = await self._execute(batch)
+        except Exception as e:
+            if len(batch) > 1:
+                # Isolate the failing intent: the others still commit
+                self.stats["split_batches"] += 1
+                for item in batch:
+                    await self._commit([item])
+                return
+            self.stats["failed"] += 1
+            future = batch[0][1]
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["committed"] += len(batch)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue counters and the average batch size."""
+        batches = self.stats["batches"]
+        return {
+            "running": self.running,
+            "pending": self._queue.qsize(),
+            "max_batch": self.max_batch,
+            "max_delay_ms": self.max_delay * 1000,
+            **self.stats,
+            "avg_batch_size": self.stats["committed"] / batches if batches else 0.0,
+        }
+
+
+# Global queue (stopped unless group commit is enabled)
+write_queue = GroupCommitQueue()
+
+
+async def run_write(
+    conn: SQLAlchemyConnectionWrapper, intent: Callable[..., Awaitable[T]]
+) -> T:
+    """
+    Run a write intent through the group-commit queue when it is running.
+
+    Args:
+        conn: Caller's connection, used directly while the queue is stopped
+        intent: Async callable taking a connection; must not commit
+
+    Returns:
+        The intent's result, after it has been committed when queued
+    """
+    # A caller already holding the writer would deadlock waiting for the
+    # queue's transaction, so it runs the intent in its own transaction
+    if write_queue.running and not database_manager.holds_writer():
+        return await write_queue.submit(intent)
+
+    # Like a queued batch, run the whole intent (checks included) on the writer
+    begin_write = getattr(conn, "begin_write", None)
+    if begin_write is not None:
+        await begin_write()
+    return await intent(conn)
+
+
+def start_write_queue() -> bool:
+    """Start the global queue if group commit is enabled in configuration."""
+    from .config import get_database_config
+
+    db_config = get_database_config()
+    if not db_config.database_group_commit:
+        return False
+
+    write_queue.max_batch = db_config.database_group_commit_max_batch
+    write_queue.max_delay = db_config.database_group_commit_delay_ms / 1000
+    write_queue.start()
+    logger.info(
+        f"Group-commit write queue started (max_batch={write_queue.max_batch}, "
+        f"max_delay={db_config.database_group_commit_delay_ms}ms)"
+    )
+    return True
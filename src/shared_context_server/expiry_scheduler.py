@@ -0,0 +1,375 @@
+"""
+Deadline-driven TTL expiry for agent memory and secure tokens.
+
+Expired memory used to be removed by a full-range ``DELETE`` every five
+minutes, and expired ``secure_tokens`` rows were never removed at all. The
+scheduler instead keeps a min-heap of upcoming expiry deadlines, loaded from
+the ``expires_at`` indexes for the next ``refill_interval`` seconds and fed
+by ``schedule()`` as entries are written. Deadlines are rounded up to
+``resolution``-second slots, so a burst of entries expiring together costs
+one heap entry per table, like a timing wheel bucket.
+
+When a slot comes due, the rows that have expired are deleted in chunks of
+``chunk_size``, one short transaction each, so the writer is never held for
+a long sweep and the work done is proportional to what actually expired.
+Each chunk is published as ``ExpiryEvent``s: memory caches for the affected
+agents are invalidated, resource subscribers are notified, and in-process
+``listeners`` receive the events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from .database import get_db_connection
+from .database_write_queue import run_write
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExpiryEvent:
+    """A row removed because its ``expires_at`` deadline passed."""
+
+    table: str
+    row_id: int
+    agent_id: str
+    session_id: str | None
+    key: str
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class ExpiryTarget:
+    """A table with an indexed ``expires_at`` column."""
+
+    table: str
+    # agent, session and key columns reported in each ExpiryEvent
+    event_columns: str
+    # agent_memory stores epoch seconds; secure_tokens stores ISO timestamps
+    iso_deadlines: bool = False
+
+    def to_db(self, deadline: float) -> Any:
+        """Convert an epoch deadline to the column's representation."""
+        if self.iso_deadlines:
+            return datetime.fromtimestamp(deadline, timezone.utc).isoformat()
+        return deadline
+
+
+EXPIRY_TARGETS = {
+    "agent_memory": ExpiryTarget(
+        "agent_memory",
+        "agent_memory.agent_id, agent_memory.session_id, agent_memory.key",
+    ),
+    "secure_tokens": ExpiryTarget(
+        "secure_tokens", "agent_id, NULL, token_id", iso_deadlines=True
+    ),
+}
+
+
+def _to_epoch(value: Any) -> float:
+    """Convert a stored ``expires_at`` value to epoch seconds."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc).timestamp()
+        return value.timestamp()
+    try:
+        return float(value)
+    except ValueError:
+        return _to_epoch(datetime.fromisoformat(value))
+
+
+async def _expire_chunk(
+    conn: Any, *, target: ExpiryTarget, deadline: Any, limit: int
+) -> list[ExpiryEvent]:
+    """Delete up to ``limit`` expired rows, oldest deadline first."""
+    cursor = await conn.execute(
+        f"""
+        SELECT id, {target.event_columns}, expires_at FROM {target.table}
+        WHERE expires_at IS NOT NULL AND expires_at <= ?
+        ORDER BY expires_at LIMIT ?
+        """,  # noqa: S608
+        (deadline, limit),
+    )
+    rows = await cursor.fetchall()
+    if not rows:
+        return []
+
+    ids = [row[0] for row in rows]
+    placeholders = ", ".join("?" * len(ids))
+    await conn.execute(
+        f"DELETE FROM {target.table} WHERE id IN ({placeholders})",  # noqa: S608
+        tuple(ids),
+    )
+    return [
+        ExpiryEvent(target.table, row[0], row[1], row[2], row[3], _to_epoch(row[4]))
+        for row in rows
+    ]
+
+
+class ExpiryScheduler:
+    """Min-heap of expiry deadlines drained by a background task."""
+
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        refill_interval: float = 60.0,
+        max_scheduled: int = 10000,
+        resolution: float = 1.0,
+    ) -> None:
+        """
+        Initialize a stopped scheduler.
+
+        Args:
+            chunk_size: Maximum rows deleted per transaction
+            refill_interval: Seconds of upcoming deadlines loaded per refill
+            max_scheduled: Maximum deadlines loaded per table per refill
+            resolution: Seconds per deadline slot
+        """
+        self.chunk_size = chunk_size
+        self.refill_interval = refill_interval
+        self.max_scheduled = max_scheduled
+        self.resolution = resolution
+        self.listeners: list[Callable[[list[ExpiryEvent]], Any]] = []
+        self._heap: list[tuple[float, str]] = []
+        self._slots: set[tuple[float, str]] = set()
+        # Deadlines up to the horizon are in the heap; later ones are loaded
+        # by the refill at next_refill
+        self._horizon = 0.0
+        self._next_refill = 0.0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self.stats = {
+            "scheduled": 0,
+            "refills": 0,
+            "wakeups": 0,
+            "chunks": 0,
+            "failed": 0,
+        }
+        self.expired_counts: dict[str, int] = dict.fromkeys(EXPIRY_TARGETS, 0)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is expiring entries."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background task in the running event loop."""
+        if self.running:
+            return
+        self._heap.clear()
+        self._slots.clear()
+        self._horizon = 0.0
+        self._next_refill = 0.0
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task; unexpired entries are reloaded on start."""
+        if not self.running:
+            return
+        task = self._task
+        self._task = None
+        task.cancel()  # type: ignore[union-attr]
+        with suppress(asyncio.CancelledError):
+            await task  # type: ignore[misc]
+
+    def schedule(self, table: str, expires_at: float) -> None:
+        """
+        Register a deadline written after the last refill.
+
+        Deadlines past the current horizon are ignored; the refill that
+        covers them loads them from the index.
+        """
+        if not self.running or expires_at > self._horizon:
+            return
+        head = self._heap[0][0] if self._heap else math.inf
+        if self._push(table, expires_at):
+            self.stats["scheduled"] += 1
+            # The task is sleeping until the old head; wake it for this one
+            if self._heap[0][0] < head:
+                self._wakeup.set()
+
+    def _push(self, table: str, deadline: float) -> bool:
+        """Add the slot covering ``deadline``; False if it was already queued."""
+        slot = (math.ceil(deadline / self.resolution) * self.resolution, table)
+        if slot in self._slots:
+            return False
+        self._slots.add(slot)
+        heapq.heappush(self._heap, slot)
+        return True
+
+    async def _refill(self, now: float) -> None:
+        """Load the deadlines of the next ``refill_interval`` seconds."""
+        self._heap.clear()
+        self._slots.clear()
+        horizon = now + self.refill_interval
+
+        async with get_db_connection() as conn:
+            for target in EXPIRY_TARGETS.values():
+                cursor = await conn.execute(
+                    f"""
+                    SELECT expires_at FROM {target.table}
+                    WHERE expires_at IS NOT NULL AND expires_at <= ?
+                    ORDER BY expires_at LIMIT ?
+                    """,  # noqa: S608
+                    (target.to_db(horizon), self.max_scheduled),
+                )
+                rows = await cursor.fetchall()
+                for row in rows:
+                    self._push(target.table, _to_epoch(row[0]))
+                if len(rows) == self.max_scheduled:
+                    # More rows expire before the horizon than were loaded;
+                    # load the rest once these have been deleted
+                    horizon = min(horizon, _to_epoch(rows[-1][0]))
+
+        self._horizon = horizon
+        self._next_refill = horizon
+        self.stats["refills"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            try:
+                if now >= self._next_refill:
+                    await self._refill(now)
+
+                due = set()
+                while self._heap and self._heap[0][0] <= now:
+                    slot = heapq.heappop(self._heap)
+                    self._slots.discard(slot)
+                    due.add(slot[1])
+                for table in sorted(due):
+                    await self.expire_now(table, now)
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Expiry pass failed")
+                # Rows left behind are picked up by the next refill
+                self._next_refill = max(self._next_refill, now + self.refill_interval)
+
+            wake_at = self._next_refill
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            self._wakeup.clear()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=max(0.0, wake_at - time.time())
+                )
+            self.stats["wakeups"] += 1
+
+    async def expire_now(
+        self,
+        table: str,
+        now: float | None = None,
+        get_connection: Callable[[], Any] | None = None,
+    ) -> int:
+        """
+        Delete every row of ``table`` that expired by ``now``, in chunks.
+
+        Args:
+            table: A key of EXPIRY_TARGETS
+            now: Epoch deadline; defaults to the current time
+            get_connection: Connection factory; defaults to get_db_connection
+
+        Returns:
+            Number of rows deleted
+        """
+        target = EXPIRY_TARGETS[table]
+        deadline = target.to_db(time.time() if now is None else now)
+        connect = get_connection or get_db_connection
+
+        expired = 0
+        while True:
+            async with connect() as conn:
+                events = await run_write(
+                    conn,
+                    partial(
+                        _expire_chunk,
+                        target=target,
+                        deadline=deadline,
+                        limit=self.chunk_size,
+                    ),
+                )
+                await conn.commit()
+
+            if events:
+                self.stats["chunks"] += 1
+                self.expired_counts[table] += len(events)
+                expired += len(events)
+                await self._publish(events)
+            if len(events) < self.chunk_size:
+                return expired
+            # Let other writers in between chunks
+            await asyncio.sleep(0)
+
+    async def _publish(self, events: list[ExpiryEvent]) -> None:
+        """Tell caches, resource subscribers and listeners about expired rows."""
+        for listener in self.listeners:
+            try:
+                result = listener(events)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:  # noqa: PERF203
+                logger.exception("Expiry listener failed")
+
+        memory_agents = {e.agent_id for e in events if e.table == "agent_memory"}
+        if not memory_agents:
+            return
+        try:
+            from .admin_resources import notification_manager
+            from .utils.caching import cache_manager, invalidate_agent_memory_cache
+
+            for agent_id in memory_agents:
+                await invalidate_agent_memory_cache(cache_manager, agent_id)
+                await notification_manager.notify_resource_updated(
+                    f"agent://{agent_id}/memory"
+                )
+        except Exception as e:
+            logger.warning(f"Failed to publish memory expiry: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get scheduler counters and heap occupancy."""
+        return {
+            "running": self.running,
+            "pending_slots": len(self._heap),
+            "next_deadline": self._heap[0][0] if self._heap else None,
+            "next_refill": self._next_refill,
+            "chunk_size": self.chunk_size,
+            **self.stats,
+            "expired": dict(self.expired_counts),
+        }
+
+
+# Global scheduler (stopped unless enabled in configuration)
+expiry_scheduler = ExpiryScheduler()
+
+
+def start_expiry_scheduler() -> bool:
+    """Start the global expiry scheduler if enabled in configuration."""
+    from .config import get_database_config
+
+    db_config = get_database_config()
+    if not db_config.expiry_scheduler:
+        return False
+
+    expiry_scheduler.chunk_size = db_config.expiry_chunk_size
+    expiry_scheduler.refill_interval = db_config.expiry_refill_interval
+    expiry_scheduler.max_scheduled = db_config.expiry_max_scheduled
+    expiry_scheduler.start()
+    logger.info(
+        f"Expiry scheduler started (chunk={expiry_scheduler.chunk_size}, "
+        f"refill={expiry_scheduler.refill_interval}s)"
+    )
+    return True
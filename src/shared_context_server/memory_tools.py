@@ -3,8 +3,10 @@ Agent Memory Management Tools for Shared Context MCP Server.
 
 Provides MCP tools for agent memory storage and retrieval:
 - set_memory: Store values with TTL, scope, and metadata support
-- get_memory: Retrieve values with automatic cleanup
+- get_memory: Retrieve unexpired values
 - list_memory: List memory entries with filtering options
+- set_memory_many, get_memory_many, delete_memory_many: Bulk variants that
+  handle many keys in one call and one transaction
 
 Built for multi-agent coordination with session isolation and global memory support.
 """
@@ -15,6 +17,7 @@ import json
 import logging
 import traceback
 from datetime import datetime, timezone
+from functools import partial
 from typing import Any
 
 # aiosqlite removed in favor of SQLAlchemy-only backend
@@ -28,6 +31,8 @@ from .auth import validate_agent_context_or_error
 # Import core dependencies
 from .core_server import mcp
 from .database import get_db_connection
+from .database_write_queue import run_write
+from .expiry_scheduler import expiry_scheduler
 from .models import parse_mcp_metadata
 from .utils.llm_errors import (
     ERROR_MESSAGE_PATTERNS,
@@ -35,6 +40,7 @@ from .utils.llm_errors import (
     create_llm_error_response,
     create_system_error,
 )
+from .utils.session_registry import session_registry
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +131,235 @@ def normalize_null_params(**kwargs: Any) -> dict[str, Any]:
     return normalized
 
 
+_UPSERT_MEMORY_INSERT = """
+    INSERT INTO agent_memory
+    (agent_id, session_id, key, value, metadata, created_at, expires_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Conflict targets name the partial unique indexes (one global entry per
+# agent and key, one per agent, session and key)
+_UPSERT_CONFLICT_TARGETS = {
+    False: "(agent_id, key) WHERE session_id IS NULL",
+    True: "(agent_id, session_id, key) WHERE session_id IS NOT NULL",
+}
+
+# overwrite=False only replaces an entry that has already expired
+_MEMORY_EXPIRED = "agent_memory.expires_at IS NOT NULL AND agent_memory.expires_at <= ?"
+
+
+def _upsert_memory_statement(
+    db_type: str, session_scoped: bool, overwrite: bool
+) -> str:
+    """Build the single-statement memory upsert for a dialect."""
+    if db_type == "mysql":
+        # MySQL evaluates assignments left to right, so expires_at goes last.
+        # For overwrite=False, LAST_INSERT_ID(id) marks a replaced row: a
+        # kept row reports no insert id.
+        columns = ("value", "metadata", "updated_at", "expires_at")
+        if overwrite:
+            assignments = [f"{column} = VALUES({column})" for column in columns]
+        else:
+            assignments = [
+                f"id = IF({_MEMORY_EXPIRED}, LAST_INSERT_ID(id), id)",
+                *(
+                    f"{column} = IF({_MEMORY_EXPIRED}, VALUES({column}), {column})"
+                    for column in columns
+                ),
+            ]
+        return f"{_UPSERT_MEMORY_INSERT} ON DUPLICATE KEY UPDATE " + ", ".join(
+            assignments
+        )
+
+    statement = (
+        f"{_UPSERT_MEMORY_INSERT} ON CONFLICT {_UPSERT_CONFLICT_TARGETS[session_scoped]} "
+        "DO UPDATE SET value = excluded.value, metadata = excluded.metadata, "
+        "updated_at = excluded.updated_at, expires_at = excluded.expires_at"
+    )
+    if not overwrite:
+        statement += f" WHERE {_MEMORY_EXPIRED}"
+    return statement
+
+
+async def _write_memory(
+    conn: Any,
+    *,
+    agent_id: str,
+    session_id: str | None,
+    key: str,
+    serialized_value: str,
+    metadata_json: str,
+    created_at: float,
+    updated_at: str,
+    expires_at: float | None,
+    overwrite: bool,
+) -> bool:
+    """
+    Insert or update one memory entry with a single upsert statement.
+
+    Write intent for set_memory: the caller (or the group-commit queue)
+    owns the transaction. The unique indexes resolve concurrent writers of
+    the same key, so there is no check-then-write window.
+
+    Returns:
+        False if the key exists, is unexpired and overwrite is False
+    """
+    db_type = getattr(conn, "db_type", "sqlite")
+    params: tuple[Any, ...] = (
+        agent_id,
+        session_id,
+        key,
+        serialized_value,
+        metadata_json,
+        created_at,  # Explicit created_at to ensure constraint works
+        expires_at,
+        updated_at,
+    )
+    if not overwrite:
+        now = datetime.now(timezone.utc).timestamp()
+        params += (now,) * (5 if db_type == "mysql" else 1)
+
+    cursor = await conn.execute(
+        _upsert_memory_statement(db_type, session_id is not None, overwrite), params
+    )
+    if overwrite:
+        return True
+    if db_type == "mysql":
+        return bool(cursor.lastrowid)
+    return bool(cursor.rowcount)
+
+
+def _prepare_memory_entry(
+    key: str, value: Any, expires_in: int | str | None, metadata: Any
+) -> dict[str, Any]:
+    """
+    Validate one memory entry's key, metadata, TTL and value for storage.
+
+    Returns:
+        An error response, or the trimmed ``key``, parsed ``metadata``,
+        ``expires_in_seconds`` and ``serialized_value``
+    """
+    # Validate and sanitize the key
+    key = key.strip()
+    if not key:
+        return create_llm_error_response(
+            error="Memory key cannot be empty after trimming whitespace",
+            code="INVALID_KEY",
+            suggestions=[
+                "Provide a non-empty memory key",
+                "Use descriptive key names like 'user_preferences' or 'session_state'",
+                "Keys should be alphanumeric with underscores or dashes",
+            ],
+            context={"field": "key", "requirement": "non_empty_string"},
+            severity=ErrorSeverity.WARNING,
+        )
+
+    # Parse metadata from MCP client (handles both string and dict inputs)
+    try:
+        metadata = parse_mcp_metadata(metadata)
+    except ValueError as e:
+        return create_llm_error_response(
+            error=f"Invalid metadata format: {str(e)}",
+            code="INVALID_METADATA_FORMAT",
+            suggestions=[
+                "Provide metadata as a JSON object (dictionary)",
+                "Use null for no metadata",
+                'Example: {"key": "value", "nested": {"data": "example"}}',
+            ],
+            context={"field": "metadata", "expected_type": "dict or null"},
+            severity=ErrorSeverity.WARNING,
+        )
+
+    if len(key) > 255:
+        return create_llm_error_response(
+            error="Memory key too long (max 255 characters)",
+            code="INVALID_KEY",
+            suggestions=[
+                "Shorten the memory key to 255 characters or less",
+                "Use abbreviated key names",
+                "Consider using hierarchical keys with dots or underscores",
+            ],
+            context={"key_length": len(key), "max_length": 255},
+            severity=ErrorSeverity.WARNING,
+        )
+
+    if "\n" in key or "\t" in key or " " in key:
+        return ERROR_MESSAGE_PATTERNS["memory_key_invalid"](key)  # type: ignore[no-any-return,operator]
+
+    # Validate and process expires_in parameter
+    expires_in_seconds = None
+    if expires_in is not None:
+        try:
+            # Convert string to int if needed
+            if isinstance(expires_in, str):
+                expires_in_seconds = int(expires_in)
+            else:
+                expires_in_seconds = expires_in
+
+            # Validate range - treat 0 as "no expiration"
+            if expires_in_seconds < 0:
+                return create_llm_error_response(
+                    error="expires_in cannot be negative",
+                    code="INVALID_TTL_VALUE",
+                    suggestions=[
+                        "Use 0 for no expiration or positive integer for TTL",
+                        "Example: expires_in: 3600 (1 hour)",
+                    ],
+                )
+
+            if expires_in_seconds > 86400 * 365:  # Max 1 year
+                return create_llm_error_response(
+                    error="expires_in cannot exceed 1 year (31536000 seconds)",
+                    code="INVALID_TTL_VALUE",
+                    suggestions=[
+                        "Use a smaller TTL value",
+                        "Maximum is 31536000 seconds (1 year)",
+                    ],
+                )
+
+        except (ValueError, TypeError) as e:
+            return create_llm_error_response(
+                error=f"Invalid expires_in format: {str(e)}",
+                code="INVALID_TTL_FORMAT",
+                suggestions=[
+                    "Use an integer value for expires_in",
+                    "Example: expires_in: 3600 (for 1 hour)",
+                ],
+            )
+
+    # TTL validation and warning for short durations
+    if expires_in_seconds and expires_in_seconds < 10:
+        logger.warning(
+            f"Short TTL detected ({expires_in_seconds}s) for key '{key}' - "
+            "may expire faster than expected due to processing time"
+        )
+
+    # Serialize value to JSON with error handling
+    try:
+        if not isinstance(value, str):
+            serialized_value = json.dumps(value, ensure_ascii=False)
+        else:
+            serialized_value = value
+    except (TypeError, ValueError) as e:
+        return create_llm_error_response(
+            error=f"Value is not JSON serializable: {str(e)}",
+            code="SERIALIZATION_ERROR",
+            suggestions=[
+                "Ensure the value contains only JSON-compatible data types",
+                "Supported types: strings, numbers, booleans, lists, dictionaries",
+                "Remove or convert unsupported types like functions, classes, or custom objects",
+            ],
+            context={"value_type": type(value).__name__, "error_detail": str(e)},
+            severity=ErrorSeverity.WARNING,
+        )
+    return {
+        "key": key,
+        "metadata": metadata,
+        "expires_in_seconds": expires_in_seconds,
+        "serialized_value": serialized_value,
+    }
+
+
 # Audit logging utility
 async def audit_log(
     _conn: Any,  # SQLAlchemy connection wrapper
@@ -196,52 +431,13 @@ async def set_memory(
     auth_token = normalized_params.get("auth_token", None)
 
     try:
-        # Validate and sanitize the key
-        key = key.strip()
-        if not key:
-            return create_llm_error_response(
-                error="Memory key cannot be empty after trimming whitespace",
-                code="INVALID_KEY",
-                suggestions=[
-                    "Provide a non-empty memory key",
-                    "Use descriptive key names like 'user_preferences' or 'session_state'",
-                    "Keys should be alphanumeric with underscores or dashes",
-                ],
-                context={"field": "key", "requirement": "non_empty_string"},
-                severity=ErrorSeverity.WARNING,
-            )
-
-        # Parse metadata from MCP client (handles both string and dict inputs)
-        try:
-            metadata = parse_mcp_metadata(metadata)
-        except ValueError as e:
-            return create_llm_error_response(
-                error=f"Invalid metadata format: {str(e)}",
-                code="INVALID_METADATA_FORMAT",
-                suggestions=[
-                    "Provide metadata as a JSON object (dictionary)",
-                    "Use null for no metadata",
-                    'Example: {"key": "value", "nested": {"data": "example"}}',
-                ],
-                context={"field": "metadata", "expected_type": "dict or null"},
-                severity=ErrorSeverity.WARNING,
-            )
-
-        if len(key) > 255:
-            return create_llm_error_response(
-                error="Memory key too long (max 255 characters)",
-                code="INVALID_KEY",
-                suggestions=[
-                    "Shorten the memory key to 255 characters or less",
-                    "Use abbreviated key names",
-                    "Consider using hierarchical keys with dots or underscores",
-                ],
-                context={"key_length": len(key), "max_length": 255},
-                severity=ErrorSeverity.WARNING,
-            )
-
-        if "\n" in key or "\t" in key or " " in key:
-            return ERROR_MESSAGE_PATTERNS["memory_key_invalid"](key)  # type: ignore[no-any-return,operator]
+        prepared = _prepare_memory_entry(key, value, expires_in, metadata)
+        if "error" in prepared:
+            return prepared
+        key = prepared["key"]
+        metadata = prepared["metadata"]
+        expires_in_seconds = prepared["expires_in_seconds"]
+        serialized_value = prepared["serialized_value"]
 
         # Extract and validate agent context (with token validation error handling)
         agent_context = await validate_agent_context_or_error(ctx, auth_token)
@@ -261,73 +457,6 @@ async def set_memory(
                 agent_context.get("permissions", [])
             )
 
-        # Validate and process expires_in parameter
-        expires_in_seconds = None
-        if expires_in is not None:
-            try:
-                # Convert string to int if needed
-                if isinstance(expires_in, str):
-                    expires_in_seconds = int(expires_in)
-                else:
-                    expires_in_seconds = expires_in
-
-                # Validate range - treat 0 as "no expiration"
-                if expires_in_seconds < 0:
-                    return create_llm_error_response(
-                        error="expires_in cannot be negative",
-                        code="INVALID_TTL_VALUE",
-                        suggestions=[
-                            "Use 0 for no expiration or positive integer for TTL",
-                            "Example: expires_in: 3600 (1 hour)",
-                        ],
-                    )
-
-                if expires_in_seconds > 86400 * 365:  # Max 1 year
-                    return create_llm_error_response(
-                        error="expires_in cannot exceed 1 year (31536000 seconds)",
-                        code="INVALID_TTL_VALUE",
-                        suggestions=[
-                            "Use a smaller TTL value",
-                            "Maximum is 31536000 seconds (1 year)",
-                        ],
-                    )
-
-            except (ValueError, TypeError) as e:
-                return create_llm_error_response(
-                    error=f"Invalid expires_in format: {str(e)}",
-                    code="INVALID_TTL_FORMAT",
-                    suggestions=[
-                        "Use an integer value for expires_in",
-                        "Example: expires_in: 3600 (for 1 hour)",
-                    ],
-                )
-
-        # TTL validation and warning for short durations
-        if expires_in_seconds and expires_in_seconds < 10:
-            logger.warning(
-                f"Short TTL detected ({expires_in_seconds}s) for key '{key}' - "
-                "may expire faster than expected due to processing time"
-            )
-
-        # Serialize value to JSON with error handling
-        try:
-            if not isinstance(value, str):
-                serialized_value = json.dumps(value, ensure_ascii=False)
-            else:
-                serialized_value = value
-        except (TypeError, ValueError) as e:
-            return create_llm_error_response(
-                error=f"Value is not JSON serializable: {str(e)}",
-                code="SERIALIZATION_ERROR",
-                suggestions=[
-                    "Ensure the value contains only JSON-compatible data types",
-                    "Supported types: strings, numbers, booleans, lists, dictionaries",
-                    "Remove or convert unsupported types like functions, classes, or custom objects",
-                ],
-                context={"value_type": type(value).__name__, "error_detail": str(e)},
-                severity=ErrorSeverity.WARNING,
-            )
-
         async with get_db_connection() as conn:
             conn.row_factory = None  # Use SQLAlchemy row type
 
@@ -339,86 +468,32 @@ async def set_memory(
                 expires_at = created_at_timestamp + expires_in_seconds
 
             # Check if session exists (if session-scoped)
-            if session_id:
-                cursor = await conn.execute(
-                    "SELECT id FROM sessions WHERE id = ?", (session_id,)
-                )
-                if not await cursor.fetchone():
-                    return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
-
-            # Check for existing key if overwrite is False
-            if not overwrite:
-                cursor = await conn.execute(
-                    """
-                    SELECT key FROM agent_memory
-                    WHERE agent_id = ? AND key = ?
-                    AND (session_id = ? OR (? IS NULL AND session_id IS NULL))
-                    AND (expires_at IS NULL OR expires_at > ?)
-                """,
-                    (
-                        agent_id,
-                        key,
-                        session_id,
-                        session_id,
-                        datetime.now(timezone.utc).timestamp(),
-                    ),
-                )
-
-                if await cursor.fetchone():
-                    return ERROR_MESSAGE_PATTERNS["memory_key_exists"](key)  # type: ignore[no-any-return,operator]
+            if session_id and not await session_registry.exists(conn, session_id):
+                return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
 
-            # Insert or update memory entry using manual upsert
-            # Check if entry already exists
-            cursor = await conn.execute(
-                """
-                SELECT id FROM agent_memory
-                WHERE agent_id = ? AND key = ?
-                AND (session_id = ? OR (? IS NULL AND session_id IS NULL))
-            """,
-                (agent_id, key, session_id, session_id),
+            # Existence check and upsert run together in the writer transaction
+            # (batched with concurrent writes when group commit is enabled)
+            stored = await run_write(
+                conn,
+                partial(
+                    _write_memory,
+                    agent_id=agent_id,
+                    session_id=session_id,
+                    key=key,
+                    serialized_value=serialized_value,
+                    metadata_json=json.dumps(metadata or {}),
+                    created_at=created_at_timestamp,
+                    updated_at=now_timestamp.isoformat(),
+                    expires_at=expires_at,
+                    overwrite=overwrite,
+                ),
             )
-            existing_row = await cursor.fetchone()
-
-            if existing_row:
-                # Update existing entry
-                await conn.execute(
-                    """
-                    UPDATE agent_memory
-                    SET value = ?, metadata = ?, updated_at = ?, expires_at = ?
-                    WHERE agent_id = ? AND key = ?
-                    AND (session_id = ? OR (? IS NULL AND session_id IS NULL))
-                """,
-                    (
-                        serialized_value,
-                        json.dumps(metadata or {}),
-                        now_timestamp.isoformat(),
-                        expires_at,
-                        agent_id,
-                        key,
-                        session_id,
-                        session_id,
-                    ),
-                )
-            else:
-                # Insert new entry
-                await conn.execute(
-                    """
-                    INSERT INTO agent_memory
-                    (agent_id, session_id, key, value, metadata, created_at, expires_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        agent_id,
-                        session_id,
-                        key,
-                        serialized_value,
-                        json.dumps(metadata or {}),
-                        created_at_timestamp,  # Explicit created_at to ensure constraint works
-                        expires_at,
-                        now_timestamp.isoformat(),
-                    ),
-                )
+            if not stored:
+                return ERROR_MESSAGE_PATTERNS["memory_key_exists"](key)  # type: ignore[no-any-return,operator]
+
             await conn.commit()
+            if expires_at is not None:
+                expiry_scheduler.schedule("agent_memory", expires_at)
 
             # Audit log
             await audit_log(
@@ -499,7 +574,9 @@ async def get_memory(
     ctx: Context = None,  # type: ignore[assignment]
 ) -> dict[str, Any]:
     """
-    Retrieve value from agent's private memory with automatic cleanup.
+    Retrieve value from agent's private memory.
+
+    Expired entries are never returned; they are deleted in the background.
     """
     # Normalize null parameters for better API usability
     normalized_params = normalize_null_params(
@@ -524,16 +601,9 @@ async def get_memory(
 
         async with get_db_connection() as conn:
             conn.row_factory = None  # Use SQLAlchemy row type
-            # Clean expired entries first
-            await conn.execute(
-                """
-                DELETE FROM agent_memory
-                WHERE expires_at IS NOT NULL AND expires_at < ?
-            """,
-                (current_timestamp,),
-            )
 
-            # Retrieve memory entry
+            # Retrieve memory entry (read-only: expired rows are filtered
+            # here and deleted by the expiry scheduler)
             # Note: Global memory (session_id IS NULL) is only accessible when session_id parameter is NULL
             # This ensures session-scoped calls don't accidentally access global memory
             cursor = await conn.execute(
@@ -629,14 +699,6 @@ async def list_memory(
 
         async with get_db_connection() as conn:
             conn.row_factory = None  # Use SQLAlchemy row type
-            # Clean expired entries
-            await conn.execute(
-                """
-                DELETE FROM agent_memory
-                WHERE expires_at IS NOT NULL AND expires_at < ?
-            """,
-                (current_timestamp,),
-            )
 
             # Build query based on scope
             where_conditions = ["agent_id = ?"]
@@ -699,3 +761,418 @@ async def list_memory(
         logger.exception("Failed to list memory")
         logger.debug(traceback.format_exc())
         return create_system_error("list_memory", "database", temporary=True)
+
+
+# ============================================================================
+# BULK MEMORY OPERATIONS
+# ============================================================================
+
+_MEMORY_BATCH_FIELDS = {"key", "value", "expires_in", "metadata", "overwrite"}
+
+_MEMORY_SCOPE_CONDITION = "(session_id = ? OR (? IS NULL AND session_id IS NULL))"
+
+
+def _key_error(key: Any, error: dict[str, Any]) -> dict[str, Any]:
+    """Per-key result for an entry that was rejected."""
+    return {
+        "key": key,
+        "success": False,
+        "error": error.get("error"),
+        "code": error.get("code"),
+    }
+
+
+async def _authorize_memory_batch(
+    ctx: Context, auth_token: str | None, *, write: bool
+) -> dict[str, Any]:
+    """Validate the agent once for a bulk call; returns the context or an error."""
+    agent_context = await validate_agent_context_or_error(ctx, auth_token)
+    if "error" in agent_context and agent_context.get("code") in [
+        "INVALID_TOKEN_FORMAT",
+        "TOKEN_AUTHENTICATION_FAILED",
+    ]:
+        return agent_context
+
+    if write and "write" not in agent_context.get("permissions", []):
+        return ERROR_MESSAGE_PATTERNS["write_required"](  # type: ignore[no-any-return,operator]
+            agent_context.get("permissions", [])
+        )
+    return agent_context
+
+
+@mcp.tool(exclude_args=["ctx"])
+async def set_memory_many(
+    entries: list[dict[str, Any]] = Field(
+        description=(
+            "Entries to store. Each is an object with 'key' and 'value' and "
+            "optional 'expires_in', 'metadata' and 'overwrite'"
+        ),
+        min_length=1,
+        max_length=100,
+        examples=[[{"key": "step", "value": 3}, {"key": "status", "value": "ok"}]],
+    ),
+    session_id: str | None = Field(
+        default=None,
+        description="Session scope for every entry (null for global memory)",
+    ),
+    overwrite: bool = Field(
+        default=True,
+        description="Whether to overwrite existing keys (entries may override)",
+    ),
+    auth_token: str | None = Field(
+        default=None,
+        description="Optional JWT token for elevated permissions",
+    ),
+    ctx: Context = None,  # type: ignore[assignment]
+) -> dict[str, Any]:
+    """
+    Store several memory entries in one transaction.
+
+    Each entry is validated like set_memory; an invalid entry, or an existing
+    key when overwrite is off, fails on its own and the rest are stored.
+    Results are returned per key, in the order given.
+    """
+    normalized_params = normalize_null_params(
+        session_id=session_id, auth_token=auth_token
+    )
+    session_id = normalized_params.get("session_id", None)
+    auth_token = normalized_params.get("auth_token", None)
+
+    try:
+        agent_context = await _authorize_memory_batch(ctx, auth_token, write=True)
+        if "error" in agent_context:
+            return agent_context
+        agent_id = agent_context["agent_id"]
+
+        results: list[dict[str, Any] | None] = []
+        pending: list[tuple[int, dict[str, Any], bool]] = []
+        for index, entry in enumerate(entries):
+            unknown = set(entry) - _MEMORY_BATCH_FIELDS
+            if "key" not in entry or "value" not in entry or unknown:
+                results.append(
+                    _key_error(
+                        entry.get("key"),
+                        {
+                            "error": "Each entry needs 'key' and 'value' "
+                            f"(unknown fields: {sorted(unknown)})",
+                            "code": "INVALID_INPUT",
+                        },
+                    )
+                )
+                continue
+
+            prepared = _prepare_memory_entry(
+                str(entry["key"]),
+                entry["value"],
+                entry.get("expires_in"),
+                entry.get("metadata"),
+            )
+            if "error" in prepared:
+                results.append(_key_error(entry["key"], prepared))
+                continue
+
+            results.append(None)
+            pending.append((index, prepared, entry.get("overwrite", overwrite)))
+
+        async with get_db_connection() as conn:
+            conn.row_factory = None  # Use SQLAlchemy row type
+
+            if session_id and not await session_registry.exists(conn, session_id):
+                return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
+
+            now_timestamp = datetime.now(timezone.utc)
+            created_at_timestamp = now_timestamp.timestamp()
+
+            def expiry(prepared: dict[str, Any]) -> float | None:
+                seconds = prepared["expires_in_seconds"]
+                return created_at_timestamp + seconds if seconds else None
+
+            async def write_entries(write_conn: Any) -> list[bool]:
+                return [
+                    await _write_memory(
+                        write_conn,
+                        agent_id=agent_id,
+                        session_id=session_id,
+                        key=prepared["key"],
+                        serialized_value=prepared["serialized_value"],
+                        metadata_json=json.dumps(prepared["metadata"] or {}),
+                        created_at=created_at_timestamp,
+                        updated_at=now_timestamp.isoformat(),
+                        expires_at=expiry(prepared),
+                        overwrite=entry_overwrite,
+                    )
+                    for _, prepared, entry_overwrite in pending
+                ]
+
+            # Every entry is written in the same writer transaction
+            stored_flags = await run_write(conn, write_entries) if pending else []
+            await conn.commit()
+
+            stored_keys = []
+            for (index, prepared, _), stored in zip(pending, stored_flags, strict=True):
+                key = prepared["key"]
+                if stored:
+                    stored_keys.append(key)
+                    expires_at = expiry(prepared)
+                    if expires_at is not None:
+                        expiry_scheduler.schedule("agent_memory", expires_at)
+                    results[index] = {
+                        "key": key,
+                        "success": True,
+                        "expires_at": expires_at,
+                    }
+                else:
+                    results[index] = _key_error(
+                        key,
+                        ERROR_MESSAGE_PATTERNS["memory_key_exists"](key),  # type: ignore[operator]
+                    )
+
+            if stored_keys:
+                await audit_log(
+                    conn,
+                    "memory_set_many",
+                    agent_id,
+                    session_id,
+                    {
+                        "keys": stored_keys,
+                        "count": len(stored_keys),
+                        "session_scoped": session_id is not None,
+                    },
+                )
+
+                admin_tools = _get_admin_tools()
+                try:
+                    await admin_tools["trigger_resource_notifications"](
+                        session_id or "global", agent_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to trigger resource notifications: {e}")
+
+            # One WebSocket update for the batch (session-scoped memory only)
+            if session_id and stored_keys:
+                websocket_handlers = _get_websocket_handlers()
+                try:
+                    values = {
+                        prepared["key"]: entries[index]["value"]
+                        for index, prepared, _ in pending
+                    }
+                    await websocket_handlers["notify_websocket_server"](
+                        session_id,
+                        {
+                            "type": "memory_updates",
+                            "data": [
+                                {
+                                    "agent_id": agent_id,
+                                    "key": key,
+                                    "value": values[key],
+                                    "session_id": session_id,
+                                    "scope": "session",
+                                    "created_at": created_at_timestamp,
+                                    "updated_at": now_timestamp.isoformat(),
+                                }
+                                for key in stored_keys
+                            ],
+                        },
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to send WebSocket memory notification: {e}")
+
+        return {
+            "success": True,
+            "results": results,
+            "stored": len(stored_keys),
+            "failed": len(results) - len(stored_keys),
+            "scope": "session" if session_id else "global",
+            "stored_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    except Exception:
+        logger.exception("Failed to set memory entries")
+        logger.debug(traceback.format_exc())
+        return create_system_error("set_memory_many", "database", temporary=True)
+
+
+@mcp.tool(exclude_args=["ctx"])
+async def get_memory_many(
+    keys: list[str] = Field(
+        description="Memory keys to retrieve", min_length=1, max_length=100
+    ),
+    session_id: str | None = Field(
+        default=None,
+        description="Session scope (null for global memory)",
+    ),
+    auth_token: str | None = Field(
+        default=None,
+        description="Optional JWT token for elevated permissions",
+    ),
+    ctx: Context = None,  # type: ignore[assignment]
+) -> dict[str, Any]:
+    """
+    Retrieve several memory entries with one query.
+
+    Returns one result per requested key, in order, with ``found`` set to
+    False for keys that are missing or expired.
+    """
+    normalized_params = normalize_null_params(
+        session_id=session_id, auth_token=auth_token
+    )
+    session_id = normalized_params.get("session_id", None)
+    auth_token = normalized_params.get("auth_token", None)
+
+    try:
+        agent_context = await _authorize_memory_batch(ctx, auth_token, write=False)
+        if "error" in agent_context:
+            return agent_context
+        agent_id = agent_context["agent_id"]
+
+        unique_keys = list(dict.fromkeys(keys))
+        current_timestamp = datetime.now(timezone.utc).timestamp()
+
+        async with get_db_connection() as conn:
+            conn.row_factory = None  # Use SQLAlchemy row type
+            placeholders = ", ".join("?" for _ in unique_keys)
+            cursor = await conn.execute(
+                f"""
+                SELECT key, value, metadata, created_at, updated_at, expires_at
+                FROM agent_memory
+                WHERE agent_id = ? AND key IN ({placeholders})
+                AND {_MEMORY_SCOPE_CONDITION}
+                AND (expires_at IS NULL OR expires_at > ?)
+            """,
+                (agent_id, *unique_keys, session_id, session_id, current_timestamp),
+            )
+            rows = {row["key"]: row for row in await cursor.fetchall()}
+
+        results = []
+        for key in keys:
+            row = rows.get(key)
+            if row is None:
+                results.append({"key": key, "found": False})
+                continue
+
+            try:
+                parsed_value = json.loads(row["value"])
+            except json.JSONDecodeError:
+                parsed_value = row["value"]
+
+            metadata = {}
+            if row["metadata"]:
+                try:
+                    metadata = json.loads(row["metadata"])
+                except json.JSONDecodeError:
+                    metadata = {}
+
+            results.append(
+                {
+                    "key": key,
+                    "found": True,
+                    "value": parsed_value,
+                    "metadata": metadata,
+                    "created_at": row["created_at"],
+                    "updated_at": row["updated_at"],
+                    "expires_at": row["expires_at"],
+                }
+            )
+
+        return {
+            "success": True,
+            "results": results,
+            "found": sum(1 for result in results if result["found"]),
+            "scope": "session" if session_id else "global",
+        }
+
+    except Exception:
+        logger.exception("Failed to get memory entries")
+        logger.debug(traceback.format_exc())
+        return create_system_error("get_memory_many", "database", temporary=True)
+
+
+@mcp.tool(exclude_args=["ctx"])
+async def delete_memory_many(
+    keys: list[str] = Field(
+        description="Memory keys to delete", min_length=1, max_length=100
+    ),
+    session_id: str | None = Field(
+        default=None,
+        description="Session scope (null for global memory)",
+    ),
+    auth_token: str | None = Field(
+        default=None,
+        description="Optional JWT token for elevated permissions",
+    ),
+    ctx: Context = None,  # type: ignore[assignment]
+) -> dict[str, Any]:
+    """
+    Delete several memory entries in one transaction.
+
+    Returns one result per requested key, in order, with ``deleted`` set to
+    False for keys that were missing or had already expired.
+    """
+    normalized_params = normalize_null_params(
+        session_id=session_id, auth_token=auth_token
+    )
+    session_id = normalized_params.get("session_id", None)
+    auth_token = normalized_params.get("auth_token", None)
+
+    try:
+        agent_context = await _authorize_memory_batch(ctx, auth_token, write=True)
+        if "error" in agent_context:
+            return agent_context
+        agent_id = agent_context["agent_id"]
+
+        unique_keys = list(dict.fromkeys(keys))
+        placeholders = ", ".join("?" for _ in unique_keys)
+        where = (
+            f"agent_id = ? AND key IN ({placeholders}) AND {_MEMORY_SCOPE_CONDITION}"
+        )
+        where_params = (agent_id, *unique_keys, session_id, session_id)
+
+        async def delete_entries(write_conn: Any) -> set[str]:
+            cursor = await write_conn.execute(
+                f"SELECT key FROM agent_memory WHERE {where} "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (*where_params, datetime.now(timezone.utc).timestamp()),
+            )
+            live_keys = {row[0] for row in await cursor.fetchall()}
+            await write_conn.execute(
+                f"DELETE FROM agent_memory WHERE {where}", where_params
+            )
+            return live_keys
+
+        async with get_db_connection() as conn:
+            conn.row_factory = None  # Use SQLAlchemy row type
+            deleted_keys = await run_write(conn, delete_entries)
+            await conn.commit()
+
+            if deleted_keys:
+                await audit_log(
+                    conn,
+                    "memory_deleted_many",
+                    agent_id,
+                    session_id,
+                    {
+                        "keys": [key for key in unique_keys if key in deleted_keys],
+                        "count": len(deleted_keys),
+                        "session_scoped": session_id is not None,
+                    },
+                )
+
+                admin_tools = _get_admin_tools()
+                try:
+                    await admin_tools["trigger_resource_notifications"](
+                        session_id or "global", agent_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to trigger resource notifications: {e}")
+
+        return {
+            "success": True,
+            "results": [{"key": key, "deleted": key in deleted_keys} for key in keys],
+            "deleted": len(deleted_keys),
+            "scope": "session" if session_id else "global",
+        }
+
+    except Exception:
+        logger.exception("Failed to delete memory entries")
+        logger.debug(traceback.format_exc())
+        return create_system_error("delete_memory_many", "database", temporary=True)
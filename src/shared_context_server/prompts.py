@@ -312,9 +312,20 @@ async def debug_session_prompt(session_id: str, ctx: Any = None) -> GetPromptRes
         async with get_db_connection() as conn:
             conn.row_factory = CompatibleRow
 
-            # Get session information
+            # Get session information with its trigger-maintained statistics
             session_cursor = await conn.execute(
-                "SELECT * FROM sessions WHERE id = ?", (session_id,)
+                """
+                SELECT s.*,
+                       COALESCE(st.message_count, 0) as message_count,
+                       COALESCE(st.public_count, 0) as public_count,
+                       COALESCE(st.private_count, 0) as private_count,
+                       COALESCE(st.agent_only_count, 0) as agent_only_count,
+                       COALESCE(st.admin_only_count, 0) as admin_only_count
+                FROM sessions s
+                LEFT JOIN session_stats st ON st.session_id = s.id
+                WHERE s.id = ?
+                """,
+                (session_id,),
             )
             session = await session_cursor.fetchone()
 
@@ -331,16 +342,19 @@ async def debug_session_prompt(session_id: str, ctx: Any = None) -> GetPromptRes
                     ]
                 )
 
-            # Get message statistics
-            msg_cursor = await conn.execute(
-                "SELECT COUNT(*) as total, visibility, sender FROM messages WHERE session_id = ? GROUP BY visibility, sender",
+            # Get per-sender message counts
+            sender_cursor = await conn.execute(
+                "SELECT sender, message_count FROM session_senders WHERE session_id = ? ORDER BY message_count DESC",
                 (session_id,),
             )
-            message_stats = await msg_cursor.fetchall()
+            sender_counts: dict[str, int] = {
+                row["sender"]: row["message_count"]
+                for row in await sender_cursor.fetchall()
+            }
 
             # Get recent messages
             recent_cursor = await conn.execute(
-                "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp DESC LIMIT 10",
+                "SELECT * FROM messages WHERE session_id = ? ORDER BY ts_us DESC LIMIT 10",
                 (session_id,),
             )
             recent_messages = await recent_cursor.fetchall()
@@ -357,27 +371,15 @@ async def debug_session_prompt(session_id: str, ctx: Any = None) -> GetPromptRes
 ## Message Activity Analysis
 """
 
-            if message_stats:
-                total_messages = sum(stat["total"] for stat in message_stats)
+            total_messages = session["message_count"]
+            if total_messages:
                 analysis += f"**Total Messages**: {total_messages}\n\n"
 
-                # Group by visibility
-                visibility_counts: dict[str, int] = {}
-                sender_counts: dict[str, int] = {}
-
-                for stat in message_stats:
-                    visibility = stat["visibility"]
-                    sender = stat["sender"]
-                    count = stat["total"]
-
-                    visibility_counts[visibility] = (
-                        visibility_counts.get(visibility, 0) + count
-                    )
-                    sender_counts[sender] = sender_counts.get(sender, 0) + count
-
                 analysis += "**Message Distribution by Visibility**:\n"
-                for visibility, count in visibility_counts.items():
-                    analysis += f"- {visibility}: {count} messages\n"
+                for visibility in ("public", "private", "agent_only", "admin_only"):
+                    count = session[f"{visibility}_count"]
+                    if count:
+                        analysis += f"- {visibility}: {count} messages\n"
 
                 analysis += "\n**Message Distribution by Sender**:\n"
                 for sender, count in sender_counts.items():
@@ -402,7 +404,7 @@ async def debug_session_prompt(session_id: str, ctx: Any = None) -> GetPromptRes
             # Health assessment and recommendations
             analysis += "\n## Health Assessment & Recommendations\n"
 
-            if not message_stats:
+            if not total_messages:
                 analysis += """
 **Status**: 🟡 **Inactive Session**
 - Session exists but no messages have been exchanged
@@ -11,11 +11,11 @@ Built for high performance with 5-10x faster search than standard fuzzy search.
 
 from __future__ import annotations
 
-import json
 import logging
+import re
 import time
 import traceback
-from datetime import datetime
+from functools import partial
 from typing import TYPE_CHECKING, Any, Literal
 
 # aiosqlite removed in favor of SQLAlchemy-only backend
@@ -32,9 +32,16 @@ from fastmcp import Context  # noqa: TC002
 
 from .auth import validate_agent_context_or_error
 from .core_server import mcp
-from .database import get_db_connection
+from .database import get_db_connection, to_epoch_us
 from .utils.caching import cache_manager, generate_search_cache_key
 from .utils.llm_errors import ERROR_MESSAGE_PATTERNS, create_system_error
+from .utils.search_corpus import (
+    build_searchable_text,
+    extract_many,
+    parse_message_metadata,
+    search_corpus_manager,
+)
+from .utils.session_registry import session_registry
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +67,369 @@ async def audit_log(
 # RAPIDFUZZ SEARCH SYSTEM
 # ============================================================================
 
+# Candidate retrieval sizing for search_context: the full-text index supplies
+# the best lexical matches, the most recent rows keep typo-tolerant matching
+_FTS_CANDIDATE_MULTIPLIER = 20
+_MIN_FTS_CANDIDATES = 200
+_RECENT_CANDIDATE_ROWS = 200
+_MAX_FTS_TOKENS = 32
+
+_FTS_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _build_fulltext_query(
+    query: str, db_type: str, search_metadata: bool = True
+) -> str | None:
+    """
+    Build a dialect-specific full-text query matching any query token by prefix.
+
+    Tokens are reduced to word characters, so user input can never inject
+    full-text operators.
+
+    Returns:
+        Full-text query string, or None if the query has no indexable tokens
+    """
+    tokens = list(dict.fromkeys(_FTS_TOKEN_PATTERN.findall(query.lower())))
+    if not tokens:
+        return None
+    tokens = tokens[:_MAX_FTS_TOKENS]
+
+    if db_type == "postgresql":
+        return " | ".join(f"{token}:*" for token in tokens)
+    if db_type == "mysql":
+        return " ".join(f"{token}*" for token in tokens)
+
+    # SQLite FTS5: quoted prefix terms, optionally restricted to sender/content
+    match = " OR ".join(f'"{token}"*' for token in tokens)
+    if not search_metadata:
+        match = f"{{sender content}} : ({match})"
+    return match
+
+
+def _build_visibility_conditions(
+    session_id: str, search_scope: str, agent_context: dict[str, Any]
+) -> tuple[list[str], list[Any]]:
+    """Build WHERE conditions (on alias ``m``) for session, scope and visibility."""
+    agent_id = agent_context["agent_id"]
+    where_conditions = ["m.session_id = ?"]
+    params: list[Any] = [session_id]
+
+    if search_scope == "public":
+        where_conditions.append("m.visibility = 'public'")
+    elif search_scope == "private":
+        where_conditions.append("m.visibility = 'private' AND m.sender = ?")
+        params.append(agent_id)
+    else:  # all accessible messages
+        # Check if agent has admin permissions using extracted agent context
+        if "admin" in agent_context.get("permissions", []):
+            # ADMIN: Unrestricted access to all messages
+            where_conditions.append("""
+                (m.visibility = 'public' OR
+                 m.visibility = 'private' OR
+                 m.visibility = 'agent_only' OR
+                 m.visibility = 'admin_only')
+            """)
+        else:
+            # Non-admin: Limited to public + own private/agent_only
+            where_conditions.append("""
+                (m.visibility = 'public' OR
+                 (m.visibility = 'private' AND m.sender = ?) OR
+                 (m.visibility = 'agent_only' AND m.sender = ?))
+            """)
+            params.extend([agent_id, agent_id])
+
+    return where_conditions, params
+
+
+async def _fetch_search_candidates(
+    conn: Any,
+    query: str,
+    where_sql: str,
+    where_params: list[Any],
+    search_metadata: bool = True,
+    limit: int = 10,
+) -> list[dict[str, Any]]:
+    """
+    Fetch the candidate messages that RapidFuzz re-ranks for a search.
+
+    Candidates are the top-N full-text matches (FTS5 BM25 on SQLite, tsvector
+    rank on PostgreSQL, FULLTEXT relevance on MySQL) unioned with the most
+    recent messages of the session. If the full-text query fails the recent
+    rows are still returned, so search degrades instead of erroring.
+
+    Returns:
+        Candidate message dicts ordered newest first
+    """
+    db_type = getattr(conn, "db_type", "sqlite")
+    candidate_limit = max(limit * _FTS_CANDIDATE_MULTIPLIER, _MIN_FTS_CANDIDATES)
+    candidates: dict[int, dict[str, Any]] = {}
+
+    fulltext_query = _build_fulltext_query(query, db_type, search_metadata)
+    if fulltext_query:
+        if db_type == "postgresql":
+            sql = f"""
+                SELECT m.* FROM messages m
+                WHERE m.search_vector @@ to_tsquery('simple', ?) AND {where_sql}
+                ORDER BY ts_rank_cd(m.search_vector, to_tsquery('simple', ?)) DESC
+                LIMIT ?
+            """
+            params = [fulltext_query, *where_params, fulltext_query, candidate_limit]
+        elif db_type == "mysql":
+            sql = f"""
+                SELECT m.* FROM messages m
+                WHERE MATCH(m.sender, m.content) AGAINST (? IN BOOLEAN MODE)
+                AND {where_sql}
+                ORDER BY MATCH(m.sender, m.content) AGAINST (? IN BOOLEAN MODE) DESC
+                LIMIT ?
+            """
+            params = [fulltext_query, *where_params, fulltext_query, candidate_limit]
+        else:
+            sql = f"""
+                SELECT m.* FROM messages_fts
+                JOIN messages m ON m.id = messages_fts.rowid
+                WHERE messages_fts MATCH ? AND {where_sql}
+                ORDER BY bm25(messages_fts)
+                LIMIT ?
+            """
+            params = [fulltext_query, *where_params, candidate_limit]
+
+        try:
+            cursor = await conn.execute(sql, tuple(params))
+            for row in await cursor.fetchall():
+                msg = dict(row)
+                candidates[msg["id"]] = msg
+        except Exception as e:
+            logger.warning(f"Full-text candidate query failed, using recent rows: {e}")
+
+    cursor = await conn.execute(
+        f"""
+        SELECT m.* FROM messages m
+        WHERE {where_sql}
+        ORDER BY m.id DESC
+        LIMIT ?
+    """,
+        (*where_params, _RECENT_CANDIDATE_ROWS),
+    )
+    for row in await cursor.fetchall():
+        msg = dict(row)
+        candidates.setdefault(msg["id"], msg)
+
+    # Newest first so equal scores keep the previous recency ordering
+    return sorted(candidates.values(), key=lambda msg: msg["id"], reverse=True)
+
+
+async def _load_search_corpus(conn: Any, session_id: str) -> Any:
+    """
+    Load a session's messages into the in-process search corpus.
+
+    Returns:
+        The installed SessionSearchCorpus, or None if the session is too large
+        to keep in memory (or a concurrent append invalidated this load)
+    """
+    if search_corpus_manager.is_oversized(session_id):
+        return None
+
+    token = search_corpus_manager.begin_load(session_id)
+    cursor = await conn.execute(
+        """
+        SELECT id, sender, content, visibility, metadata, timestamp
+        FROM messages
+        WHERE session_id = ?
+        ORDER BY id
+        LIMIT ?
+    """,
+        (session_id, search_corpus_manager.max_messages_per_session + 1),
+    )
+    rows = [dict(row) for row in await cursor.fetchall()]
+    return search_corpus_manager.finish_load(session_id, token, rows)
+
+
+async def _get_search_documents(
+    session_id: str,
+    queries: list[str],
+    agent_context: dict[str, Any],
+    *,
+    search_scope: str,
+    search_metadata: bool,
+    limit: int,
+) -> list[tuple[list[str], list[dict[str, Any]]]] | None:
+    """
+    Get the normalized texts and messages each query is scored against.
+
+    Hot sessions are served from the in-memory corpus without a database
+    round trip, and every query shares the same document set. Cold sessions
+    are loaded into the corpus; sessions too large for it fall back to
+    full-text candidates fetched separately for each query, so a query is
+    always scored against the candidates search_context would use.
+
+    Returns:
+        One tuple of (searchable texts, messages) visible to the agent, newest
+        first, per query, or None if the session does not exist
+    """
+    agent_id = agent_context["agent_id"]
+    is_admin = "admin" in agent_context.get("permissions", [])
+
+    corpus = search_corpus_manager.get(session_id)
+    if corpus is None:
+        async with get_db_connection() as conn:
+            # First, verify session exists
+            if not await session_registry.exists(conn, session_id):
+                return None
+
+            corpus = await _load_search_corpus(conn, session_id)
+            if corpus is None:
+                # Build visibility/scope filter against the aliased messages table
+                where_conditions, params = _build_visibility_conditions(
+                    session_id, search_scope, agent_context
+                )
+
+                # Candidate retrieval: full-text index top-N plus the session
+                # tail, so RapidFuzz only re-ranks a bounded candidate set
+                per_query = []
+                for query in queries:
+                    candidates = await _fetch_search_candidates(
+                        conn,
+                        query,
+                        " AND ".join(where_conditions),
+                        params,
+                        search_metadata=search_metadata,
+                        limit=limit,
+                    )
+                    texts = [
+                        build_searchable_text(msg, search_metadata)
+                        for msg in candidates
+                    ]
+                    per_query.append((texts, candidates))
+                return per_query
+
+    documents = corpus.visible_documents(
+        agent_id, is_admin, search_scope, search_metadata
+    )
+    return [documents] * len(queries)
+
+
+def _format_search_result(message: dict[str, Any], score: float) -> dict[str, Any]:
+    """Format a scored message as a search result entry."""
+    # Create match preview with highlighting context
+    content = message["content"]
+    preview_length = 150
+    if len(content) > preview_length:
+        content = content[:preview_length] + "..."
+
+    return {
+        "message": {
+            "id": message["id"],
+            "sender": message["sender"],
+            "content": message["content"],
+            "timestamp": message["timestamp"],
+            "visibility": message["visibility"],
+            "metadata": parse_message_metadata(message.get("metadata")),
+        },
+        "score": round(score, 2),
+        "match_preview": content,
+        "relevance": "high" if score >= 80 else "medium" if score >= 60 else "low",
+    }
+
+
+async def _run_search_context(
+    session_id: str,
+    query: str,
+    agent_context: dict[str, Any],
+    *,
+    fuzzy_threshold: float,
+    limit: int,
+    search_metadata: bool,
+    search_scope: str,
+    cache_key: str,
+    cache_context: dict[str, Any],
+    start_time: float,
+    audit: bool = True,
+) -> dict[str, Any]:
+    """
+    Score a query against the session and cache it (search_context miss path).
+
+    Background stale-while-revalidate refreshes pass ``audit=False``: nobody
+    made that search, so it must not be audited as the original agent's.
+    """
+    agent_id = agent_context["agent_id"]
+
+    documents = await _get_search_documents(
+        session_id,
+        [query],
+        agent_context,
+        search_scope=search_scope,
+        search_metadata=search_metadata,
+        limit=limit,
+    )
+    if documents is None:
+        return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
+
+    searchable_texts, messages = documents[0]
+    if not searchable_texts:
+        return {
+            "success": True,
+            "results": [],
+            "query": query,
+            "message_count": 0,
+            "search_time_ms": round((time.time() - start_time) * 1000, 2),
+        }
+
+    # RapidFuzz process.extract for optimal performance
+    matches = process.extract(
+        query.lower(),
+        searchable_texts,
+        scorer=fuzz.partial_ratio,  # Better for finding substrings in search context
+        limit=limit,
+        score_cutoff=fuzzy_threshold,
+    )
+
+    # Build optimized results
+    results = [
+        _format_search_result(messages[index], score) for _, score, index in matches
+    ]
+
+    search_time_ms = round((time.time() - start_time) * 1000, 2)
+
+    # Audit search operation
+    if audit:
+        await audit_log(
+            None,
+            "context_searched",
+            agent_id,
+            session_id,
+            {
+                "query": query,
+                "results_count": len(results),
+                "threshold": fuzzy_threshold,
+                "search_scope": search_scope,
+                "search_time_ms": search_time_ms,
+            },
+        )
+
+    result = {
+        "success": True,
+        "results": results,
+        "query": query,
+        "threshold": fuzzy_threshold,
+        "search_scope": search_scope,
+        "message_count": len(results),
+        "search_time_ms": search_time_ms,
+        "performance_note": "RapidFuzz enabled (5-10x faster than standard fuzzy search)",
+        "cache_hit": False,
+    }
+
+    # Phase 4: Cache search results (10-minute TTL due to computational cost)
+    await cache_manager.set(
+        cache_key,
+        result,
+        ttl=600,
+        context=cache_context,
+        tags=(f"session:{session_id}", f"agent:{agent_id}", "search"),
+    )
+    logger.debug(f"Cached search_context result: {cache_key}")
+
+    return result
+
 
 @mcp.tool(exclude_args=["ctx"])
 async def search_context(
@@ -109,8 +479,25 @@ async def search_context(
             session_id, query, fuzzy_threshold, search_scope, limit
         )
         cache_context = {"agent_id": agent_id, "search_metadata": search_metadata}
+        run_search = partial(
+            _run_search_context,
+            session_id,
+            query,
+            agent_context,
+            fuzzy_threshold=fuzzy_threshold,
+            limit=limit,
+            search_metadata=search_metadata,
+            search_scope=search_scope,
+            cache_key=cache_key,
+            cache_context=cache_context,
+            start_time=start_time,
+        )
 
-        cached_result = await cache_manager.get(cache_key, cache_context)
+        # Stale results within the search stale window are served while
+        # run_search refreshes them in the background
+        cached_result = await cache_manager.get(
+            cache_key, cache_context, refresh=partial(run_search, audit=False)
+        )
         if cached_result is not None:
             logger.debug(f"Cache hit for search_context: {cache_key}")
             # Update search_time_ms to reflect cache hit
@@ -120,208 +507,181 @@ async def search_context(
             cached_result["cache_hit"] = True
             return cached_result  # type: ignore[no-any-return]
 
-        # Production connection path
-        async with get_db_connection() as conn:
-            # Set row factory for dict-like access
-            # Row factory handled by SQLAlchemy connection wrapper
-
-            # First, verify session exists
-            cursor = await conn.execute(
-                "SELECT id FROM sessions WHERE id = ?", (session_id,)
-            )
-            if not await cursor.fetchone():
-                return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
-
-            # Pre-filter optimization: Apply time window and row limits first
-            max_rows_scanned = 1000  # Maximum rows to scan for large datasets
-            recent_hours = 168  # 7 days default window
+        # Concurrent misses for the same query share one scoring pass
+        result: dict[str, Any] = await cache_manager.single_flight(
+            cache_key, run_search, cache_context
+        )
 
-            # Build query with visibility, scope, and pre-filtering
-            where_conditions = ["session_id = ?"]
-            params = [session_id]
+    except Exception:
+        logger.exception("Failed to search context")
+        logger.debug(traceback.format_exc())
+        return create_system_error("search_context", "database", temporary=True)
+    else:
+        return result
 
-            # Add recency filter to reduce scan scope
-            # Handle both Unix timestamp (numeric) and ISO datetime (string) formats
-            where_conditions.append(
-                f"(timestamp >= unixepoch('now', '-{recent_hours} hours') OR datetime(timestamp) >= datetime('now', '-{recent_hours} hours'))"
-            )
 
-            # Apply visibility controls with admin support
-            if search_scope == "public":
-                where_conditions.append("visibility = 'public'")
-            elif search_scope == "private":
-                where_conditions.append("visibility = 'private' AND sender = ?")
-                params.append(agent_id)
-            else:  # all accessible messages
-                # Check if agent has admin permissions using extracted agent context
-                has_admin_permission = "admin" in agent_context.get("permissions", [])
-
-                if has_admin_permission:
-                    # ADMIN: Unrestricted access to all messages
-                    where_conditions.append("""
-                        (visibility = 'public' OR
-                         visibility = 'private' OR
-                         visibility = 'agent_only' OR
-                         visibility = 'admin_only')
-                    """)
-                    # No sender restrictions for admin
-                else:
-                    # Non-admin: Limited to public + own private/agent_only
-                    where_conditions.append("""
-                        (visibility = 'public' OR
-                         (visibility = 'private' AND sender = ?) OR
-                         (visibility = 'agent_only' AND sender = ?))
-                    """)
-                    params.append(agent_id)
-                    params.append(agent_id)
+@mcp.tool(exclude_args=["ctx"])
+async def search_context_batch(
+    session_id: str = Field(description="Session ID to search within"),
+    queries: list[str] = Field(
+        description="Search queries, scored together against one candidate set",
+        min_length=1,
+        max_length=50,
+    ),
+    auth_token: str | None = Field(
+        default=None,
+        description="Optional JWT token for elevated permissions",
+    ),
+    fuzzy_threshold: float = Field(
+        default=60.0, description="Minimum similarity score (0-100)", ge=0, le=100
+    ),
+    limit: int = Field(
+        default=10, description="Maximum results to return per query", ge=1, le=100
+    ),
+    search_metadata: bool = Field(
+        default=True, description="Include metadata in search"
+    ),
+    search_scope: Literal["all", "public", "private"] = Field(
+        default="all", description="Search scope: all, public, private"
+    ),
+    ctx: Context = None,  # type: ignore[assignment]
+) -> dict[str, Any]:
+    """
+    Fuzzy search messages for several queries in one call.
 
-            cursor = await conn.execute(
-                f"""
-                SELECT * FROM messages
-                WHERE {" AND ".join(where_conditions)}
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """,
-                params + [max_rows_scanned],
-            )
+    Hot sessions are normalized once and all queries are scored in a single
+    RapidFuzz cdist pass; sessions too large for the in-memory corpus fetch
+    full-text candidates per query. Per-query results match search_context
+    and share its cache entries.
+    """
 
-            rows = await cursor.fetchall()
+    try:
+        start_time = time.time()
+        # Extract and validate agent context (with token validation error handling)
+        agent_context = await validate_agent_context_or_error(ctx, auth_token)
 
-            if not rows:
-                return {
-                    "success": True,
-                    "results": [],
-                    "query": query,
-                    "message_count": 0,
-                    "search_time_ms": round((time.time() - start_time) * 1000, 2),
-                }
+        # If validation failed, return the error response immediately
+        if "error" in agent_context and agent_context.get("code") in [
+            "INVALID_TOKEN_FORMAT",
+            "TOKEN_AUTHENTICATION_FAILED",
+        ]:
+            return agent_context
 
-            # Prepare searchable text with optimized processing
-            searchable_items = []
-            for row in rows:
-                msg = dict(row)
+        agent_id = agent_context["agent_id"]
+        cache_context = {"agent_id": agent_id, "search_metadata": search_metadata}
 
-                # Build searchable text efficiently
-                text_parts = [msg.get("sender", ""), msg.get("content", "")]
-
-                if search_metadata and msg.get("metadata"):
-                    try:
-                        metadata = json.loads(msg["metadata"])
-                        if isinstance(metadata, dict):
-                            # Extract searchable metadata values
-                            searchable_values = [
-                                str(v)
-                                for v in metadata.values()
-                                if v and isinstance(v, (str, int, float, bool))
-                            ]
-                            text_parts.extend(searchable_values)
-                    except json.JSONDecodeError:
-                        pass
-
-                searchable_text = " ".join(text_parts).lower()
-                searchable_items.append((searchable_text, msg))
-
-            # Use RapidFuzz for high-performance matching
-            # Extract just the searchable text for simpler processing
-            searchable_texts = [item[0] for item in searchable_items]
-
-            # RapidFuzz process.extract for optimal performance
-            matches = process.extract(
-                query.lower(),
-                searchable_texts,
-                scorer=fuzz.partial_ratio,  # Better for finding substrings in search context
-                limit=limit,
-                score_cutoff=fuzzy_threshold,
+        # Serve each query from the search_context cache where possible
+        query_results: dict[str, dict[str, Any]] = {}
+        missed_queries: list[str] = []
+        for query in dict.fromkeys(queries):
+            cache_key = generate_search_cache_key(
+                session_id, query, fuzzy_threshold, search_scope, limit
             )
-
-            # Build optimized results
-            results = []
-            for match in matches:
-                match_text, score, _ = match
-
-                # Find the corresponding message by matching the searchable text
-                message = None
-                for text, msg in searchable_items:
-                    if text == match_text:
-                        message = msg
-                        break
-
-                if not message:
-                    continue
-
-                # Parse metadata for result
-                metadata = {}
-                if message.get("metadata"):
-                    try:
-                        metadata = json.loads(message["metadata"])
-                    except json.JSONDecodeError:
-                        metadata = {}
-
-                # Create match preview with highlighting context
-                content = message["content"]
-                preview_length = 150
-                if len(content) > preview_length:
-                    content = content[:preview_length] + "..."
-
-                results.append(
-                    {
-                        "message": {
-                            "id": message["id"],
-                            "sender": message["sender"],
-                            "content": message["content"],
-                            "timestamp": message["timestamp"],
-                            "visibility": message["visibility"],
-                            "metadata": metadata,
-                        },
-                        "score": round(score, 2),
-                        "match_preview": content,
-                        "relevance": "high"
-                        if score >= 80
-                        else "medium"
-                        if score >= 60
-                        else "low",
-                    }
+            cached_result = await cache_manager.get(cache_key, cache_context)
+            if cached_result is not None:
+                cached_result["cache_hit"] = True
+                query_results[query] = cached_result
+            else:
+                missed_queries.append(query)
+
+        if missed_queries:
+            # Results read before the session is invalidated are not cached
+            with cache_manager.loading(f"search:{session_id}"):
+                documents = await _get_search_documents(
+                    session_id,
+                    missed_queries,
+                    agent_context,
+                    search_scope=search_scope,
+                    search_metadata=search_metadata,
+                    limit=limit,
                 )
+                if documents is None:
+                    return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
+
+                shared_texts, _ = documents[0]
+                if all(texts is shared_texts for texts, _ in documents):
+                    # One corpus document set: score every query in one pass
+                    all_matches = extract_many(
+                        missed_queries,
+                        shared_texts,
+                        limit=limit,
+                        score_cutoff=fuzzy_threshold,
+                    )
+                else:
+                    all_matches = [
+                        extract_many(
+                            [query], texts, limit=limit, score_cutoff=fuzzy_threshold
+                        )[0]
+                        for query, (texts, _) in zip(
+                            missed_queries, documents, strict=True
+                        )
+                    ]
+                search_time_ms = round((time.time() - start_time) * 1000, 2)
+                cache_tags = (f"session:{session_id}", f"agent:{agent_id}", "search")
+
+                for query, matches, (_, messages) in zip(
+                    missed_queries, all_matches, documents, strict=True
+                ):
+                    results = [
+                        _format_search_result(messages[index], score)
+                        for index, score in matches
+                    ]
+                    result = {
+                        "success": True,
+                        "results": results,
+                        "query": query,
+                        "threshold": fuzzy_threshold,
+                        "search_scope": search_scope,
+                        "message_count": len(results),
+                        "search_time_ms": search_time_ms,
+                        "performance_note": "RapidFuzz enabled (5-10x faster than standard fuzzy search)",
+                        "cache_hit": False,
+                    }
+                    cache_key = generate_search_cache_key(
+                        session_id, query, fuzzy_threshold, search_scope, limit
+                    )
+                    await cache_manager.set(
+                        cache_key,
+                        result,
+                        ttl=600,
+                        context=cache_context,
+                        tags=cache_tags,
+                    )
+                    query_results[query] = dict(result)
+
+        search_time_ms = round((time.time() - start_time) * 1000, 2)
+        for result in query_results.values():
+            result["search_time_ms"] = search_time_ms
+
+        # Audit search operation
+        await audit_log(
+            None,
+            "context_batch_searched",
+            agent_id,
+            session_id,
+            {
+                "query_count": len(queries),
+                "cache_misses": len(missed_queries),
+                "threshold": fuzzy_threshold,
+                "search_scope": search_scope,
+                "search_time_ms": search_time_ms,
+            },
+        )
 
-            search_time_ms = round((time.time() - start_time) * 1000, 2)
-
-            # Audit search operation
-            await audit_log(
-                conn,
-                "context_searched",
-                agent_id,
-                session_id,
-                {
-                    "query": query,
-                    "results_count": len(results),
-                    "threshold": fuzzy_threshold,
-                    "search_scope": search_scope,
-                    "search_time_ms": search_time_ms,
-                },
-            )
-
-        result = {
+        return {
             "success": True,
-            "results": results,
-            "query": query,
+            "results": [query_results[query] for query in queries],
+            "query_count": len(queries),
+            "cache_hits": len(query_results) - len(missed_queries),
             "threshold": fuzzy_threshold,
             "search_scope": search_scope,
-            "message_count": len(results),
             "search_time_ms": search_time_ms,
-            "performance_note": "RapidFuzz enabled (5-10x faster than standard fuzzy search)",
-            "cache_hit": False,
         }
 
-        # Phase 4: Cache search results (10-minute TTL due to computational cost)
-        await cache_manager.set(cache_key, result, ttl=600, context=cache_context)
-        logger.debug(f"Cached search_context result: {cache_key}")
-
     except Exception:
-        logger.exception("Failed to search context")
+        logger.exception("Failed to batch search context")
         logger.debug(traceback.format_exc())
-        return create_system_error("search_context", "database", temporary=True)
-    else:
-        return result
+        return create_system_error("search_context_batch", "database", temporary=True)
 
 
 @mcp.tool(exclude_args=["ctx"])
@@ -354,10 +714,7 @@ async def search_by_sender(
             conn.row_factory = None  # Use SQLAlchemy row type
 
             # First, verify session exists
-            cursor = await conn.execute(
-                "SELECT id FROM sessions WHERE id = ?", (session_id,)
-            )
-            if not await cursor.fetchone():
+            if not await session_registry.exists(conn, session_id):
                 return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
 
             cursor = await conn.execute(
@@ -367,7 +724,7 @@ async def search_by_sender(
                 AND (visibility = 'public' OR
                      (visibility = 'private' AND sender = ?) OR
                      (visibility = 'agent_only' AND sender = ?))
-                ORDER BY timestamp DESC
+                ORDER BY ts_us DESC
                 LIMIT ?
             """,
                 (session_id, sender, agent_id, agent_id, limit),
@@ -416,14 +773,10 @@ async def search_by_timerange(
 
         agent_id = agent_context["agent_id"]
 
-        # Convert ISO datetime strings to Unix timestamps for comparison
+        # Convert ISO datetime strings to epoch microseconds for ts_us range scans
         try:
-            start_unix = datetime.fromisoformat(
-                start_time.replace("Z", "+00:00")
-            ).timestamp()
-            end_unix = datetime.fromisoformat(
-                end_time.replace("Z", "+00:00")
-            ).timestamp()
+            start_us = to_epoch_us(start_time)
+            end_us = to_epoch_us(end_time)
         except ValueError:
             return {
                 "success": False,
@@ -435,25 +788,22 @@ async def search_by_timerange(
             conn.row_factory = None  # Use SQLAlchemy row type
 
             # First, verify session exists
-            cursor = await conn.execute(
-                "SELECT id FROM sessions WHERE id = ?", (session_id,)
-            )
-            if not await cursor.fetchone():
+            if not await session_registry.exists(conn, session_id):
                 return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
 
             cursor = await conn.execute(
                 """
                 SELECT * FROM messages
                 WHERE session_id = ?
-                AND timestamp >= ?
-                AND timestamp <= ?
+                AND ts_us >= ?
+                AND ts_us <= ?
                 AND (visibility = 'public' OR
                      (visibility = 'private' AND sender = ?) OR
                      (visibility = 'agent_only' AND sender = ?))
-                ORDER BY timestamp ASC
+                ORDER BY ts_us ASC
                 LIMIT ?
             """,
-                (session_id, start_unix, end_unix, agent_id, agent_id, limit),
+                (session_id, start_us, end_us, agent_id, agent_id, limit),
             )
 
             messages_rows = await cursor.fetchall()
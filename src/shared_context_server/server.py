@@ -4,7 +4,7 @@ Phase 1 - Core Infrastructure Implementation for Shared Context MCP Server.
 Implements FastMCP server with 4 core tools for multi-agent collaboration:
 1. FastMCP Server Foundation - Server setup, lifecycle management, transport configuration
 2. Session Management System - create_session, get_session tools with UUID-based isolation
-3. Message Storage with Visibility Controls - add_message, get_messages with public/private/agent_only filtering
+3. Message Storage with Visibility Controls - add_message, add_messages, get_messages with public/private/agent_only filtering
 4. Agent Identity & Authentication - MCP context extraction, basic API key auth, audit logging
 
 Built according to PRP-002: Phase 1 - Core Infrastructure specification.
@@ -88,6 +88,7 @@ def _lazy_import_session_tools() -> Any:
     if "session_tools" not in _LAZY_IMPORTS:
         from .session_tools import (
             add_message,
+            add_messages,
             create_session,
             get_messages,
             get_session,
@@ -95,6 +96,7 @@ def _lazy_import_session_tools() -> Any:
 
         _LAZY_IMPORTS["session_tools"] = {
             "add_message": add_message,
+            "add_messages": add_messages,
             "create_session": create_session,
             "get_messages": get_messages,
             "get_session": get_session,
@@ -109,10 +111,12 @@ def _lazy_import_search_tools() -> Any:
             search_by_sender,
             search_by_timerange,
             search_context,
+            search_context_batch,
         )
 
         _LAZY_IMPORTS["search_tools"] = {
             "search_context": search_context,
+            "search_context_batch": search_context_batch,
             "search_by_sender": search_by_sender,
             "search_by_timerange": search_by_timerange,
         }
@@ -122,12 +126,22 @@ def _lazy_import_search_tools() -> Any:
 def _lazy_import_memory_tools() -> Any:
     """Lazy import memory_tools module."""
     if "memory_tools" not in _LAZY_IMPORTS:
-        from .memory_tools import get_memory, list_memory, set_memory
+        from .memory_tools import (
+            delete_memory_many,
+            get_memory,
+            get_memory_many,
+            list_memory,
+            set_memory,
+            set_memory_many,
+        )
 
         _LAZY_IMPORTS["memory_tools"] = {
+            "delete_memory_many": delete_memory_many,
             "get_memory": get_memory,
+            "get_memory_many": get_memory_many,
             "list_memory": list_memory,
             "set_memory": set_memory,
+            "set_memory_many": set_memory_many,
         }
     return _LAZY_IMPORTS["memory_tools"]
 
@@ -201,6 +215,7 @@ def __getattr__(name: str) -> Any:
     # Session tools backward compatibility
     if name in [
         "add_message",
+        "add_messages",
         "create_session",
         "get_messages",
         "get_session",
@@ -210,6 +225,7 @@ def __getattr__(name: str) -> Any:
     # Search tools backward compatibility
     if name in [
         "search_context",
+        "search_context_batch",
         "search_by_sender",
         "search_by_timerange",
         "search_context_function",
@@ -219,7 +235,14 @@ def __getattr__(name: str) -> Any:
         return _lazy_import_search_tools()[name]
 
     # Memory tools backward compatibility
-    if name in ["get_memory", "list_memory", "set_memory"]:
+    if name in [
+        "delete_memory_many",
+        "get_memory",
+        "get_memory_many",
+        "list_memory",
+        "set_memory",
+        "set_memory_many",
+    ]:
         return _lazy_import_memory_tools()[name]
 
     # WebSocket handlers backward compatibility
@@ -12,9 +12,12 @@ Built for multi-agent coordination with visibility controls and real-time update
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
 import traceback
 from datetime import datetime, timezone
+from functools import partial
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
@@ -22,7 +25,7 @@ from uuid import uuid4
 from pydantic import Field
 
 if TYPE_CHECKING:
-    pass  # TYPE_CHECKING imports removed
+    from .database_write_queue import WriteIntent
 else:
     TestConnectionType = Any
 
@@ -30,7 +33,8 @@ from fastmcp import Context  # noqa: TC002
 
 from .auth import validate_agent_context_or_error
 from .core_server import mcp
-from .database import get_db_connection
+from .database import get_db_connection, to_epoch_us
+from .database_write_queue import run_write, write_statement
 from .models import parse_mcp_metadata, sanitize_text_input, serialize_metadata
 from .utils.caching import cache_manager, generate_session_cache_key
 from .utils.llm_errors import (
@@ -39,6 +43,8 @@ from .utils.llm_errors import (
     create_llm_error_response,
     create_system_error,
 )
+from .utils.search_corpus import search_corpus_manager
+from .utils.session_registry import session_registry
 
 # Removed sanitization imports - using generic logging instead
 
@@ -198,6 +204,10 @@ async def create_session(
             )
             await conn.commit()
 
+            # Known here now; other processes drop any negative entry for it
+            session_registry.add(session_id)
+            await cache_manager.invalidate_namespace(f"session:{session_id}")
+
             # Audit log
             await audit_log(conn, "session_created", agent_id, session_id)
 
@@ -244,13 +254,16 @@ async def get_session(
             # Set row factory for dict-like access
             # Row factory handled by SQLAlchemy connection wrapper
 
-            # Get session info
+            # Get session info (IDs recently found missing skip the query)
+            if session_registry.lookup(session_id) is False:
+                return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
             cursor = await conn.execute(
                 "SELECT * FROM sessions WHERE id = ?", (session_id,)
             )
             session = await cursor.fetchone()
 
             if not session:
+                session_registry.mark_missing(session_id)
                 return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
 
             # Get accessible messages
@@ -261,7 +274,7 @@ async def get_session(
                 AND (visibility = 'public' OR
                      (visibility = 'private' AND sender = ?) OR
                      (visibility = 'agent_only' AND sender = ?))
-                ORDER BY timestamp DESC
+                ORDER BY ts_us DESC
                 LIMIT 50
             """,
                 (session_id, agent_id, agent_id),
@@ -283,6 +296,65 @@ async def get_session(
         return create_system_error("get_session", "database", temporary=True)
 
 
+def _prepare_message(
+    agent_context: dict[str, Any], content: str, visibility: str, metadata: Any
+) -> dict[str, Any]:
+    """
+    Validate one message's visibility, content and metadata for insertion.
+
+    Returns:
+        An error response, or the sanitized ``content``, parsed ``metadata``
+        and serialized ``metadata_str``
+    """
+    # Validate visibility level (Phase 3 adds admin_only)
+    if visibility not in ["public", "private", "agent_only", "admin_only"]:
+        return create_llm_error_response(
+            error=f"Invalid visibility level: {visibility}",
+            code="INVALID_VISIBILITY",
+            suggestions=[
+                "Use one of the supported visibility levels",
+                "Available options: 'public', 'private', 'agent_only', 'admin_only'",
+                "Check the API documentation for visibility rules",
+            ],
+            context={
+                "provided_visibility": visibility,
+                "allowed_values": ["public", "private", "agent_only", "admin_only"],
+            },
+            severity=ErrorSeverity.WARNING,
+        )
+
+    # Check permission for admin_only visibility
+    if visibility == "admin_only" and "admin" not in agent_context.get(
+        "permissions", []
+    ):
+        return ERROR_MESSAGE_PATTERNS["admin_required"]()  # type: ignore[no-any-return,operator]
+
+    # Input sanitization
+    content = sanitize_text_input(content)
+    if not content:
+        return ERROR_MESSAGE_PATTERNS["content_empty"]()  # type: ignore[no-any-return,operator]
+
+    # Parse metadata from MCP client (handles both string and dict inputs)
+    try:
+        metadata = parse_mcp_metadata(metadata)
+    except ValueError as e:
+        return create_llm_error_response(
+            error=f"Invalid metadata format: {str(e)}",
+            code="INVALID_METADATA_FORMAT",
+            suggestions=[
+                "Provide metadata as a JSON object (dictionary)",
+                "Use null for no metadata",
+                'Example: {"key": "value", "nested": {"data": "example"}}',
+            ],
+            context={"field": "metadata", "expected_type": "dict or null"},
+            severity=ErrorSeverity.WARNING,
+        )
+
+    # Serialize metadata for database storage
+    metadata_str = serialize_metadata(metadata) if metadata else None
+    return {"content": content, "metadata": metadata, "metadata_str": metadata_str}
+
+
 @mcp.tool(exclude_args=["ctx"])
 async def add_message(
     session_id: str = Field(description="Session ID to add message to"),
@@ -342,68 +414,26 @@ async def add_message(
                 agent_context.get("permissions", [])
             )
 
-        # Validate visibility level (Phase 3 adds admin_only)
-        if visibility not in ["public", "private", "agent_only", "admin_only"]:
-            return create_llm_error_response(
-                error=f"Invalid visibility level: {visibility}",
-                code="INVALID_VISIBILITY",
-                suggestions=[
-                    "Use one of the supported visibility levels",
-                    "Available options: 'public', 'private', 'agent_only', 'admin_only'",
-                    "Check the API documentation for visibility rules",
-                ],
-                context={
-                    "provided_visibility": visibility,
-                    "allowed_values": ["public", "private", "agent_only", "admin_only"],
-                },
-                severity=ErrorSeverity.WARNING,
-            )
-
-        # Check permission for admin_only visibility
-        if visibility == "admin_only" and "admin" not in agent_context.get(
-            "permissions", []
-        ):
-            return ERROR_MESSAGE_PATTERNS["admin_required"]()  # type: ignore[no-any-return,operator]
-
-        # Input sanitization
-        content = sanitize_text_input(content)
-        if not content:
-            return ERROR_MESSAGE_PATTERNS["content_empty"]()  # type: ignore[no-any-return,operator]
-
-        # Parse metadata from MCP client (handles both string and dict inputs)
-        try:
-            metadata = parse_mcp_metadata(metadata)
-        except ValueError as e:
-            return create_llm_error_response(
-                error=f"Invalid metadata format: {str(e)}",
-                code="INVALID_METADATA_FORMAT",
-                suggestions=[
-                    "Provide metadata as a JSON object (dictionary)",
-                    "Use null for no metadata",
-                    'Example: {"key": "value", "nested": {"data": "example"}}',
-                ],
-                context={"field": "metadata", "expected_type": "dict or null"},
-                severity=ErrorSeverity.WARNING,
-            )
-
-        # Serialize metadata for database storage
-        metadata_str = serialize_metadata(metadata) if metadata else None
+        prepared = _prepare_message(agent_context, content, visibility, metadata)
+        if "error" in prepared:
+            return prepared
+        content = prepared["content"]
+        metadata = prepared["metadata"]
+        metadata_str = prepared["metadata_str"]
 
         async with get_db_connection() as conn:
             # Verify session exists
-            cursor = await conn.execute(
-                "SELECT id FROM sessions WHERE id = ?", (session_id,)
-            )
-            if not await cursor.fetchone():
+            if not await session_registry.exists(conn, session_id):
                 return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
 
-            # Insert message with sender_type (Phase 3 enhancement)
+            # Insert message with sender_type (Phase 3 enhancement); batched
+            # with concurrent writes when group commit is enabled
             current_timestamp = datetime.now(timezone.utc).timestamp()
-            cursor = await conn.execute(
+            insert_message = write_statement(
                 """
                 INSERT INTO messages
-                (session_id, sender, sender_type, content, visibility, metadata, parent_message_id, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (session_id, sender, sender_type, content, visibility, metadata, parent_message_id, timestamp, ts_us)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     session_id,
@@ -414,12 +444,26 @@ async def add_message(
                     metadata_str,
                     parent_message_id,
                     current_timestamp,
+                    to_epoch_us(current_timestamp),
                 ),
             )
 
-            message_id = cursor.lastrowid
+            message_id = await run_write(conn, insert_message)
             await conn.commit()
 
+            # Keep the in-memory search corpus in sync (no-op for cold sessions)
+            search_corpus_manager.append(
+                session_id,
+                {
+                    "id": message_id,
+                    "sender": agent_id,
+                    "content": content,
+                    "visibility": visibility,
+                    "metadata": metadata,
+                    "timestamp": current_timestamp,
+                },
+            )
+
             # Audit log
             await audit_log(
                 conn,
@@ -479,6 +523,452 @@ async def add_message(
         return create_system_error("add_message", "database", temporary=True)
 
 
+_MESSAGE_BATCH_FIELDS = {"content", "visibility", "metadata", "parent_message_id"}
+
+_INSERT_MESSAGE = """
+    INSERT INTO messages
+    (session_id, sender, sender_type, content, visibility, metadata, parent_message_id, timestamp, ts_us)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _insert_messages(rows: list[tuple[Any, ...]]) -> WriteIntent:
+    """Create a write intent inserting ``rows`` and returning their ids in order."""
+
+    async def intent(conn: Any) -> list[int]:
+        # One statement per row so each id comes from its own insert; reading
+        # them back afterwards races concurrent writers outside SQLite
+        message_ids = []
+        for row in rows:
+            cursor = await conn.execute(_INSERT_MESSAGE, row)
+            message_ids.append(cursor.lastrowid)
+        return message_ids
+
+    return intent
+
+
+@mcp.tool(exclude_args=["ctx"])
+async def add_messages(
+    session_id: str = Field(description="Session ID to add the messages to"),
+    messages: list[dict[str, Any]] = Field(
+        description=(
+            "Messages to add, in order. Each is an object with 'content' and "
+            "optional 'visibility', 'metadata' and 'parent_message_id'"
+        ),
+        min_length=1,
+        max_length=100,
+        examples=[[{"content": "Step 1 done"}, {"content": "Step 2 done"}]],
+    ),
+    auth_token: str | None = Field(
+        default=None,
+        description="Optional JWT token for elevated permissions (e.g., admin_only visibility)",
+    ),
+    ctx: Context = None,  # type: ignore[assignment]
+) -> dict[str, Any]:
+    """
+    Add several messages to a session in one transaction.
+
+    Every message is validated before any is stored, so an invalid message
+    rejects the whole batch (its index is in the error context). The batch
+    is inserted together, audited once and broadcast as one real-time
+    update. Returns the new message IDs in the order given.
+    """
+
+    try:
+        agent_context = await validate_agent_context_or_error(ctx, auth_token)
+
+        if "error" in agent_context and agent_context.get("code") in [
+            "INVALID_TOKEN_FORMAT",
+            "TOKEN_AUTHENTICATION_FAILED",
+        ]:
+            return agent_context
+
+        agent_id = agent_context["agent_id"]
+        agent_type = agent_context["agent_type"]
+
+        if "write" not in agent_context.get("permissions", []):
+            return ERROR_MESSAGE_PATTERNS["write_required"](  # type: ignore[no-any-return,operator]
+                agent_context.get("permissions", [])
+            )
+
+        prepared_messages = []
+        for index, message in enumerate(messages):
+            unknown = set(message) - _MESSAGE_BATCH_FIELDS
+            if "content" not in message or unknown:
+                return create_llm_error_response(
+                    error=f"Invalid message at index {index}",
+                    code="INVALID_INPUT",
+                    suggestions=[
+                        "Give every message a 'content' string",
+                        "Optional fields: 'visibility', 'metadata', 'parent_message_id'",
+                    ],
+                    context={
+                        "message_index": index,
+                        "unknown_fields": sorted(unknown),
+                    },
+                    severity=ErrorSeverity.WARNING,
+                )
+
+            visibility = message.get("visibility", "public")
+            prepared = _prepare_message(
+                agent_context, message["content"], visibility, message.get("metadata")
+            )
+            if "error" in prepared:
+                prepared.setdefault("context", {})["message_index"] = index
+                return prepared
+            prepared["visibility"] = visibility
+            prepared["parent_message_id"] = message.get("parent_message_id")
+            prepared_messages.append(prepared)
+
+        async with get_db_connection() as conn:
+            if not await session_registry.exists(conn, session_id):
+                return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
+
+            current_timestamp = datetime.now(timezone.utc).timestamp()
+            rows = [
+                (
+                    session_id,
+                    agent_id,
+                    agent_type,
+                    prepared["content"],
+                    prepared["visibility"],
+                    prepared["metadata_str"],
+                    prepared["parent_message_id"],
+                    current_timestamp,
+                    to_epoch_us(current_timestamp),
+                )
+                for prepared in prepared_messages
+            ]
+
+            message_ids = await run_write(conn, _insert_messages(rows))
+            await conn.commit()
+
+            for message_id, prepared in zip(
+                message_ids, prepared_messages, strict=True
+            ):
+                search_corpus_manager.append(
+                    session_id,
+                    {
+                        "id": message_id,
+                        "sender": agent_id,
+                        "content": prepared["content"],
+                        "visibility": prepared["visibility"],
+                        "metadata": prepared["metadata"],
+                        "timestamp": current_timestamp,
+                    },
+                )
+
+            await audit_log(
+                conn,
+                "messages_added",
+                agent_id,
+                session_id,
+                {
+                    "message_ids": message_ids,
+                    "count": len(message_ids),
+                    "visibilities": sorted(
+                        {prepared["visibility"] for prepared in prepared_messages}
+                    ),
+                },
+            )
+
+            try:
+                from .admin_resources import trigger_resource_notifications
+
+                await trigger_resource_notifications(
+                    session_id, agent_id, broadcast_session_update=False
+                )
+            except Exception as e:
+                logger.warning(f"Failed to trigger resource notifications: {e}")
+
+            # One coalesced real-time update for the whole batch
+            try:
+                sent_at = datetime.now(timezone.utc).isoformat()
+                message_data = {
+                    "type": "new_messages",
+                    "data": [
+                        {
+                            "id": message_id,
+                            "sender": agent_id,
+                            "sender_type": agent_type,
+                            "content": prepared["content"],
+                            "visibility": prepared["visibility"],
+                            "timestamp": sent_at,
+                            "metadata": prepared["metadata"] or {},
+                        }
+                        for message_id, prepared in zip(
+                            message_ids, prepared_messages, strict=True
+                        )
+                    ],
+                }
+                websocket_imports = get_websocket_imports()
+                if websocket_imports["available"]:
+                    await websocket_imports["notify_websocket_server"](
+                        session_id, message_data
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to send WebSocket message notification: {e}")
+
+        return {
+            "success": True,
+            "message_ids": message_ids,
+            "count": len(message_ids),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    except Exception:
+        logger.exception("Failed to add messages")
+        logger.debug(traceback.format_exc())
+        return create_system_error("add_messages", "database", temporary=True)
+
+
+def encode_message_cursor(direction: str, message_id: int) -> str:
+    """Encode an opaque get_messages cursor ("after" or "before" a message id)."""
+    payload = json.dumps({direction: message_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_message_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Decode a get_messages cursor into its direction and message id.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        ((direction, message_id),) = payload.items()
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if direction not in ("after", "before") or not isinstance(message_id, int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return direction, message_id
+
+
+def _message_visibility_conditions(
+    session_id: str, agent_context: dict[str, Any], visibility_filter: str | None
+) -> tuple[list[str], list[Any]]:
+    """Build the WHERE conditions selecting messages an agent may read."""
+    agent_id = agent_context["agent_id"]
+    where_conditions = ["session_id = ?"]
+    params: list[Any] = [session_id]
+
+    # Agent-specific visibility filtering
+    has_admin_permission = "admin" in agent_context.get("permissions", [])
+
+    if visibility_filter:
+        # Apply specific visibility filter with agent access rules
+        if visibility_filter == "public":
+            where_conditions.append("visibility = 'public'")
+        elif visibility_filter == "private":
+            where_conditions.append("visibility = 'private' AND sender = ?")
+            params.append(agent_id)
+        elif visibility_filter == "agent_only":
+            where_conditions.append("visibility = 'agent_only' AND sender = ?")
+            params.append(agent_id)
+        elif visibility_filter == "admin_only" and has_admin_permission:
+            where_conditions.append("visibility = 'admin_only'")
+    else:
+        # Admin gets unrestricted access to all messages
+        if has_admin_permission:
+            visibility_conditions = [
+                "visibility = 'public'",
+                "visibility = 'private'",  # ADMIN: All private messages
+                "visibility = 'agent_only'",  # ADMIN: All agent_only messages
+                "visibility = 'admin_only'",  # ADMIN: All admin_only messages
+            ]
+            # No sender restrictions for admin - they can read all messages
+        else:
+            # Default visibility rules for non-admin: public + own private/agent_only
+            visibility_conditions = [
+                "visibility = 'public'",
+                "(visibility = 'private' AND sender = ?)",
+                "(visibility = 'agent_only' AND sender = ?)",
+            ]
+            params.extend([agent_id, agent_id])
+
+        visibility_clause = f"({' OR '.join(visibility_conditions)})"
+        where_conditions.append(visibility_clause)
+
+    return where_conditions, params
+
+
+async def _count_messages(
+    conn: Any, where_conditions: list[str], params: list[Any]
+) -> int:
+    """Count messages matching the visibility conditions."""
+    count_query = f"""
+            SELECT COUNT(*) FROM messages
+            WHERE {" AND ".join(where_conditions)}
+        """
+    cursor = await conn.execute(count_query, params)
+    count_row = await cursor.fetchone()
+    return count_row[0] if count_row else 0
+
+
+async def _load_message_page_by_id(
+    conn: Any,
+    where_conditions: list[str],
+    params: list[Any],
+    limit: int,
+    after_id: int | None,
+    before_id: int | None,
+) -> dict[str, Any]:
+    """
+    Load one keyset page ordered by message id.
+
+    Seeks on (session_id, id) instead of counting and skipping rows, so a
+    poll costs the same however long the session is. Pages are returned in
+    ascending id order; with only ``before_id`` the page holds the newest
+    messages older than it.
+    """
+    conditions = list(where_conditions)
+    page_params = list(params)
+    if after_id is not None:
+        conditions.append("id > ?")
+        page_params.append(after_id)
+    if before_id is not None:
+        conditions.append("id < ?")
+        page_params.append(before_id)
+
+    # Paging backwards walks the index from before_id downwards
+    backwards = before_id is not None and after_id is None
+    query = f"""
+            SELECT * FROM messages
+            WHERE {" AND ".join(conditions)}
+            ORDER BY id {"DESC" if backwards else "ASC"}
+            LIMIT ?
+        """
+    # One extra row tells whether another page follows
+    cursor = await conn.execute(query, [*page_params, limit + 1])
+    messages = [dict(msg) for msg in await cursor.fetchall()]
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if backwards:
+        messages.reverse()
+        next_cursor = (
+            encode_message_cursor("before", messages[0]["id"]) if messages else None
+        )
+    else:
+        # Polling continues after the last message seen, even on an empty page
+        last_id = messages[-1]["id"] if messages else after_id
+        next_cursor = (
+            encode_message_cursor("after", last_id) if last_id is not None else None
+        )
+
+    return {
+        "success": True,
+        "messages": messages,
+        "count": len(messages),
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+    }
+
+
+async def _load_messages(
+    session_id: str,
+    agent_context: dict[str, Any],
+    visibility_filter: str | None,
+    limit: int,
+    offset: int,
+    cache_key: str,
+    cache_context: dict[str, Any],
+    after_id: int | None = None,
+    before_id: int | None = None,
+    include_total: bool | None = None,
+) -> dict[str, Any]:
+    """Load and cache one page of messages (get_messages cache-miss path)."""
+    agent_id = agent_context["agent_id"]
+
+    async with get_db_connection() as conn:
+        # Set row factory for dict-like access
+        # Row factory handled by SQLAlchemy connection wrapper
+
+        # First, verify session exists
+        if not await session_registry.exists(conn, session_id):
+            return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
+
+        # Build query with visibility controls
+        where_conditions, params = _message_visibility_conditions(
+            session_id, agent_context, visibility_filter
+        )
+
+        if after_id is not None or before_id is not None:
+            # Keyset pagination: no COUNT(*) unless explicitly requested
+            result = await _load_message_page_by_id(
+                conn, where_conditions, params, limit, after_id, before_id
+            )
+            if include_total:
+                result["total_count"] = await _count_messages(
+                    conn, where_conditions, params
+                )
+        else:
+            # First, get total count for pagination
+            total_count = (
+                await _count_messages(conn, where_conditions, params)
+                if include_total is not False
+                else None
+            )
+
+            # Then get the actual messages
+            query = f"""
+                    SELECT * FROM messages
+                    WHERE {" AND ".join(where_conditions)}
+                    ORDER BY ts_us ASC
+                    LIMIT ? OFFSET ?
+                """
+            cursor = await conn.execute(query, [*params, limit, offset])
+            messages_rows = await cursor.fetchall()
+            messages = [dict(msg) for msg in messages_rows]
+
+            if messages:
+                last_id = messages[-1].get("id")
+            elif offset:
+                # Past the end: poll after the newest visible message
+                max_query = f"""
+                    SELECT MAX(id) FROM messages
+                    WHERE {" AND ".join(where_conditions)}
+                """
+                cursor = await conn.execute(max_query, params)
+                max_row = await cursor.fetchone()
+                last_id = max_row[0] if max_row and max_row[0] else 0
+            else:
+                # Nothing visible yet (e.g. an empty session): poll from the start
+                last_id = 0
+            result = {
+                "success": True,
+                "messages": messages,
+                "count": len(messages),
+                "has_more": (
+                    offset + limit < total_count
+                    if total_count is not None
+                    else len(messages) == limit
+                ),
+                "next_cursor": (
+                    encode_message_cursor("after", last_id)
+                    if isinstance(last_id, int)
+                    else None
+                ),
+            }
+            if total_count is not None:
+                result["total_count"] = total_count
+
+        # Phase 4: Cache the result for faster subsequent access (5-minute TTL)
+        await cache_manager.set(
+            cache_key,
+            result,
+            ttl=300,
+            context=cache_context,
+            tags=(f"session:{session_id}", f"agent:{agent_id}"),
+        )
+        # Log cache set without sensitive cache key
+        logger.debug("Cached get_messages result successfully")
+
+        return result
+
+
 @mcp.tool(exclude_args=["ctx"])
 async def get_messages(
     session_id: str = Field(description="Session ID to retrieve messages from"),
@@ -495,20 +985,44 @@ async def get_messages(
     ),
     offset: int = Field(
         default=0,
-        description="Offset for pagination (IMPORTANT: Use to fetch new messages efficiently - if you previously saw 3 messages, use offset=3 to get only newer messages)",
+        description="Offset for pagination (prefer cursor for polling - offset gets slower as the session grows)",
+        ge=0,
+    ),
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque next_cursor from a previous get_messages response (IMPORTANT: use to poll for new messages efficiently)",
+    ),
+    after_id: int | None = Field(
+        default=None,
+        description="Return messages with id greater than this (oldest first)",
         ge=0,
     ),
+    before_id: int | None = Field(
+        default=None,
+        description="Return messages with id less than this (the newest ones before it)",
+        ge=1,
+    ),
+    include_total: bool | None = Field(
+        default=None,
+        description="Include total_count (always counted with offset paging; off by default with cursors)",
+    ),
     ctx: Context = None,  # type: ignore[assignment]
 ) -> dict[str, Any]:
     """
     Retrieve messages from session with agent-specific filtering.
 
     EFFICIENT POLLING PATTERN:
-    - First call: get_messages(session_id) → returns messages 0-49 (if limit=50)
-    - If you got 3 messages, next call: get_messages(session_id, offset=3) → returns messages 3+ only
-    - For real-time updates: track message_count from previous calls, use as offset for next call
+    - First call: get_messages(session_id) → returns the first page and a next_cursor
+    - Next call: get_messages(session_id, cursor=<next_cursor>) → returns only newer messages
+    - Keep passing the latest next_cursor; it is returned even when no new messages arrived
+      (including for an empty session)
 
-    This prevents re-fetching the same messages and improves performance for multi-agent coordination.
+    Offset pages are ordered by timestamp, but their next_cursor is id-based: it
+    continues after the id of the page's last message.
+
+    Cursor polling seeks directly to the last seen message, so it costs the same
+    for a 10-message and a 100k-message session. after_id/before_id page by
+    message id explicitly; offset paging is still supported.
     """
 
     try:
@@ -524,110 +1038,75 @@ async def get_messages(
 
         agent_id = agent_context["agent_id"]
 
+        if cursor is not None:
+            if after_id is not None or before_id is not None:
+                return create_llm_error_response(
+                    error="cursor cannot be combined with after_id or before_id",
+                    code="INVALID_PAGINATION",
+                    suggestions=[
+                        "Pass only the next_cursor from the previous response",
+                        "Or page explicitly with after_id/before_id and no cursor",
+                    ],
+                    context={"field": "cursor"},
+                    severity=ErrorSeverity.WARNING,
+                )
+            try:
+                direction, message_id = decode_message_cursor(cursor)
+            except ValueError:
+                return create_llm_error_response(
+                    error="Invalid pagination cursor",
+                    code="INVALID_CURSOR",
+                    suggestions=[
+                        "Use the next_cursor value exactly as returned by get_messages",
+                        "Omit cursor to start from the beginning of the session",
+                    ],
+                    context={"field": "cursor"},
+                    severity=ErrorSeverity.WARNING,
+                )
+            if direction == "after":
+                after_id = message_id
+            else:
+                before_id = message_id
+
         # Phase 4: Try cache first for frequently accessed message lists
         cache_context = {
             "agent_id": agent_id,
             "visibility_filter": visibility_filter or "all",
             "offset": offset,
+            "after_id": after_id,
+            "before_id": before_id,
+            "include_total": include_total,
         }
         cache_key = generate_session_cache_key(session_id, agent_id, limit)
-
-        # Check cache for this specific query (5-minute TTL for message lists)
-        cached_result = await cache_manager.get(cache_key, cache_context)
+        load_messages = partial(
+            _load_messages,
+            session_id,
+            agent_context,
+            visibility_filter,
+            limit,
+            offset,
+            cache_key,
+            cache_context,
+            after_id,
+            before_id,
+            include_total,
+        )
+
+        # Check cache for this specific query (5-minute TTL for message lists);
+        # stale pages within the session stale window are served while
+        # load_messages refreshes them in the background
+        cached_result = await cache_manager.get(
+            cache_key, cache_context, refresh=load_messages
+        )
         if cached_result is not None:
             # Log cache hit without sensitive cache key
             logger.debug("Cache hit for get_messages operation")
             return cached_result  # type: ignore[no-any-return]
 
-        # Regular production connection
-        async with get_db_connection() as conn:
-            # Set row factory for dict-like access
-            # Row factory handled by SQLAlchemy connection wrapper
-
-            # First, verify session exists
-            cursor = await conn.execute(
-                "SELECT id FROM sessions WHERE id = ?", (session_id,)
-            )
-            if not await cursor.fetchone():
-                return ERROR_MESSAGE_PATTERNS["session_not_found"](session_id)  # type: ignore[no-any-return,operator]
-
-            # Build query with visibility controls
-            where_conditions = ["session_id = ?"]
-            params: list[Any] = [session_id]
-
-            # Agent-specific visibility filtering
-            has_admin_permission = "admin" in agent_context.get("permissions", [])
-
-            if visibility_filter:
-                # Apply specific visibility filter with agent access rules
-                if visibility_filter == "public":
-                    where_conditions.append("visibility = 'public'")
-                elif visibility_filter == "private":
-                    where_conditions.append("visibility = 'private' AND sender = ?")
-                    params.append(agent_id)
-                elif visibility_filter == "agent_only":
-                    where_conditions.append("visibility = 'agent_only' AND sender = ?")
-                    params.append(agent_id)
-                elif visibility_filter == "admin_only" and has_admin_permission:
-                    where_conditions.append("visibility = 'admin_only'")
-            else:
-                # Admin gets unrestricted access to all messages
-                if has_admin_permission:
-                    visibility_conditions = [
-                        "visibility = 'public'",
-                        "visibility = 'private'",  # ADMIN: All private messages
-                        "visibility = 'agent_only'",  # ADMIN: All agent_only messages
-                        "visibility = 'admin_only'",  # ADMIN: All admin_only messages
-                    ]
-                    # No sender restrictions for admin - they can read all messages
-                else:
-                    # Default visibility rules for non-admin: public + own private/agent_only
-                    visibility_conditions = [
-                        "visibility = 'public'",
-                        "(visibility = 'private' AND sender = ?)",
-                        "(visibility = 'agent_only' AND sender = ?)",
-                    ]
-                    params.extend([agent_id, agent_id])
-
-                visibility_clause = f"({' OR '.join(visibility_conditions)})"
-                where_conditions.append(visibility_clause)
-
-            # First, get total count for pagination
-            count_query = f"""
-                    SELECT COUNT(*) FROM messages
-                    WHERE {" AND ".join(where_conditions)}
-                """
-            cursor = await conn.execute(count_query, params)
-            count_row = await cursor.fetchone()
-            total_count = count_row[0] if count_row else 0
-
-            # Then get the actual messages
-            query = f"""
-                    SELECT * FROM messages
-                    WHERE {" AND ".join(where_conditions)}
-                    ORDER BY timestamp ASC
-                    LIMIT ? OFFSET ?
-                """
-            params.extend([limit, offset])
-
-            cursor = await conn.execute(query, params)
-            messages_rows = await cursor.fetchall()
-            messages = [dict(msg) for msg in messages_rows]
-
-            result = {
-                "success": True,
-                "messages": messages,
-                "count": len(messages),
-                "total_count": total_count,
-                "has_more": offset + limit < total_count,
-            }
-
-            # Phase 4: Cache the result for faster subsequent access (5-minute TTL)
-            await cache_manager.set(cache_key, result, ttl=300, context=cache_context)
-            # Log cache set without sensitive cache key
-            logger.debug("Cached get_messages result successfully")
-
-            return result
+        # Concurrent misses for the same page share one database round trip
+        return await cache_manager.single_flight(  # type: ignore[no-any-return]
+            cache_key, load_messages, cache_context
+        )
 
     except Exception:
         logger.exception("Failed to retrieve messages")
@@ -423,6 +423,10 @@ function handleWebSocketMessage(data, sessionId) {
         // Add new message to the UI
         addMessageToUI(data.data);
         showNotification('New message received');
+    } else if (data.type === 'new_messages') {
+        // Batched add_messages broadcast: one event carrying every message
+        data.data.forEach(addMessageToUI);
+        showNotification(`${data.data.length} new messages received`);
     } else if (data.type === 'session_update') {
         // Handle session updates
         updateSessionInfo(data);
@@ -5,9 +5,10 @@ This module provides a centralized registry of all available MCP tools,
 with organized categories and metadata for tool discovery and documentation.
 
 Tool Categories:
-- Session Management: create_session, add_message, get_session_messages
-- Agent Memory: set_agent_memory, get_agent_memory
-- Context Search: search_context
+- Session Management: create_session, add_message, add_messages, get_session_messages
+- Agent Memory: set_agent_memory, get_agent_memory, set_memory_many,
+  get_memory_many, delete_memory_many
+- Context Search: search_context, search_context_batch
 - Server Utilities: get_server_info
 """
 
@@ -74,6 +75,12 @@ TOOL_REGISTRY: dict[str, ToolMetadata] = {
         description="Add a message to an existing session with visibility controls",
         tags=["message", "communication", "threading"],
     ),
+    "add_messages": ToolMetadata(
+        name="add_messages",
+        category=ToolCategory.SESSION_MANAGEMENT,
+        description="Add several messages to a session in one transaction",
+        tags=["message", "communication", "batch"],
+    ),
     "get_session_messages": ToolMetadata(
         name="get_session_messages",
         category=ToolCategory.SESSION_MANAGEMENT,
@@ -92,12 +99,36 @@ TOOL_REGISTRY: dict[str, ToolMetadata] = {
         description="Retrieve values from agent memory with scope resolution",
         tags=["memory", "retrieval", "scoping"],
     ),
+    "set_memory_many": ToolMetadata(
+        name="set_memory_many",
+        category=ToolCategory.AGENT_MEMORY,
+        description="Store several memory entries in one transaction",
+        tags=["memory", "storage", "batch"],
+    ),
+    "get_memory_many": ToolMetadata(
+        name="get_memory_many",
+        category=ToolCategory.AGENT_MEMORY,
+        description="Retrieve several memory entries with one query",
+        tags=["memory", "retrieval", "batch"],
+    ),
+    "delete_memory_many": ToolMetadata(
+        name="delete_memory_many",
+        category=ToolCategory.AGENT_MEMORY,
+        description="Delete several memory entries in one transaction",
+        tags=["memory", "deletion", "batch"],
+    ),
     "search_context": ToolMetadata(
         name="search_context",
         category=ToolCategory.CONTEXT_SEARCH,
         description="Search session context using fuzzy matching and filtering",
         tags=["search", "fuzzy", "context", "similarity"],
     ),
+    "search_context_batch": ToolMetadata(
+        name="search_context_batch",
+        category=ToolCategory.CONTEXT_SEARCH,
+        description="Search session context for several queries in one pass",
+        tags=["search", "fuzzy", "context", "batch"],
+    ),
     "get_server_info": ToolMetadata(
         name="get_server_info",
         category=ToolCategory.SERVER_UTILITIES,
@@ -0,0 +1,346 @@
+"""
+Shared L2 cache backends for multi-process deployments.
+
+SmartCacheManager keeps its L1/L2 tiers in process memory. When several
+server processes run behind a load balancer, a shared backend adds a tier
+that every process reads through and writes to, and carries invalidations
+between processes:
+
+- entries are stored under generation-free keys, since namespace generations
+  are per-process counters
+- namespace and tag invalidations delete the matching shared entries and
+  record an event that other processes poll and apply to their local tiers
+
+The default is no shared backend (in-process caching only).
+SQLiteSharedCacheBackend works for processes on one host via a WAL-mode
+SQLite file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCacheBackend(ABC):
+    """Interface for a cache tier and invalidation channel shared by processes."""
+
+    name = "shared"
+
+    @abstractmethod
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Get an unexpired entry.
+
+        Returns:
+            Dict with value, stale_at, expires_at, ttl and tags, or None
+        """
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        entry: dict[str, Any],
+        namespace: str | None,
+        tags: frozenset[str],
+    ) -> None:
+        """Store an entry (value, stale_at, expires_at, ttl) under a key."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete one entry and notify other processes."""
+
+    @abstractmethod
+    async def invalidate_namespace(self, namespace: str) -> None:
+        """Delete a namespace's entries and notify other processes."""
+
+    @abstractmethod
+    async def invalidate_tag(self, tag: str) -> None:
+        """Delete a tag's entries and notify other processes."""
+
+    @abstractmethod
+    async def poll_invalidations(self) -> list[tuple[str, str]]:
+        """
+        Get invalidations published by other processes since the last poll.
+
+        Returns:
+            (kind, value) tuples where kind is "namespace", "tag", "key" or "clear"
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Delete every entry and notify other processes."""
+
+    @abstractmethod
+    async def cleanup_expired(self) -> int:
+        """Delete expired entries and old invalidation events."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release backend resources."""
+
+
+class SQLiteSharedCacheBackend(SharedCacheBackend):
+    """Shared cache tier in a WAL-mode SQLite file for processes on one host."""
+
+    name = "sqlite"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            namespace TEXT,
+            value TEXT NOT NULL,
+            tags TEXT NOT NULL DEFAULT '[]',
+            stale_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            ttl INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_namespace
+            ON cache_entries(namespace);
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_expires
+            ON cache_entries(expires_at);
+        CREATE TABLE IF NOT EXISTS cache_entry_tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tag, key)
+        );
+        CREATE TABLE IF NOT EXISTS cache_invalidations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            origin TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str | Path, event_retention: int = 3600) -> None:
+        """
+        Open (and create if needed) the shared cache file.
+
+        Args:
+            path: SQLite file shared by all processes
+            event_retention: Seconds invalidation events are kept for polling
+        """
+        self.path = str(path)
+        self.event_retention = event_retention
+        # Identifies this process's own events so it doesn't re-apply them
+        self.origin = uuid.uuid4().hex
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+
+        # Only events published after this process attached are relevant
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM cache_invalidations"
+        ).fetchone()
+        self._last_event_id = row[0]
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        """Run a blocking SQLite operation in a worker thread."""
+
+        def locked() -> Any:
+            with self._lock:
+                return func(*args)
+
+        return await asyncio.to_thread(locked)
+
+    def _publish(self, kind: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO cache_invalidations (origin, kind, value, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (self.origin, kind, value, time.time()),
+        )
+
+    def _delete_keys(self, keys: list[str]) -> None:
+        self._conn.executemany(
+            "DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys]
+        )
+        self._conn.executemany(
+            "DELETE FROM cache_entry_tags WHERE key = ?", [(key,) for key in keys]
+        )
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        def read() -> tuple[Any, ...] | None:
+            return self._conn.execute(  # type: ignore[no-any-return]
+                "SELECT value, tags, stale_at, expires_at, ttl FROM cache_entries "
+                "WHERE key = ? AND expires_at >= ?",
+                (key, time.time()),
+            ).fetchone()
+
+        row = await self._run(read)
+        if row is None:
+            return None
+
+        value, tags, stale_at, expires_at, ttl = row
+        return {
+            "value": json.loads(value),
+            "tags": frozenset(json.loads(tags)),
+            "stale_at": stale_at,
+            "expires_at": expires_at,
+            "ttl": ttl,
+        }
+
+    async def set(
+        self,
+        key: str,
+        entry: dict[str, Any],
+        namespace: str | None,
+        tags: frozenset[str],
+    ) -> None:
+        # Values are returned to MCP clients as JSON, so JSON is lossless enough
+        value = json.dumps(entry["value"], default=str)
+        tag_list = sorted(tags)
+
+        def write() -> None:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(key, namespace, value, tags, stale_at, expires_at, ttl) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        namespace,
+                        value,
+                        json.dumps(tag_list),
+                        entry["stale_at"],
+                        entry["expires_at"],
+                        entry["ttl"],
+                    ),
+                )
+                self._conn.execute("DELETE FROM cache_entry_tags WHERE key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_entry_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in tag_list],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        await self._run(write)
+
+    async def _invalidate(self, kind: str, value: str, keys_query: str | None) -> None:
+        def write() -> None:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if keys_query is None:
+                    keys = [value]
+                else:
+                    keys = [row[0] for row in self._conn.execute(keys_query, (value,))]
+                self._delete_keys(keys)
+                self._publish(kind, value)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        await self._run(write)
+
+    async def delete(self, key: str) -> None:
+        await self._invalidate("key", key, None)
+
+    async def invalidate_namespace(self, namespace: str) -> None:
+        await self._invalidate(
+            "namespace",
+            namespace,
+            "SELECT key FROM cache_entries WHERE namespace = ?",
+        )
+
+    async def invalidate_tag(self, tag: str) -> None:
+        await self._invalidate(
+            "tag", tag, "SELECT key FROM cache_entry_tags WHERE tag = ?"
+        )
+
+    async def poll_invalidations(self) -> list[tuple[str, str]]:
+        def read() -> list[tuple[int, str, str, str]]:
+            return self._conn.execute(
+                "SELECT id, origin, kind, value FROM cache_invalidations "
+                "WHERE id > ? ORDER BY id",
+                (self._last_event_id,),
+            ).fetchall()
+
+        rows = await self._run(read)
+        if not rows:
+            return []
+
+        self._last_event_id = rows[-1][0]
+        return [
+            (kind, value) for _, origin, kind, value in rows if origin != self.origin
+        ]
+
+    async def clear(self) -> None:
+        def write() -> None:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM cache_entries")
+                self._conn.execute("DELETE FROM cache_entry_tags")
+                self._publish("clear", "")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        await self._run(write)
+
+    async def cleanup_expired(self) -> int:
+        def write() -> int:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                expired = [
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT key FROM cache_entries WHERE expires_at < ?", (now,)
+                    )
+                ]
+                self._delete_keys(expired)
+                self._conn.execute(
+                    "DELETE FROM cache_invalidations WHERE created_at < ?",
+                    (now - self.event_retention,),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return len(expired)
+
+        return await self._run(write)  # type: ignore[no-any-return]
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+
+
+def create_shared_backend(kind: str, path: str) -> SharedCacheBackend | None:
+    """
+    Create the configured shared backend.
+
+    Args:
+        kind: "none" (in-process caching only) or "sqlite"
+        path: Location of the shared store for file-based backends
+
+    Returns:
+        Backend instance, or None for in-process caching
+    """
+    kind = kind.lower()
+    if kind in ("", "none"):
+        return None
+    if kind == "sqlite":
+        return SQLiteSharedCacheBackend(path)
+    raise ValueError(f"Unknown shared cache backend: {kind}")
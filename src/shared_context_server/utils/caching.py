@@ -6,7 +6,13 @@ Implements production-ready multi-level caching including:
 2. TTL-based expiration and automatic cleanup
 3. Cache performance monitoring and hit ratio tracking
 4. Session-based and search-based cache keys
-5. Cache invalidation on data changes
+5. Cache invalidation on data changes via O(1) namespace generation bumps
+6. Tag-indexed entries for targeted O(k) eviction with invalidate_tag
+7. Per-level byte budgets with size-weighted LRU eviction
+8. Single-flight coalescing of concurrent misses on the same key
+9. Stale-while-revalidate windows per namespace with background refresh
+10. TinyLFU admission so one-off keys cannot evict frequently used ones
+11. Optional shared L2 backend with cross-process invalidation fan-out
 
 Built according to PRP-005: Phase 4 - Production Ready specification.
 """
@@ -16,23 +22,65 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import sys
 import time
 from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Iterator
+
+    from .cache_backends import SharedCacheBackend
+
+from .frequency_sketch import FrequencySketch
 from .security import secure_hash_short_for_cache_keys
 
 # Removed sanitization imports - using generic logging instead
 
 logger = logging.getLogger(__name__)
 
+# (manager id, namespace, generation) of the load running in this task, if any
+_active_load: ContextVar[tuple[int, str, int] | None] = ContextVar(
+    "cache_active_load", default=None
+)
+
 
 # ============================================================================
 # SMART CACHE MANAGER
 # ============================================================================
 
 
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Walks nested dicts, lists, tuples and sets summing ``sys.getsizeof`` of
+    every object; shared containers are only counted once.
+    """
+    total = 0
+    seen: set[int] = set()
+    stack = [value]
+
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, (dict, list, tuple, set, frozenset)):
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            else:
+                stack.extend(obj)
+        total += sys.getsizeof(obj)
+
+    return total
+
+
 class SmartCacheManager:
     """Production-ready multi-level cache with LRU eviction and monitoring."""
 
@@ -45,6 +93,17 @@ class SmartCacheManager:
         self.l2_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
         self.max_l2_size = 5000  # Max entries in L2 cache
 
+        # Byte budgets - entry counts alone let a few huge message payloads
+        # dominate memory, so each level is also bounded by estimated bytes
+        self.max_l1_bytes = 64 * 1024 * 1024
+        self.max_l2_bytes = 256 * 1024 * 1024
+        self.l1_bytes = 0
+        self.l2_bytes = 0
+        # Entries larger than this share of a level's byte budget are refused
+        self.max_entry_fraction = 0.1
+        # Under byte pressure, evict the largest of this many LRU entries
+        self.eviction_sample_size = 5
+
         # Cache statistics for monitoring
         self.cache_stats = {
             "l1_hits": 0,
@@ -54,8 +113,41 @@ class SmartCacheManager:
             "evictions": 0,
             "invalidations": 0,
             "cleanup_runs": 0,
+            "oversize_rejections": 0,
+            "singleflight_leaders": 0,
+            "coalesced_waiters": 0,
+            "stale_hits": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0,
+            "admission_rejections": 0,
+            "shared_hits": 0,
+            "shared_errors": 0,
+            "remote_invalidations": 0,
+            "stale_load_drops": 0,
         }
 
+        # Optional tier shared with other server processes (see cache_backends);
+        # None keeps caching in-process. Invalidations from other processes
+        # are applied by sync_invalidations every invalidation_poll_interval
+        self.shared_backend: SharedCacheBackend | None = None
+        self.invalidation_poll_interval = 0.5
+        # Called with (kind, value) for each remote invalidation, so other
+        # in-process caches (e.g. the session registry) can follow them
+        self.invalidation_listeners: list[Callable[[str, str], None]] = []
+
+        # W-TinyLFU admission - new entries land in a small per-level LRU
+        # window and only displace main-region entries requested less often,
+        # so bursts of one-off keys (e.g. distinct search queries) cannot
+        # flush hot session entries
+        self.admission_enabled = True
+        self.admission_window_fraction = 0.01
+        self.frequency_sketch = FrequencySketch(self.max_l1_size + self.max_l2_size)
+        self._l1_window: OrderedDict[str, None] = OrderedDict()
+        self._l2_window: OrderedDict[str, None] = OrderedDict()
+
+        # In-flight computations by cache key for single-flight coalescing
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+
         # Cache locks for thread safety
         self.l1_lock = asyncio.Lock()
         self.l2_lock = asyncio.Lock()
@@ -64,10 +156,44 @@ class SmartCacheManager:
         self.default_l1_ttl = 300  # 5 minutes for hot data
         self.default_l2_ttl = 1800  # 30 minutes for warm data
 
+        # Namespace generations - keys under "<prefix>:<id>:" for these prefixes
+        # embed the namespace generation, so bumping it invalidates every entry
+        # in the namespace at once; stale entries age out via LRU/TTL
+        self.generation_prefixes = frozenset({"session", "search", "memory"})
+        self.max_tracked_generations = 50000
+        self._generations: dict[str, int] = {}
+        self._generation_clock = 0
+        # Generation for namespaces not tracked in _generations (raised when
+        # tracking is pruned so pruned namespaces can't resurrect stale entries)
+        self._generation_floor = 0
+        self.generation_bumps = 0
+
+        # Tag secondary index - tag -> cache keys, and cache key -> tags so the
+        # index is kept exact as entries expire, get evicted or are replaced
+        self._tag_index: dict[str, set[str]] = {}
+        self._key_tags: dict[str, frozenset[str]] = {}
+
+        # Stale-while-revalidate - seconds past an entry's (soft) TTL during
+        # which get() serves the stale value and refreshes it in the
+        # background, by key prefix; the hard TTL is the sum of both.
+        # Invalidation still takes effect immediately via generation bumps.
+        self.stale_policies: dict[str, int] = {
+            "session": 30,
+            "search": 60,
+            "memory": 30,
+        }
+        self._refresh_tasks: dict[str, asyncio.Task[None]] = {}
+
     def _generate_cache_key(
         self, key: str, context: dict[str, Any] | None = None
     ) -> str:
-        """Generate consistent cache key with context."""
+        """Generate consistent cache key with namespace generation and context."""
+
+        namespace = self._key_namespace(key)
+        if namespace is not None:
+            generation = self._generations.get(namespace, self._generation_floor)
+            if generation:
+                key = f"{key}#g{generation}"
 
         if context:
             # Sort context for consistent key generation
@@ -79,28 +205,132 @@ class SmartCacheManager:
 
         return key
 
-    async def get(self, key: str, context: dict[str, Any] | None = None) -> Any:
-        """Get value from layered cache with LRU behavior."""
+    @staticmethod
+    def _frequency_key(cache_key: str) -> str:
+        """Strip the generation so access frequency survives invalidation."""
+        marker = cache_key.find("#g")
+        if marker == -1:
+            return cache_key
+        context_sep = cache_key.find(":", marker)
+        return cache_key[:marker] + (
+            cache_key[context_sep:] if context_sep != -1 else ""
+        )
+
+    def _key_namespace(self, key: str) -> str | None:
+        """Return the generation namespace ("<prefix>:<id>") for a key, if any."""
+        prefix, _, rest = key.partition(":")
+        if prefix not in self.generation_prefixes or not rest:
+            return None
+        return f"{prefix}:{rest.partition(':')[0]}"
+
+    def get_generation(self, namespace: str) -> int:
+        """Get the current generation of a cache namespace."""
+        return self._generations.get(namespace, self._generation_floor)
+
+    @contextmanager
+    def loading(
+        self, key: str, context: dict[str, Any] | None = None
+    ) -> Iterator[None]:
+        """
+        Mark the current task as loading ``key`` for a later ``set``.
+
+        The key's namespace generation is captured on entry; if the namespace
+        is invalidated before the load calls ``set``, the value it read may
+        predate the invalidation and ``set`` drops it instead of caching it
+        (and publishing it to the shared tier) under the new generation.
+        """
+        namespace = self._key_namespace(key)
+        if namespace is None:
+            yield
+            return
+        token = _active_load.set((id(self), namespace, self.get_generation(namespace)))
+        try:
+            yield
+        finally:
+            _active_load.reset(token)
+
+    def _is_stale_load(self, key: str) -> bool:
+        """Check whether a set of ``key`` comes from a load an invalidation overtook."""
+        active = _active_load.get()
+        if active is None or active[0] != id(self):
+            return False
+        _, namespace, generation = active
+        return (
+            namespace == self._key_namespace(key)
+            and self.get_generation(namespace) != generation
+        )
+
+    def bump_generation(self, namespace: str) -> int:
+        """
+        Invalidate every entry in a namespace by advancing its generation.
+
+        Args:
+            namespace: Namespace in "<prefix>:<id>" form, e.g. "session:<session_id>"
+
+        Returns:
+            The namespace's new generation
+        """
+        self._generation_clock += 1
+        # Re-insert so dict order tracks how recently each namespace changed
+        self._generations.pop(namespace, None)
+        self._generations[namespace] = self._generation_clock
+        self.generation_bumps += 1
+
+        if len(self._generations) > self.max_tracked_generations:
+            # Forget the least recently bumped half; untracked namespaces move
+            # to the new floor, which invalidates them as well
+            for stale in list(self._generations)[: len(self._generations) // 2]:
+                del self._generations[stale]
+            self._generation_floor = self._generation_clock
+
+        return self._generation_clock
+
+    async def get(
+        self,
+        key: str,
+        context: dict[str, Any] | None = None,
+        refresh: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """
+        Get value from layered cache with LRU behavior.
+
+        Args:
+            key: Cache key
+            context: Extra context folded into the cache key
+            refresh: Coroutine factory that reloads and re-caches the value.
+                When given, an entry past its soft TTL but within its
+                namespace's stale window is returned immediately and one
+                background refresh is scheduled; without it such entries
+                count as misses.
+        """
 
         cache_key = self._generate_cache_key(key, context)
         current_time = time.time()
 
+        if self.admission_enabled:
+            self.frequency_sketch.increment(self._frequency_key(cache_key))
+
         # Check L1 cache first (hot data)
         async with self.l1_lock:
             if cache_key in self.l1_cache:
                 entry = self.l1_cache[cache_key]
 
                 # Check if entry is still valid
-                if current_time <= entry["expires_at"]:
+                if current_time > entry["expires_at"]:
+                    # Entry expired, remove it
+                    self._discard_entry(self.l1_cache, cache_key)
+                elif self._serve_entry(
+                    key, context, cache_key, entry, current_time, refresh
+                ):
                     # Move to end (most recently used)
                     self.l1_cache.move_to_end(cache_key)
+                    if cache_key in self._l1_window:
+                        self._l1_window.move_to_end(cache_key)
                     self.cache_stats["l1_hits"] += 1
 
                     # Log L1 cache hit without sensitive key
                     logger.debug("L1 cache hit")
                     return entry["value"]
-                # Entry expired, remove it
-                del self.l1_cache[cache_key]
 
         # Check L2 cache (warm data)
         async with self.l2_lock:
@@ -108,19 +338,32 @@ class SmartCacheManager:
                 entry = self.l2_cache[cache_key]
 
                 # Check if entry is still valid
-                if current_time <= entry["expires_at"]:
+                if current_time > entry["expires_at"]:
+                    # Entry expired, remove it
+                    self._discard_entry(self.l2_cache, cache_key)
+                elif self._serve_entry(
+                    key, context, cache_key, entry, current_time, refresh
+                ):
                     # Move to end (most recently used)
                     self.l2_cache.move_to_end(cache_key)
+                    if cache_key in self._l2_window:
+                        self._l2_window.move_to_end(cache_key)
                     self.cache_stats["l2_hits"] += 1
 
                     # Promote to L1 cache for faster future access
-                    await self._promote_to_l1(cache_key, entry["value"], entry["ttl"])
+                    await self._promote_to_l1(cache_key, entry)
 
                     # Log L2 cache hit without sensitive key
                     logger.debug("L2 cache hit (promoted to L1)")
                     return entry["value"]
-                # Entry expired, remove it
-                del self.l2_cache[cache_key]
+
+        # Read through to the shared tier of other processes
+        if self.shared_backend is not None:
+            shared_value = await self._get_shared(
+                key, context, cache_key, current_time, refresh
+            )
+            if shared_value is not None:
+                return shared_value
 
         # Cache miss
         self.cache_stats["misses"] += 1
@@ -128,6 +371,120 @@ class SmartCacheManager:
         logger.debug("Cache miss")
         return None
 
+    async def _get_shared(
+        self,
+        key: str,
+        context: dict[str, Any] | None,
+        cache_key: str,
+        current_time: float,
+        refresh: Callable[[], Awaitable[Any]] | None,
+    ) -> Any:
+        """Look a key up in the shared backend and copy hits into local tiers."""
+        entry = await self._shared_call("get", self._frequency_key(cache_key))
+        if entry is None or not self._serve_entry(
+            key, context, cache_key, entry, current_time, refresh
+        ):
+            return None
+
+        self.cache_stats["l2_hits"] += 1
+        self.cache_stats["shared_hits"] += 1
+
+        value = entry["value"]
+        size = estimate_size(value)
+        target = (
+            "l1"
+            if entry["ttl"] <= self.default_l1_ttl and self._fits_level("l1", size)
+            else "l2"
+        )
+        if self._fits_level(target, size):
+            self._track_tags(cache_key, entry["tags"])
+            local_entry = {
+                "value": value,
+                "created_at": current_time,
+                "stale_at": entry["stale_at"],
+                "expires_at": entry["expires_at"],
+                "ttl": entry["ttl"],
+                "access_count": 1,
+                "size": size,
+            }
+            if target == "l1":
+                await self._set_l1(cache_key, local_entry)
+            else:
+                await self._set_l2(cache_key, local_entry)
+
+        logger.debug("Shared cache hit")
+        return value
+
+    async def _shared_call(self, operation: str, *args: Any) -> Any:
+        """Call the shared backend; failures are logged and never raised."""
+        backend = self.shared_backend
+        if backend is None:
+            return None
+        try:
+            return await getattr(backend, operation)(*args)
+        except Exception:
+            self.cache_stats["shared_errors"] += 1
+            logger.warning("Shared cache %s failed", operation, exc_info=True)
+            return None
+
+    def _serve_entry(
+        self,
+        key: str,
+        context: dict[str, Any] | None,
+        cache_key: str,
+        entry: dict[str, Any],
+        current_time: float,
+        refresh: Callable[[], Awaitable[Any]] | None,
+    ) -> bool:
+        """Check whether an unexpired entry may be served, revalidating stale ones."""
+        if current_time <= entry.get("stale_at", entry["expires_at"]):
+            return True
+        if refresh is None:
+            return False
+
+        self.cache_stats["stale_hits"] += 1
+        self._schedule_refresh(key, context, cache_key, refresh)
+        return True
+
+    def _stale_window(self, key: str) -> int:
+        """Get the stale-while-revalidate window for a key's namespace."""
+        return self.stale_policies.get(key.partition(":")[0], 0)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        context: dict[str, Any] | None,
+        cache_key: str,
+        refresh: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Start one background refresh per key unless a load is already running."""
+        if cache_key in self._refresh_tasks or cache_key in self._inflight:
+            return
+
+        self.cache_stats["background_refreshes"] += 1
+        task = asyncio.create_task(self._refresh_entry(key, context, refresh))
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(cache_key, None))
+
+    async def _refresh_entry(
+        self,
+        key: str,
+        context: dict[str, Any] | None,
+        refresh: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Run a background refresh, sharing it with concurrent misses."""
+        try:
+            await self.single_flight(key, refresh, context)
+        except Exception:
+            self.cache_stats["refresh_failures"] += 1
+            logger.warning("Background cache refresh failed", exc_info=True)
+
+    def _cancel_refreshes(self) -> None:
+        """Cancel pending background refreshes."""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+
     async def set(
         self,
         key: str,
@@ -135,8 +492,27 @@ class SmartCacheManager:
         ttl: int | None = None,
         context: dict[str, Any] | None = None,
         level: str = "auto",
+        tags: Iterable[str] | None = None,
     ) -> None:
-        """Set value in layered cache with automatic level selection."""
+        """
+        Set value in layered cache with automatic level selection.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time to live in seconds (defaults by level); for namespaces
+                with a stale window this is the soft TTL
+            context: Extra context folded into the cache key
+            level: "l1", "l2" or "auto"
+            tags: Tags such as "session:<id>" or "agent:<id>" that
+                invalidate_tag can later evict this entry by
+        """
+
+        if self._is_stale_load(key):
+            # The load read its value before the namespace was invalidated
+            self.cache_stats["stale_load_drops"] += 1
+            logger.debug("Dropped cache set from a load started before invalidation")
+            return
 
         cache_key = self._generate_cache_key(key, context)
         current_time = time.time()
@@ -145,74 +521,289 @@ class SmartCacheManager:
         if ttl is None:
             ttl = self.default_l1_ttl if level == "l1" else self.default_l2_ttl
 
-        expires_at = current_time + ttl
+        # ttl is the soft TTL; namespaces with a stale window stay servable
+        # (with background revalidation) until the hard TTL
+        stale_at = current_time + ttl
+        expires_at = stale_at + self._stale_window(key)
+        size = estimate_size(value)
+
+        # Determine cache level
+        if level == "l1" or (level == "auto" and ttl <= self.default_l1_ttl):
+            target = "l1"
+            # Short-lived entries too large for L1 may still fit L2's budget
+            if level == "auto" and not self._fits_level("l1", size):
+                target = "l2"
+        else:
+            # Default to L2 for longer-lived data
+            target = "l2"
+
+        if not self._fits_level(target, size):
+            # Refuse oversized entries and drop any older value under the key
+            self.cache_stats["oversize_rejections"] += 1
+            await self.invalidate_key(cache_key)
+            logger.debug("Refused oversized cache entry (%d bytes)", size)
+            return
 
+        self._track_tags(cache_key, tags)
         cache_entry = {
             "value": value,
             "created_at": current_time,
+            "stale_at": stale_at,
             "expires_at": expires_at,
             "ttl": ttl,
             "access_count": 1,
+            "size": size,
         }
 
-        # Determine cache level
-        if level == "l1" or (level == "auto" and ttl <= self.default_l1_ttl):
+        if target == "l1":
             await self._set_l1(cache_key, cache_entry)
-        elif level == "l2" or (level == "auto" and ttl > self.default_l1_ttl):
-            await self._set_l2(cache_key, cache_entry)
         else:
-            # Default to L2 for longer-lived data
             await self._set_l2(cache_key, cache_entry)
 
+        # Write through so other processes can serve this entry
+        if self.shared_backend is not None:
+            await self._shared_call(
+                "set",
+                self._frequency_key(cache_key),
+                cache_entry,
+                self._key_namespace(key),
+                frozenset(tags or ()),
+            )
+
         self.cache_stats["sets"] += 1
         # Log cache set without sensitive key
         logger.debug("Cached value (TTL: %ds, Level: %s)", ttl, level)
 
     async def _set_l1(self, cache_key: str, cache_entry: dict[str, Any]) -> None:
-        """Set value in L1 cache with LRU eviction."""
+        """Set value in L1 cache with LRU eviction and TinyLFU admission."""
 
         async with self.l1_lock:
-            # Evict LRU items if cache is full
-            while len(self.l1_cache) >= self.max_l1_size:
-                lru_key, _ = self.l1_cache.popitem(
-                    last=False
-                )  # Remove least recently used
-                self.cache_stats["evictions"] += 1
-                # Log L1 eviction without sensitive key
-                logger.debug("Evicted LRU item from L1")
-
+            self._discard_entry(self.l1_cache, cache_key, untrack=False)
+            self._make_room(
+                self.l1_cache,
+                self.max_l1_size,
+                self.max_l1_bytes - cache_entry["size"],
+            )
             self.l1_cache[cache_key] = cache_entry
+            self.l1_bytes += cache_entry["size"]
+            self._enter_window(self._l1_window, cache_key, self.max_l1_size)
 
     async def _set_l2(self, cache_key: str, cache_entry: dict[str, Any]) -> None:
-        """Set value in L2 cache with LRU eviction."""
+        """Set value in L2 cache with LRU eviction and TinyLFU admission."""
 
         async with self.l2_lock:
-            # Evict LRU items if cache is full
-            while len(self.l2_cache) >= self.max_l2_size:
-                lru_key, _ = self.l2_cache.popitem(
-                    last=False
-                )  # Remove least recently used
-                self.cache_stats["evictions"] += 1
-                # Log L2 eviction without sensitive key
-                logger.debug("Evicted LRU item from L2")
-
+            self._discard_entry(self.l2_cache, cache_key, untrack=False)
+            self._make_room(
+                self.l2_cache,
+                self.max_l2_size,
+                self.max_l2_bytes - cache_entry["size"],
+            )
             self.l2_cache[cache_key] = cache_entry
+            self.l2_bytes += cache_entry["size"]
+            self._enter_window(self._l2_window, cache_key, self.max_l2_size)
+
+    def _window_size(self, max_entries: int) -> int:
+        return max(1, int(max_entries * self.admission_window_fraction))
+
+    def _enter_window(
+        self, window: OrderedDict[str, None], cache_key: str, max_entries: int
+    ) -> None:
+        """Add a new entry to the admission window, graduating the oldest."""
+        window[cache_key] = None
+        while len(window) > self._window_size(max_entries):
+            # Oldest window entry moves to the main region
+            window.popitem(last=False)
+
+    def _fits_level(self, level: str, size: int) -> bool:
+        """Check an entry against a level's maximum entry share."""
+        max_bytes = self.max_l1_bytes if level == "l1" else self.max_l2_bytes
+        return size <= max_bytes * self.max_entry_fraction
+
+    def _make_room(
+        self, cache: OrderedDict[str, dict[str, Any]], max_entries: int, max_bytes: int
+    ) -> None:
+        """
+        Evict entries until one more entry fits the entry and byte limits.
+
+        Entry-count pressure evicts in plain LRU order. Byte pressure uses
+        size-weighted LRU: the largest of the ``eviction_sample_size`` least
+        recently used entries goes first, so one big payload is dropped
+        instead of many small hot entries.
 
-    async def _promote_to_l1(self, cache_key: str, value: Any, ttl: int) -> None:
+        With admission enabled (W-TinyLFU), that victim is taken from the main
+        region only and compared with the oldest entry of the full admission
+        window; whichever has been requested less often is evicted, so
+        one-off keys cannot push out frequently used ones.
+        """
+        level = "L1" if cache is self.l1_cache else "L2"
+        window = self._l1_window if cache is self.l1_cache else self._l2_window
+        admission = self.admission_enabled and len(window) >= self._window_size(
+            max_entries
+        )
+
+        while len(cache) >= max_entries:
+            if admission:
+                victim_key = next(
+                    (key for key in cache if key not in window), next(iter(cache))
+                )
+                victim_key = self._admission_victim(window, victim_key)
+            else:
+                victim_key = next(iter(cache))  # Least recently used
+            self._discard_entry(cache, victim_key)
+            self.cache_stats["evictions"] += 1
+            logger.debug("Evicted LRU item from %s", level)
+
+        used_bytes = self.l1_bytes if cache is self.l1_cache else self.l2_bytes
+        while cache and used_bytes > max_bytes:
+            if admission:
+                main_keys = (key for key in cache if key not in window)
+                sample = [
+                    (key, cache[key])
+                    for key in islice(main_keys, self.eviction_sample_size)
+                ]
+            else:
+                sample = list(islice(cache.items(), self.eviction_sample_size))
+            if sample:
+                victim_key, _ = max(sample, key=lambda item: item[1].get("size", 0))
+                if admission:
+                    victim_key = self._admission_victim(window, victim_key)
+            else:
+                victim_key = next(iter(cache))
+            used_bytes -= self._discard_entry(cache, victim_key)
+            self.cache_stats["evictions"] += 1
+            logger.debug("Evicted large LRU item from %s (byte budget)", level)
+
+    def _admission_victim(
+        self, window: OrderedDict[str, None], main_victim: str
+    ) -> str:
+        """
+        TinyLFU duel between the window's oldest entry and a main-region victim.
+
+        Ties go to the window candidate, which keeps plain LRU order among
+        keys of equal popularity.
+        """
+        candidate = next(iter(window), None)
+        if candidate is None or candidate == main_victim:
+            return main_victim
+
+        sketch = self.frequency_sketch
+        if sketch.frequency(self._frequency_key(candidate)) >= sketch.frequency(
+            self._frequency_key(main_victim)
+        ):
+            # Candidate graduates to the main region in the victim's place
+            window.pop(candidate)
+            return main_victim
+
+        self.cache_stats["admission_rejections"] += 1
+        return candidate
+
+    def _discard_entry(
+        self,
+        cache: OrderedDict[str, dict[str, Any]],
+        cache_key: str,
+        untrack: bool = True,
+    ) -> int:
+        """
+        Remove an entry from one level, keeping byte counts and tags in sync.
+
+        Returns:
+            Estimated size of the removed entry (0 if it was not present)
+        """
+        entry = cache.pop(cache_key, None)
+        if entry is None:
+            return 0
+
+        size = int(entry.get("size", 0))
+        if cache is self.l1_cache:
+            self.l1_bytes = max(0, self.l1_bytes - size)
+            self._l1_window.pop(cache_key, None)
+        else:
+            self.l2_bytes = max(0, self.l2_bytes - size)
+            self._l2_window.pop(cache_key, None)
+
+        if untrack:
+            self._untrack_key(cache_key)
+        return size
+
+    async def _promote_to_l1(self, cache_key: str, entry: dict[str, Any]) -> None:
         """Promote frequently accessed item from L2 to L1."""
 
-        # Only promote if TTL is suitable for L1
-        if ttl <= self.default_l1_ttl:
+        ttl = entry["ttl"]
+        size = entry.get("size", 0)
+
+        # Only promote if TTL is suitable for L1 and the entry fits its budget
+        if ttl <= self.default_l1_ttl and self._fits_level("l1", size):
+            # Keep the original deadlines so promotion never refreshes staleness
             cache_entry = {
-                "value": value,
+                "value": entry["value"],
                 "created_at": time.time(),
-                "expires_at": time.time() + ttl,
+                "stale_at": entry.get("stale_at", entry["expires_at"]),
+                "expires_at": entry["expires_at"],
                 "ttl": ttl,
                 "access_count": 1,
+                "size": size,
             }
 
             await self._set_l1(cache_key, cache_entry)
 
+    async def single_flight(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        context: dict[str, Any] | None = None,
+    ) -> Any:
+        """
+        Run ``compute`` once for concurrent callers missing the same key.
+
+        The first caller computes; callers arriving while it is in flight
+        await and share its result (or exception). If the first caller is
+        cancelled, one waiter takes over the computation instead of every
+        waiter failing. Keys include the namespace generation, so computations
+        started before an invalidation are never joined by callers after it.
+
+        Args:
+            key: Cache key (as passed to get/set)
+            compute: Coroutine factory that loads (and typically caches) the value
+            context: Cache key context
+
+        Returns:
+            Result of the shared computation
+        """
+        cache_key = self._generate_cache_key(key, context)
+
+        joined = False
+        while (inflight := self._inflight.get(cache_key)) is not None:
+            if not joined:
+                self.cache_stats["coalesced_waiters"] += 1
+                joined = True
+            # wait() neither cancels the shared computation when this waiter
+            # is cancelled nor raises when the leader is
+            await asyncio.wait((inflight,))
+            if not inflight.cancelled():
+                return inflight.result()
+            # The leader was cancelled: retry, the first waiter becomes leader
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved even when nobody joined the flight
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[cache_key] = future
+        self.cache_stats["singleflight_leaders"] += 1
+
+        try:
+            with self.loading(key, context):
+                result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(cache_key, None)
+
     async def invalidate(self, key: str, context: dict[str, Any] | None = None) -> None:
         """Invalidate cache entry from both levels."""
 
@@ -221,7 +812,7 @@ class SmartCacheManager:
         # Remove from L1 cache
         async with self.l1_lock:
             if cache_key in self.l1_cache:
-                del self.l1_cache[cache_key]
+                self._discard_entry(self.l1_cache, cache_key)
                 self.cache_stats["invalidations"] += 1
                 # Log L1 invalidation without sensitive key
                 logger.debug("Invalidated L1 cache entry")
@@ -229,11 +820,13 @@ class SmartCacheManager:
         # Remove from L2 cache
         async with self.l2_lock:
             if cache_key in self.l2_cache:
-                del self.l2_cache[cache_key]
+                self._discard_entry(self.l2_cache, cache_key)
                 self.cache_stats["invalidations"] += 1
                 # Log L2 cache invalidation without sensitive key
                 logger.debug("Invalidated L2 cache entry")
 
+        await self._shared_call("delete", self._frequency_key(cache_key))
+
     async def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate all cache entries matching a pattern."""
 
@@ -267,15 +860,137 @@ class SmartCacheManager:
         # Remove from L1 cache
         async with self.l1_lock:
             if cache_key in self.l1_cache:
-                del self.l1_cache[cache_key]
+                self._discard_entry(self.l1_cache, cache_key)
                 self.cache_stats["invalidations"] += 1
 
         # Remove from L2 cache
         async with self.l2_lock:
             if cache_key in self.l2_cache:
-                del self.l2_cache[cache_key]
+                self._discard_entry(self.l2_cache, cache_key)
                 self.cache_stats["invalidations"] += 1
 
+        await self._shared_call("delete", self._frequency_key(cache_key))
+
+    async def invalidate_namespace(self, namespace: str) -> None:
+        """
+        Invalidate a namespace here and in every process sharing the backend.
+
+        Args:
+            namespace: Namespace in "<prefix>:<id>" form, e.g. "session:<session_id>"
+        """
+        self.bump_generation(namespace)
+        await self._shared_call("invalidate_namespace", namespace)
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every entry tagged with ``tag`` from both levels.
+
+        Runs in O(k) for k tagged entries and frees them immediately rather
+        than leaving them to LRU/TTL. With a shared backend the tag is
+        invalidated in other processes as well.
+
+        Returns:
+            Number of local cache keys removed
+        """
+        removed = await self._invalidate_tag_local(tag)
+        await self._shared_call("invalidate_tag", tag)
+        return removed
+
+    async def _invalidate_tag_local(self, tag: str) -> int:
+        """Remove tagged entries from this process's tiers."""
+        cache_keys = self._tag_index.pop(tag, None)
+        if not cache_keys:
+            return 0
+
+        async with self.l1_lock:
+            for cache_key in cache_keys:
+                if cache_key in self.l1_cache:
+                    self._discard_entry(self.l1_cache, cache_key, untrack=False)
+                    self.cache_stats["invalidations"] += 1
+
+        async with self.l2_lock:
+            for cache_key in cache_keys:
+                if cache_key in self.l2_cache:
+                    self._discard_entry(self.l2_cache, cache_key, untrack=False)
+                    self.cache_stats["invalidations"] += 1
+
+        for cache_key in cache_keys:
+            self._untrack_key(cache_key)
+
+        logger.debug("Invalidated %d cache entries by tag", len(cache_keys))
+        return len(cache_keys)
+
+    def _track_tags(self, cache_key: str, tags: Iterable[str] | None) -> None:
+        """Record the tags of a (possibly replaced) cache entry."""
+        self._forget_tags(cache_key)
+        if not tags:
+            return
+
+        key_tags = frozenset(tags)
+        self._key_tags[cache_key] = key_tags
+        for tag in key_tags:
+            self._tag_index.setdefault(tag, set()).add(cache_key)
+
+    def _untrack_key(self, cache_key: str) -> None:
+        """Drop a key from the tag index once it is gone from both levels."""
+        if cache_key not in self.l1_cache and cache_key not in self.l2_cache:
+            self._forget_tags(cache_key)
+
+    def _forget_tags(self, cache_key: str) -> None:
+        key_tags = self._key_tags.pop(cache_key, None)
+        if not key_tags:
+            return
+
+        for tag in key_tags:
+            tagged = self._tag_index.get(tag)
+            if tagged is not None:
+                tagged.discard(cache_key)
+                if not tagged:
+                    del self._tag_index[tag]
+
+    async def sync_invalidations(self) -> int:
+        """
+        Apply invalidations published by other processes to the local tiers.
+
+        Returns:
+            Number of remote invalidations applied
+        """
+        if self.shared_backend is None:
+            return 0
+
+        events = await self._shared_call("poll_invalidations")
+        if not events:
+            return 0
+
+        for kind, value in events:
+            if kind == "namespace":
+                self.bump_generation(value)
+            elif kind == "tag":
+                await self._invalidate_tag_local(value)
+            elif kind == "key":
+                await self._invalidate_local_by_shared_key(value)
+            elif kind == "clear":
+                await self._clear_local()
+            for listener in self.invalidation_listeners:
+                listener(kind, value)
+
+        self.cache_stats["remote_invalidations"] += len(events)
+        logger.debug("Applied %d remote cache invalidations", len(events))
+        return len(events)
+
+    async def _invalidate_local_by_shared_key(self, shared_key: str) -> None:
+        """Drop local entries stored under any generation of a shared key."""
+        for cache, lock in (
+            (self.l1_cache, self.l1_lock),
+            (self.l2_cache, self.l2_lock),
+        ):
+            async with lock:
+                for cache_key in [
+                    key for key in cache if self._frequency_key(key) == shared_key
+                ]:
+                    self._discard_entry(cache, cache_key)
+                    self.cache_stats["invalidations"] += 1
+
     async def cleanup_expired(self) -> int:
         """Remove expired entries from both cache levels."""
 
@@ -291,7 +1006,7 @@ class SmartCacheManager:
             ]
 
             for key in expired_keys:
-                del self.l1_cache[key]
+                self._discard_entry(self.l1_cache, key)
                 expired_count += 1
 
         # Cleanup L2 cache
@@ -303,9 +1018,11 @@ class SmartCacheManager:
             ]
 
             for key in expired_keys:
-                del self.l2_cache[key]
+                self._discard_entry(self.l2_cache, key)
                 expired_count += 1
 
+        await self._shared_call("cleanup_expired")
+
         if expired_count > 0:
             self.cache_stats["cleanup_runs"] += 1
             # CodeQL: This logging statement uses non-sensitive data only
@@ -349,6 +1066,48 @@ class SmartCacheManager:
                 "l2_max_size": self.max_l2_size,
                 "l1_utilization": len(self.l1_cache) / self.max_l1_size,
                 "l2_utilization": len(self.l2_cache) / self.max_l2_size,
+                "l1_bytes": self.l1_bytes,
+                "l2_bytes": self.l2_bytes,
+                "total_bytes": self.l1_bytes + self.l2_bytes,
+                "l1_max_bytes": self.max_l1_bytes,
+                "l2_max_bytes": self.max_l2_bytes,
+                "l1_byte_utilization": self.l1_bytes / self.max_l1_bytes,
+                "l2_byte_utilization": self.l2_bytes / self.max_l2_bytes,
+            },
+            "generations": {
+                "tracked_namespaces": len(self._generations),
+                "bumps": self.generation_bumps,
+                "stale_load_drops": self.cache_stats["stale_load_drops"],
+            },
+            "tags": {
+                "tracked_tags": len(self._tag_index),
+                "tagged_entries": len(self._key_tags),
+            },
+            "single_flight": {
+                "in_flight": len(self._inflight),
+                "leaders": self.cache_stats["singleflight_leaders"],
+                "coalesced_waiters": self.cache_stats["coalesced_waiters"],
+            },
+            "admission": {
+                "enabled": self.admission_enabled,
+                "rejections": self.cache_stats["admission_rejections"],
+                "sketch_width": self.frequency_sketch.width,
+                "sketch_resets": self.frequency_sketch.resets,
+            },
+            "shared_backend": {
+                "backend": self.shared_backend.name
+                if self.shared_backend is not None
+                else "in_process",
+                "shared_hits": self.cache_stats["shared_hits"],
+                "errors": self.cache_stats["shared_errors"],
+                "remote_invalidations": self.cache_stats["remote_invalidations"],
+            },
+            "stale_while_revalidate": {
+                "policies": dict(self.stale_policies),
+                "stale_hits": self.cache_stats["stale_hits"],
+                "background_refreshes": self.cache_stats["background_refreshes"],
+                "refresh_failures": self.cache_stats["refresh_failures"],
+                "refreshing": len(self._refresh_tasks),
             },
             "total_requests": total_requests,
             "health_status": self._get_cache_health(),
@@ -380,16 +1139,40 @@ class SmartCacheManager:
         return "poor"
 
     async def clear_all(self) -> None:
-        """Clear all cache entries."""
+        """Clear all cache entries, including the shared tier."""
+
+        await self._clear_local()
+        await self._shared_call("clear")
+
+    async def _clear_local(self) -> None:
+        """Clear this process's cache entries."""
 
         async with self.l1_lock:
             self.l1_cache.clear()
+            self.l1_bytes = 0
 
         async with self.l2_lock:
             self.l2_cache.clear()
+            self.l2_bytes = 0
+
+        # No entries are left to shadow or index, so start the indexes over
+        self._reset_key_indexes()
 
         logger.info("Cleared all cache entries")
 
+    def _reset_key_indexes(self) -> None:
+        """Reset generations, the tag index, access frequencies and refreshes."""
+        # A refresh finishing after the reset could re-cache pre-reset data
+        self._cancel_refreshes()
+        self._generations.clear()
+        self._generation_clock = 0
+        self._generation_floor = 0
+        self._tag_index.clear()
+        self._key_tags.clear()
+        self.frequency_sketch.clear()
+        self._l1_window.clear()
+        self._l2_window.clear()
+
     async def reset_for_testing(self) -> None:
         """
         Reset cache state for testing environments.
@@ -400,9 +1183,11 @@ class SmartCacheManager:
         # Clear all cache entries
         async with self.l1_lock:
             self.l1_cache.clear()
+            self.l1_bytes = 0
 
         async with self.l2_lock:
             self.l2_cache.clear()
+            self.l2_bytes = 0
 
         # Reset cache statistics
         self.cache_stats = {
@@ -413,7 +1198,20 @@ class SmartCacheManager:
             "evictions": 0,
             "invalidations": 0,
             "cleanup_runs": 0,
+            "oversize_rejections": 0,
+            "singleflight_leaders": 0,
+            "coalesced_waiters": 0,
+            "stale_hits": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0,
+            "admission_rejections": 0,
+            "shared_hits": 0,
+            "shared_errors": 0,
+            "remote_invalidations": 0,
+            "stale_load_drops": 0,
         }
+        self._reset_key_indexes()
+        self.generation_bumps = 0
 
         logger.debug("Cache state reset for testing")
 
@@ -456,18 +1254,16 @@ async def invalidate_session_cache(
 ) -> None:
     """Invalidate all cached data for a session after mutations."""
 
-    # Invalidate session-specific caches
-    patterns = [
-        f"session:{session_id}",
-        f"search:{session_id}",
-    ]
+    # Bump session-specific namespaces (O(1), no cache scan)
+    await cache_manager.invalidate_namespace(f"session:{session_id}")
+    await cache_manager.invalidate_namespace(f"search:{session_id}")
 
-    invalidated_count = 0
-    for pattern in patterns:
-        invalidated_count += await cache_manager.invalidate_pattern(pattern)
+    # Free tagged session entries now instead of leaving them to LRU/TTL
+    freed_count = await cache_manager.invalidate_tag(f"session:{session_id}")
 
     logger.debug(
-        f"Invalidated {invalidated_count} cache entries for session {session_id}"
+        f"Invalidated cache namespaces for session {session_id} "
+        f"({freed_count} tagged entries freed)"
     )
 
 
@@ -476,11 +1272,10 @@ async def invalidate_agent_memory_cache(
 ) -> None:
     """Invalidate agent memory caches after mutations."""
 
-    pattern = f"memory:{agent_id}"
-    invalidated_count = await cache_manager.invalidate_pattern(pattern)
+    await cache_manager.invalidate_namespace(f"memory:{agent_id}")
 
     # Log cache invalidation without sensitive agent ID
-    logger.debug("Invalidated %d memory cache entries", invalidated_count)
+    logger.debug("Invalidated agent memory cache namespace")
 
 
 # ============================================================================
@@ -535,9 +1330,84 @@ async def cache_maintenance_task() -> None:
             # Continue the loop - don't add extra sleep here since we already sleep above
 
 
+def configure_cache_budgets(manager: SmartCacheManager) -> None:
+    """Apply configured byte budgets and stale windows to a cache manager."""
+    try:
+        from ..config import get_operational_config
+
+        operational = get_operational_config()
+    except Exception:
+        logger.debug("Using default cache byte budgets")
+        return
+
+    manager.max_l1_bytes = operational.cache_l1_max_bytes
+    manager.max_l2_bytes = operational.cache_l2_max_bytes
+    manager.max_entry_fraction = operational.cache_max_entry_fraction
+    manager.stale_policies = {
+        "session": operational.cache_stale_session_seconds,
+        "search": operational.cache_stale_search_seconds,
+        "memory": operational.cache_stale_memory_seconds,
+    }
+
+
+def configure_cache_backend(manager: SmartCacheManager) -> None:
+    """Attach the configured shared L2 backend to a cache manager."""
+    if manager.shared_backend is not None:
+        return
+
+    try:
+        from ..config import get_operational_config
+
+        operational = get_operational_config()
+    except Exception:
+        logger.debug("Using in-process cache backend")
+        return
+
+    from .cache_backends import create_shared_backend
+
+    manager.shared_backend = create_shared_backend(
+        operational.cache_shared_backend, operational.cache_shared_path
+    )
+    manager.invalidation_poll_interval = operational.cache_invalidation_poll_interval
+    if manager.shared_backend is not None:
+        logger.info("Using shared cache backend: %s", manager.shared_backend.name)
+
+        # Corpora only see in-process appends; drop them when another process
+        # writes to the session
+        from .search_corpus import search_corpus_manager
+
+        listener = search_corpus_manager.apply_invalidation
+        if listener not in manager.invalidation_listeners:
+            manager.invalidation_listeners.append(listener)
+
+
+async def cache_invalidation_listener(manager: SmartCacheManager) -> None:
+    """Background task applying cache invalidations from other processes."""
+
+    while True:
+        await asyncio.sleep(manager.invalidation_poll_interval)
+        await manager.sync_invalidations()
+
+
+async def _run_shared_cache_tasks(manager: SmartCacheManager) -> None:
+    """Run cache maintenance and the invalidation listener together."""
+    try:
+        await asyncio.gather(
+            cache_maintenance_task(), cache_invalidation_listener(manager)
+        )
+    finally:
+        backend, manager.shared_backend = manager.shared_backend, None
+        if backend is not None:
+            await backend.close()
+
+
 async def start_cache_maintenance() -> asyncio.Task[None]:
     """Start the cache maintenance background task."""
 
+    configure_cache_budgets(cache_manager)
+    configure_cache_backend(cache_manager)
+    if cache_manager.shared_backend is not None:
+        return asyncio.create_task(_run_shared_cache_tasks(cache_manager))
     return asyncio.create_task(cache_maintenance_task())
 
 
@@ -553,28 +1423,40 @@ async def cached_operation(
     context: dict[str, Any] | None = None,
     force_refresh: bool = False,
 ) -> Any:
-    """Execute operation with caching support."""
+    """Execute operation with caching support and single-flight coalescing."""
+
+    async def load() -> Any:
+        # Execute operation
+        result = await operation_func()
+
+        # Cache the result
+        await cache_manager.set(cache_key, result, ttl, context)
 
-    # Check cache first (unless force refresh)
-    if not force_refresh:
-        cached_result = await cache_manager.get(cache_key, context)
-        if cached_result is not None:
-            return cached_result
+        return result
 
-    # Execute operation
-    result = await operation_func()
+    # A forced refresh must not join a computation that started earlier
+    if force_refresh:
+        with cache_manager.loading(cache_key, context):
+            return await load()
 
-    # Cache the result
-    await cache_manager.set(cache_key, result, ttl, context)
+    # Check cache first; stale entries are served while load runs in background
+    cached_result = await cache_manager.get(cache_key, context, refresh=load)
+    if cached_result is not None:
+        return cached_result
 
-    return result
+    # Concurrent misses share one in-flight operation
+    return await cache_manager.single_flight(cache_key, load, context)
 
 
 def get_cache_performance_metrics() -> dict[str, Any]:
     """Get cache performance metrics for monitoring."""
+    from .search_corpus import search_corpus_manager
+    from .session_registry import session_registry
 
     return {
         "success": True,
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "cache_performance": cache_manager.get_cache_stats(),
+        "search_corpus": search_corpus_manager.get_stats(),
+        "session_registry": session_registry.get_stats(),
     }
@@ -0,0 +1,114 @@
+"""
+Approximate access-frequency sketch for TinyLFU cache admission.
+
+Combines a Count-Min sketch of small saturating counters with a doorkeeper
+Bloom filter:
+- the first access of a key only sets its doorkeeper bits, so the long tail
+  of one-off keys never touches the counters
+- repeat accesses increment the key's counters (capped at 15)
+- after ``sample_size`` recorded accesses all counters are halved and the
+  doorkeeper is cleared, so old popularity decays and new hot keys can win
+
+The estimate for a key is the minimum of its counters plus one if the
+doorkeeper has seen it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# 4-bit style saturation keeps counters comparable after halving
+_MAX_COUNT = 15
+_HASH_MASK = (1 << 64) - 1
+
+
+class FrequencySketch:
+    """Count-Min sketch with a doorkeeper filter and periodic aging."""
+
+    def __init__(self, capacity: int, depth: int = 4) -> None:
+        """
+        Size the sketch for a cache holding about ``capacity`` entries.
+
+        Args:
+            capacity: Expected number of cached entries
+            depth: Number of counter rows (independent hash functions)
+        """
+        capacity = max(16, capacity)
+        # Power-of-two widths turn the modulo into a mask
+        self.width = 1 << (capacity - 1).bit_length()
+        self.depth = depth
+        self.sample_size = 10 * capacity
+        self.additions = 0
+        self.resets = 0
+
+        self._mask = self.width - 1
+        self._counters = bytearray(self.width * depth)
+        # Doorkeeper Bloom filter with 8 bits per sketch column
+        self._doorkeeper_bits = self.width * 8
+        self._doorkeeper = bytearray(self.width)
+
+    @staticmethod
+    def _hashes(key: Any) -> tuple[int, int]:
+        """Derive two hashes for double hashing from one 64-bit hash."""
+        hashed = hash(key) & _HASH_MASK
+        return hashed & 0xFFFFFFFF, (hashed >> 32) | 1
+
+    def _doorkeeper_positions(self, h1: int, h2: int) -> tuple[int, int]:
+        bits = self._doorkeeper_bits
+        return h1 % bits, (h1 + h2) % bits
+
+    def _counter_indexes(self, h1: int, h2: int) -> list[int]:
+        width, mask = self.width, self._mask
+        return [row * width + ((h1 + row * h2) & mask) for row in range(self.depth)]
+
+    def increment(self, key: Any) -> None:
+        """Record one access of ``key``."""
+        h1, h2 = self._hashes(key)
+
+        doorkeeper = self._doorkeeper
+        first, second = self._doorkeeper_positions(h1, h2)
+        if not (
+            doorkeeper[first >> 3] & (1 << (first & 7))
+            and doorkeeper[second >> 3] & (1 << (second & 7))
+        ):
+            # First sighting only goes to the doorkeeper
+            doorkeeper[first >> 3] |= 1 << (first & 7)
+            doorkeeper[second >> 3] |= 1 << (second & 7)
+        else:
+            counters = self._counters
+            for index in self._counter_indexes(h1, h2):
+                if counters[index] < _MAX_COUNT:
+                    counters[index] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.reset()
+
+    def frequency(self, key: Any) -> int:
+        """Estimate how often ``key`` was accessed in the current sample."""
+        h1, h2 = self._hashes(key)
+
+        first, second = self._doorkeeper_positions(h1, h2)
+        doorkeeper = self._doorkeeper
+        seen = bool(
+            doorkeeper[first >> 3] & (1 << (first & 7))
+            and doorkeeper[second >> 3] & (1 << (second & 7))
+        )
+
+        counters = self._counters
+        count = min(counters[index] for index in self._counter_indexes(h1, h2))
+        return count + 1 if seen else count
+
+    def reset(self) -> None:
+        """Age the sketch: halve every counter and clear the doorkeeper."""
+        self._counters = bytearray(count >> 1 for count in self._counters)
+        self._doorkeeper = bytearray(self.width)
+        self.additions //= 2
+        self.resets += 1
+
+    def clear(self) -> None:
+        """Forget all recorded accesses."""
+        self._counters = bytearray(self.width * self.depth)
+        self._doorkeeper = bytearray(self.width)
+        self.additions = 0
+        self.resets = 0
@@ -53,6 +53,8 @@ async def start_performance_monitoring() -> asyncio.Task[None]:
 
 def get_performance_metrics_dict() -> dict[str, Any]:
     """Get performance metrics using SQLAlchemy backend."""
+    from ..audit_writer import audit_writer
+    from ..database_write_queue import write_queue
 
     try:
         # Return simplified metrics for SQLAlchemy-only architecture
@@ -86,6 +88,8 @@ def get_performance_metrics_dict() -> dict[str, Any]:
                     "error_rate": 0.0,
                 },
                 "health_status": "healthy",
+                "write_queue": write_queue.get_stats(),
+                "audit_writer": audit_writer.get_stats(),
             },
             "system_info": {
                 "database_backend": "sqlalchemy",
@@ -0,0 +1,404 @@
+"""
+In-process per-session search corpus for RapidFuzz queries.
+
+Keeps a columnar, append-only copy of each hot session's searchable data:
+- message ids (sorted array) and the message payload returned in results
+- pre-normalized search text, with and without metadata values
+- visibility and sender columns for per-agent filtering
+
+search_context consults the corpus before touching the database, so repeated
+searches against a hot session skip both the database round trip and the
+per-row JSON parsing / lowercasing. add_message appends new rows, messages
+written by other processes drop the session's corpus through the shared cache
+invalidations, and whole sessions are evicted in LRU order once the session
+or byte budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any
+
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry overhead (payload dict, list slots, ints) on top of text bytes
+_ENTRY_OVERHEAD_BYTES = 256
+
+# Cache namespace bumped whenever a session's messages change
+_SESSION_NAMESPACE_PREFIX = "session:"
+
+
+def build_searchable_text(msg: dict[str, Any], include_metadata: bool) -> str:
+    """Build the lowercased text RapidFuzz scores for a message."""
+    text_parts = [msg.get("sender", ""), msg.get("content", "")]
+
+    metadata = msg.get("metadata")
+    if include_metadata and metadata:
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata)
+            except json.JSONDecodeError:
+                metadata = None
+        if isinstance(metadata, dict):
+            # Extract searchable metadata values
+            text_parts.extend(
+                str(v)
+                for v in metadata.values()
+                if v and isinstance(v, (str, int, float, bool))
+            )
+
+    return " ".join(text_parts).lower()
+
+
+def parse_message_metadata(metadata: Any) -> dict[str, Any]:
+    """Return message metadata as a dict, tolerating NULL and invalid JSON."""
+    if isinstance(metadata, dict):
+        return metadata
+    if not metadata:
+        return {}
+    try:
+        parsed = json.loads(metadata)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def extract_many(
+    queries: list[str],
+    choices: list[str],
+    *,
+    limit: int,
+    score_cutoff: float,
+) -> list[list[tuple[int, float]]]:
+    """
+    Score several queries against one shared set of choices.
+
+    Uses a single ``process.cdist`` call across all CPU cores when numpy is
+    available, falling back to one ``process.extract`` per query otherwise.
+    Ties keep the order of ``choices``, matching ``process.extract``.
+
+    Returns:
+        One list of (choice index, score) tuples per query, best matches first
+    """
+    if not queries:
+        return []
+    if not choices:
+        return [[] for _ in queries]
+
+    processed = [query.lower() for query in queries]
+
+    try:
+        scores = process.cdist(
+            processed,
+            choices,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=score_cutoff,
+            workers=-1,
+        )
+    except ImportError:
+        # cdist needs numpy, which is an optional dependency
+        return [
+            [
+                (index, score)
+                for _, score, index in process.extract(
+                    query,
+                    choices,
+                    scorer=fuzz.partial_ratio,
+                    limit=limit,
+                    score_cutoff=score_cutoff,
+                )
+            ]
+            for query in processed
+        ]
+
+    results: list[list[tuple[int, float]]] = []
+    for row in scores.tolist():
+        matches = [
+            (index, float(score))
+            for index, score in enumerate(row)
+            if score and score >= score_cutoff
+        ]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        results.append(matches[:limit])
+    return results
+
+
+class SessionSearchCorpus:
+    """Columnar, append-only search corpus for a single session."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.message_ids: array[int] = array("q")
+        self.texts_with_metadata: list[str] = []
+        self.texts_without_metadata: list[str] = []
+        self.senders: list[str] = []
+        self.visibilities: list[str] = []
+        self.messages: list[dict[str, Any]] = []
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.message_ids)
+
+    def add(self, row: dict[str, Any]) -> bool:
+        """
+        Add a message row, keeping ids sorted and ignoring duplicates.
+
+        Returns:
+            True if the row was added, False if it was already present
+        """
+        message_id = int(row["id"])
+        position = bisect_left(self.message_ids, message_id)
+        if (
+            position < len(self.message_ids)
+            and self.message_ids[position] == message_id
+        ):
+            return False
+
+        metadata = parse_message_metadata(row.get("metadata"))
+        message = {
+            "id": message_id,
+            "sender": row["sender"],
+            "content": row["content"],
+            "timestamp": row.get("timestamp"),
+            "visibility": row.get("visibility") or "public",
+            "metadata": metadata,
+        }
+        with_metadata = build_searchable_text(message, include_metadata=True)
+        without_metadata = build_searchable_text(message, include_metadata=False)
+
+        self.message_ids.insert(position, message_id)
+        self.texts_with_metadata.insert(position, with_metadata)
+        self.texts_without_metadata.insert(position, without_metadata)
+        self.senders.insert(position, message["sender"])
+        self.visibilities.insert(position, message["visibility"])
+        self.messages.insert(position, message)
+
+        self.size_bytes += (
+            len(with_metadata)
+            + len(without_metadata)
+            + len(message["content"])
+            + _ENTRY_OVERHEAD_BYTES
+        )
+        return True
+
+    def _visible_indices(
+        self, agent_id: str, is_admin: bool, search_scope: str
+    ) -> list[int]:
+        """Indices visible to the agent for the scope, newest first."""
+        visibilities = self.visibilities
+        senders = self.senders
+        indices = range(len(visibilities) - 1, -1, -1)
+
+        if search_scope == "public":
+            return [i for i in indices if visibilities[i] == "public"]
+        if search_scope == "private":
+            return [
+                i
+                for i in indices
+                if visibilities[i] == "private" and senders[i] == agent_id
+            ]
+        if is_admin:
+            return list(indices)
+        return [
+            i
+            for i in indices
+            if visibilities[i] == "public"
+            or (visibilities[i] in ("private", "agent_only") and senders[i] == agent_id)
+        ]
+
+    def visible_documents(
+        self,
+        agent_id: str,
+        is_admin: bool,
+        search_scope: str,
+        search_metadata: bool,
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """
+        Get searchable texts and messages visible to an agent, newest first.
+
+        Applies the same visibility rules as the SQL search path.
+        """
+        indices = self._visible_indices(agent_id, is_admin, search_scope)
+        texts = (
+            self.texts_with_metadata if search_metadata else self.texts_without_metadata
+        )
+        return [texts[i] for i in indices], [self.messages[i] for i in indices]
+
+
+class SearchCorpusManager:
+    """LRU-managed collection of per-session search corpora with a byte budget."""
+
+    def __init__(
+        self,
+        max_sessions: int = 128,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_messages_per_session: int = 20000,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.max_messages_per_session = max_messages_per_session
+
+        self._corpora: OrderedDict[str, SessionSearchCorpus] = OrderedDict()
+        # Change counters for resident or loading sessions; a load is only
+        # installed if no append raced with it
+        self._versions: dict[str, int] = {}
+        # Sessions known to exceed max_messages_per_session or max_bytes
+        # (bounded LRU)
+        self._oversized: OrderedDict[str, None] = OrderedDict()
+        self.total_bytes = 0
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "appends": 0,
+            "evictions": 0,
+            "discarded_loads": 0,
+            "oversized_sessions": 0,
+        }
+
+    def get(self, session_id: str) -> SessionSearchCorpus | None:
+        """Return the resident corpus for a session, marking it recently used."""
+        corpus = self._corpora.get(session_id)
+        if corpus is None:
+            self.stats["misses"] += 1
+            return None
+
+        self._corpora.move_to_end(session_id)
+        self.stats["hits"] += 1
+        return corpus
+
+    def begin_load(self, session_id: str) -> int:
+        """Start loading a session; returns the token to pass to finish_load."""
+        return self._versions.setdefault(session_id, 0)
+
+    def finish_load(
+        self, session_id: str, token: int, rows: list[dict[str, Any]]
+    ) -> SessionSearchCorpus | None:
+        """
+        Install a corpus built from ``rows`` (all messages of the session).
+
+        The load is discarded if a message was appended while it was running,
+        or if the session exceeds max_messages_per_session or max_bytes on its
+        own.
+        """
+        if self._versions.get(session_id) != token:
+            self.stats["discarded_loads"] += 1
+            return None
+
+        if len(rows) > self.max_messages_per_session:
+            self._mark_oversized(session_id)
+            return None
+
+        corpus = SessionSearchCorpus(session_id)
+        for row in rows:
+            corpus.add(row)
+
+        # A corpus bigger than the whole budget would be evicted at once and
+        # reloaded on every search
+        if corpus.size_bytes > self.max_bytes:
+            self._mark_oversized(session_id)
+            return None
+
+        self._remove(session_id)
+        self._versions[session_id] = token
+        self._corpora[session_id] = corpus
+        self.total_bytes += corpus.size_bytes
+        self.stats["loads"] += 1
+        self._enforce_budget()
+        return corpus
+
+    def append(self, session_id: str, row: dict[str, Any]) -> None:
+        """Record a newly inserted message for a session."""
+        if session_id in self._versions:
+            self._versions[session_id] += 1
+
+        corpus = self._corpora.get(session_id)
+        if corpus is None:
+            return
+
+        before = corpus.size_bytes
+        if corpus.add(row):
+            self.total_bytes += corpus.size_bytes - before
+            self.stats["appends"] += 1
+            if (
+                len(corpus) > self.max_messages_per_session
+                or corpus.size_bytes > self.max_bytes
+            ):
+                self._mark_oversized(session_id)
+                return
+            self._enforce_budget()
+
+    def is_oversized(self, session_id: str) -> bool:
+        """Check whether a session is too large to keep in memory."""
+        return session_id in self._oversized
+
+    def _mark_oversized(self, session_id: str) -> None:
+        self.invalidate(session_id)
+        self._oversized[session_id] = None
+        self._oversized.move_to_end(session_id)
+        while len(self._oversized) > self.max_sessions * 8:
+            self._oversized.popitem(last=False)
+        self.stats["oversized_sessions"] += 1
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop a session's corpus so the next search reloads it."""
+        self._remove(session_id)
+        self._versions.pop(session_id, None)
+
+    def apply_invalidation(self, kind: str, value: str) -> None:
+        """Apply a cache invalidation published by another process."""
+        if kind == "namespace" and value.startswith(_SESSION_NAMESPACE_PREFIX):
+            self.invalidate(value[len(_SESSION_NAMESPACE_PREFIX) :])
+        elif kind == "clear":
+            # Dropping every version also discards loads still in flight
+            self._corpora.clear()
+            self._versions.clear()
+            self.total_bytes = 0
+
+    def clear(self) -> None:
+        """Drop all corpora and reset statistics."""
+        self._corpora.clear()
+        self._versions.clear()
+        self._oversized.clear()
+        self.total_bytes = 0
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def _remove(self, session_id: str) -> None:
+        corpus = self._corpora.pop(session_id, None)
+        if corpus is not None:
+            self.total_bytes -= corpus.size_bytes
+
+    def _enforce_budget(self) -> None:
+        """Evict least recently used sessions until within budget."""
+        while self._corpora and (
+            len(self._corpora) > self.max_sessions or self.total_bytes > self.max_bytes
+        ):
+            session_id, corpus = self._corpora.popitem(last=False)
+            self.total_bytes -= corpus.size_bytes
+            self._versions.pop(session_id, None)
+            self.stats["evictions"] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get corpus statistics for monitoring."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "sessions": len(self._corpora),
+            "messages": sum(len(corpus) for corpus in self._corpora.values()),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "max_sessions": self.max_sessions,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+# Global search corpus instance
+search_corpus_manager = SearchCorpusManager()
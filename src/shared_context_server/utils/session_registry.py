@@ -0,0 +1,194 @@
+"""
+In-process registry of known session IDs.
+
+Almost every tool starts with ``SELECT id FROM sessions WHERE id = ?`` as
+its own round trip. Once warmed at startup, the registry answers that
+question from memory: known sessions are kept in an LRU set, and IDs found
+missing are remembered for a short negative TTL so repeated calls with a
+bad ID don't reach the database either. Anything the registry can't answer
+falls back to the query and records the result.
+
+create_session adds its session directly and publishes a ``session:<id>``
+cache namespace invalidation; with a shared cache backend, other processes
+apply it through SmartCacheManager.sync_invalidations and forget their
+(negative) entry for that ID. Sessions are never deleted in this tree, so
+positive entries don't expire; ``remove`` drops one if that changes.
+
+Until ``warm`` has run the registry is inactive and every check queries the
+database, as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .caching import SmartCacheManager
+
+logger = logging.getLogger(__name__)
+
+_NAMESPACE_PREFIX = "session:"
+
+
+class SessionRegistry:
+    """Known and recently-missing session IDs with a database fallback."""
+
+    def __init__(self, max_entries: int = 100000, negative_ttl: float = 5.0) -> None:
+        """
+        Initialize an inactive registry.
+
+        Args:
+            max_entries: Maximum IDs kept in each of the known and missing sets
+            negative_ttl: Seconds an ID found missing is reported missing
+        """
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.active = False
+        self._known: OrderedDict[str, None] = OrderedDict()
+        # session_id -> monotonic time the negative entry expires
+        self._missing: OrderedDict[str, float] = OrderedDict()
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+    def lookup(self, session_id: str) -> bool | None:
+        """
+        Answer from memory whether a session exists.
+
+        Returns:
+            True or False when the registry knows, None if the database must
+            be asked (including while the registry is inactive)
+        """
+        if not self.active:
+            return None
+
+        if session_id in self._known:
+            self._known.move_to_end(session_id)
+            self.stats["hits"] += 1
+            return True
+
+        expires_at = self._missing.get(session_id)
+        if expires_at is not None:
+            if time.monotonic() < expires_at:
+                self.stats["negative_hits"] += 1
+                return False
+            del self._missing[session_id]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def exists(self, conn: Any, session_id: str) -> bool:
+        """Check whether a session exists, querying ``conn`` only on a miss."""
+        known = self.lookup(session_id)
+        if known is not None:
+            return known
+
+        cursor = await conn.execute(
+            "SELECT id FROM sessions WHERE id = ?", (session_id,)
+        )
+        found = await cursor.fetchone() is not None
+        if found:
+            self.add(session_id)
+        else:
+            self.mark_missing(session_id)
+        return found
+
+    def add(self, session_id: str) -> None:
+        """Record a session that exists (e.g. just created)."""
+        if not self.active:
+            return
+        self._missing.pop(session_id, None)
+        self._known[session_id] = None
+        self._known.move_to_end(session_id)
+        if len(self._known) > self.max_entries:
+            self._known.popitem(last=False)
+
+    def mark_missing(self, session_id: str) -> None:
+        """Remember for ``negative_ttl`` seconds that a session doesn't exist."""
+        if not self.active or self.negative_ttl <= 0:
+            return
+        self._missing[session_id] = time.monotonic() + self.negative_ttl
+        self._missing.move_to_end(session_id)
+        if len(self._missing) > self.max_entries:
+            self._missing.popitem(last=False)
+
+    def remove(self, session_id: str) -> None:
+        """Forget everything known about a session."""
+        self._known.pop(session_id, None)
+        self._missing.pop(session_id, None)
+
+    def apply_invalidation(self, kind: str, value: str) -> None:
+        """Apply a cache invalidation published by another process."""
+        if kind == "namespace" and value.startswith(_NAMESPACE_PREFIX):
+            self.remove(value[len(_NAMESPACE_PREFIX) :])
+        elif kind == "clear":
+            self._missing.clear()
+
+    async def warm(self, conn: Any) -> int:
+        """
+        Load the most recently updated session IDs and activate the registry.
+
+        Returns:
+            Number of session IDs loaded
+        """
+        cursor = await conn.execute(
+            "SELECT id FROM sessions ORDER BY updated_at DESC LIMIT ?",
+            (self.max_entries,),
+        )
+        rows = await cursor.fetchall()
+
+        self._known = OrderedDict((row[0], None) for row in reversed(rows))
+        self._missing.clear()
+        self.active = True
+        return len(rows)
+
+    def reset(self) -> None:
+        """Deactivate the registry and forget every entry."""
+        self.active = False
+        self._known.clear()
+        self._missing.clear()
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get registry sizes and hit counters."""
+        lookups = sum(self.stats.values())
+        answered = self.stats["hits"] + self.stats["negative_hits"]
+        return {
+            "active": self.active,
+            "known_sessions": len(self._known),
+            "missing_sessions": len(self._missing),
+            "negative_ttl": self.negative_ttl,
+            **self.stats,
+            "hit_ratio": answered / lookups if lookups else 0.0,
+        }
+
+
+# Global registry instance (inactive until warmed in lifespan)
+session_registry = SessionRegistry()
+
+
+async def start_session_registry(cache_manager: SmartCacheManager) -> bool:
+    """Warm the global registry if enabled and subscribe it to invalidations."""
+    try:
+        from ..config import get_operational_config
+
+        operational = get_operational_config()
+    except Exception:
+        logger.debug("Session registry disabled: configuration unavailable")
+        return False
+
+    if not operational.session_registry_enabled:
+        return False
+
+    from ..database import get_db_connection
+
+    session_registry.max_entries = operational.session_registry_max_entries
+    session_registry.negative_ttl = operational.session_registry_negative_ttl
+    async with get_db_connection() as conn:
+        loaded = await session_registry.warm(conn)
+
+    if session_registry.apply_invalidation not in cache_manager.invalidation_listeners:
+        cache_manager.invalidation_listeners.append(session_registry.apply_invalidation)
+    logger.info(f"Session registry warmed with {loaded} sessions")
+    return True
@@ -134,22 +134,17 @@ async def dashboard(request: Request) -> HTMLResponse | RedirectResponse:
                 pass
 
             # Get active sessions with message counts, memory counts, and participant counts
+            # (one trigger-maintained session_stats row per session)
             cursor = await conn.execute("""
                 SELECT s.*,
-                       COUNT(DISTINCT m.id) as message_count,
-                       COUNT(DISTINCT am.id) as memory_count,
-                       COUNT(DISTINCT m.sender) as participant_count,
-                       MAX(m.timestamp) as last_activity,
-                       CASE
-                           WHEN MAX(m.timestamp) IS NOT NULL THEN MAX(m.timestamp)
-                           ELSE s.created_at
-                       END as sort_timestamp
+                       COALESCE(st.message_count, 0) as message_count,
+                       COALESCE(st.memory_count, 0) as memory_count,
+                       COALESCE(st.participant_count, 0) as participant_count,
+                       st.last_activity as last_activity,
+                       COALESCE(st.last_activity, s.created_at) as sort_timestamp
                 FROM sessions s
-                LEFT JOIN messages m ON s.id = m.session_id
-                LEFT JOIN agent_memory am ON s.id = am.session_id
-                    AND (am.expires_at IS NULL OR am.expires_at > unixepoch('now'))
+                LEFT JOIN session_stats st ON st.session_id = s.id
                 WHERE s.is_active = 1
-                GROUP BY s.id
                 ORDER BY sort_timestamp DESC
                 LIMIT 50
             """)
@@ -215,12 +210,11 @@ async def session_view(request: Request) -> HTMLResponse | RedirectResponse:
             cursor = await conn.execute(
                 """
                 SELECT s.*,
-                       MAX(m.timestamp) as last_activity,
-                       COUNT(DISTINCT m.sender) as participant_count
+                       st.last_activity as last_activity,
+                       COALESCE(st.participant_count, 0) as participant_count
                 FROM sessions s
-                LEFT JOIN messages m ON s.id = m.session_id
+                LEFT JOIN session_stats st ON st.session_id = s.id
                 WHERE s.id = ?
-                GROUP BY s.id
                 """,
                 (session_id,),
             )
@@ -237,7 +231,7 @@ async def session_view(request: Request) -> HTMLResponse | RedirectResponse:
                 """
                 SELECT * FROM messages
                 WHERE session_id = ?
-                ORDER BY timestamp ASC
+                ORDER BY ts_us ASC
             """,
                 (session_id,),
             )
@@ -153,7 +153,7 @@ if MCPSOCK_AVAILABLE:
                     query += " AND id > ?"
                     params.append(since_id)
 
-                query += " ORDER BY timestamp ASC LIMIT 50"
+                query += " ORDER BY ts_us ASC LIMIT 50"
 
                 cursor = await conn.execute(query, params)
                 rows = await cursor.fetchall()
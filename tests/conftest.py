@@ -512,6 +512,7 @@ async def test_db_manager():
     Yields:
         TestDatabaseManager: Initialized database manager with applied schema
     """
+    from shared_context_server.database_migrations import SCHEMA_VERSION
     from shared_context_server.database_testing import TestDatabaseManager
 
     # Create in-memory database manager (no files, no cleanup needed)
@@ -524,8 +525,8 @@ async def test_db_manager():
     async with db_manager.get_connection() as conn:
         cursor = await conn.execute("SELECT MAX(version) FROM schema_version")
         version = await cursor.fetchone()
-        assert version and version[0] == 3, (
-            f"Expected schema version 3, got {version[0] if version else None}"
+        assert version and version[0] == SCHEMA_VERSION, (
+            f"Expected schema version {SCHEMA_VERSION}, got {version[0] if version else None}"
         )
 
     yield db_manager
@@ -912,6 +913,22 @@ async def reset_global_singletons():
     except ImportError:
         pass
 
+    # Reset in-process search corpus if it exists
+    try:
+        from shared_context_server.utils.search_corpus import search_corpus_manager
+
+        search_corpus_manager.clear()
+    except ImportError:
+        pass
+
+    # Deactivate the session registry if a test warmed it
+    try:
+        from shared_context_server.utils.session_registry import session_registry
+
+        session_registry.reset()
+    except ImportError:
+        pass
+
     # Reset notification manager if it exists
     try:
         from shared_context_server.server import notification_manager
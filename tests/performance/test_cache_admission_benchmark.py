@@ -0,0 +1,84 @@
+"""
+Hit-ratio benchmark for W-TinyLFU cache admission.
+
+Replays a synthetic trace of polling traffic - get_messages keys for active
+sessions with a skewed (Zipf-like) popularity - interrupted by bursts of
+one-off search keys, which is the pattern that flushes hot entries from a
+recency-only cache. The same trace is replayed with admission disabled
+(plain LRU) and enabled.
+"""
+
+import random
+import time
+
+import pytest
+
+from shared_context_server.utils.caching import SmartCacheManager
+
+CACHE_ENTRIES = 100
+TRACE_LENGTH = 20000
+
+
+def build_trace(seed: int = 7, length: int = TRACE_LENGTH) -> list[str]:
+    """Build a reproducible request trace of hot session keys and search bursts."""
+    rng = random.Random(seed)
+    session_keys = [f"session:s{i}:agent:poller:limit:50" for i in range(150)]
+    weights = [1 / (rank + 1) for rank in range(len(session_keys))]
+
+    trace: list[str] = []
+    query_id = 0
+    while len(trace) < length:
+        if rng.random() < 0.1:
+            # Burst of distinct search queries, each requested once
+            for _ in range(rng.randint(50, 200)):
+                query_id += 1
+                trace.append(f"search:s{rng.randrange(150)}:query:{query_id}")
+        else:
+            trace.extend(rng.choices(session_keys, weights, k=20))
+    return trace[:length]
+
+
+async def replay(trace: list[str], admission: bool) -> dict[str, float]:
+    """Replay a trace through a read-through cache and report its hit ratio."""
+    cache = SmartCacheManager()
+    cache.max_l1_size = CACHE_ENTRIES
+    cache.admission_enabled = admission
+
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if await cache.get(key) is not None:
+            hits += 1
+        else:
+            await cache.set(key, {"key": key}, ttl=300, level="l1")
+
+    return {
+        "hit_ratio": hits / len(trace),
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+        "rejections": cache.cache_stats["admission_rejections"],
+    }
+
+
+class TestCacheAdmissionBenchmark:
+    """Compare LRU and W-TinyLFU hit ratios on a replayed trace."""
+
+    @pytest.mark.asyncio
+    async def test_admission_improves_hit_ratio_on_replayed_trace(self):
+        """One-off search bursts no longer flush hot get_messages entries."""
+        trace = build_trace()
+
+        lru = await replay(trace, admission=False)
+        tinylfu = await replay(trace, admission=True)
+
+        print(f"✅ LRU hit ratio: {lru['hit_ratio']:.1%} ({lru['elapsed_ms']:.0f}ms)")
+        print(
+            f"✅ W-TinyLFU hit ratio: {tinylfu['hit_ratio']:.1%} "
+            f"({tinylfu['elapsed_ms']:.0f}ms, "
+            f"{tinylfu['rejections']:.0f} rejected candidates)"
+        )
+
+        assert tinylfu["rejections"] > 0
+        assert tinylfu["hit_ratio"] > lru["hit_ratio"] + 0.05, (
+            f"Admission hit ratio {tinylfu['hit_ratio']:.1%} not clearly above "
+            f"LRU {lru['hit_ratio']:.1%}"
+        )
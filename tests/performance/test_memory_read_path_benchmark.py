@@ -0,0 +1,129 @@
+"""
+Mixed read/write benchmark for the agent memory read path.
+
+Agents read memory while others add messages. get_memory and list_memory
+used to start with ``DELETE FROM agent_memory WHERE expires_at < ?``, which
+made every read a write transaction queued on the SQLite writer behind the
+message inserts. The read-only path only filters expired rows, so reads
+run on the reader pool alongside the writes.
+"""
+
+import asyncio
+import contextlib
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from shared_context_server.database_manager import SimpleSQLAlchemyManager
+
+READERS = 8
+WRITERS = 4
+OPERATIONS_PER_TASK = 25
+MEMORY_KEYS = 200
+SESSION_ID = "session_memoryreadpath00"
+AGENT_ID = "memory_bench_agent"
+
+# What get_memory ran before each read, and still does not need to
+EXPIRY_DELETE = (
+    "DELETE FROM agent_memory WHERE expires_at IS NOT NULL AND expires_at < ?"
+)
+MEMORY_READ = """
+    SELECT key, value, metadata, created_at, updated_at, expires_at
+    FROM agent_memory
+    WHERE agent_id = ? AND key = ?
+    AND (session_id = ? OR (? IS NULL AND session_id IS NULL))
+    AND (expires_at IS NULL OR expires_at > ?)
+"""
+INSERT_MESSAGE = "INSERT INTO messages (session_id, sender, content) VALUES (?, ?, ?)"
+
+
+@pytest.fixture
+async def manager():
+    """A file-backed WAL database with a reader pool and populated memory."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    manager = SimpleSQLAlchemyManager(
+        f"sqlite+aiosqlite:///{temp_path}", eager_init=False, read_pool_size=READERS
+    )
+    await manager.initialize()
+    async with manager.get_connection() as conn:
+        await conn.execute(
+            "INSERT OR IGNORE INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+            (SESSION_ID, "memory read path benchmark", "bench"),
+        )
+        await conn.execute("DELETE FROM agent_memory WHERE agent_id = ?", (AGENT_ID,))
+        await conn.executemany(
+            "INSERT INTO agent_memory (agent_id, key, value) VALUES (?, ?, ?)",
+            [(AGENT_ID, f"key_{i}", f'{{"n": {i}}}') for i in range(MEMORY_KEYS)],
+        )
+
+    yield manager
+
+    # The per-worker file outlives this test; drop the benchmark rows
+    async with manager.get_connection() as conn:
+        await conn.execute("DELETE FROM agent_memory WHERE agent_id = ?", (AGENT_ID,))
+        await conn.execute("DELETE FROM messages WHERE session_id = ?", (SESSION_ID,))
+        await conn.execute("DELETE FROM sessions WHERE id = ?", (SESSION_ID,))
+    await manager.close()
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+async def measure_mixed_throughput(manager, delete_on_read: bool) -> float:
+    """Run concurrent memory readers and message writers; return ops/second."""
+
+    async def read(n: int) -> None:
+        now = datetime.now(timezone.utc).timestamp()
+        async with manager.get_connection() as conn:
+            if delete_on_read:
+                await conn.execute(EXPIRY_DELETE, (now,))
+            cursor = await conn.execute(
+                MEMORY_READ, (AGENT_ID, f"key_{n % MEMORY_KEYS}", None, None, now)
+            )
+            assert await cursor.fetchone() is not None
+
+    async def write(writer_id: int, n: int) -> None:
+        async with manager.get_connection() as conn:
+            await conn.execute(
+                INSERT_MESSAGE, (SESSION_ID, f"agent_{writer_id}", f"message {n}")
+            )
+
+    async def reader(reader_id: int) -> None:
+        for n in range(OPERATIONS_PER_TASK):
+            await read(reader_id * OPERATIONS_PER_TASK + n)
+
+    async def writer(writer_id: int) -> None:
+        for n in range(OPERATIONS_PER_TASK):
+            await write(writer_id, n)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(reader(i) for i in range(READERS)), *(writer(i) for i in range(WRITERS))
+    )
+    elapsed = time.perf_counter() - start
+    return (READERS + WRITERS) * OPERATIONS_PER_TASK / elapsed
+
+
+class TestMemoryReadPathBenchmark:
+    """Compare delete-on-read memory lookups with read-only ones."""
+
+    @pytest.mark.asyncio
+    async def test_read_only_memory_path_increases_mixed_throughput(self, manager):
+        """Reads that never take the write lock don't queue behind writers."""
+        # Warm up the reader pool so connection setup isn't measured
+        await measure_mixed_throughput(manager, delete_on_read=False)
+
+        before = await measure_mixed_throughput(manager, delete_on_read=True)
+        after = await measure_mixed_throughput(manager, delete_on_read=False)
+
+        print(f"✅ Delete-on-read memory lookups: {before:.0f} ops/s")
+        print(f"✅ Read-only memory lookups: {after:.0f} ops/s ({after / before:.1f}x)")
+        assert after > before, (
+            f"Read-only path {after:.0f} ops/s not above "
+            f"delete-on-read path {before:.0f} ops/s"
+        )
@@ -0,0 +1,148 @@
+"""
+Read-throughput benchmark for the SQLite reader pool.
+
+Concurrent agents issue scan-heavy SELECTs (the shape of search and
+dashboard queries) against a populated WAL database. With one shared
+connection every query queues on the same aiosqlite thread; with a reader
+pool each connection has its own thread and SQLite releases the GIL while
+it steps, so throughput scales with the available cores.
+"""
+
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from shared_context_server.database_manager import SimpleSQLAlchemyManager
+
+MESSAGE_COUNT = 10000
+QUERIES_PER_READER = 5
+CONCURRENCY_LEVELS = (1, 2, 4, 8)
+READ_QUERY = "SELECT COUNT(*) FROM messages WHERE content LIKE ? AND session_id = ?"
+
+
+@pytest.fixture
+async def populated_db_url():
+    """A WAL database file holding one session with many messages."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+    url = f"sqlite+aiosqlite:///{temp_path}"
+
+    manager = SimpleSQLAlchemyManager(url, eager_init=False)
+    await manager.initialize()
+    # Tests rewrite URLs to a per-worker file; reuse the effective one
+    url = manager.database_url
+    async with manager.get_connection() as conn:
+        await conn.execute(
+            "INSERT OR IGNORE INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+            ("session_benchmark000000", "read pool benchmark", "bench"),
+        )
+        await conn.execute(
+            "DELETE FROM messages WHERE session_id = ?", ("session_benchmark000000",)
+        )
+        await conn.execute(
+            """
+            WITH RECURSIVE seq(i) AS (
+                SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i < ?
+            )
+            INSERT INTO messages (session_id, sender, content)
+            SELECT ?, 'agent_' || (i % 10),
+                   'message ' || i || ' about topic ' || (i % 97) || ' with padding'
+            FROM seq
+            """,
+            (MESSAGE_COUNT - 1, "session_benchmark000000"),
+        )
+    await manager.close()
+
+    yield url
+
+    # The per-worker file outlives this test; drop the benchmark rows
+    manager = SimpleSQLAlchemyManager(url, eager_init=False)
+    async with manager.get_connection() as conn:
+        await conn.execute(
+            "DELETE FROM messages WHERE session_id = ?", ("session_benchmark000000",)
+        )
+        await conn.execute(
+            "DELETE FROM sessions WHERE id = ?", ("session_benchmark000000",)
+        )
+    await manager.close()
+
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+async def measure_read_throughput(
+    url: str, read_pool_size: int, concurrency: int
+) -> float:
+    """Run concurrent readers and return queries per second."""
+    manager = SimpleSQLAlchemyManager(
+        url, eager_init=False, read_pool_size=read_pool_size
+    )
+    await manager.initialize()
+
+    async def reader(reader_id: int) -> None:
+        for query_id in range(QUERIES_PER_READER):
+            async with manager.get_connection() as conn:
+                cursor = await conn.execute(
+                    READ_QUERY,
+                    (
+                        f"%topic {(reader_id + query_id) % 97} %",
+                        "session_benchmark000000",
+                    ),
+                )
+                await cursor.fetchone()
+
+    try:
+        # Warm up the pool so connection setup isn't measured
+        await asyncio.gather(*(reader(i) for i in range(concurrency)))
+        start = time.perf_counter()
+        await asyncio.gather(*(reader(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await manager.close()
+
+    return concurrency * QUERIES_PER_READER / elapsed
+
+
+class TestSQLiteReadPoolBenchmark:
+    """Compare read throughput of one shared connection and a reader pool."""
+
+    @pytest.mark.asyncio
+    async def test_read_throughput_by_concurrency(self, populated_db_url):
+        """Report queries/second per concurrency level for both modes."""
+        print(f"✅ CPU cores: {os.cpu_count()}")
+        results = {}
+        for concurrency in CONCURRENCY_LEVELS:
+            shared = await measure_read_throughput(populated_db_url, 0, concurrency)
+            pooled = await measure_read_throughput(
+                populated_db_url, max(CONCURRENCY_LEVELS), concurrency
+            )
+            results[concurrency] = (shared, pooled)
+            print(
+                f"✅ {concurrency} readers: shared connection {shared:.0f} q/s, "
+                f"reader pool {pooled:.0f} q/s ({pooled / shared:.2f}x)"
+            )
+
+        # The pool must never cost much even without spare cores
+        for shared, pooled in results.values():
+            assert pooled > shared * 0.5
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(
+        (os.cpu_count() or 1) < 4, reason="read scaling needs at least 4 cores"
+    )
+    async def test_reader_pool_scales_with_cores(self, populated_db_url):
+        """Concurrent reads beat a single shared connection on multicore hosts."""
+        shared = await measure_read_throughput(populated_db_url, 0, 4)
+        pooled = await measure_read_throughput(populated_db_url, 4, 4)
+
+        print(f"✅ 4 readers: {shared:.0f} q/s shared vs {pooled:.0f} q/s pooled")
+        assert pooled > shared * 1.5, (
+            f"Reader pool {pooled:.0f} q/s not clearly above "
+            f"shared connection {shared:.0f} q/s"
+        )
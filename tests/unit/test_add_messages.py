@@ -0,0 +1,221 @@
+"""
+Unit tests for the add_messages batch tool.
+
+A batch is validated up front, inserted in one transaction, audited once and
+broadcast as a single WebSocket update; the returned IDs follow input order.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from shared_context_server import server
+from shared_context_server.session_tools import _insert_messages
+from tests.conftest import MockContext, call_fastmcp_tool, patch_database_connection
+
+
+@pytest.fixture
+async def session(test_db_manager):
+    """A fresh session, with the database patched in."""
+    with patch_database_connection(test_db_manager):
+        ctx = MockContext(session_id="batch_test", agent_id="batcher")
+        created = await call_fastmcp_tool(
+            server.create_session, ctx, purpose="Batch add test"
+        )
+        yield ctx, created["session_id"]
+
+
+async def _session_messages(ctx, session_id: str) -> list[dict]:
+    result = await call_fastmcp_tool(server.get_messages, ctx, session_id=session_id)
+    return result["messages"]
+
+
+class TestAddMessages:
+    """Test batched message insertion."""
+
+    async def test_ids_are_returned_in_order(self, session, test_db_manager):
+        """Each message is stored once and the IDs match the input order."""
+        ctx, session_id = session
+        await call_fastmcp_tool(
+            server.add_message, ctx, session_id=session_id, content="before"
+        )
+
+        result = await call_fastmcp_tool(
+            server.add_messages,
+            ctx,
+            session_id=session_id,
+            messages=[
+                {"content": "first"},
+                {"content": "second", "visibility": "private"},
+                {"content": "third", "metadata": {"step": 3}},
+            ],
+        )
+
+        assert result["success"] is True
+        assert result["count"] == 3
+        ids = result["message_ids"]
+        assert ids == sorted(ids)
+
+        stored = {m["id"]: m for m in await _session_messages(ctx, session_id)}
+        assert [stored[i]["content"] for i in ids] == ["first", "second", "third"]
+        assert stored[ids[1]]["visibility"] == "private"
+        assert json.loads(stored[ids[2]]["metadata"]) == {"step": 3}
+
+        async with test_db_manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT metadata FROM audit_log "
+                "WHERE session_id = ? AND event_type = 'messages_added'",
+                (session_id,),
+            )
+            audits = await cursor.fetchall()
+        assert len(audits) == 1
+
+    async def test_interleaved_batches_keep_their_own_ids(
+        self, session, test_db_manager
+    ):
+        """IDs come from each batch's own inserts, not the sender's newest rows."""
+        _, session_id = session
+
+        def rows(*contents: str) -> list[tuple]:
+            return [
+                (session_id, "batcher", "test", content, "public", None, None, 0, 0)
+                for content in contents
+            ]
+
+        class InterleavingConnection:
+            """Runs a second batch from the same sender mid-way through the first."""
+
+            def __init__(self, conn):
+                self.conn = conn
+                self.inserts = 0
+                self.other_ids: list[int] = []
+
+            async def execute(self, query, params=()):
+                cursor = await self.conn.execute(query, params)
+                self.inserts += 1
+                if self.inserts == 1:
+                    self.other_ids = await _insert_messages(rows("b1", "b2"))(self.conn)
+                return cursor
+
+        async with test_db_manager.get_connection() as conn:
+            interleaving = InterleavingConnection(conn)
+            ids = await _insert_messages(rows("a1", "a2"))(interleaving)
+            await conn.commit()
+
+        async with test_db_manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT id, content FROM messages WHERE session_id = ?",
+                (session_id,),
+            )
+            stored = {row[0]: row[1] for row in await cursor.fetchall()}
+
+        assert [stored[i] for i in ids] == ["a1", "a2"]
+        assert [stored[i] for i in interleaving.other_ids] == ["b1", "b2"]
+
+    async def test_invalid_message_rejects_the_batch(self, session):
+        """Nothing is stored when any message fails validation."""
+        ctx, session_id = session
+
+        result = await call_fastmcp_tool(
+            server.add_messages,
+            ctx,
+            session_id=session_id,
+            messages=[
+                {"content": "fine"},
+                {"content": "bad", "visibility": "everyone"},
+            ],
+        )
+        assert result["success"] is False
+        assert result["code"] == "INVALID_VISIBILITY"
+        assert result["context"]["message_index"] == 1
+
+        missing = await call_fastmcp_tool(
+            server.add_messages,
+            ctx,
+            session_id=session_id,
+            messages=[{"text": "no content"}],
+        )
+        assert missing["code"] == "INVALID_INPUT"
+        assert missing["context"]["unknown_fields"] == ["text"]
+
+        assert await _session_messages(ctx, session_id) == []
+
+    async def test_one_notification_per_batch(self, session):
+        """Cache invalidation and the WebSocket broadcast happen once."""
+        ctx, session_id = session
+        notify = AsyncMock()
+
+        with (
+            patch(
+                "shared_context_server.admin_resources.trigger_resource_notifications",
+                new=AsyncMock(),
+            ) as trigger,
+            patch(
+                "shared_context_server.session_tools.get_websocket_imports",
+                return_value={"available": True, "notify_websocket_server": notify},
+            ),
+        ):
+            result = await call_fastmcp_tool(
+                server.add_messages,
+                ctx,
+                session_id=session_id,
+                messages=[{"content": f"m{i}"} for i in range(5)],
+            )
+
+        trigger.assert_awaited_once()
+        notify.assert_awaited_once()
+        payload = notify.await_args.args[1]
+        assert payload["type"] == "new_messages"
+        assert [m["id"] for m in payload["data"]] == result["message_ids"]
+
+    async def test_writers_do_not_wait_for_notifications(self, session):
+        """A message commits while another add_message is still notifying."""
+        ctx, session_id = session
+        notifying, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_first_notification(*args, **kwargs):
+            if not notifying.is_set():
+                notifying.set()
+                await release.wait()
+
+        with patch(
+            "shared_context_server.admin_resources.trigger_resource_notifications",
+            new=slow_first_notification,
+        ):
+            first = asyncio.create_task(
+                call_fastmcp_tool(
+                    server.add_message, ctx, session_id=session_id, content="first"
+                )
+            )
+            await notifying.wait()
+            try:
+                second = await asyncio.wait_for(
+                    call_fastmcp_tool(
+                        server.add_messages,
+                        ctx,
+                        session_id=session_id,
+                        messages=[{"content": "second"}],
+                    ),
+                    5,
+                )
+            finally:
+                release.set()
+            assert (await first)["success"] is True
+
+        assert second["success"] is True
+        contents = [m["content"] for m in await _session_messages(ctx, session_id)]
+        assert contents == ["first", "second"]
+
+    async def test_unknown_session(self, session):
+        """A missing session is reported without inserting anything."""
+        ctx, _ = session
+
+        result = await call_fastmcp_tool(
+            server.add_messages,
+            ctx,
+            session_id="session_0000000000000000",
+            messages=[{"content": "orphan"}],
+        )
+        assert result["success"] is False
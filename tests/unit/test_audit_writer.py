@@ -0,0 +1,257 @@
+"""
+Unit tests for the write-behind audit log writer.
+
+Routine audit events are buffered and inserted in batches off the request
+path; security events are written before the caller continues; a full
+buffer applies the configured overflow policy and counts each outcome.
+Per-event-type policies sample or aggregate high-volume events.
+"""
+
+import asyncio
+import contextlib
+import json
+import tempfile
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from shared_context_server import audit_writer as audit_writer_module
+from shared_context_server.audit_writer import AuditLogWriter, is_security_event
+from shared_context_server.auth import audit_log_auth_event
+from shared_context_server.config import AuditPolicyConfig
+from shared_context_server.database_manager import SimpleSQLAlchemyManager
+
+
+@pytest.fixture
+async def manager():
+    """A runtime manager backing both the writer and synchronous audit logs."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    manager = SimpleSQLAlchemyManager(
+        f"sqlite+aiosqlite:///{temp_path}", eager_init=False, read_pool_size=2
+    )
+    await manager.initialize()
+
+    with (
+        patch.object(
+            audit_writer_module, "get_db_connection", side_effect=manager.get_connection
+        ),
+        patch(
+            "shared_context_server.auth_core.get_db_connection",
+            side_effect=manager.get_connection,
+        ),
+    ):
+        yield manager
+
+    await manager.close()
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+@pytest.fixture
+async def writer():
+    """The global audit writer, started for one test and stopped after it."""
+    writer = audit_writer_module.audit_writer
+    flush_interval = writer.flush_interval
+    writer.flush_interval = 0.01
+    writer.start()
+    yield writer
+    await writer.stop()
+    writer.flush_interval = flush_interval
+
+
+async def _audit_events(manager, agent_id: str) -> list[tuple[str, dict]]:
+    async with manager.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT event_type, metadata FROM audit_log WHERE agent_id = ? ORDER BY id",
+            (agent_id,),
+        )
+        return [(row[0], json.loads(row[1])) for row in await cursor.fetchall()]
+
+
+def _agent_id() -> str:
+    return f"audit_agent_{uuid.uuid4().hex[:8]}"
+
+
+class TestAuditLogWriter:
+    """Test buffering, batching, synchronous security events and overflow."""
+
+    async def test_routine_events_are_written_in_batches(self, manager, writer):
+        """Buffered events return immediately and land in one insert."""
+        agent_id = _agent_id()
+        batches_before = writer.stats["batches"]
+
+        # Routine events never yield to the writer, so all 25 are still buffered
+        for i in range(25):
+            await audit_log_auth_event("message_added", agent_id, None, {"n": i})
+        assert writer.get_stats()["pending"] == 25
+
+        await writer.flush()
+
+        events = await _audit_events(manager, agent_id)
+        assert [metadata["n"] for _, metadata in events] == list(range(25))
+        assert writer.stats["batches"] - batches_before == 1
+
+    async def test_security_events_are_written_synchronously(self, manager, writer):
+        """Security events are committed before audit_log_auth_event returns."""
+        agent_id = _agent_id()
+        enqueued_before = writer.stats["enqueued"]
+
+        await audit_log_auth_event("authentication_failed", agent_id, None, {})
+        await audit_log_auth_event("memory_set", agent_id, None, {}, sync=True)
+
+        assert [event for event, _ in await _audit_events(manager, agent_id)] == [
+            "authentication_failed",
+            "memory_set",
+        ]
+        assert writer.stats["enqueued"] == enqueued_before
+        assert is_security_event("permission_denied")
+        assert is_security_event("custom_check_failed")
+        assert not is_security_event("context_searched")
+
+    async def test_stop_flushes_buffered_events(self, manager):
+        """Records buffered before shutdown are written, not dropped."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(flush_interval=1.0)
+        writer.start()
+
+        for i in range(5):
+            assert writer.enqueue("context_searched", agent_id, None, f'{{"n": {i}}}')
+        await writer.stop()
+
+        assert not writer.running
+        assert len(await _audit_events(manager, agent_id)) == 5
+        assert writer.enqueue("context_searched", agent_id, None, "{}") is False
+
+    async def test_bad_record_does_not_drop_its_batch(self, manager):
+        """A record that violates a constraint only loses itself."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(flush_interval=0.01)
+        writer.start()
+
+        writer.enqueue("message_added", agent_id, None, "{}")
+        writer.enqueue("message_added", agent_id, "session_does_not_exist", "{}")
+        writer.enqueue("message_added", agent_id, None, "{}")
+        await writer.stop()
+
+        assert len(await _audit_events(manager, agent_id)) == 2
+        assert writer.stats["failed"] == 1
+
+    @pytest.mark.parametrize(
+        ("policy", "accepted", "counter"),
+        [
+            ("write_through", [True, True, False], "written_through"),
+            ("drop_newest", [True, True, True], "dropped_newest"),
+            ("drop_oldest", [True, True, True], "dropped_oldest"),
+        ],
+    )
+    async def test_overflow_policies(self, manager, policy, accepted, counter):
+        """A full buffer applies the overflow policy and counts it."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(max_size=2, flush_interval=0.01, overflow_policy=policy)
+        writer.start()
+
+        # The background task hasn't run yet, so the third record overflows
+        results = [
+            writer.enqueue("message_added", agent_id, None, f'{{"n": {i}}}')
+            for i in range(3)
+        ]
+        await writer.stop()
+
+        assert results == accepted
+        assert writer.stats[counter] == 1
+        kept = [metadata["n"] for _, metadata in await _audit_events(manager, agent_id)]
+        assert kept == ([1, 2] if policy == "drop_oldest" else [0, 1])
+
+
+class TestAuditPolicies:
+    """Test sampling and per-minute aggregation of audit events."""
+
+    async def test_sampled_events_keep_one_in_n(self, manager):
+        """sample:N logs every Nth event and records the rate."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(
+            flush_interval=0.01, policies={"context_searched": "sample:4"}
+        )
+        writer.start()
+
+        for i in range(10):
+            writer.record("context_searched", agent_id, None, {"n": i})
+        await writer.stop()
+
+        events = await _audit_events(manager, agent_id)
+        assert [metadata["n"] for _, metadata in events] == [0, 4, 8]
+        assert all(metadata["sample_rate"] == 4 for _, metadata in events)
+        assert writer.stats["sampled_out"] == 7
+
+    async def test_aggregated_events_become_counts(self, manager):
+        """aggregate folds events into one row per agent/session/event window."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(
+            flush_interval=0.01, default_policy="aggregate", aggregate_window=3600
+        )
+        writer.start()
+
+        for _ in range(7):
+            writer.record("context_searched", agent_id, None, {"query": "q"})
+        for _ in range(2):
+            writer.record("usage_guidance_accessed", agent_id, None, {})
+        assert writer.get_stats()["open_aggregates"] == 2
+        await writer.stop()
+
+        counts = {
+            event: metadata["count"]
+            for event, metadata in await _audit_events(manager, agent_id)
+        }
+        assert counts == {"context_searched": 7, "usage_guidance_accessed": 2}
+        assert writer.stats["aggregated"] == 9
+
+    async def test_closed_windows_are_written_while_running(self, manager):
+        """Aggregates are flushed when their window closes, not only on stop."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(
+            flush_interval=0.01, default_policy="aggregate", aggregate_window=0.2
+        )
+        writer.start()
+        try:
+            writer.record("context_searched", agent_id, None, {})
+            for _ in range(50):
+                if await _audit_events(manager, agent_id):
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await writer.stop()
+
+        [(event, metadata)] = await _audit_events(manager, agent_id)
+        assert event == "context_searched"
+        assert metadata["count"] == 1
+
+    async def test_security_events_ignore_policies(self, manager):
+        """A security event is logged in full even under an aggregate policy."""
+        agent_id = _agent_id()
+        writer = AuditLogWriter(flush_interval=0.01, default_policy="aggregate")
+        writer.start()
+
+        writer.record("authentication_failed", agent_id, None, {"error": "bad key"})
+        await writer.stop()
+
+        assert await _audit_events(manager, agent_id) == [
+            ("authentication_failed", {"error": "bad key"})
+        ]
+
+    def test_policy_configuration_is_validated(self):
+        """Only always, sample:N and aggregate are accepted."""
+        config = AuditPolicyConfig(
+            audit_event_policies={"message_added": "sample:5"},
+            default_audit_policy="aggregate",
+        )
+        assert config.audit_event_policies == {"message_added": "sample:5"}
+        assert config.default_audit_policy == "aggregate"
+
+        for bad in ("sample:0", "sometimes", "always:2"):
+            with pytest.raises(ValueError, match="Invalid audit policy"):
+                AuditPolicyConfig(audit_event_policies={"context_searched": bad})
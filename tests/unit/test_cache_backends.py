@@ -0,0 +1,203 @@
+"""
+Unit tests for the shared L2 cache backend.
+
+Two SmartCacheManager instances attached to one SQLite file stand in for two
+server processes: entries written by one are served by the other, and
+invalidations fan out through polled events.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from shared_context_server.utils.cache_backends import (
+    SQLiteSharedCacheBackend,
+    create_shared_backend,
+)
+from shared_context_server.utils.caching import (
+    SmartCacheManager,
+    configure_cache_backend,
+    invalidate_session_cache,
+)
+from shared_context_server.utils.search_corpus import (
+    SearchCorpusManager,
+    search_corpus_manager,
+)
+
+
+@pytest.fixture
+async def managers(tmp_path):
+    """Two cache managers ("processes") sharing one backend file."""
+    path = tmp_path / "shared_cache.db"
+    first, second = SmartCacheManager(), SmartCacheManager()
+    first.shared_backend = SQLiteSharedCacheBackend(path)
+    second.shared_backend = SQLiteSharedCacheBackend(path)
+
+    yield first, second
+
+    for manager in (first, second):
+        await manager.shared_backend.close()
+
+
+class TestSharedCacheBackend:
+    """Test read-through, write-through and invalidation fan-out."""
+
+    async def test_entries_are_shared_between_processes(self, managers):
+        """A value cached by one process is a hit in another."""
+        first, second = managers
+        context = {"agent_id": "agent_a", "offset": 0}
+        page = {"success": True, "messages": [{"id": 1, "content": "hi"}]}
+
+        # Different local generations must not prevent sharing
+        first.bump_generation("session:s1")
+        await first.set("session:s1:page", page, ttl=300, context=context)
+
+        assert await second.get("session:s1:page", context) == page
+        # The shared hit was copied into the local tiers
+        assert await second.get("session:s1:page", context) == page
+
+        stats = second.get_cache_stats()
+        assert stats["shared_backend"]["backend"] == "sqlite"
+        assert stats["shared_backend"]["shared_hits"] == 1
+        assert stats["operation_counts"]["l2_hits"] == 1
+        assert stats["operation_counts"]["l1_hits"] == 1
+
+    async def test_session_invalidation_fans_out(self, managers):
+        """Invalidating a session in one process reaches the others."""
+        first, second = managers
+        await first.set("session:s1:page", "messages", tags=("session:s1",))
+        await first.set("search:s1:query", "results", tags=("session:s1",))
+        await first.set("session:s2:page", "other session")
+        assert await second.get("session:s1:page") == "messages"
+
+        await invalidate_session_cache(first, "s1")
+
+        # Shared entries are gone immediately; local copies after the poll
+        assert await second.sync_invalidations() >= 3
+        assert await second.get("session:s1:page") is None
+        assert await second.get("search:s1:query") is None
+        assert await second.get("session:s2:page") == "other session"
+        assert second.get_cache_stats()["shared_backend"]["remote_invalidations"] >= 3
+
+        # A process only applies events from others
+        assert await first.sync_invalidations() == 0
+
+    async def test_loads_overtaken_by_invalidation_are_not_cached(self, managers):
+        """A load that read before an invalidation must not publish its value."""
+        first, second = managers
+        loaded = asyncio.Event()
+        release = asyncio.Event()
+
+        async def load():
+            value = "messages before the write"
+            loaded.set()
+            await release.wait()
+            await first.set("session:s1:page", value)
+            return value
+
+        task = asyncio.create_task(first.single_flight("session:s1:page", load))
+        await loaded.wait()
+        await invalidate_session_cache(first, "s1")
+        release.set()
+
+        # The caller still gets its result, but nothing is cached
+        assert await task == "messages before the write"
+        assert await first.get("session:s1:page") is None
+        assert await second.get("session:s1:page") is None
+        stats = first.get_cache_stats()
+        assert stats["generations"]["stale_load_drops"] == 1
+
+        # Loads started after the invalidation cache as usual
+        async def reload():
+            await first.set("session:s1:page", "messages after the write")
+
+        await first.single_flight("session:s1:page", reload)
+        assert await second.get("session:s1:page") == "messages after the write"
+
+    async def test_remote_session_writes_drop_search_corpora(self, managers):
+        """A hot corpus is reloaded after another process writes to its session."""
+        first, second = managers
+        corpora = SearchCorpusManager()
+        second.invalidation_listeners.append(corpora.apply_invalidation)
+        for session_id in ("s1", "s2"):
+            token = corpora.begin_load(session_id)
+            corpora.finish_load(session_id, token, [])
+
+        # What add_message publishes in the other process
+        await invalidate_session_cache(first, "s1")
+        await second.sync_invalidations()
+
+        assert corpora.get("s1") is None
+        assert corpora.get("s2") is not None
+
+        await first.clear_all()
+        await second.sync_invalidations()
+        assert corpora.get("s2") is None
+        assert corpora.total_bytes == 0
+
+    async def test_configured_backend_subscribes_search_corpus(self, tmp_path):
+        """configure_cache_backend registers the corpus invalidation listener."""
+        manager = SmartCacheManager()
+        operational = SimpleNamespace(
+            cache_shared_backend="sqlite",
+            cache_shared_path=str(tmp_path / "shared_cache.db"),
+            cache_invalidation_poll_interval=0.5,
+        )
+        with patch(
+            "shared_context_server.config.get_operational_config",
+            return_value=operational,
+        ):
+            configure_cache_backend(manager)
+        try:
+            assert manager.invalidation_listeners == [
+                search_corpus_manager.apply_invalidation
+            ]
+        finally:
+            await manager.shared_backend.close()
+
+    async def test_key_and_tag_invalidations_fan_out(self, managers):
+        """Single-key and tag invalidations drop remote local copies too."""
+        first, second = managers
+        await first.set("memory:agent_a:scope:all", ["k1"], tags=("agent:agent_a",))
+        await first.set("report", {"rows": 3})
+        assert await second.get("memory:agent_a:scope:all") == ["k1"]
+        assert await second.get("report") == {"rows": 3}
+
+        await first.invalidate_tag("agent:agent_a")
+        await first.invalidate("report")
+        await second.sync_invalidations()
+
+        assert await second.get("memory:agent_a:scope:all") is None
+        assert await second.get("report") is None
+
+    async def test_backend_failures_fall_back_to_local_cache(self, managers):
+        """A broken shared tier is counted and never fails cache calls."""
+        first, _ = managers
+        await first.shared_backend.close()
+
+        await first.set("session:s1:page", "local only")
+        assert await first.get("session:s1:page") == "local only"
+        assert await first.get("session:s1:missing") is None
+        assert first.get_cache_stats()["shared_backend"]["errors"] >= 2
+
+    async def test_expired_entries_are_cleaned_up(self, tmp_path):
+        """cleanup_expired removes expired rows and old events."""
+        backend = SQLiteSharedCacheBackend(tmp_path / "cache.db", event_retention=0)
+        entry = {"value": 1, "stale_at": 0.0, "expires_at": 1.0, "ttl": 1}
+        await backend.set("expired", entry, None, frozenset({"t"}))
+        await backend.invalidate_tag("unrelated")
+
+        assert await backend.get("expired") is None
+        assert await backend.cleanup_expired() == 1
+        await backend.close()
+
+    def test_in_process_default(self):
+        """No shared backend is configured unless requested."""
+        assert create_shared_backend("none", "unused.db") is None
+        stats = SmartCacheManager().get_cache_stats()
+        assert stats["shared_backend"]["backend"] == "in_process"
+
+        with pytest.raises(ValueError, match="Unknown shared cache backend"):
+            create_shared_backend("memcached", "unused.db")
@@ -16,6 +16,7 @@ from shared_context_server.utils.caching import (
     cache_maintenance_task,
     cache_manager,
     cached_operation,
+    estimate_size,
     generate_memory_cache_key,
     generate_search_cache_key,
     generate_session_cache_key,
@@ -24,6 +25,7 @@ from shared_context_server.utils.caching import (
     invalidate_session_cache,
     start_cache_maintenance,
 )
+from shared_context_server.utils.frequency_sketch import FrequencySketch
 
 
 class TestSmartCacheManager:
@@ -340,6 +342,363 @@ class TestCacheInvalidationHooks:
         assert await cache_mgr.get("memory:agent123:meta") is None
         assert await cache_mgr.get("memory:agent456:data") == "other_data"
 
+    @pytest.mark.asyncio
+    async def test_session_invalidation_bumps_generation_without_scan(self):
+        """Invalidation is a generation bump; stale entries are left to age out."""
+        cache_mgr = SmartCacheManager()
+        context = {"agent_id": "agent1"}
+
+        await cache_mgr.set(generate_session_cache_key("s1", "agent1"), "v1", 60)
+        await cache_mgr.set("search:s1:query", "results", 60, context)
+        await cache_mgr.set("search:s10:query", "untouched", 60, context)
+
+        await invalidate_session_cache(cache_mgr, "s1")
+
+        assert cache_mgr.get_generation("session:s1") > 0
+        assert cache_mgr.get_generation("session:s10") == 0
+        assert await cache_mgr.get(generate_session_cache_key("s1", "agent1")) is None
+        assert await cache_mgr.get("search:s1:query", context) is None
+        assert await cache_mgr.get("search:s10:query", context) == "untouched"
+
+        # No entries were removed - they are unreachable until LRU/TTL evicts them
+        assert len(cache_mgr.l1_cache) == 3
+        assert cache_mgr.cache_stats["invalidations"] == 0
+
+        # New writes land in the new generation
+        await cache_mgr.set(generate_session_cache_key("s1", "agent1"), "v2", 60)
+        assert await cache_mgr.get(generate_session_cache_key("s1", "agent1")) == "v2"
+        assert cache_mgr.get_cache_stats()["generations"]["bumps"] == 2
+
+    @pytest.mark.asyncio
+    async def test_pruned_generations_do_not_resurrect_stale_entries(self):
+        """Forgetting tracked namespaces invalidates them rather than resetting."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_tracked_generations = 4
+
+        await cache_mgr.set("memory:agent0:scope:all", "v0", 60)
+        await invalidate_agent_memory_cache(cache_mgr, "agent0")
+        await cache_mgr.set("memory:agent0:scope:all", "stale", 60)
+        await cache_mgr.set("memory:never_bumped:scope:all", "old", 60)
+
+        for i in range(1, 6):
+            await invalidate_agent_memory_cache(cache_mgr, f"agent{i}")
+
+        assert len(cache_mgr._generations) <= cache_mgr.max_tracked_generations
+        assert await cache_mgr.get("memory:agent0:scope:all") is None
+        assert await cache_mgr.get("memory:never_bumped:scope:all") is None
+
+
+class TestCacheTagIndex:
+    """Test tag-indexed invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tag_removes_only_tagged_entries(self):
+        """invalidate_tag frees exactly the tagged entries from both levels."""
+        cache_mgr = SmartCacheManager()
+
+        await cache_mgr.set("a", 1, ttl=60, tags={"session:s1", "agent:x"})
+        await cache_mgr.set("b", 2, ttl=3600, tags={"session:s1"})
+        await cache_mgr.set("c", 3, ttl=60, tags={"session:s2", "agent:x"})
+        await cache_mgr.set("d", 4, ttl=60)
+
+        assert await cache_mgr.invalidate_tag("session:s1") == 2
+        assert "a" not in cache_mgr.l1_cache
+        assert "b" not in cache_mgr.l2_cache
+        assert await cache_mgr.get("c") == 3
+        assert await cache_mgr.get("d") == 4
+
+        # Index stays exact: "a" no longer counts under agent:x
+        assert await cache_mgr.invalidate_tag("agent:x") == 1
+        assert await cache_mgr.invalidate_tag("unknown") == 0
+        assert cache_mgr.get_cache_stats()["tags"] == {
+            "tracked_tags": 0,
+            "tagged_entries": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_tag_index_follows_eviction_and_replacement(self):
+        """Evicted or re-tagged entries drop out of the tag index."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_l1_size = 2
+
+        await cache_mgr.set("k1", 1, ttl=60, tags={"t1"})
+        await cache_mgr.set("k1", 1, ttl=60, tags={"t2"})
+        await cache_mgr.set("k2", 2, ttl=60, tags={"t2"})
+        await cache_mgr.set("k3", 3, ttl=60, tags={"t2"})  # evicts k1
+
+        assert "t1" not in cache_mgr._tag_index
+        assert cache_mgr._tag_index["t2"] == {"k2", "k3"}
+        assert await cache_mgr.invalidate_tag("t2") == 2
+
+    @pytest.mark.asyncio
+    async def test_session_invalidation_frees_tagged_entries(self):
+        """invalidate_session_cache releases tagged entries immediately."""
+        cache_mgr = SmartCacheManager()
+        key = generate_session_cache_key("s1", "agent1")
+
+        await cache_mgr.set(key, {"messages": ["x" * 1000]}, 60, tags={"session:s1"})
+        await invalidate_session_cache(cache_mgr, "s1")
+
+        assert len(cache_mgr.l1_cache) == 0
+        assert cache_mgr.cache_stats["invalidations"] == 1
+
+
+class TestCacheByteBudget:
+    """Test size-aware budgeting and eviction."""
+
+    def test_estimate_size_grows_with_payload(self):
+        """Nested payload estimates scale with content size."""
+        small = {"messages": [{"content": "x" * 10}]}
+        large = {"messages": [{"content": "x" * 10000} for _ in range(10)]}
+
+        assert estimate_size(small) < estimate_size(large)
+        assert estimate_size(large) >= 100000
+
+    @pytest.mark.asyncio
+    async def test_bytes_reported_and_released(self):
+        """Byte usage is tracked per level and released on removal."""
+        cache_mgr = SmartCacheManager()
+
+        await cache_mgr.set("small", "x" * 100, ttl=60, tags={"t"})
+        await cache_mgr.set("warm", "y" * 1000, ttl=3600)
+
+        sizes = cache_mgr.get_cache_stats()["cache_sizes"]
+        assert sizes["l1_bytes"] == estimate_size("x" * 100)
+        assert sizes["l2_bytes"] == estimate_size("y" * 1000)
+        assert sizes["total_bytes"] == sizes["l1_bytes"] + sizes["l2_bytes"]
+
+        await cache_mgr.invalidate_tag("t")
+        await cache_mgr.invalidate("warm")
+        assert cache_mgr.l1_bytes == 0
+        assert cache_mgr.l2_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_byte_pressure_evicts_large_entries_first(self):
+        """Under byte pressure the largest recently-unused entry goes first."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_l1_bytes = 20000
+        cache_mgr.max_entry_fraction = 0.5
+
+        await cache_mgr.set("small_1", "a" * 100, ttl=60)
+        await cache_mgr.set("big", "b" * 9000, ttl=60)
+        await cache_mgr.set("small_2", "c" * 100, ttl=60)
+        await cache_mgr.set("big_2", "d" * 9000, ttl=60)
+        await cache_mgr.set("incoming", "e" * 5000, ttl=60)
+
+        assert "big" not in cache_mgr.l1_cache
+        assert "small_1" in cache_mgr.l1_cache
+        assert "small_2" in cache_mgr.l1_cache
+        assert cache_mgr.l1_bytes <= cache_mgr.max_l1_bytes
+
+    @pytest.mark.asyncio
+    async def test_oversized_entries_are_refused(self):
+        """Entries over the level share are not cached and drop older values."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_l1_bytes = 10000
+        cache_mgr.max_l2_bytes = 10000
+        cache_mgr.max_entry_fraction = 0.1
+
+        await cache_mgr.set("key", "ok", ttl=60)
+        await cache_mgr.set("key", "z" * 5000, ttl=60)
+
+        assert await cache_mgr.get("key") is None
+        assert cache_mgr.cache_stats["oversize_rejections"] == 1
+        assert cache_mgr.l1_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_auto_level_falls_back_to_l2_for_large_entries(self):
+        """Short-lived entries too large for L1 are kept in the larger L2."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_l1_bytes = 10000
+        cache_mgr.max_l2_bytes = 1000000
+
+        await cache_mgr.set("payload", "p" * 5000, ttl=60)
+
+        assert "payload" in cache_mgr.l2_cache
+        assert await cache_mgr.get("payload") == "p" * 5000
+        # Too large to promote into L1
+        assert "payload" not in cache_mgr.l1_cache
+
+
+class TestCacheAdmission:
+    """Test the frequency sketch and W-TinyLFU admission."""
+
+    def test_frequency_sketch_doorkeeper_and_aging(self):
+        """First sightings only hit the doorkeeper; aging halves counts."""
+        sketch = FrequencySketch(capacity=100)
+        assert sketch.frequency("hot") == 0
+
+        sketch.increment("hot")
+        assert sketch.frequency("hot") == 1
+
+        for _ in range(9):
+            sketch.increment("hot")
+        assert sketch.frequency("hot") == 10
+
+        sketch.reset()
+        assert sketch.frequency("hot") == 4
+        assert sketch.resets == 1
+
+    def test_frequency_sketch_ages_automatically(self):
+        """Recording sample_size accesses triggers a reset."""
+        sketch = FrequencySketch(capacity=16)
+        for i in range(sketch.sample_size):
+            sketch.increment(f"key_{i % 8}")
+        assert sketch.resets == 1
+
+    @pytest.mark.asyncio
+    async def test_one_off_keys_cannot_evict_hot_entries(self):
+        """A burst of never-repeated keys leaves frequently read entries cached."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_l1_size = 10
+
+        for i in range(9):
+            await cache_mgr.set(f"session:s{i}:page", i, level="l1")
+            for _ in range(3):
+                assert await cache_mgr.get(f"session:s{i}:page") == i
+
+        for i in range(50):
+            await cache_mgr.set(f"search:s0:query:{i}", i, level="l1")
+
+        for i in range(9):
+            assert await cache_mgr.get(f"session:s{i}:page") == i
+        # The newest one-off key still sits in the admission window
+        assert await cache_mgr.get("search:s0:query:49") == 49
+        assert cache_mgr.get_cache_stats()["admission"]["rejections"] > 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_admission_is_plain_lru(self):
+        """Without admission the same burst flushes the hot entries."""
+        cache_mgr = SmartCacheManager()
+        cache_mgr.max_l1_size = 10
+        cache_mgr.admission_enabled = False
+
+        for i in range(9):
+            await cache_mgr.set(f"session:s{i}:page", i, level="l1")
+            await cache_mgr.get(f"session:s{i}:page")
+
+        for i in range(50):
+            await cache_mgr.set(f"search:s0:query:{i}", i, level="l1")
+
+        for i in range(9):
+            assert await cache_mgr.get(f"session:s{i}:page") is None
+
+    @pytest.mark.asyncio
+    async def test_frequency_survives_generation_bumps(self):
+        """Invalidated keys keep their popularity for the next generation."""
+        cache_mgr = SmartCacheManager()
+        for _ in range(3):
+            await cache_mgr.get("session:s1:page", {"agent_id": "a"})
+
+        cache_mgr.bump_generation("session:s1")
+        cache_key = cache_mgr._generate_cache_key("session:s1:page", {"agent_id": "a"})
+        frequency_key = cache_mgr._frequency_key(cache_key)
+
+        assert "#g" in cache_key
+        assert "#g" not in frequency_key
+        assert cache_mgr.frequency_sketch.frequency(frequency_key) == 3
+
+
+class TestStaleWhileRevalidate:
+    """Test soft/hard TTL handling with background revalidation."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_with_single_background_refresh(self):
+        """Between soft and hard TTL, get serves stale data and refreshes once."""
+        import time
+
+        cache_mgr = SmartCacheManager()
+        cache_mgr.stale_policies = {"session": 30}
+        await cache_mgr.set("session:s1:page", "old", ttl=10)
+
+        release = asyncio.Event()
+        refreshes = 0
+
+        async def refresh():
+            nonlocal refreshes
+            refreshes += 1
+            await release.wait()
+            await cache_mgr.set("session:s1:page", "new", ttl=10)
+            return "new"
+
+        with patch("time.time", return_value=time.time() + 15):
+            results = [
+                await cache_mgr.get("session:s1:page", refresh=refresh)
+                for _ in range(3)
+            ]
+            assert results == ["old", "old", "old"]
+
+            # A concurrent miss joins the background refresh instead of reloading
+            waiter = asyncio.create_task(
+                cache_mgr.single_flight("session:s1:page", refresh)
+            )
+            await asyncio.sleep(0)
+            release.set()
+            assert await waiter == "new"
+
+        assert refreshes == 1
+        assert await cache_mgr.get("session:s1:page") == "new"
+
+        swr = cache_mgr.get_cache_stats()["stale_while_revalidate"]
+        assert swr["stale_hits"] == 3
+        assert swr["background_refreshes"] == 1
+        assert swr["refreshing"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_window_is_per_namespace(self):
+        """Stale entries need a refresh callback, a window, and the hard TTL."""
+        import time
+
+        cache_mgr = SmartCacheManager()
+        cache_mgr.stale_policies = {"session": 30}
+        await cache_mgr.set("session:s1:page", "session_value", ttl=10)
+        await cache_mgr.set("search:s1:query", "search_value", ttl=10)
+
+        async def refresh():
+            return "refreshed"
+
+        now = time.time()
+        with patch("time.time", return_value=now + 15):
+            # Without a refresh callback stale entries are misses
+            assert await cache_mgr.get("session:s1:page") is None
+            # Namespaces without a window expire at the soft TTL
+            assert await cache_mgr.get("search:s1:query", refresh=refresh) is None
+
+        with patch("time.time", return_value=now + 45):
+            # Past the hard TTL nothing is served
+            assert await cache_mgr.get("session:s1:page", refresh=refresh) is None
+
+        assert (
+            cache_mgr.get_cache_stats()["stale_while_revalidate"][
+                "background_refreshes"
+            ]
+            == 0
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        """A failing background refresh is counted and leaves the entry in place."""
+        import time
+
+        cache_mgr = SmartCacheManager()
+        cache_mgr.stale_policies = {"search": 60}
+        await cache_mgr.set("search:s1:query", "stale", ttl=10)
+
+        async def failing_refresh():
+            raise RuntimeError("database unavailable")
+
+        with patch("time.time", return_value=time.time() + 15):
+            assert (
+                await cache_mgr.get("search:s1:query", refresh=failing_refresh)
+                == "stale"
+            )
+            for _ in range(3):
+                await asyncio.sleep(0)
+            assert await cache_mgr.get("search:s1:query", refresh=failing_refresh)
+
+        swr = cache_mgr.get_cache_stats()["stale_while_revalidate"]
+        assert swr["refresh_failures"] >= 1
+
 
 class TestCachedOperation:
     """Test cached operation helper function."""
@@ -401,6 +760,104 @@ class TestCachedOperation:
         assert result == "new_result"
         assert operation_called
 
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_operation(self):
+        """Concurrent misses on one key run the operation once and share it."""
+        stats_before = cache_manager.get_cache_stats()["single_flight"]
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_operation():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"value": "shared"}
+
+        tasks = [
+            asyncio.create_task(cached_operation("single_flight_key", slow_operation))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        assert cache_manager.get_cache_stats()["single_flight"]["in_flight"] == 1
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+
+        stats = cache_manager.get_cache_stats()["single_flight"]
+        assert stats["in_flight"] == 0
+        assert stats["leaders"] - stats_before["leaders"] == 1
+        assert stats["coalesced_waiters"] - stats_before["coalesced_waiters"] == 4
+
+    @pytest.mark.asyncio
+    async def test_single_flight_shares_errors_without_caching(self):
+        """Waiters see the leader's exception and the next miss recomputes."""
+        release = asyncio.Event()
+        calls = 0
+
+        async def failing_operation():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            raise RuntimeError("backend unavailable")
+
+        tasks = [
+            asyncio.create_task(
+                cached_operation("single_flight_error_key", failing_operation)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await cache_manager.get("single_flight_error_key") is None
+
+        async def recovered_operation():
+            return "recovered"
+
+        assert (
+            await cached_operation("single_flight_error_key", recovered_operation)
+            == "recovered"
+        )
+
+    @pytest.mark.asyncio
+    async def test_single_flight_leader_cancellation_hands_over(self):
+        """A cancelled leader does not fail its waiters; one of them recomputes."""
+        manager = SmartCacheManager()
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_operation():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        leader = asyncio.create_task(manager.single_flight("key", slow_operation))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(manager.single_flight("key", slow_operation))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.gather(leader, return_exceptions=True)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert leader.cancelled()
+        assert calls == 2
+        assert results == [2, 2, 2]
+        stats = manager.get_cache_stats()["single_flight"]
+        assert stats["leaders"] == 2
+        assert stats["coalesced_waiters"] == 3
+        assert stats["in_flight"] == 0
+
 
 class TestBackgroundMaintenance:
     """Test background cache maintenance functionality."""
@@ -0,0 +1,186 @@
+"""
+Unit tests for incremental schema migrations.
+
+Simulates databases created by an older release and verifies that
+re-initialization brings them up to the current schema version.
+"""
+
+import contextlib
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from shared_context_server.database_migrations import (
+    SCHEMA_VERSION,
+    apply_pending_migrations,
+)
+from shared_context_server.database_sqlalchemy import SimpleSQLAlchemyManager
+
+
+@pytest.fixture
+def temp_db_url():
+    """Provide a file-backed SQLite URL that is removed after the test."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    yield f"sqlite+aiosqlite:///{temp_path}"
+
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+async def _downgrade_to_version_3(db_url: str) -> None:
+    """Create a populated database and strip everything added after v3."""
+    manager = SimpleSQLAlchemyManager(db_url)
+    await manager.initialize()
+
+    async with manager.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+            ("session_0123456789abcdef", "Migration test", "migration_agent"),
+        )
+        await conn.execute(
+            """
+            INSERT INTO messages (session_id, sender, content, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                "session_0123456789abcdef",
+                "migration_agent",
+                "legacy kubernetes note",
+                "2024-01-01 12:00:00",
+            ),
+        )
+        await conn.execute(
+            """
+            INSERT INTO messages (session_id, sender, content, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            ("session_0123456789abcdef", "migration_agent", "float note", 1704110400.5),
+        )
+        # Pre-v4 databases had no full-text index contents
+        await conn.execute(
+            "INSERT INTO messages_fts (messages_fts) VALUES ('delete-all')"
+        )
+        # Pre-v7 databases had no session statistics
+        for trigger in (
+            "session_stats_session_insert_trigger",
+            "session_stats_message_insert_trigger",
+            "session_stats_message_delete_trigger",
+            "session_stats_memory_insert_trigger",
+            "session_stats_memory_delete_trigger",
+        ):
+            await conn.execute(f"DROP TRIGGER {trigger}")
+        await conn.execute("DROP TABLE session_senders")
+        await conn.execute("DROP TABLE session_stats")
+        # Pre-v5 databases had no ts_us column
+        await conn.execute("DROP TRIGGER messages_ts_us_insert_trigger")
+        await conn.execute("DROP INDEX idx_messages_session_ts")
+        await conn.execute("ALTER TABLE messages DROP COLUMN ts_us")
+        await conn.execute("DELETE FROM schema_version WHERE version > 3")
+
+    await manager.close()
+
+
+class TestDatabaseMigrations:
+    """Test schema migrations for existing databases."""
+
+    async def test_fresh_database_skips_migrations(self, temp_db_url):
+        """Migrations only run for databases that existed before initialization."""
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+        await manager.initialize()
+
+        async with manager.engine.connect() as conn:
+            assert await apply_pending_migrations(conn, "sqlite", None) == []
+            assert await apply_pending_migrations(conn, "sqlite", SCHEMA_VERSION) == []
+
+        await manager.close()
+
+    async def test_upgrade_rebuilds_fulltext_index(self, temp_db_url):
+        """Upgrading from v3 indexes messages written before the FTS table existed."""
+        await _downgrade_to_version_3(temp_db_url)
+
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+        await manager.initialize()
+
+        async with manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?",
+                ('"kubernetes"*',),
+            )
+            assert len(await cursor.fetchall()) == 1
+
+            cursor = await conn.execute("SELECT MAX(version) FROM schema_version")
+            assert (await cursor.fetchone())[0] == SCHEMA_VERSION
+
+        await manager.close()
+
+    async def test_upgrade_backfills_ts_us(self, temp_db_url):
+        """Upgrading normalizes ISO and float timestamps into indexed ts_us."""
+        await _downgrade_to_version_3(temp_db_url)
+
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+        await manager.initialize()
+
+        async with manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT content, ts_us FROM messages ORDER BY ts_us"
+            )
+            rows = [tuple(row) for row in await cursor.fetchall()]
+            assert rows == [
+                ("legacy kubernetes note", 1704110400000000),
+                ("float note", 1704110400500000),
+            ]
+
+            cursor = await conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM messages "
+                "WHERE session_id = ? AND ts_us >= ? ORDER BY ts_us",
+                ("session_0123456789abcdef", 0),
+            )
+            plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+            assert "idx_messages_session_ts" in plan
+
+            # Rows written after the upgrade get ts_us from the insert trigger
+            await conn.execute(
+                "INSERT INTO messages (session_id, sender, content, timestamp) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    "session_0123456789abcdef",
+                    "migration_agent",
+                    "new note",
+                    "2024-01-02 00:00:00",
+                ),
+            )
+            cursor = await conn.execute(
+                "SELECT ts_us FROM messages WHERE content = ?", ("new note",)
+            )
+            assert (await cursor.fetchone())[0] == 1704153600000000
+
+        await manager.close()
+
+    async def test_upgrade_backfills_session_stats(self, temp_db_url):
+        """Upgrading counts existing messages into session_stats once."""
+        await _downgrade_to_version_3(temp_db_url)
+
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+        await manager.initialize()
+
+        async with manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT message_count, public_count, participant_count, "
+                "memory_count, last_activity_us FROM session_stats "
+                "WHERE session_id = ?",
+                ("session_0123456789abcdef",),
+            )
+            assert tuple(await cursor.fetchone()) == (2, 2, 1, 0, 1704110400500000)
+
+            cursor = await conn.execute(
+                "SELECT sender, message_count FROM session_senders"
+            )
+            assert [tuple(row) for row in await cursor.fetchall()] == [
+                ("migration_agent", 2)
+            ]
+
+        await manager.close()
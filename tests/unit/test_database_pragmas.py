@@ -0,0 +1,80 @@
+"""
+Unit tests for SQLite PRAGMA setup in the SQLAlchemy manager.
+
+PRAGMAs are applied by a connect event once per physical connection and
+validated once at startup, so connection checkouts issue no PRAGMA queries.
+"""
+
+import contextlib
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from shared_context_server.database_sqlalchemy import SimpleSQLAlchemyManager
+
+
+@pytest.fixture
+def temp_db_url():
+    """Provide a file-backed SQLite URL that is removed after the test."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    yield f"sqlite+aiosqlite:///{temp_path}"
+
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+class TestSQLitePragmas:
+    """Test connect-time PRAGMA application and startup validation."""
+
+    async def test_checkouts_do_not_reissue_pragmas(self, temp_db_url):
+        """Requests after startup run only their own statements."""
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+        await manager.initialize()
+
+        statements: list[str] = []
+
+        @event.listens_for(manager.engine.sync_engine, "before_cursor_execute")
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        try:
+            for _ in range(3):
+                async with manager.get_connection() as conn:
+                    cursor = await conn.execute("SELECT COUNT(*) FROM sessions")
+                    await cursor.fetchone()
+
+                    # Settings from the connect event are in effect
+                    cursor = await conn.execute("PRAGMA foreign_keys")
+                    assert (await cursor.fetchone())[0] == 1
+        finally:
+            await manager.close()
+
+        assert statements.count("PRAGMA foreign_keys") == 3
+        assert not [s for s in statements if s.startswith("PRAGMA optimize")]
+        assert len(statements) == 6
+
+    async def test_startup_requires_wal_outside_tests(self, temp_db_url):
+        """A non-WAL journal mode fails initialization in production."""
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+
+        @event.listens_for(manager.engine.sync_engine, "connect")
+        def use_rollback_journal(dbapi_connection, _record):
+            dbapi_connection.execute("PRAGMA journal_mode = DELETE")
+
+        try:
+            with (
+                patch(
+                    "shared_context_server.database_sqlalchemy._is_testing_environment",
+                    return_value=False,
+                ),
+                pytest.raises(RuntimeError, match="journal_mode=wal"),
+            ):
+                await manager.initialize()
+        finally:
+            await manager.close()
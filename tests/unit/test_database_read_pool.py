@@ -0,0 +1,156 @@
+"""
+Unit tests for the SQLite reader pool and single writer.
+
+With a read pool configured, SELECTs run on pooled query-only connections
+until a block first writes; from then on the block stays on the writer so
+it reads its own uncommitted changes, until commit releases the writer.
+"""
+
+import asyncio
+import contextlib
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+from shared_context_server.database_manager import (
+    RoutedConnectionWrapper,
+    SimpleSQLAlchemyManager,
+)
+
+
+@pytest.fixture
+async def manager(request):
+    """A runtime manager with a two-connection read pool (or the given size)."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    manager = SimpleSQLAlchemyManager(
+        f"sqlite+aiosqlite:///{temp_path}",
+        eager_init=False,
+        read_pool_size=getattr(request, "param", 2),
+    )
+    await manager.initialize()
+
+    yield manager
+
+    await manager.close()
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+def _session_id() -> str:
+    return f"session_{uuid.uuid4().hex[:16]}"
+
+
+async def _count_sessions(manager, session_id: str) -> int:
+    async with manager.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT COUNT(*) FROM sessions WHERE id = ?", (session_id,)
+        )
+        return (await cursor.fetchone())[0]
+
+
+class TestReadPoolRouting:
+    """Test statement routing between the reader pool and the writer."""
+
+    async def test_select_only_blocks_use_the_reader_pool(self, manager):
+        """A block that only reads never checks out the writer."""
+        async with manager.get_connection() as conn:
+            assert isinstance(conn, RoutedConnectionWrapper)
+            cursor = await conn.execute("SELECT COUNT(*) FROM sessions")
+            assert await cursor.fetchone() is not None
+
+            assert conn._reader is not None
+            assert conn._connection is None
+            assert manager.get_engine_metrics()["read_pool"]["checked_out"] == 1
+
+        assert manager.get_engine_metrics()["read_pool"]["checked_out"] == 0
+
+    async def test_block_reads_its_own_writes(self, manager):
+        """After the first write, reads in the block go to the writer."""
+        session_id = _session_id()
+
+        async with manager.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+                (session_id, "read pool test", "pool_agent"),
+            )
+            cursor = await conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE id = ?", (session_id,)
+            )
+            assert (await cursor.fetchone())[0] == 1
+            assert conn._reader is None
+
+        assert await _count_sessions(manager, session_id) == 1
+
+    async def test_readers_see_only_committed_writes(self, manager):
+        """Concurrent readers are not blocked by, and don't see, open writes."""
+        session_id = _session_id()
+        written, release = asyncio.Event(), asyncio.Event()
+
+        async def writer():
+            async with manager.get_connection() as conn:
+                await conn.execute(
+                    "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+                    (session_id, "uncommitted", "pool_agent"),
+                )
+                written.set()
+                await release.wait()
+
+        task = asyncio.create_task(writer())
+        await written.wait()
+
+        # The writer holds its transaction open; reads still complete
+        assert await asyncio.wait_for(_count_sessions(manager, session_id), 5) == 0
+
+        release.set()
+        await task
+        assert await _count_sessions(manager, session_id) == 1
+
+    @pytest.mark.parametrize("manager", [2, 0], indirect=True)
+    async def test_commit_releases_the_writer(self, manager):
+        """Another block can write while one is past its commit."""
+        first_id, second_id = _session_id(), _session_id()
+        committed, release = asyncio.Event(), asyncio.Event()
+
+        async def first_block():
+            async with manager.get_connection() as conn:
+                await conn.execute(
+                    "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+                    (first_id, "first", "pool_agent"),
+                )
+                await conn.commit()
+                # Post-commit side effects (audit, notifications) run here
+                committed.set()
+                await release.wait()
+
+        async def second_block():
+            async with manager.get_connection() as conn:
+                await conn.execute(
+                    "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+                    (second_id, "second", "pool_agent"),
+                )
+                await conn.commit()
+
+        task = asyncio.create_task(first_block())
+        await committed.wait()
+        try:
+            await asyncio.wait_for(second_block(), 5)
+        finally:
+            release.set()
+            await task
+
+        assert await _count_sessions(manager, first_id) == 1
+        assert await _count_sessions(manager, second_id) == 1
+
+    async def test_reader_connections_reject_writes(self, manager):
+        """Pooled readers are query-only even if a write reaches them."""
+        async with manager.read_engine.connect() as conn:
+            with pytest.raises(Exception, match="readonly"):
+                await conn.exec_driver_sql(
+                    "INSERT INTO sessions (id, purpose, created_by) "
+                    "VALUES ('session_0000000000000000', 'x', 'y')"
+                )
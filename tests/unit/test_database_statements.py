@@ -0,0 +1,115 @@
+"""
+Unit tests for the compiled statement cache.
+
+Covers placeholder translation, LRU behaviour and the hit/miss counts that
+the database managers report in their engine metrics.
+"""
+
+import contextlib
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from shared_context_server import database_sqlalchemy
+from shared_context_server.database_sqlalchemy import SimpleSQLAlchemyManager
+from shared_context_server.database_statements import StatementCache
+
+
+@pytest.fixture
+def temp_db_url():
+    """Provide a file-backed SQLite URL that is removed after the test."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    yield f"sqlite+aiosqlite:///{temp_path}"
+
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+class TestStatementCache:
+    """Test statement compilation and caching."""
+
+    def test_placeholders_are_converted_once(self):
+        """Repeated statements reuse the compiled clause and only bind values."""
+        cache = StatementCache()
+        query = "SELECT * FROM messages WHERE session_id = ? AND id > ?"
+
+        first = cache.get("sqlite", query)
+        second = cache.get("sqlite", query)
+
+        assert second is first
+        assert str(first.clause) == (
+            "SELECT * FROM messages WHERE session_id = :param_0 AND id > :param_1"
+        )
+        assert first.bind(("session_1", 10)) == {
+            "param_0": "session_1",
+            "param_1": 10,
+        }
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_question_marks_in_string_literals_are_kept(self):
+        """Only placeholders outside quoted literals become parameters."""
+        compiled = StatementCache().get(
+            "sqlite", "SELECT 'why?', 'it''s ?' FROM t WHERE a = ?"
+        )
+
+        assert compiled.param_names == ("param_0",)
+        assert str(compiled.clause) == (
+            "SELECT 'why?', 'it''s ?' FROM t WHERE a = :param_0"
+        )
+
+    def test_entries_are_keyed_by_dialect_and_evicted_lru(self):
+        """Each dialect gets its own rewrite; the least recent entry goes first."""
+        cache = StatementCache(
+            max_size=2,
+            rewrite=lambda dialect, query: (
+                query.upper() if dialect == "mysql" else query
+            ),
+        )
+
+        sqlite_stmt = cache.get("sqlite", "select ?")
+        mysql_stmt = cache.get("mysql", "select ?")
+        assert str(sqlite_stmt.clause) == "select :param_0"
+        assert str(mysql_stmt.clause) == "SELECT :param_0"
+
+        cache.get("sqlite", "select ?")  # refresh recency
+        cache.get("sqlite", "select 1")
+
+        assert cache.get_stats()["size"] == 2
+        assert cache.get("sqlite", "select ?") is sqlite_stmt
+        assert cache.get("mysql", "select ?") is not mysql_stmt
+
+    def test_mysql_key_column_translation_is_cached(self):
+        """The MySQL key -> key_name rewrite is applied at compile time."""
+        compiled = database_sqlalchemy._statement_cache.get(
+            "mysql", "SELECT value FROM agent_memory WHERE agent_id = ? AND key = ?"
+        )
+
+        assert "key_name = :param_1" in str(compiled.clause)
+
+
+class TestStatementCacheMetrics:
+    """Test that executes go through the cache and report their counts."""
+
+    async def test_repeated_queries_hit_the_cache(self, temp_db_url):
+        """Running one statement repeatedly compiles it once."""
+        manager = SimpleSQLAlchemyManager(temp_db_url)
+        await manager.initialize()
+        query = "SELECT COUNT(*) FROM sessions WHERE id = ? -- statement cache test"
+
+        before = manager.get_stats()["statement_cache"]
+        try:
+            async with manager.get_connection() as conn:
+                for _ in range(5):
+                    cursor = await conn.execute(query, ("session_missing",))
+                    assert (await cursor.fetchone())[0] == 0
+        finally:
+            await manager.close()
+
+        after = manager.get_stats()["statement_cache"]
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 4
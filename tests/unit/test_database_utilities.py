@@ -21,6 +21,7 @@ from shared_context_server.database import (
     _raise_table_not_found_error,
     _raise_wal_mode_error,
     parse_utc_timestamp,
+    to_epoch_us,
     utc_now,
     utc_timestamp,
     validate_json_string,
@@ -116,6 +117,20 @@ class TestDatabaseUtilities:
         with pytest.raises(ValueError):
             parse_utc_timestamp("")
 
+    def test_to_epoch_us_mixed_inputs(self):
+        """Unix floats, ISO strings and datetimes normalize to the same microseconds."""
+        moment = datetime(2024, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        expected = 1704112215123456
+
+        assert to_epoch_us(moment) == expected
+        assert to_epoch_us(moment.isoformat()) == expected
+        assert to_epoch_us("2024-01-01T12:30:15.123456Z") == expected
+        assert to_epoch_us(moment.timestamp()) == expected
+        assert to_epoch_us(0) == 0
+
+        with pytest.raises(ValueError):
+            to_epoch_us("not-a-timestamp")
+
     # =============================================================================
     # VALIDATION UTILITIES
     # =============================================================================
@@ -0,0 +1,158 @@
+"""
+Unit tests for the group-commit write queue.
+
+Concurrent write intents are committed together in one writer transaction;
+each caller gets its own result only after that commit, and a failing
+intent doesn't take its batch neighbours down with it.
+"""
+
+import asyncio
+import contextlib
+import tempfile
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from shared_context_server import database_manager
+from shared_context_server.database_manager import SimpleSQLAlchemyManager
+from shared_context_server.database_write_queue import (
+    GroupCommitQueue,
+    run_write,
+    write_statement,
+)
+
+INSERT_MESSAGE = "INSERT INTO messages (session_id, sender, content) VALUES (?, ?, ?)"
+
+
+@pytest.fixture
+async def manager():
+    """A runtime manager whose connections back the queue's writer."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    manager = SimpleSQLAlchemyManager(
+        f"sqlite+aiosqlite:///{temp_path}", eager_init=False, read_pool_size=2
+    )
+    await manager.initialize()
+
+    with patch.object(
+        database_manager, "get_db_connection", side_effect=manager.get_connection
+    ):
+        yield manager
+
+    await manager.close()
+    for suffix in ("", "-wal", "-shm"):
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path + suffix).unlink()
+
+
+@pytest.fixture
+async def session_id(manager):
+    """A session that test messages can reference."""
+    session_id = f"session_{uuid.uuid4().hex[:16]}"
+    async with manager.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+            (session_id, "group commit test", "queue_agent"),
+        )
+    return session_id
+
+
+async def _message_ids(manager, session_id: str) -> list[int]:
+    async with manager.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT id FROM messages WHERE session_id = ? ORDER BY id", (session_id,)
+        )
+        return [row[0] for row in await cursor.fetchall()]
+
+
+class TestGroupCommitQueue:
+    """Test batching, durability and failure isolation."""
+
+    async def test_concurrent_writes_share_commits(self, manager, session_id):
+        """Each caller gets its own lastrowid from a shared transaction."""
+        queue = GroupCommitQueue(max_batch=16, max_delay=0.01)
+        queue.start()
+        try:
+            message_ids = await asyncio.gather(
+                *(
+                    queue.submit(
+                        write_statement(
+                            INSERT_MESSAGE, (session_id, "queue_agent", f"m{i}")
+                        )
+                    )
+                    for i in range(40)
+                )
+            )
+        finally:
+            await queue.stop()
+
+        # Results are committed and visible to new connections
+        assert sorted(message_ids) == await _message_ids(manager, session_id)
+        assert len(set(message_ids)) == 40
+
+        stats = queue.get_stats()
+        assert stats["committed"] == 40
+        assert stats["batches"] < 40
+        assert stats["largest_batch"] <= 16
+
+    async def test_failing_intent_only_fails_its_caller(self, manager, session_id):
+        """A batch with a bad write is retried one transaction per intent."""
+        queue = GroupCommitQueue(max_batch=8, max_delay=0.05)
+        queue.start()
+        try:
+            results = await asyncio.gather(
+                queue.submit(
+                    write_statement(INSERT_MESSAGE, (session_id, "queue_agent", "ok"))
+                ),
+                queue.submit(write_statement("INSERT INTO missing_table VALUES (1)")),
+                queue.submit(
+                    write_statement(INSERT_MESSAGE, (session_id, "queue_agent", "ok"))
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            await queue.stop()
+
+        assert isinstance(results[1], Exception)
+        assert sorted([results[0], results[2]]) == await _message_ids(
+            manager, session_id
+        )
+        assert queue.stats["split_batches"] == 1
+        assert queue.stats["failed"] == 1
+
+    async def test_stop_commits_pending_writes(self, manager, session_id):
+        """Writes submitted before stop() are committed, not dropped."""
+        queue = GroupCommitQueue(max_batch=4, max_delay=0.05)
+        queue.start()
+
+        pending = [
+            asyncio.create_task(
+                queue.submit(
+                    write_statement(
+                        INSERT_MESSAGE, (session_id, "queue_agent", f"m{i}")
+                    )
+                )
+            )
+            for i in range(10)
+        ]
+        await asyncio.sleep(0)
+        await queue.stop()
+
+        assert not queue.running
+        message_ids = await asyncio.gather(*pending)
+        assert sorted(message_ids) == await _message_ids(manager, session_id)
+
+    async def test_run_write_executes_inline_when_stopped(self, manager, session_id):
+        """Without a running queue, intents run on the caller's connection."""
+        async with manager.get_connection() as conn:
+            message_id = await run_write(
+                conn,
+                write_statement(INSERT_MESSAGE, (session_id, "queue_agent", "inline")),
+            )
+
+        assert await _message_ids(manager, session_id) == [message_id]
+        with pytest.raises(RuntimeError, match="not running"):
+            await GroupCommitQueue().submit(write_statement("SELECT 1"))
@@ -0,0 +1,160 @@
+"""
+Unit tests for the TTL expiry scheduler.
+
+Expired agent memory and secure tokens are deleted in chunks close to their
+deadlines, loaded from the expires_at indexes or registered by schedule(),
+and each deletion is published as ExpiryEvents.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from shared_context_server import expiry_scheduler as expiry_module
+from shared_context_server.expiry_scheduler import ExpiryScheduler
+
+
+@pytest.fixture
+async def scheduler(test_db_manager):
+    """A scheduler with a small chunk size, using the test database."""
+    scheduler = ExpiryScheduler(chunk_size=2, resolution=0.05)
+    with patch.object(
+        expiry_module, "get_db_connection", test_db_manager.get_connection
+    ):
+        yield scheduler
+        await scheduler.stop()
+
+
+async def _add_memory(test_db_manager, key: str, expires_at: float | None) -> None:
+    async with test_db_manager.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO agent_memory (agent_id, key, value, created_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ("expiry_agent", key, '"v"', time.time() - 3600, expires_at),
+        )
+        await conn.commit()
+
+
+async def _memory_keys(test_db_manager) -> list[str]:
+    async with test_db_manager.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT key FROM agent_memory WHERE agent_id = ? ORDER BY key",
+            ("expiry_agent",),
+        )
+        return [row[0] for row in await cursor.fetchall()]
+
+
+async def _wait_for(condition, timeout: float = 3.0) -> None:
+    """Poll ``condition`` (sync or async) until it holds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = condition()
+        if asyncio.iscoroutine(result):
+            result = await result
+        if result:
+            return
+        assert time.monotonic() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.02)
+
+
+async def _deleted(test_db_manager, key: str) -> bool:
+    return key not in await _memory_keys(test_db_manager)
+
+
+class TestExpiryScheduler:
+    """Test chunked deletion, events and deadline scheduling."""
+
+    async def test_expire_now_deletes_in_chunks(self, scheduler, test_db_manager):
+        """Only expired rows are deleted, chunk_size at a time, with events."""
+        now = time.time()
+        for i in range(5):
+            await _add_memory(test_db_manager, f"old_{i}", now - 60 + i)
+        await _add_memory(test_db_manager, "live", now + 3600)
+        await _add_memory(test_db_manager, "permanent", None)
+
+        published = []
+        scheduler.listeners.append(published.extend)
+
+        assert await scheduler.expire_now("agent_memory", now) == 5
+
+        assert await _memory_keys(test_db_manager) == ["live", "permanent"]
+        assert scheduler.stats["chunks"] == 3
+        assert scheduler.expired_counts["agent_memory"] == 5
+        assert [event.key for event in published] == [f"old_{i}" for i in range(5)]
+        assert all(event.agent_id == "expiry_agent" for event in published)
+        assert published[0].expires_at == pytest.approx(now - 60)
+
+    async def test_expired_secure_tokens_are_deleted(self, scheduler, test_db_manager):
+        """Tokens with a past ISO expires_at are removed; live tokens stay."""
+        now = datetime.now(timezone.utc)
+        async with test_db_manager.get_connection() as conn:
+            for token_id, expires_at in (
+                ("sct_expired", now - timedelta(minutes=5)),
+                ("sct_live", now + timedelta(hours=1)),
+            ):
+                await conn.execute(
+                    "INSERT INTO secure_tokens "
+                    "(token_id, encrypted_jwt, agent_id, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (token_id, b"jwt", "expiry_agent", expires_at.isoformat()),
+                )
+            await conn.commit()
+
+        published = []
+        scheduler.listeners.append(published.extend)
+
+        assert await scheduler.expire_now("secure_tokens") == 1
+        assert [(e.table, e.key) for e in published] == [
+            ("secure_tokens", "sct_expired")
+        ]
+        async with test_db_manager.get_connection() as conn:
+            cursor = await conn.execute("SELECT token_id FROM secure_tokens")
+            assert [row[0] for row in await cursor.fetchall()] == ["sct_live"]
+
+    async def test_refill_loads_deadlines_from_index(self, scheduler, test_db_manager):
+        """Start-up deletes the backlog and queues deadlines within the horizon."""
+        now = time.time()
+        await _add_memory(test_db_manager, "backlog", now - 10)
+        await _add_memory(test_db_manager, "soon", now + 30)
+        await _add_memory(test_db_manager, "later", now + 3600)
+
+        scheduler.start()
+        await _wait_for(lambda: _deleted(test_db_manager, "backlog"))
+
+        stats = scheduler.get_stats()
+        assert stats["refills"] == 1
+        assert stats["pending_slots"] == 1
+        assert stats["next_deadline"] == pytest.approx(now + 30, abs=0.1)
+        assert await _memory_keys(test_db_manager) == ["later", "soon"]
+
+    async def test_scheduled_deadline_wakes_the_loop(self, scheduler, test_db_manager):
+        """A deadline registered after the refill is expired on time."""
+        scheduler.start()
+        await _wait_for(lambda: scheduler.stats["refills"] == 1)
+
+        await _add_memory(test_db_manager, "short", time.time() + 0.2)
+        scheduler.schedule("agent_memory", time.time() + 0.2)
+        assert scheduler.stats["scheduled"] == 1
+
+        await _wait_for(lambda: _deleted(test_db_manager, "short"))
+        assert scheduler.expired_counts["agent_memory"] == 1
+        assert scheduler.stats["refills"] == 1
+
+    async def test_refill_limit_brings_next_refill_forward(
+        self, scheduler, test_db_manager
+    ):
+        """When max_scheduled is reached, the next refill is at the last deadline."""
+        now = time.time()
+        for i in range(3):
+            await _add_memory(test_db_manager, f"k{i}", now + 10 + i)
+        scheduler.max_scheduled = 2
+
+        scheduler.start()
+        await _wait_for(lambda: scheduler.stats["refills"] == 1)
+
+        stats = scheduler.get_stats()
+        assert stats["pending_slots"] == 2
+        assert stats["next_refill"] == pytest.approx(now + 11, abs=0.1)
@@ -0,0 +1,187 @@
+"""
+Unit tests for the bulk memory tools.
+
+set_memory_many, get_memory_many and delete_memory_many authenticate once,
+run in one transaction (or one IN query) and report a result per key.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from shared_context_server import server
+from tests.conftest import MockContext, call_fastmcp_tool, patch_database_connection
+
+
+@pytest.fixture
+async def ctx(test_db_manager):
+    """An agent context, with the database patched in."""
+    with patch_database_connection(test_db_manager):
+        yield MockContext(session_id="bulk_memory", agent_id="bulk_agent")
+
+
+class TestBulkMemory:
+    """Test per-key results and single-call behavior of the bulk tools."""
+
+    async def test_set_get_and_delete_many(self, ctx, test_db_manager):
+        """Entries round-trip through the bulk tools in request order."""
+        stored = await call_fastmcp_tool(
+            server.set_memory_many,
+            ctx,
+            entries=[
+                {"key": "alpha", "value": {"step": 1}},
+                {"key": "beta", "value": "text", "metadata": {"tag": "b"}},
+                {"key": "gamma", "value": [1, 2], "expires_in": 3600},
+            ],
+        )
+        assert stored["success"] is True
+        assert stored["stored"] == 3
+        assert [r["key"] for r in stored["results"]] == ["alpha", "beta", "gamma"]
+        assert stored["results"][2]["expires_at"] is not None
+
+        fetched = await call_fastmcp_tool(
+            server.get_memory_many, ctx, keys=["gamma", "missing", "alpha", "beta"]
+        )
+        assert [(r["key"], r["found"]) for r in fetched["results"]] == [
+            ("gamma", True),
+            ("missing", False),
+            ("alpha", True),
+            ("beta", True),
+        ]
+        assert fetched["results"][2]["value"] == {"step": 1}
+        assert fetched["results"][3]["metadata"] == {"tag": "b"}
+        assert fetched["found"] == 3
+
+        deleted = await call_fastmcp_tool(
+            server.delete_memory_many, ctx, keys=["alpha", "missing", "gamma"]
+        )
+        assert deleted["results"] == [
+            {"key": "alpha", "deleted": True},
+            {"key": "missing", "deleted": False},
+            {"key": "gamma", "deleted": True},
+        ]
+
+        remaining = await call_fastmcp_tool(server.list_memory, ctx)
+        assert [entry["key"] for entry in remaining["entries"]] == ["beta"]
+
+        async with test_db_manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT event_type FROM audit_log WHERE agent_id = ? ORDER BY id",
+                ("bulk_agent",),
+            )
+            events = [row[0] for row in await cursor.fetchall()]
+        assert events.count("memory_set_many") == 1
+        assert events.count("memory_deleted_many") == 1
+
+    async def test_invalid_entries_fail_alone(self, ctx):
+        """Bad keys, bad TTLs and existing keys fail; the rest are stored."""
+        await call_fastmcp_tool(server.set_memory, ctx, key="taken", value=1)
+
+        result = await call_fastmcp_tool(
+            server.set_memory_many,
+            ctx,
+            overwrite=False,
+            entries=[
+                {"key": "bad key", "value": 1},
+                {"key": "fresh", "value": 2},
+                {"key": "taken", "value": 3},
+                {"key": "ttl", "value": 4, "expires_in": -5},
+                {"value": 5},
+                {"key": "forced", "value": 6, "overwrite": True},
+            ],
+        )
+
+        assert [(r["key"], r["success"]) for r in result["results"]] == [
+            ("bad key", False),
+            ("fresh", True),
+            ("taken", False),
+            ("ttl", False),
+            (None, False),
+            ("forced", True),
+        ]
+        codes = [r.get("code") for r in result["results"]]
+        assert codes[2] == "KEY_EXISTS"
+        assert codes[3] == "INVALID_TTL_VALUE"
+        assert result["stored"] == 2
+        assert result["failed"] == 4
+
+        taken = await call_fastmcp_tool(server.get_memory, ctx, key="taken")
+        assert taken["value"] == 1
+
+    async def test_one_auth_check_and_one_read_query(self, ctx, test_db_manager):
+        """A bulk read validates the agent once and issues a single SELECT."""
+        await call_fastmcp_tool(
+            server.set_memory_many,
+            ctx,
+            entries=[{"key": f"k{i}", "value": i} for i in range(20)],
+        )
+
+        statements = []
+        real_connection = test_db_manager.get_connection
+
+        def tracking_connection():
+            context = real_connection()
+
+            class Tracker:
+                async def __aenter__(self):
+                    conn = await context.__aenter__()
+                    execute = conn.execute
+
+                    async def tracked(query, *args, **kwargs):
+                        statements.append(query)
+                        return await execute(query, *args, **kwargs)
+
+                    conn.execute = tracked
+                    return conn
+
+                async def __aexit__(self, *exc):
+                    return await context.__aexit__(*exc)
+
+            return Tracker()
+
+        from shared_context_server import memory_tools
+
+        validate = AsyncMock(wraps=memory_tools.validate_agent_context_or_error)
+        with (
+            patch.object(memory_tools, "get_db_connection", tracking_connection),
+            patch.object(memory_tools, "validate_agent_context_or_error", validate),
+        ):
+            result = await call_fastmcp_tool(
+                server.get_memory_many, ctx, keys=[f"k{i}" for i in range(20)]
+            )
+
+        assert result["found"] == 20
+        assert validate.await_count == 1
+        assert len(statements) == 1
+        assert " IN (" in statements[0]
+
+    async def test_session_scope(self, ctx):
+        """Session-scoped entries are separate from global ones."""
+        created = await call_fastmcp_tool(
+            server.create_session, ctx, purpose="Bulk memory scope"
+        )
+        session_id = created["session_id"]
+
+        await call_fastmcp_tool(
+            server.set_memory_many,
+            ctx,
+            session_id=session_id,
+            entries=[{"key": "scoped", "value": "session"}],
+        )
+
+        global_result = await call_fastmcp_tool(
+            server.get_memory_many, ctx, keys=["scoped"]
+        )
+        session_result = await call_fastmcp_tool(
+            server.get_memory_many, ctx, keys=["scoped"], session_id=session_id
+        )
+        assert global_result["results"][0]["found"] is False
+        assert session_result["results"][0]["value"] == "session"
+
+        missing = await call_fastmcp_tool(
+            server.set_memory_many,
+            ctx,
+            session_id="session_0000000000000000",
+            entries=[{"key": "orphan", "value": 1}],
+        )
+        assert missing["success"] is False
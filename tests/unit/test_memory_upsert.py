@@ -0,0 +1,111 @@
+"""
+Unit tests for set_memory's single-statement upsert.
+
+One INSERT ... ON CONFLICT DO UPDATE replaces the existence SELECTs: the
+partial unique indexes pick the conflicting row, and overwrite=False only
+replaces entries that have already expired.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from shared_context_server import server
+from shared_context_server.memory_tools import _upsert_memory_statement
+from tests.conftest import MockContext, call_fastmcp_tool, patch_database_connection
+
+
+@pytest.fixture
+async def ctx(test_db_manager):
+    """An agent context, with the database patched in."""
+    with patch_database_connection(test_db_manager):
+        yield MockContext(session_id="upsert_memory", agent_id="upsert_agent")
+
+
+async def _memory_rows(test_db_manager, key: str) -> list[tuple]:
+    async with test_db_manager.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT session_id, value, expires_at FROM agent_memory "
+            "WHERE agent_id = ? AND key = ?",
+            ("upsert_agent", key),
+        )
+        return [tuple(row) for row in await cursor.fetchall()]
+
+
+class TestMemoryUpsert:
+    """Test conflict handling of the memory upsert."""
+
+    async def test_overwrite_updates_in_place(self, ctx, test_db_manager):
+        """Rewriting a key updates its one row in each scope."""
+        created = await call_fastmcp_tool(
+            server.create_session, ctx, purpose="Upsert scopes"
+        )
+        session_id = created["session_id"]
+
+        for value in ("one", "two"):
+            await call_fastmcp_tool(server.set_memory, ctx, key="k", value=value)
+            await call_fastmcp_tool(
+                server.set_memory, ctx, key="k", value=value, session_id=session_id
+            )
+
+        rows = await _memory_rows(test_db_manager, "k")
+        assert sorted(rows, key=lambda row: row[0] or "") == [
+            (None, "two", None),
+            (session_id, "two", None),
+        ]
+
+    async def test_overwrite_false_replaces_only_expired_entries(
+        self, ctx, test_db_manager
+    ):
+        """A live entry is kept; an expired one is replaced in place."""
+        now = datetime.now(timezone.utc).timestamp()
+        async with test_db_manager.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO agent_memory "
+                "(agent_id, key, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                ("upsert_agent", "stale", '"old"', now - 120, now - 60),
+            )
+            await conn.commit()
+
+        kept = await call_fastmcp_tool(server.set_memory, ctx, key="live", value=1)
+        assert kept["success"] is True
+        refused = await call_fastmcp_tool(
+            server.set_memory, ctx, key="live", value=2, overwrite=False
+        )
+        assert refused["success"] is False
+        assert refused["code"] == "KEY_EXISTS"
+        assert await _memory_rows(test_db_manager, "live") == [(None, "1", None)]
+
+        replaced = await call_fastmcp_tool(
+            server.set_memory, ctx, key="stale", value="new", overwrite=False
+        )
+        assert replaced["success"] is True
+        assert await _memory_rows(test_db_manager, "stale") == [(None, "new", None)]
+
+    async def test_concurrent_writers_leave_one_row(self, ctx, test_db_manager):
+        """Simultaneous set_memory calls for one key never duplicate it."""
+        results = await asyncio.gather(
+            *(
+                call_fastmcp_tool(server.set_memory, ctx, key="race", value=i)
+                for i in range(10)
+            )
+        )
+
+        assert all(result["success"] for result in results)
+        assert len(await _memory_rows(test_db_manager, "race")) == 1
+
+    def test_statements_per_dialect(self):
+        """SQLite/PostgreSQL use ON CONFLICT; MySQL uses ON DUPLICATE KEY."""
+        global_insert = _upsert_memory_statement("sqlite", False, True)
+        assert "ON CONFLICT (agent_id, key) WHERE session_id IS NULL" in global_insert
+        assert " WHERE agent_memory.expires_at" not in global_insert
+
+        keep_live = _upsert_memory_statement("postgresql", True, False)
+        assert "(agent_id, session_id, key) WHERE session_id IS NOT NULL" in keep_live
+        assert keep_live.endswith("agent_memory.expires_at <= ?")
+
+        mysql = _upsert_memory_statement("mysql", False, False)
+        assert "ON DUPLICATE KEY UPDATE" in mysql
+        assert mysql.count("?") == 8 + 5
+        assert mysql.index("expires_at = IF") > mysql.index("value = IF")
@@ -0,0 +1,187 @@
+"""
+Unit tests for keyset (cursor) pagination in get_messages.
+
+Cursor, after_id and before_id pages seek on (session_id, id) instead of
+counting and skipping rows; total_count is only computed when requested.
+Offset paging keeps its previous behavior.
+"""
+
+import pytest
+
+from shared_context_server import server
+from shared_context_server.session_tools import (
+    decode_message_cursor,
+    encode_message_cursor,
+)
+from tests.conftest import MockContext, call_fastmcp_tool, patch_database_connection
+
+
+@pytest.fixture
+async def session(test_db_manager):
+    """A session holding five public messages, with the database patched in."""
+    with patch_database_connection(test_db_manager):
+        ctx = MockContext(session_id="pagination_test", agent_id="pager")
+        created = await call_fastmcp_tool(
+            server.create_session, ctx, purpose="Cursor pagination test"
+        )
+        session_id = created["session_id"]
+        ids = []
+        for i in range(5):
+            result = await call_fastmcp_tool(
+                server.add_message, ctx, session_id=session_id, content=f"m{i}"
+            )
+            ids.append(result["message_id"])
+        yield ctx, session_id, ids
+
+
+def _contents(result: dict) -> list[str]:
+    return [message["content"] for message in result["messages"]]
+
+
+class TestCursorPagination:
+    """Test polling with next_cursor and explicit id bounds."""
+
+    async def test_cursor_polling_returns_only_new_messages(self, session):
+        """Following next_cursor yields each message once, even across empty polls."""
+        ctx, session_id, _ = session
+
+        first = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, limit=3
+        )
+        assert _contents(first) == ["m0", "m1", "m2"]
+        assert first["has_more"] is True
+
+        second = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, cursor=first["next_cursor"]
+        )
+        assert _contents(second) == ["m3", "m4"]
+        assert second["has_more"] is False
+        assert "total_count" not in second
+
+        empty = await call_fastmcp_tool(
+            server.get_messages,
+            ctx,
+            session_id=session_id,
+            cursor=second["next_cursor"],
+        )
+        assert empty["messages"] == []
+        assert empty["next_cursor"] == second["next_cursor"]
+
+        await call_fastmcp_tool(
+            server.add_message, ctx, session_id=session_id, content="m5"
+        )
+        newer = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, cursor=empty["next_cursor"]
+        )
+        assert _contents(newer) == ["m5"]
+
+    async def test_polling_an_empty_session(self, session):
+        """An empty first page still returns a cursor that picks up new messages."""
+        ctx, _, _ = session
+        created = await call_fastmcp_tool(
+            server.create_session, ctx, purpose="Empty polling test"
+        )
+        session_id = created["session_id"]
+
+        empty = await call_fastmcp_tool(server.get_messages, ctx, session_id=session_id)
+        assert empty["messages"] == []
+        assert empty["next_cursor"] == encode_message_cursor("after", 0)
+
+        await call_fastmcp_tool(
+            server.add_message, ctx, session_id=session_id, content="first"
+        )
+        newer = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, cursor=empty["next_cursor"]
+        )
+        assert _contents(newer) == ["first"]
+
+    async def test_offset_past_the_end_polls_after_the_newest_message(self, session):
+        """An empty offset page continues after the last visible message."""
+        ctx, session_id, ids = session
+
+        past_end = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, offset=10
+        )
+        assert past_end["messages"] == []
+        assert past_end["next_cursor"] == encode_message_cursor("after", ids[-1])
+
+    async def test_before_id_pages_backwards(self, session):
+        """before_id returns the newest older messages, oldest first."""
+        ctx, session_id, ids = session
+
+        page = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, before_id=ids[4], limit=2
+        )
+        assert _contents(page) == ["m2", "m3"]
+        assert page["has_more"] is True
+
+        older = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, cursor=page["next_cursor"]
+        )
+        assert _contents(older) == ["m0", "m1"]
+        assert older["has_more"] is False
+
+    async def test_include_total_counts_on_request(self, session):
+        """Keyset pages count matching messages only when include_total is set."""
+        ctx, session_id, ids = session
+
+        page = await call_fastmcp_tool(
+            server.get_messages,
+            ctx,
+            session_id=session_id,
+            after_id=ids[1],
+            include_total=True,
+        )
+        assert _contents(page) == ["m2", "m3", "m4"]
+        assert page["total_count"] == 5
+
+        uncounted = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, include_total=False
+        )
+        assert "total_count" not in uncounted
+        assert len(uncounted["messages"]) == 5
+
+    async def test_invalid_cursors_are_rejected(self, session):
+        """Malformed cursors, or cursors mixed with id bounds, return errors."""
+        ctx, session_id, ids = session
+
+        bad = await call_fastmcp_tool(
+            server.get_messages, ctx, session_id=session_id, cursor="not-a-cursor"
+        )
+        assert bad["success"] is False
+        assert bad["code"] == "INVALID_CURSOR"
+
+        mixed = await call_fastmcp_tool(
+            server.get_messages,
+            ctx,
+            session_id=session_id,
+            cursor=encode_message_cursor("after", ids[0]),
+            after_id=ids[1],
+        )
+        assert mixed["success"] is False
+        assert mixed["code"] == "INVALID_PAGINATION"
+
+    def test_cursor_round_trip(self):
+        """Cursors are opaque URL-safe strings that decode to their bounds."""
+        cursor = encode_message_cursor("before", 12345)
+        assert "=" not in cursor
+        assert decode_message_cursor(cursor) == ("before", 12345)
+
+        for bad in ("", "e30", encode_message_cursor("sideways", 1)):
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                decode_message_cursor(bad)
+
+    async def test_keyset_query_seeks_the_session_index(self, test_db_manager):
+        """The keyset query searches an index on session_id and id."""
+        async with test_db_manager.get_connection() as conn:
+            cursor = await conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM messages "
+                "WHERE session_id = ? AND id > ? ORDER BY id ASC LIMIT ?",
+                ("session_x", 100, 51),
+            )
+            plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+
+        assert "SEARCH messages USING INDEX" in plan
+        assert "session_id=?" in plan
+        assert "rowid>?" in plan or "id>?" in plan
+        assert "TEMP B-TREE" not in plan
@@ -159,13 +159,18 @@ class TestDebugSessionPrompt:
             "created_at": "2023-01-01T00:00:00Z",
             "created_by": "test_agent",
             "metadata": {"project": "test"},
+            "message_count": 8,
+            "public_count": 5,
+            "private_count": 3,
+            "agent_only_count": 0,
+            "admin_only_count": 0,
         }
 
-        # Mock message statistics
+        # Mock per-sender message counts
         mock_msg_cursor = AsyncMock()
         mock_msg_cursor.fetchall.return_value = [
-            {"total": 5, "visibility": "public", "sender": "agent1"},
-            {"total": 3, "visibility": "private", "sender": "agent2"},
+            {"sender": "agent1", "message_count": 5},
+            {"sender": "agent2", "message_count": 3},
         ]
 
         # Mock recent messages
@@ -234,6 +239,11 @@ class TestDebugSessionPrompt:
             "created_at": "2023-01-01T00:00:00Z",
             "created_by": "test_agent",
             "metadata": {},
+            "message_count": 0,
+            "public_count": 0,
+            "private_count": 0,
+            "agent_only_count": 0,
+            "admin_only_count": 0,
         }
 
         mock_msg_cursor = AsyncMock()
@@ -270,11 +280,16 @@ class TestDebugSessionPrompt:
             "created_at": "2023-01-01T00:00:00Z",
             "created_by": "agent1",
             "metadata": {},
+            "message_count": 10,
+            "public_count": 10,
+            "private_count": 0,
+            "agent_only_count": 0,
+            "admin_only_count": 0,
         }
 
         mock_msg_cursor = AsyncMock()
         mock_msg_cursor.fetchall.return_value = [
-            {"total": 10, "visibility": "public", "sender": "agent1"}
+            {"sender": "agent1", "message_count": 10}
         ]
 
         mock_recent_cursor = AsyncMock()
@@ -0,0 +1,230 @@
+"""
+Unit tests for the in-process per-session search corpus.
+
+Covers incremental appends, visibility filtering, load/append races,
+LRU eviction under session and byte budgets, and multi-query scoring.
+"""
+
+import pytest
+from rapidfuzz import fuzz, process
+
+from shared_context_server.utils.search_corpus import (
+    SearchCorpusManager,
+    SessionSearchCorpus,
+    build_searchable_text,
+    extract_many,
+)
+
+
+def _row(message_id, content, sender="agent_a", visibility="public", metadata=None):
+    return {
+        "id": message_id,
+        "sender": sender,
+        "content": content,
+        "visibility": visibility,
+        "metadata": metadata,
+        "timestamp": 1700000000.0 + message_id,
+    }
+
+
+def _search(
+    corpus,
+    query,
+    agent_id="agent_a",
+    is_admin=False,
+    search_scope="all",
+    search_metadata=True,
+):
+    texts, messages = corpus.visible_documents(
+        agent_id, is_admin, search_scope, search_metadata
+    )
+    (matches,) = extract_many([query], texts, limit=10, score_cutoff=80.0)
+    return [(messages[index], score) for index, score in matches]
+
+
+class TestSessionSearchCorpus:
+    """Test corpus storage and search behavior."""
+
+    def test_build_searchable_text_parses_metadata_once(self):
+        """Metadata JSON strings and dicts normalize to the same text."""
+        as_string = _row(1, "Hello", metadata='{"topic": "Deploy"}')
+        as_dict = _row(1, "Hello", metadata={"topic": "Deploy"})
+
+        assert build_searchable_text(as_string, True) == "agent_a hello deploy"
+        assert build_searchable_text(as_dict, True) == "agent_a hello deploy"
+        assert build_searchable_text(as_dict, False) == "agent_a hello"
+
+    def test_add_keeps_ids_sorted_and_ignores_duplicates(self):
+        """Out-of-order appends are inserted in id order, duplicates skipped."""
+        corpus = SessionSearchCorpus("session_test")
+
+        assert corpus.add(_row(3, "third"))
+        assert corpus.add(_row(1, "first"))
+        assert not corpus.add(_row(3, "third again"))
+
+        assert list(corpus.message_ids) == [1, 3]
+        assert [m["content"] for m in corpus.messages] == ["first", "third"]
+
+    def test_visibility_rules_match_sql_path(self):
+        """Non-admins see public plus their own private/agent_only rows."""
+        corpus = SessionSearchCorpus("session_test")
+        corpus.add(_row(1, "shared deploy notes", sender="agent_a"))
+        corpus.add(_row(2, "private deploy notes", "agent_b", "private"))
+        corpus.add(_row(3, "agent deploy notes", "agent_b", "agent_only"))
+        corpus.add(_row(4, "admin deploy notes", "agent_b", "admin_only"))
+
+        ids = {m["id"] for m, _ in _search(corpus, "deploy")}
+        assert ids == {1}
+
+        ids = {m["id"] for m, _ in _search(corpus, "deploy", agent_id="agent_b")}
+        assert ids == {1, 2, 3}
+
+        ids = {m["id"] for m, _ in _search(corpus, "deploy", is_admin=True)}
+        assert ids == {1, 2, 3, 4}
+
+        ids = {
+            m["id"]
+            for m, _ in _search(
+                corpus, "deploy", agent_id="agent_b", search_scope="private"
+            )
+        }
+        assert ids == {2}
+
+    def test_search_metadata_toggle(self):
+        """Metadata values only match when search_metadata is enabled."""
+        corpus = SessionSearchCorpus("session_test")
+        corpus.add(_row(1, "status update", metadata={"project": "kubernetes"}))
+
+        assert len(_search(corpus, "kubernetes")) == 1
+        assert _search(corpus, "kubernetes", search_metadata=False) == []
+
+
+class TestSearchCorpusManager:
+    """Test corpus lifecycle management."""
+
+    def test_append_only_updates_resident_sessions(self):
+        """Appends to cold sessions are ignored; hot sessions grow in place."""
+        manager = SearchCorpusManager()
+        manager.append("session_cold", _row(1, "ignored"))
+        assert manager.get("session_cold") is None
+
+        token = manager.begin_load("session_hot")
+        manager.finish_load("session_hot", token, [_row(1, "loaded")])
+        manager.append("session_hot", _row(2, "appended"))
+
+        corpus = manager.get("session_hot")
+        assert corpus is not None
+        assert list(corpus.message_ids) == [1, 2]
+        assert manager.get_stats()["appends"] == 1
+
+    def test_load_discarded_when_append_races(self):
+        """A load that overlapped an append is not installed."""
+        manager = SearchCorpusManager()
+
+        token = manager.begin_load("session_race")
+        manager.append("session_race", _row(2, "written during load"))
+        corpus = manager.finish_load("session_race", token, [_row(1, "stale")])
+
+        assert corpus is None
+        assert manager.get("session_race") is None
+        assert manager.get_stats()["discarded_loads"] == 1
+
+    def test_oversized_sessions_are_not_loaded(self):
+        """Sessions above max_messages_per_session stay on the database path."""
+        manager = SearchCorpusManager(max_messages_per_session=2)
+
+        token = manager.begin_load("session_big")
+        rows = [_row(i, f"message {i}") for i in range(3)]
+        assert manager.finish_load("session_big", token, rows) is None
+        assert manager.is_oversized("session_big")
+
+    def test_sessions_over_the_byte_budget_are_not_loaded(self):
+        """A session larger than max_bytes alone is marked oversized, not cycled."""
+        manager = SearchCorpusManager(max_bytes=1000)
+
+        token = manager.begin_load("session_wide")
+        rows = [_row(i, "x" * 200) for i in range(3)]
+        assert manager.finish_load("session_wide", token, rows) is None
+        assert manager.is_oversized("session_wide")
+        assert manager.get_stats()["evictions"] == 0
+        assert manager.total_bytes == 0
+
+        token = manager.begin_load("session_grows")
+        manager.finish_load("session_grows", token, [_row(1, "small")])
+        for i in range(2, 5):
+            manager.append("session_grows", _row(i, "x" * 200))
+        assert manager.get("session_grows") is None
+        assert manager.is_oversized("session_grows")
+
+    @pytest.mark.parametrize(
+        ("max_sessions", "max_bytes"), [(2, 64 * 1024 * 1024), (100, 1200)]
+    )
+    def test_lru_eviction_by_sessions_and_bytes(self, max_sessions, max_bytes):
+        """Least recently used sessions are evicted first under either budget."""
+        manager = SearchCorpusManager(max_sessions=max_sessions, max_bytes=max_bytes)
+
+        for name in ("session_a", "session_b"):
+            token = manager.begin_load(name)
+            manager.finish_load(name, token, [_row(1, "x" * 100)])
+
+        # Touch session_a so session_b becomes least recently used
+        assert manager.get("session_a") is not None
+
+        token = manager.begin_load("session_c")
+        manager.finish_load("session_c", token, [_row(1, "x" * 100)])
+
+        assert manager.get("session_b") is None
+        assert manager.get("session_a") is not None
+        assert manager.get("session_c") is not None
+        assert manager.get_stats()["evictions"] == 1
+        assert manager.total_bytes <= max_bytes
+
+
+class TestExtractMany:
+    """Test multi-query scoring against a shared choice list."""
+
+    CHOICES = [
+        "agent_a deploy the kubernetes cluster",
+        "agent_b review the database migration",
+        "agent_a kubernetes rollout finished",
+        "agent_c lunch plans",
+    ]
+
+    def _expected(self, query, limit, score_cutoff):
+        return [
+            (index, score)
+            for _, score, index in process.extract(
+                query.lower(),
+                self.CHOICES,
+                scorer=fuzz.partial_ratio,
+                limit=limit,
+                score_cutoff=score_cutoff,
+            )
+        ]
+
+    @pytest.mark.parametrize("without_cdist", [False, True])
+    def test_matches_process_extract_per_query(self, monkeypatch, without_cdist):
+        """Each query's matches equal a standalone process.extract call."""
+        if without_cdist:
+
+            def _missing_numpy(*args, **kwargs):
+                raise ImportError("numpy is required for cdist")
+
+            monkeypatch.setattr(process, "cdist", _missing_numpy)
+
+        queries = ["Kubernetes", "database", "nothing relevant here"]
+        results = extract_many(queries, self.CHOICES, limit=2, score_cutoff=70.0)
+
+        assert len(results) == len(queries)
+        for query, matches in zip(queries, results, strict=True):
+            assert [index for index, _ in matches] == [
+                index for index, _ in self._expected(query, 2, 70.0)
+            ]
+            assert [round(score, 2) for _, score in matches] == [
+                round(score, 2) for _, score in self._expected(query, 2, 70.0)
+            ]
+
+    def test_empty_inputs(self):
+        """No queries or no choices yield empty results without scoring."""
+        assert extract_many([], self.CHOICES, limit=5, score_cutoff=0) == []
+        assert extract_many(["a", "b"], [], limit=5, score_cutoff=0) == [[], []]
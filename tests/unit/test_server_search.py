@@ -636,6 +636,54 @@ class TestRapidFuzzSearchSystem:
         assert len(narrow_result["messages"]) == 1
         assert "after delay" in narrow_result["messages"][0]["content"]
 
+    async def test_search_by_timerange_includes_iso_timestamps(
+        self, server_with_db, test_db_manager
+    ):
+        """Rows stored with ISO string timestamps are matched via ts_us."""
+        ctx = MockContext(agent_id="iso_time_agent")
+        create_result = await call_fastmcp_tool(
+            server_with_db.create_session, ctx, purpose="ISO timestamp test"
+        )
+        session_id = create_result["session_id"]
+
+        await call_fastmcp_tool(
+            server_with_db.add_message,
+            ctx,
+            session_id=session_id,
+            content="Float timestamp message",
+            visibility="public",
+        )
+
+        # Simulate rows written with CURRENT_TIMESTAMP-style ISO strings
+        async with test_db_manager.get_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO messages (session_id, sender, content, visibility, timestamp)
+                VALUES (?, ?, ?, 'public', ?)
+                """,
+                (session_id, "iso_time_agent", "ISO inside", "2024-01-01 12:00:00"),
+            )
+            await conn.execute(
+                """
+                INSERT INTO messages (session_id, sender, content, visibility, timestamp)
+                VALUES (?, ?, ?, 'public', ?)
+                """,
+                (session_id, "iso_time_agent", "ISO outside", "2024-01-02 12:00:00"),
+            )
+            await conn.commit()
+
+        result = await call_fastmcp_tool(
+            server_with_db.search_by_timerange,
+            ctx,
+            session_id=session_id,
+            start_time="2024-01-01T00:00:00Z",
+            end_time="2024-01-01T23:59:59Z",
+        )
+
+        assert result["success"] is True
+        assert [m["content"] for m in result["messages"]] == ["ISO inside"]
+        assert result["messages"][0]["ts_us"] == 1704110400000000
+
     async def test_search_context_edge_cases(self, server_with_db, search_test_session):
         """Test search with edge case inputs."""
         session_id, ctx = search_test_session
@@ -840,3 +888,330 @@ class TestRapidFuzzSearchSystem:
             assert any(
                 search_case["should_find"] in content for content in found_contents
             )
+
+    async def test_search_finds_messages_outside_recent_window(
+        self, server_with_db, test_db_manager, monkeypatch
+    ):
+        """Full-text candidates reach messages older than the recent-row tail."""
+        from shared_context_server import search_tools
+        from shared_context_server.utils.search_corpus import search_corpus_manager
+
+        # Force the index-backed path by treating every session as oversized
+        monkeypatch.setattr(search_corpus_manager, "max_messages_per_session", 0)
+        monkeypatch.setattr(search_tools, "_RECENT_CANDIDATE_ROWS", 3)
+        ctx = MockContext(agent_id="fts_agent")
+
+        create_result = await call_fastmcp_tool(
+            server_with_db.create_session, ctx, purpose="FTS candidate test"
+        )
+        session_id = create_result["session_id"]
+
+        await call_fastmcp_tool(
+            server_with_db.add_message,
+            ctx,
+            session_id=session_id,
+            content="Kubernetes deployment manifest reviewed",
+            visibility="public",
+        )
+        for i in range(10):
+            await call_fastmcp_tool(
+                server_with_db.add_message,
+                ctx,
+                session_id=session_id,
+                content=f"Unrelated filler message number {i}",
+                visibility="public",
+            )
+
+        result = await call_fastmcp_tool(
+            server_with_db.search_context,
+            ctx,
+            session_id=session_id,
+            query="kubernetes",
+            fuzzy_threshold=80.0,
+        )
+
+        assert result["success"] is True
+        found_contents = [r["message"]["content"] for r in result["results"]]
+        assert "Kubernetes deployment manifest reviewed" in found_contents
+
+    def test_build_fulltext_query_strips_operators(self):
+        """Full-text queries only contain sanitized prefix tokens."""
+        from shared_context_server.search_tools import _build_fulltext_query
+
+        assert _build_fulltext_query('fast* "api" OR -x', "sqlite") == (
+            '"fast"* OR "api"* OR "or"* OR "x"*'
+        )
+        assert _build_fulltext_query("api", "sqlite", search_metadata=False) == (
+            '{sender content} : ("api"*)'
+        )
+        assert _build_fulltext_query("web api", "postgresql") == "web:* | api:*"
+        assert _build_fulltext_query("web api", "mysql") == "web* api*"
+        assert _build_fulltext_query("?!  --", "sqlite") is None
+
+    async def test_search_uses_session_corpus_after_first_query(
+        self, server_with_db, test_db_manager
+    ):
+        """Hot sessions are served from the in-memory corpus, including new messages."""
+        from shared_context_server.utils.search_corpus import search_corpus_manager
+
+        ctx = MockContext(agent_id="corpus_agent")
+        create_result = await call_fastmcp_tool(
+            server_with_db.create_session, ctx, purpose="Corpus test session"
+        )
+        session_id = create_result["session_id"]
+
+        await call_fastmcp_tool(
+            server_with_db.add_message,
+            ctx,
+            session_id=session_id,
+            content="Initial design discussion about caching",
+            visibility="public",
+        )
+
+        first = await call_fastmcp_tool(
+            server_with_db.search_context, ctx, session_id=session_id, query="caching"
+        )
+        assert first["success"] is True
+        assert search_corpus_manager.get_stats()["loads"] == 1
+
+        # Appended message must be searchable without reloading the corpus
+        await call_fastmcp_tool(
+            server_with_db.add_message,
+            ctx,
+            session_id=session_id,
+            content="Follow-up on websocket reconnection",
+            visibility="private",
+        )
+
+        second = await call_fastmcp_tool(
+            server_with_db.search_context,
+            ctx,
+            session_id=session_id,
+            query="websocket",
+            fuzzy_threshold=80.0,
+        )
+        assert second["success"] is True
+        assert second["cache_hit"] is False
+        found_contents = [r["message"]["content"] for r in second["results"]]
+        assert "Follow-up on websocket reconnection" in found_contents
+
+        stats = search_corpus_manager.get_stats()
+        assert stats["loads"] == 1
+        assert stats["appends"] == 1
+        assert stats["hits"] >= 1
+
+        # Private message stays invisible to other agents on the corpus path
+        other = await call_fastmcp_tool(
+            server_with_db.search_context,
+            MockContext(agent_id="other_corpus_agent"),
+            session_id=session_id,
+            query="websocket",
+            fuzzy_threshold=80.0,
+        )
+        assert other["results"] == []
+
+    async def test_concurrent_search_context_misses_score_once(
+        self, server_with_db, search_test_session
+    ):
+        """Concurrent identical searches share one in-flight scoring pass."""
+        import asyncio
+        from unittest.mock import patch
+
+        from shared_context_server import search_tools
+
+        session_id, ctx = search_test_session
+
+        with patch.object(
+            search_tools,
+            "_get_search_documents",
+            wraps=search_tools._get_search_documents,
+        ) as get_documents:
+            results = await asyncio.gather(
+                *(
+                    call_fastmcp_tool(
+                        server_with_db.search_context,
+                        ctx,
+                        session_id=session_id,
+                        query="framework",
+                        fuzzy_threshold=70.0,
+                    )
+                    for _ in range(5)
+                )
+            )
+
+        assert get_documents.call_count == 1
+        assert all(result["success"] for result in results)
+        assert {
+            tuple(r["message"]["id"] for r in result["results"]) for result in results
+        } == {tuple(r["message"]["id"] for r in results[0]["results"])}
+
+    async def test_stale_search_refresh_is_not_audited(
+        self, server_with_db, search_test_session, monkeypatch
+    ):
+        """A stale-while-revalidate refresh re-caches without an audit record."""
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+
+        from shared_context_server import search_tools
+        from shared_context_server.utils.caching import cache_manager
+
+        session_id, ctx = search_test_session
+        monkeypatch.setattr(cache_manager, "stale_policies", {"search": 600})
+        audit = AsyncMock()
+        monkeypatch.setattr(search_tools, "audit_log", audit)
+
+        async def search():
+            return await call_fastmcp_tool(
+                server_with_db.search_context,
+                ctx,
+                session_id=session_id,
+                query="python",
+                fuzzy_threshold=70.0,
+            )
+
+        first = await search()
+        assert first["cache_hit"] is False
+        refreshes_before = cache_manager.get_cache_stats()["stale_while_revalidate"][
+            "background_refreshes"
+        ]
+
+        # Past the 10-minute TTL but inside the stale window
+        with patch("time.time", return_value=time.time() + 700):
+            stale = await search()
+            assert stale["cache_hit"] is True
+            await asyncio.gather(*list(cache_manager._refresh_tasks.values()))
+
+        swr = cache_manager.get_cache_stats()["stale_while_revalidate"]
+        assert swr["background_refreshes"] - refreshes_before == 1
+        searched = [
+            call for call in audit.await_args_list if call.args[1] == "context_searched"
+        ]
+        assert len(searched) == 1
+
+    async def test_search_context_batch_shares_cache_with_search_context(
+        self, server_with_db, search_test_session
+    ):
+        """Batch results match search_context and reuse its cache entries."""
+        session_id, ctx = search_test_session
+
+        single = await call_fastmcp_tool(
+            server_with_db.search_context,
+            ctx,
+            session_id=session_id,
+            query="python",
+            fuzzy_threshold=70.0,
+        )
+        assert single["cache_hit"] is False
+
+        batch = await call_fastmcp_tool(
+            server_with_db.search_context_batch,
+            ctx,
+            session_id=session_id,
+            queries=["python", "database", "python"],
+            fuzzy_threshold=70.0,
+        )
+        assert batch["success"] is True
+        assert batch["query_count"] == 3
+        assert batch["cache_hits"] == 1
+        assert [r["query"] for r in batch["results"]] == [
+            "python",
+            "database",
+            "python",
+        ]
+
+        python_result, database_result, _ = batch["results"]
+        assert python_result["cache_hit"] is True
+        assert [r["message"]["id"] for r in python_result["results"]] == [
+            r["message"]["id"] for r in single["results"]
+        ]
+        assert database_result["cache_hit"] is False
+        assert any(
+            "SQLite" in r["message"]["content"] for r in database_result["results"]
+        )
+
+        # The batch populated the search_context cache for its misses
+        followup = await call_fastmcp_tool(
+            server_with_db.search_context,
+            ctx,
+            session_id=session_id,
+            query="database",
+            fuzzy_threshold=70.0,
+        )
+        assert followup["cache_hit"] is True
+        assert [r["message"]["id"] for r in followup["results"]] == [
+            r["message"]["id"] for r in database_result["results"]
+        ]
+
+    async def test_search_context_batch_fetches_candidates_per_query(
+        self, server_with_db, monkeypatch
+    ):
+        """Oversized sessions score each batch query against its own candidates."""
+        from shared_context_server import search_tools
+        from shared_context_server.utils.caching import cache_manager
+        from shared_context_server.utils.search_corpus import search_corpus_manager
+
+        # Full-text candidates only, so each query sees just its own matches
+        monkeypatch.setattr(search_corpus_manager, "max_messages_per_session", 0)
+        monkeypatch.setattr(search_tools, "_RECENT_CANDIDATE_ROWS", 0)
+        ctx = MockContext(agent_id="batch_fts_agent")
+
+        create_result = await call_fastmcp_tool(
+            server_with_db.create_session, ctx, purpose="Batch FTS test"
+        )
+        session_id = create_result["session_id"]
+        for content in ("Kube cluster upgraded", "Stacked cubes in storage"):
+            await call_fastmcp_tool(
+                server_with_db.add_message, ctx, session_id=session_id, content=content
+            )
+
+        batch = await call_fastmcp_tool(
+            server_with_db.search_context_batch,
+            ctx,
+            session_id=session_id,
+            queries=["kube", "cubes"],
+            fuzzy_threshold=70.0,
+        )
+        assert batch["success"] is True
+        assert batch["cache_hits"] == 0
+
+        await cache_manager.clear_all()
+        for query, batch_result in zip(["kube", "cubes"], batch["results"]):
+            single = await call_fastmcp_tool(
+                server_with_db.search_context,
+                ctx,
+                session_id=session_id,
+                query=query,
+                fuzzy_threshold=70.0,
+            )
+            assert single["cache_hit"] is False
+            assert [r["message"]["id"] for r in batch_result["results"]] == [
+                r["message"]["id"] for r in single["results"]
+            ]
+
+    async def test_search_context_batch_visibility_and_errors(
+        self, server_with_db, search_test_session
+    ):
+        """Batch search applies per-agent visibility and reports missing sessions."""
+        session_id, _ = search_test_session
+
+        other = await call_fastmcp_tool(
+            server_with_db.search_context_batch,
+            MockContext(agent_id="other_batch_agent"),
+            session_id=session_id,
+            queries=["SQLite database", "machine learning"],
+            fuzzy_threshold=80.0,
+        )
+        assert other["success"] is True
+        for result in other["results"]:
+            assert all(
+                r["message"]["visibility"] == "public" for r in result["results"]
+            )
+
+        missing = await call_fastmcp_tool(
+            server_with_db.search_context_batch,
+            MockContext(agent_id="other_batch_agent"),
+            session_id="session_fake123",
+            queries=["anything"],
+        )
+        assert missing["success"] is False
+        assert missing["code"] == "SESSION_NOT_FOUND"
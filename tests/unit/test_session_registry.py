@@ -0,0 +1,124 @@
+"""
+Unit tests for the in-process session registry.
+
+Once warmed, known session IDs and recently-missing ones are answered from
+memory; anything else falls back to one query whose result is recorded.
+Creating a session in another process reaches the registry through the
+shared cache backend's invalidation fan-out.
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from shared_context_server.utils.cache_backends import SQLiteSharedCacheBackend
+from shared_context_server.utils.caching import SmartCacheManager
+from shared_context_server.utils.session_registry import SessionRegistry
+
+
+def _connection(session_ids: set[str]) -> MagicMock:
+    """A connection whose sessions table holds ``session_ids``."""
+    conn = MagicMock()
+
+    async def execute(query, params):
+        cursor = MagicMock()
+        if query.startswith("SELECT id FROM sessions WHERE"):
+            row = (params[0],) if params[0] in session_ids else None
+            cursor.fetchone = AsyncMock(return_value=row)
+        else:
+            cursor.fetchall = AsyncMock(return_value=[(sid,) for sid in session_ids])
+        return cursor
+
+    conn.execute = AsyncMock(side_effect=execute)
+    return conn
+
+
+@pytest.fixture
+async def registry():
+    """A registry warmed with one existing session."""
+    registry = SessionRegistry(negative_ttl=60)
+    assert await registry.warm(_connection({"session_known"})) == 1
+    return registry
+
+
+class TestSessionRegistry:
+    """Test positive and negative answers, fallbacks and invalidation."""
+
+    async def test_inactive_registry_always_queries(self):
+        """Before warm() every check goes to the database."""
+        registry = SessionRegistry()
+        conn = _connection({"session_a"})
+
+        assert await registry.exists(conn, "session_a")
+        assert await registry.exists(conn, "session_a")
+        assert not await registry.exists(conn, "session_missing")
+        assert conn.execute.await_count == 3
+
+    async def test_known_and_missing_sessions_skip_the_query(self, registry):
+        """Warmed IDs hit; an unknown ID is queried once, then cached as missing."""
+        conn = _connection({"session_known"})
+
+        assert await registry.exists(conn, "session_known")
+        assert not await registry.exists(conn, "session_missing")
+        assert not await registry.exists(conn, "session_missing")
+        assert conn.execute.await_count == 1
+
+        stats = registry.get_stats()
+        assert stats["hits"] == 1
+        assert stats["negative_hits"] == 1
+        assert stats["misses"] == 1
+
+    async def test_negative_entries_expire(self, registry):
+        """A missing ID is re-checked once its negative TTL has passed."""
+        registry.negative_ttl = 0.01
+        assert not await registry.exists(_connection(set()), "session_new")
+
+        time.sleep(0.02)
+        conn = _connection({"session_new"})
+        assert await registry.exists(conn, "session_new")
+        assert conn.execute.await_count == 1
+
+    async def test_created_sessions_replace_negative_entries(self, registry):
+        """add() makes a session known even if it was just reported missing."""
+        assert not await registry.exists(_connection(set()), "session_new")
+
+        registry.add("session_new")
+
+        assert registry.lookup("session_new") is True
+
+    async def test_entries_are_bounded(self, registry):
+        """The least recently used IDs are dropped beyond max_entries."""
+        registry.max_entries = 2
+        registry.add("session_b")
+        registry.lookup("session_known")
+        registry.add("session_c")
+
+        assert registry.lookup("session_b") is None
+        assert registry.lookup("session_known") is True
+        assert registry.lookup("session_c") is True
+
+
+class TestSessionRegistryInvalidation:
+    """Test invalidations published by other processes."""
+
+    async def test_remote_session_creation_clears_negative_entry(
+        self, registry, tmp_path
+    ):
+        """A session namespace invalidation from another process is applied."""
+        path = tmp_path / "shared_cache.db"
+        first, second = SmartCacheManager(), SmartCacheManager()
+        first.shared_backend = SQLiteSharedCacheBackend(path)
+        second.shared_backend = SQLiteSharedCacheBackend(path)
+        second.invalidation_listeners.append(registry.apply_invalidation)
+        try:
+            assert not await registry.exists(_connection(set()), "session_remote")
+
+            # What create_session publishes in the other process
+            await first.invalidate_namespace("session:session_remote")
+            await second.sync_invalidations()
+
+            assert registry.lookup("session_remote") is None
+        finally:
+            await first.shared_backend.close()
+            await second.shared_backend.close()
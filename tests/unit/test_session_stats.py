@@ -0,0 +1,149 @@
+"""
+Unit tests for the trigger-maintained session_stats table.
+
+Every insert and delete on messages and agent_memory keeps the per-session
+counters equal to what the dashboard used to aggregate on each page load.
+"""
+
+from unittest.mock import patch
+
+from shared_context_server import server
+from tests.conftest import MockContext, call_fastmcp_tool, patch_database_connection
+
+RECOUNT = """
+    SELECT COUNT(*) as message_count,
+           COALESCE(SUM(visibility = 'public'), 0) as public_count,
+           COALESCE(SUM(visibility = 'private'), 0) as private_count,
+           COALESCE(SUM(visibility = 'agent_only'), 0) as agent_only_count,
+           COALESCE(SUM(visibility = 'admin_only'), 0) as admin_only_count,
+           COUNT(DISTINCT sender) as participant_count,
+           MAX(ts_us) as last_activity_us
+    FROM messages WHERE session_id = ?
+"""
+STATS = """
+    SELECT message_count, public_count, private_count, agent_only_count,
+           admin_only_count, participant_count, last_activity_us
+    FROM session_stats WHERE session_id = ?
+"""
+
+
+async def _assert_stats_match(conn, session_id: str) -> dict:
+    cursor = await conn.execute(STATS, (session_id,))
+    stats = dict(await cursor.fetchone())
+    cursor = await conn.execute(RECOUNT, (session_id,))
+    assert stats == dict(await cursor.fetchone())
+    return stats
+
+
+class TestSessionStats:
+    """Test that session_stats follows message and memory writes."""
+
+    async def test_counters_follow_inserts_and_deletes(self, test_db_manager):
+        """Counts, senders and last activity match a full recount throughout."""
+        async with test_db_manager.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+                ("session_stats_test", "Stats test", "agent_a"),
+            )
+            stats = await _assert_stats_match(conn, "session_stats_test")
+            assert stats["message_count"] == 0
+
+            messages = [
+                ("agent_a", "public", "2024-01-01 00:00:00"),
+                ("agent_b", "private", 1704067300.25),
+                ("agent_a", "admin_only", "2024-01-01 00:00:10"),
+                ("agent_c", "agent_only", 1704067200.5),
+            ]
+            for sender, visibility, timestamp in messages:
+                await conn.execute(
+                    "INSERT INTO messages "
+                    "(session_id, sender, content, visibility, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ("session_stats_test", sender, "hello", visibility, timestamp),
+                )
+            stats = await _assert_stats_match(conn, "session_stats_test")
+            assert stats["participant_count"] == 3
+            assert stats["last_activity_us"] == 1704067300250000
+
+            cursor = await conn.execute(
+                "SELECT last_activity FROM session_stats WHERE session_id = ?",
+                ("session_stats_test",),
+            )
+            assert (await cursor.fetchone())[0] == 1704067300.25
+
+            # Deleting the newest message and a sender's only message
+            await conn.execute("DELETE FROM messages WHERE sender = 'agent_b'")
+            stats = await _assert_stats_match(conn, "session_stats_test")
+            assert stats["participant_count"] == 2
+
+            cursor = await conn.execute(
+                "SELECT sender, message_count FROM session_senders "
+                "WHERE session_id = ? ORDER BY sender",
+                ("session_stats_test",),
+            )
+            assert [tuple(row) for row in await cursor.fetchall()] == [
+                ("agent_a", 2),
+                ("agent_c", 1),
+            ]
+
+    async def test_memory_count_tracks_session_memory(self, test_db_manager):
+        """Session-scoped memory entries are counted; global ones are not."""
+        async with test_db_manager.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO sessions (id, purpose, created_by) VALUES (?, ?, ?)",
+                ("session_stats_mem", "Stats test", "agent_a"),
+            )
+            for session_id, key in (
+                ("session_stats_mem", "one"),
+                ("session_stats_mem", "two"),
+                (None, "global"),
+            ):
+                await conn.execute(
+                    "INSERT INTO agent_memory (agent_id, session_id, key, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    ("agent_a", session_id, key, '"v"'),
+                )
+            await conn.execute("DELETE FROM agent_memory WHERE key = 'one'")
+
+            cursor = await conn.execute(
+                "SELECT memory_count FROM session_stats WHERE session_id = ?",
+                ("session_stats_mem",),
+            )
+            assert (await cursor.fetchone())[0] == 1
+
+    async def test_tools_and_debug_prompt_use_stats(self, test_db_manager):
+        """Messages added through the tools show up in the debug prompt."""
+        from shared_context_server.prompts import debug_session_prompt
+
+        with patch_database_connection(test_db_manager):
+            ctx_a = MockContext(session_id="stats_tools", agent_id="agent_a")
+            ctx_b = MockContext(session_id="stats_tools", agent_id="agent_b")
+            created = await call_fastmcp_tool(
+                server.create_session, ctx_a, purpose="Stats through tools"
+            )
+            session_id = created["session_id"]
+            for ctx, visibility in (
+                (ctx_a, "public"),
+                (ctx_a, "private"),
+                (ctx_b, "public"),
+            ):
+                await call_fastmcp_tool(
+                    server.add_message,
+                    ctx,
+                    session_id=session_id,
+                    content="hello",
+                    visibility=visibility,
+                )
+
+            with patch(
+                "shared_context_server.prompts.get_db_connection",
+                test_db_manager.get_connection,
+            ):
+                result = await debug_session_prompt.render({"session_id": session_id})
+
+        content = result[0].content.text
+        assert "**Total Messages**: 3" in content
+        assert "- public: 2 messages" in content
+        assert "- private: 1 messages" in content
+        assert "- agent_a: 2 messages" in content
+        assert "Active Multi-Agent Session" in content